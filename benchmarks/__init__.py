@@ -0,0 +1,16 @@
+"""
+Benchmarks de rendimiento.
+
+- benchmarks.generators: micro-benchmark de cada generador de ejercicios
+- benchmarks.pipeline: pipeline completo de main_v2.py, desglosado por etapas
+- benchmarks.profiling: medición por etapas y muestreo de pilas (flamegraphs)
+- benchmarks.report: informes JSON comparables entre commits + regresiones
+
+Ejecutar con:
+    python -m benchmarks.generators --baseline informe_anterior.json
+    python -m benchmarks.pipeline --sizes 10 100 --profile
+"""
+
+from benchmarks.report import Regression, compare_reports, load_report, save_report
+
+__all__ = ['Regression', 'compare_reports', 'load_report', 'save_report']
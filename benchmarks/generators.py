@@ -0,0 +1,279 @@
+"""
+Micro-benchmark de generación: todos los generadores del ExerciseMapper
+(GENERATORS_MAP) y del EXERCISE_CATALOG.
+
+Para cada generador se miden hasta dos modos:
+- generate:   generator.generate(difficulty)
+- randomized: aleatorizador (<Nombre>Randomizer, la misma convención que
+              ExamBuilder) + generator.generate_from_problem(); sin
+              aleatorizador, generate_from_problem({}) (el generador sortea)
+
+Y por modo: ejercicios/segundo, latencia p50/p99 y pico de memoria por
+ejercicio (tracemalloc, en una pasada aparte para no falsear los tiempos).
+
+Un generador que no se puede importar, que no implementa el modo o que
+falla siempre queda en el informe con status 'unavailable' / 'skipped' /
+'error': el benchmark nunca se interrumpe por uno. Si solo falla a veces
+se mide igual (las llamadas correctas) y se anotan los fallos en 'errors'.
+
+Uso:
+    python -m benchmarks.generators
+    python -m benchmarks.generators --iterations 500 --filter numeracion
+    python -m benchmarks.generators --baseline build/benchmarks/generators_base.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from core.generator_base import ExerciseGenerator
+from benchmarks.report import (
+    compare_reports, load_report, make_report, print_comparison, save_report, summarize_latencies
+)
+
+DEFAULT_OUTPUT = "build/benchmarks/generators.json"
+
+
+@dataclass
+class GeneratorCase:
+    """Un generador + modo a medir."""
+    case_id: str          # 'mapper:2.1.1.2:generate', 'catalog:karnaugh_4vars:randomized'...
+    source: str           # 'mapper' o 'catalog'
+    key: str              # topic_id o id del catálogo
+    mode: str             # 'generate' o 'randomized'
+    factory: Callable[[], Any]  # Crea el generador (puede lanzar ImportError...)
+    difficulty: int = 1
+
+
+def find_randomizer_class(generator: Any) -> Optional[type]:
+    """
+    Aleatorizador de un generador, por convención (la de ExamBuilder):
+    <Nombre>Generator → <Nombre>Randomizer en el mismo módulo. Si no existe,
+    el único Randomizer del módulo que empiece por el tema del generador
+    (ConversionExerciseGenerator → ConversionRowRandomizer).
+    """
+    module = sys.modules.get(generator.__class__.__module__)
+    if module is None:
+        return None
+    name = generator.__class__.__name__
+    if 'Generator' not in name:
+        return None
+    exact = getattr(module, name.replace('Generator', 'Randomizer'), None)
+    if exact is not None:
+        return exact
+
+    stem = name.replace('ExerciseGenerator', '').replace('Generator', '')
+    candidates = [value for attr, value in vars(module).items()
+                  if isinstance(value, type) and attr.endswith('Randomizer') and attr.startswith(stem)
+                  and value.__module__ == module.__name__]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def discover_cases(name_filter: Optional[str] = None) -> List[GeneratorCase]:
+    """Casos de GENERATORS_MAP y EXERCISE_CATALOG (filtrados por subcadena)."""
+    from core.exercise_mapper import ExerciseMapper
+    from core.generator_factory import GeneratorFactory
+
+    cases = []
+    for topic_id in ExerciseMapper.get_all_generators():
+        factory = (lambda topic_id=topic_id: GeneratorFactory.create_generator(topic_id))
+        for mode in ('generate', 'randomized'):
+            cases.append(GeneratorCase(f"mapper:{topic_id}:{mode}", 'mapper', topic_id, mode, factory))
+
+    try:
+        from core.catalog import EXERCISE_CATALOG
+    except ImportError as e:
+        print(f"[WARN] EXERCISE_CATALOG no disponible: {e}")
+        EXERCISE_CATALOG = {}
+    for ex_id, generator in EXERCISE_CATALOG.items():
+        factory = (lambda generator=generator: generator)
+        for mode in ('generate', 'randomized'):
+            cases.append(GeneratorCase(f"catalog:{ex_id}:{mode}", 'catalog', ex_id, mode, factory))
+
+    if name_filter:
+        cases = [case for case in cases if name_filter in case.case_id]
+    return cases
+
+
+def _make_call(case: GeneratorCase, generator: Any) -> Optional[Callable[[], Any]]:
+    """Función a medir (None si el modo no aplica a este generador)."""
+    if case.mode == 'generate':
+        if type(generator).generate is ExerciseGenerator.generate:
+            return None  # Solo el generate() por defecto, que lanza NotImplementedError
+        return lambda: generator.generate(difficulty=case.difficulty)
+
+    randomizer_class = find_randomizer_class(generator)
+    if randomizer_class is not None:
+        randomizer = randomizer_class()
+        return lambda: generator.generate_from_problem(randomizer.randomize())
+    if type(generator).generate_from_problem is not ExerciseGenerator.generate_from_problem:
+        # Sin aleatorizador: los generadores sortean los campos que falten
+        return lambda: generator.generate_from_problem({})
+    return None
+
+
+def run_case(case: GeneratorCase, iterations: int = 200, warmup: int = 10,
+             memory_samples: int = 20, seed: int = 0) -> Dict[str, Any]:
+    """
+    Mide un caso.
+
+    Returns:
+        Entrada del informe: status + métricas (o el error)
+    """
+    result: Dict[str, Any] = {'source': case.source, 'key': case.key, 'mode': case.mode}
+    try:
+        generator = case.factory()
+    except Exception as e:  # ImportError, AttributeError, constructores rotos...
+        return {**result, 'status': 'unavailable', 'error': f"{type(e).__name__}: {e}"}
+    if generator is None:
+        return {**result, 'status': 'unavailable', 'error': "Sin generador mapeado"}
+    result['generator'] = generator.__class__.__name__
+
+    try:
+        call = _make_call(case, generator)
+    except Exception as e:
+        return {**result, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    if call is None:
+        return {**result, 'status': 'skipped', 'error': "El generador no implementa este modo"}
+
+    errors: List[str] = []
+
+    def timed() -> Optional[int]:
+        start = time.perf_counter_ns()
+        try:
+            call()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return None
+        return time.perf_counter_ns() - start
+
+    # Los generadores imprimen trazas: se descartan para no medir la consola
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        random.seed(seed)
+        for _ in range(warmup):
+            timed()
+            _clear(sink)
+
+        samples = []
+        for _ in range(iterations):
+            elapsed = timed()
+            if elapsed is not None:
+                samples.append(elapsed)
+            _clear(sink)
+
+        peak = _peak_memory(call, memory_samples, sink) if samples else 0
+
+    if not samples:
+        return {**result, 'status': 'error', 'errors': len(errors), 'error': errors[-1] if errors else None}
+
+    entry = {**result, 'status': 'ok', 'iterations': len(samples), 'errors': len(errors),
+             **summarize_latencies(samples), 'peak_kib': round(peak / 1024, 2)}
+    if errors:
+        entry['error'] = errors[-1]
+    return entry
+
+
+def _clear(sink: io.StringIO):
+    sink.seek(0)
+    sink.truncate()
+
+
+def _peak_memory(call: Callable[[], Any], samples: int, sink: io.StringIO) -> int:
+    """Mayor pico de memoria (bytes) de `samples` llamadas."""
+    if samples <= 0:
+        return 0
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            try:
+                call()
+            except Exception:
+                continue  # Los fallos ya se contaron al medir tiempos
+            finally:
+                _clear(sink)
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - baseline)
+        return peak
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def run_suite(cases: Optional[Iterable[GeneratorCase]] = None, iterations: int = 200,
+              warmup: int = 10, memory_samples: int = 20, seed: int = 0,
+              verbose: bool = True) -> Dict[str, Any]:
+    """Ejecuta todos los casos y devuelve el informe."""
+    cases = list(discover_cases() if cases is None else cases)
+    results = {}
+    for case in cases:
+        results[case.case_id] = entry = run_case(case, iterations, warmup, memory_samples, seed)
+        if verbose:
+            _print_entry(case.case_id, entry)
+
+    params = {'iterations': iterations, 'warmup': warmup,
+              'memory_samples': memory_samples, 'seed': seed}
+    return make_report('generators', results, params)
+
+
+def _print_entry(case_id: str, entry: Dict[str, Any]):
+    if entry['status'] == 'ok':
+        print(f"   ⏱️  {case_id:<48} {entry['ops_per_sec']:>10.1f} ej/s  "
+              f"p50 {entry['p50_us']:>9.1f}µs  p99 {entry['p99_us']:>9.1f}µs  "
+              f"pico {entry['peak_kib']:>8.1f}KiB")
+        if entry['errors']:
+            print(f"   [WARN] {case_id}: {entry['errors']} llamadas fallidas ({entry['error']})")
+    else:
+        print(f"   [{entry['status'].upper()}] {case_id}: {entry.get('error', '')}")
+
+
+def hottest(report: Dict[str, Any], top: int = 5) -> List[str]:
+    """Casos más lentos (menos ejercicios/segundo)."""
+    ok = [(entry['ops_per_sec'], case_id) for case_id, entry in report['cases'].items()
+          if entry.get('status') == 'ok']
+    return [case_id for _, case_id in sorted(ok)[:top]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark de los generadores de ejercicios")
+    parser.add_argument("--iterations", type=int, default=200, help="Ejercicios medidos por caso")
+    parser.add_argument("--warmup", type=int, default=10, help="Ejercicios de calentamiento por caso")
+    parser.add_argument("--memory-samples", type=int, default=20,
+                        help="Ejercicios medidos con tracemalloc (0 = no medir memoria)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de random (reproducible)")
+    parser.add_argument("--filter", default=None, help="Solo casos cuyo id contenga este texto")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Informe JSON de salida")
+    parser.add_argument("--baseline", default=None, help="Informe anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Empeoramiento relativo tolerado (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    cases = discover_cases(args.filter)
+    print(f"📊 Benchmark de generadores: {len(cases)} casos, {args.iterations} iteraciones")
+    report = run_suite(cases, args.iterations, args.warmup, args.memory_samples, args.seed)
+    path = save_report(report, args.output)
+    print(f"💾 Informe: {path}")
+
+    slowest = hottest(report)
+    if slowest:
+        print(f"🔥 Más lentos: {', '.join(slowest)}")
+
+    if args.baseline:
+        regressions = compare_reports(load_report(args.baseline), report, args.threshold)
+        print_comparison(regressions, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
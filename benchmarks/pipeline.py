@@ -0,0 +1,361 @@
+"""
+Benchmark de extremo a extremo del pipeline de main_v2.py, por etapas.
+
+Para cada tamaño de examen (10/100/1000 ejercicios) y cada repositorio
+(ficheros, SQLite o ninguno) ejecuta el flujo completo en un directorio
+temporal y mide por separado:
+
+    setup              config del caso en disco + construcción del repositorio
+                       (esquema/WAL de SQLite, carga del índice de ficheros)
+    config_load        ExamBuilder(config): lectura del JSON + semilla
+    build              builder.build() sin sus subetapas (generación + JSON agnóstico)
+    mapper             conversiones ExerciseData → Problem (MAPPER_REGISTRY)
+    repo_save          guardado en lote en el repositorio (_flush_saves)
+    intermediate_json  builder.save_intermediate_json()
+    render_exam        LatexExamRenderer(is_solution=False).render_to(fichero)
+    render_solution    LatexExamRenderer(is_solution=True).render_to(fichero)
+    teardown           repository.close() + borrado del directorio temporal
+    other              resto no asignado a ninguna etapa (total - suma de etapas)
+
+Por etapa (tiempos propios, sin subetapas; con 'other' el desglose suma el
+total, que es la mediana de las pasadas):
+tiempo de pared, tiempo de CPU, porcentaje del total y memoria
+(retenida y pico, con tracemalloc en una pasada aparte para no inflar los
+tiempos). Con --profile vuelca además las pilas plegadas de cada caso
+(flamegraph.pl / speedscope).
+
+La carga es sintética y reproducible (semilla fija), sin red ni LaTeX:
+tablas de conversión (ConversionExerciseData, las que renderiza el examen)
+y filas sueltas (ConversionRow, las que el mapper guarda en el repositorio),
+calculadas por los generadores reales de numeración.
+
+Uso:
+    python -m benchmarks.pipeline
+    python -m benchmarks.pipeline --sizes 10 100 --repos sqlite --repeat 5
+    python -m benchmarks.pipeline --profile --baseline build/benchmarks/pipeline_base.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.profiling import StackSampler, StageProfiler
+from benchmarks.report import compare_reports, load_report, make_report, print_comparison, save_report
+from core import exam_builder
+from core.exam_builder import ExamBuilder
+from core.generator_base import ExerciseGenerator
+from modules.numeracion.generators import ConversionExerciseGenerator
+from modules.numeracion.models import ArithmeticOp, ConversionExerciseData, ConversionRow
+
+DEFAULT_OUTPUT = "build/benchmarks/pipeline.json"
+DEFAULT_SIZES = (10, 100, 1000)
+REPOSITORIES = ('file', 'sqlite', 'none')
+STAGES = ('setup', 'config_load', 'build', 'mapper', 'repo_save', 'intermediate_json',
+          'render_exam', 'render_solution', 'teardown')
+# Tiempo de la pasada fuera de las etapas medidas
+OTHER_STAGE = 'other'
+
+# Ids del catálogo de la carga sintética ('numeracion' → ProblemType.NUMERACION)
+ROW_EXERCISE_ID = "numeracion"
+TABLE_EXERCISE_ID = "bench_tabla_numeracion"
+
+
+# ---------- Carga sintética ----------
+
+class _SyntheticRowGenerator(ExerciseGenerator):
+    """Fila de conversión válida: problema sorteado + solución del generador real."""
+
+    # Columna (numeración del generador) → rango representable en 8 bits
+    RANGES = {1: (-128, 255), 2: (0, 255), 3: (-128, 127)}
+
+    def __init__(self):
+        self.solver = ConversionExerciseGenerator()
+
+    @property
+    def topic(self) -> str:
+        return "Representación Numérica (benchmark)"
+
+    def generate(self, difficulty: int = 1) -> ConversionRow:
+        return self.make_row(random.choice("abcd"))
+
+    def make_row(self, label: str) -> ConversionRow:
+        column = random.choice(list(self.RANGES))
+        return self.solver.generate_from_problem({
+            'label': label, 'val_decimal': random.randint(*self.RANGES[column]),
+            'target_col_idx': column, 'representable': True,
+        })
+
+
+class _SyntheticTableGenerator(_SyntheticRowGenerator):
+    """Tabla de conversión (4 filas + 2 operaciones), como num_conversion_8bits."""
+
+    def generate(self, difficulty: int = 1) -> ConversionExerciseData:
+        rows = [self.make_row(label) for label in "abcd"]
+        ops = []
+        for _ in range(2):
+            first, second = random.sample(rows, 2)
+            result = first.val_decimal + second.val_decimal
+            ops.append(ArithmeticOp(
+                title="Operación Aritmética", description="Realizar suma en binario",
+                op_type="suma", system="binario", operand1=first.label, operand2=second.label,
+                operator_symbol="+", val1_dec=first.val_decimal, val2_dec=second.val_decimal,
+                result_dec=result, result_bin=self.solver._int_to_bin(result, 8),
+                overflow=False, underflow=False, carry_bits="",
+            ))
+        return ConversionExerciseData(title="Sistemas de Representación",
+                                      description="Complete la tabla. Registro de 8 bits.",
+                                      n_bits=8, rows=rows, operations=ops)
+
+
+def make_config(n_exercises: int, seed: int = 2026) -> Dict[str, Any]:
+    """Config sintética: mitad tablas (se renderizan), mitad filas (se guardan)."""
+    tables = (n_exercises + 1) // 2
+    return {
+        'title': f"Benchmark {n_exercises}",
+        'seed': seed,
+        'exercises': [
+            {'id': TABLE_EXERCISE_ID, 'qty': tables},
+            {'id': ROW_EXERCISE_ID, 'qty': n_exercises - tables},
+        ],
+    }
+
+
+@contextmanager
+def synthetic_catalog() -> Iterator[None]:
+    """Registra los generadores sintéticos en el catálogo mientras dura el bloque."""
+    catalog = exam_builder.EXERCISE_CATALOG
+    previous = {key: catalog.get(key) for key in (ROW_EXERCISE_ID, TABLE_EXERCISE_ID)}
+    catalog[ROW_EXERCISE_ID] = _SyntheticRowGenerator()
+    catalog[TABLE_EXERCISE_ID] = _SyntheticTableGenerator()
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                catalog.pop(key, None)
+            else:
+                catalog[key] = value
+
+
+@contextmanager
+def _working_dir(path: Path) -> Iterator[None]:
+    # Los renderers escriben en build/latex relativo al directorio actual
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _make_repository(kind: str, workdir: Path):
+    from database import FileProblemRepository, SQLiteProblemRepository
+    if kind == 'file':
+        return FileProblemRepository(str(workdir / "problems_db"))
+    if kind == 'sqlite':
+        return SQLiteProblemRepository(str(workdir / "problems.db"))
+    if kind == 'none':
+        return None
+    raise ValueError(f"Repositorio desconocido: {kind}. Válidos: {REPOSITORIES}")
+
+
+# ---------- Ejecución ----------
+
+def run_pipeline(n_exercises: int, repo: str, profiler: StageProfiler, seed: int = 2026) -> int:
+    """
+    Una ejecución completa (en un directorio temporal), midiendo cada etapa.
+
+    Returns:
+        Número de ejercicios construidos
+    """
+    from renderers.latex.main_renderer import LatexExamRenderer
+
+    tmp = tempfile.TemporaryDirectory(prefix="bench_pipeline_")
+    workdir = Path(tmp.name)
+    repository = None
+    try:
+        with profiler.stage('setup'):
+            config_path = workdir / "exam.json"
+            config_path.write_text(json.dumps(make_config(n_exercises, seed)), encoding="utf-8")
+            repository = _make_repository(repo, workdir)
+
+        with _working_dir(workdir):
+            with profiler.stage('config_load'):
+                builder = ExamBuilder(str(config_path), problem_repository=repository)
+
+            with contextlib.ExitStack() as patches:
+                patches.enter_context(profiler.patched(builder, '_flush_saves', 'repo_save'))
+                for mapper in exam_builder.MAPPER_REGISTRY.values():
+                    patches.enter_context(profiler.patched(mapper, 'exercise_to_problem', 'mapper'))
+                with profiler.stage('build'):
+                    exercises = builder.build(use_repository=repository is not None)
+
+            with profiler.stage('intermediate_json'):
+                builder.save_intermediate_json(str(workdir / "json" / "ejercicios.json"))
+
+            os.makedirs(os.path.join("build", "latex"), exist_ok=True)
+            for stage, is_solution in (('render_exam', False), ('render_solution', True)):
+                with profiler.stage(stage):
+                    renderer = LatexExamRenderer(is_solution=is_solution)
+                    path = os.path.join("build", "latex", f"{stage}.tex")
+                    with open(path, "w", encoding="utf-8") as f:
+                        renderer.render_to(f, exercises)
+    finally:
+        with profiler.stage('teardown'):
+            if repository is not None and hasattr(repository, 'close'):
+                repository.close()
+            tmp.cleanup()
+    return len(exercises)
+
+
+def run_case(n_exercises: int, repo: str, repeat: int = 3, track_memory: bool = True,
+             seed: int = 2026, profile_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Mide un caso: `repeat` pasadas de tiempo (mediana por etapa), una de
+    memoria y, opcionalmente, una de muestreo de pilas.
+    """
+    sink = io.StringIO()  # El pipeline imprime su progreso: no se mide la consola
+    with synthetic_catalog(), contextlib.redirect_stdout(sink):
+        runs = []
+        built = 0
+        for _ in range(repeat):
+            profiler = StageProfiler()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            built = run_pipeline(n_exercises, repo, profiler, seed)
+            runs.append((time.perf_counter() - wall_start, time.process_time() - cpu_start,
+                         profiler.results()))
+
+        memory: Dict[str, Dict[str, Any]] = {}
+        total_peak = 0.0
+        if track_memory:
+            with StageProfiler(track_memory=True) as profiler:
+                with profiler.stage('total'):
+                    run_pipeline(n_exercises, repo, profiler, seed)
+            memory = profiler.results()
+            total_peak = memory.pop('total')['peak_kib']
+
+        if profile_path is not None:
+            with StackSampler() as sampler:
+                run_pipeline(n_exercises, repo, StageProfiler(), seed)
+            sampler.write_folded(profile_path)
+
+    wall_s = statistics.median(run[0] for run in runs)
+    stages = {}
+    for name in STAGES:
+        measured = [run[2][name] for run in runs if name in run[2]]
+        if not measured:
+            continue
+        stages[name] = {
+            'calls': measured[0]['calls'],
+            'wall_s': round(statistics.median(m['self_wall_s'] for m in measured), 6),
+            'cpu_s': round(statistics.median(m['self_cpu_s'] for m in measured), 6),
+            'share': round(statistics.median(m['self_wall_s'] for m in measured) / wall_s, 4) if wall_s else 0.0,
+        }
+        if name in memory:
+            stages[name]['net_kib'] = memory[name]['net_kib']
+            stages[name]['peak_kib'] = memory[name]['peak_kib']
+
+    # Resto: total - suma de etapas (tiempos propios, no se solapan). Sobre las
+    # medianas ya redondeadas, para que el informe sume exactamente el total
+    cpu_s = statistics.median(run[1] for run in runs)
+    other_wall = wall_s - sum(stage['wall_s'] for stage in stages.values())
+    other_cpu = cpu_s - sum(stage['cpu_s'] for stage in stages.values())
+    stages[OTHER_STAGE] = {
+        'calls': 1,
+        'wall_s': round(other_wall, 6),
+        'cpu_s': round(other_cpu, 6),
+        'share': round(other_wall / wall_s, 4) if wall_s else 0.0,
+    }
+
+    entry = {
+        'status': 'ok', 'exercises': built, 'repo': repo, 'repeat': repeat,
+        'wall_s': round(wall_s, 6),
+        'cpu_s': round(cpu_s, 6),
+        'ops_per_sec': round(built / wall_s, 2) if wall_s else 0.0,
+        'stages': stages,
+    }
+    if track_memory:
+        entry['peak_kib'] = total_peak
+    if profile_path is not None:
+        entry['profile'] = str(profile_path)
+    return entry
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES, repos: Sequence[str] = ('file', 'sqlite'),
+              repeat: int = 3, track_memory: bool = True, seed: int = 2026,
+              profile_dir: Optional[Path] = None, verbose: bool = True) -> Dict[str, Any]:
+    """Todos los casos tamaño × repositorio; devuelve el informe."""
+    cases = {}
+    for n_exercises in sizes:
+        for repo in repos:
+            case_id = f"{n_exercises}:{repo}"
+            profile_path = profile_dir / f"pipeline_{n_exercises}_{repo}.folded" if profile_dir else None
+            try:
+                cases[case_id] = run_case(n_exercises, repo, repeat, track_memory, seed, profile_path)
+            except Exception as e:
+                cases[case_id] = {'status': 'error', 'exercises': n_exercises, 'repo': repo,
+                                  'error': f"{type(e).__name__}: {e}"}
+            if verbose:
+                print_case(case_id, cases[case_id])
+
+    params = {'sizes': list(sizes), 'repos': list(repos), 'repeat': repeat,
+              'track_memory': track_memory, 'seed': seed}
+    return make_report('pipeline', cases, params)
+
+
+def print_case(case_id: str, entry: Dict[str, Any]):
+    if entry['status'] != 'ok':
+        print(f"   [ERROR] {case_id}: {entry['error']}")
+        return
+    print(f"   ⏱️  {case_id}: {entry['wall_s']:.3f}s pared, {entry['cpu_s']:.3f}s CPU, "
+          f"{entry['ops_per_sec']:.1f} ej/s")
+    for name, stage in entry['stages'].items():
+        memory = f"  pico {stage['peak_kib']:>9.1f}KiB" if 'peak_kib' in stage else ""
+        print(f"      {name:<18} {stage['wall_s']:>8.4f}s ({stage['share']:>6.1%})  "
+              f"CPU {stage['cpu_s']:>8.4f}s{memory}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de extremo a extremo del pipeline de exámenes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Ejercicios por examen (por defecto: 10 100 1000)")
+    parser.add_argument("--repos", nargs="+", choices=REPOSITORIES, default=['file', 'sqlite'],
+                        help="Repositorios a medir")
+    parser.add_argument("--repeat", type=int, default=3, help="Pasadas de tiempo por caso (mediana)")
+    parser.add_argument("--no-memory", action="store_true", help="No medir memoria (más rápido)")
+    parser.add_argument("--seed", type=int, default=2026, help="Semilla de la carga sintética")
+    parser.add_argument("--profile", action="store_true",
+                        help="Vuelca pilas plegadas por caso (flamegraph.pl / speedscope)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Informe JSON de salida")
+    parser.add_argument("--baseline", default=None, help="Informe anterior con el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Empeoramiento relativo tolerado (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat debe ser >= 1")
+
+    output = Path(args.output)
+    profile_dir = output.parent if args.profile else None
+    print(f"📊 Benchmark del pipeline: tamaños {args.sizes}, repositorios {args.repos}")
+    report = run_suite(args.sizes, args.repos, args.repeat, not args.no_memory, args.seed, profile_dir)
+    print(f"💾 Informe: {save_report(report, output)}")
+
+    if args.baseline:
+        regressions = compare_reports(load_report(args.baseline), report, args.threshold)
+        print_comparison(regressions, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
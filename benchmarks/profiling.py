@@ -0,0 +1,225 @@
+"""
+Herramientas de medición por etapas para los benchmarks.
+
+- StageProfiler: tiempo de pared, tiempo de CPU y memoria (tracemalloc) de
+  etapas con nombre, anidables. Además del total de cada etapa guarda sus
+  tiempos PROPIOS (sin las subetapas), para que el desglose sume el total.
+- StackSampler: muestreo de la pila del hilo principal cada `interval`
+  segundos; vuelca "pilas plegadas" (formato de flamegraph.pl / speedscope):
+
+      main (main_v2.py:9);build (core/exam_builder.py:171);... 42
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+@dataclass
+class StageStats:
+    """Acumulado de una etapa (puede ejecutarse varias veces)."""
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    self_wall_s: float = 0.0  # Sin subetapas
+    self_cpu_s: float = 0.0
+    net_kib: float = 0.0      # Memoria retenida al salir (solo con tracemalloc)
+    peak_kib: float = 0.0     # Pico sobre la memoria al entrar (solo con tracemalloc)
+
+    def asdict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'self_wall_s': round(self.self_wall_s, 6),
+            'self_cpu_s': round(self.self_cpu_s, 6),
+            'net_kib': round(self.net_kib, 2),
+            'peak_kib': round(self.peak_kib, 2),
+        }
+
+
+@dataclass
+class _Frame:
+    name: str
+    wall_start: float
+    cpu_start: float
+    mem_start: int = 0
+    child_wall: float = 0.0
+    child_cpu: float = 0.0
+    child_peak: int = 0  # Mayor pico visto por las subetapas (tracemalloc)
+
+
+class StageProfiler:
+    """
+    Mide etapas con nombre.
+
+    Ejemplo:
+        profiler = StageProfiler(track_memory=True)
+        with profiler.stage("build"):
+            with profiler.patched(builder, "_flush_saves", "repo_save"):
+                builder.build()
+        profiler.results()  # {'build': {...}, 'repo_save': {...}}
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.stats: Dict[str, StageStats] = {}
+        self._stack: List[_Frame] = []
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Arranca tracemalloc si se mide memoria."""
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self):
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def __enter__(self) -> "StageProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mide el bloque como la etapa `name` (anidable; solo en un hilo)."""
+        frame = _Frame(name, time.perf_counter(), time.process_time())
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            tracemalloc.reset_peak()
+            frame.mem_start = current
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall = time.perf_counter() - frame.wall_start
+            cpu = time.process_time() - frame.cpu_start
+            stats = self.stats.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall_s += wall
+            stats.cpu_s += cpu
+            stats.self_wall_s += wall - frame.child_wall
+            stats.self_cpu_s += cpu - frame.child_cpu
+
+            if self.track_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame.child_peak)
+                stats.net_kib += (current - frame.mem_start) / 1024
+                stats.peak_kib = max(stats.peak_kib, (peak - frame.mem_start) / 1024)
+
+            if self._stack:
+                parent = self._stack[-1]
+                parent.child_wall += wall
+                parent.child_cpu += cpu
+                if self.track_memory:
+                    parent.child_peak = max(parent.child_peak, peak)
+
+    @contextmanager
+    def patched(self, obj: Any, attr: str, name: str) -> Iterator[None]:
+        """Mide como etapa `name` cada llamada a obj.attr mientras dura el bloque."""
+        original = getattr(obj, attr)
+        had_own = attr in getattr(obj, '__dict__', {})
+
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return original(*args, **kwargs)
+
+        setattr(obj, attr, timed)
+        try:
+            yield
+        finally:
+            if had_own:
+                setattr(obj, attr, original)
+            else:
+                delattr(obj, attr)
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.asdict() for name, stats in self.stats.items()}
+
+
+class StackSampler:
+    """
+    Perfilador por muestreo de un hilo (por defecto, el que lo crea).
+
+    Ejemplo:
+        with StackSampler() as sampler:
+            run()
+        sampler.write_folded("build/benchmarks/pipeline.folded")
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None,
+                 root: Optional[str] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.root = os.path.abspath(root or os.getcwd())
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._previous_switch: Optional[float] = None
+
+    def start(self):
+        # Con un intervalo de cambio de hilo menor el muestreo es más fino
+        self._previous_switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._previous_switch, self.interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._previous_switch is not None:
+            sys.setswitchinterval(self._previous_switch)
+            self._previous_switch = None
+
+    def __enter__(self) -> "StackSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        filename = code.co_filename
+        if filename.startswith(self.root):
+            filename = os.path.relpath(filename, self.root)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def write_folded(self, path: Union[str, Path]) -> Path:
+        """Pilas plegadas ("marco;marco;... cuenta"), de más a menos frecuente."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,194 @@
+"""
+Informes de benchmark: estadísticas, JSON comparable entre commits y
+detección de regresiones.
+
+Un informe es un JSON con el mismo esquema para todas las suites:
+
+    {
+        "suite": "generators",
+        "schema": 1,
+        "created_at": "2026-01-15T10:00:00",
+        "environment": {"python": "3.11.7", "platform": "...", "commit": "abc123"},
+        "params": {...},
+        "cases": {
+            "<case_id>": {"status": "ok", "ops_per_sec": ..., "p50_us": ..., ...},
+            "<case_id>": {"status": "error", "error": "..."}
+        }
+    }
+
+compare_reports() enfrenta dos informes caso a caso: una métrica empeora
+más que `threshold` (0.10 = 10%) → regresión. Si los casos tienen desglose
+por etapas ("stages": {nombre: {"wall_s": ...}}), también cada etapa.
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+SCHEMA_VERSION = 1
+
+# Métricas que se comparan: nombre -> True si "más es mejor"
+COMPARED_METRICS = {
+    'ops_per_sec': True,
+    'p99_us': False,
+    'peak_kib': False,
+    'wall_s': False,
+}
+
+# Etapas más cortas que esto (en la referencia) son ruido: no se comparan
+MIN_STAGE_SECONDS = 0.005
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_latencies(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """ops/s, media, p50 y p99 (en microsegundos) de unas latencias en ns."""
+    if not samples_ns:
+        return {'ops_per_sec': 0.0, 'mean_us': 0.0, 'p50_us': 0.0, 'p99_us': 0.0}
+    ordered = sorted(samples_ns)
+    total_ns = sum(ordered)
+    return {
+        'ops_per_sec': round(len(ordered) * 1e9 / total_ns, 2) if total_ns else float('inf'),
+        'mean_us': round(total_ns / len(ordered) / 1000, 2),
+        'p50_us': round(percentile(ordered, 0.50) / 1000, 2),
+        'p99_us': round(percentile(ordered, 0.99) / 1000, 2),
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Python, plataforma y commit actual (si hay git)."""
+    info = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5, check=True).stdout.strip()
+        info['commit'] = commit or None
+    except (OSError, subprocess.SubprocessError):
+        info['commit'] = None
+    return info
+
+
+def make_report(suite: str, cases: Dict[str, Dict[str, Any]],
+                params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Informe con el esquema común."""
+    return {
+        'suite': suite,
+        'schema': SCHEMA_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'params': params or {},
+        'cases': cases,
+    }
+
+
+def save_report(report: Dict[str, Any], path: Union[str, Path]) -> Path:
+    """Guarda el informe (JSON indentado, claves ordenadas: diffs legibles)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    return path
+
+
+def load_report(path: Union[str, Path]) -> Dict[str, Any]:
+    """Carga un informe y comprueba su esquema."""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('schema') != SCHEMA_VERSION:
+        raise ValueError(f"Esquema de informe no soportado en {path}: {report.get('schema')}")
+    return report
+
+
+@dataclass
+class Regression:
+    """Métrica de un caso que empeora más que el umbral."""
+    case_id: str
+    metric: str
+    baseline: Any
+    current: Any
+    change: Optional[float]  # Variación relativa (+0.25 = 25% peor); None si no aplica
+
+    def __str__(self) -> str:
+        if self.change is None:
+            return f"{self.case_id}: {self.metric} {self.baseline} → {self.current}"
+        return (f"{self.case_id}: {self.metric} {self.baseline} → {self.current} "
+                f"({self.change:+.1%} peor)")
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Regression]:
+    """
+    Regresiones de `current` respecto a `baseline`.
+
+    Solo se comparan los casos presentes en ambos. Un caso que funcionaba y
+    ahora falla también es una regresión.
+    """
+    if threshold < 0:
+        raise ValueError(f"threshold debe ser >= 0, recibió {threshold}")
+    if baseline.get('suite') != current.get('suite'):
+        raise ValueError(f"Informes de suites distintas: {baseline.get('suite')} vs {current.get('suite')}")
+
+    regressions = []
+    for case_id, before in sorted(baseline.get('cases', {}).items()):
+        after = current.get('cases', {}).get(case_id)
+        if after is None or before.get('status') != 'ok':
+            continue
+        if after.get('status') != 'ok':
+            regressions.append(Regression(case_id, 'status', 'ok', after.get('status'), None))
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            regression = _compare_metric(case_id, metric, before.get(metric), after.get(metric),
+                                         higher_is_better, threshold)
+            if regression:
+                regressions.append(regression)
+
+        after_stages = after.get('stages', {})
+        for stage, stats in before.get('stages', {}).items():
+            old = stats.get('wall_s')
+            if stage not in after_stages or not old or old < MIN_STAGE_SECONDS:
+                continue
+            regression = _compare_metric(case_id, f"stages.{stage}.wall_s", old,
+                                         after_stages[stage].get('wall_s'), False, threshold)
+            if regression:
+                regressions.append(regression)
+    return regressions
+
+
+def _compare_metric(case_id: str, metric: str, old: Any, new: Any, higher_is_better: bool,
+                    threshold: float) -> Optional[Regression]:
+    if not old or new is None:
+        return None
+    change = (old - new) / old if higher_is_better else (new - old) / old
+    if change > threshold:
+        return Regression(case_id, metric, old, new, round(change, 4))
+    return None
+
+
+def print_comparison(regressions: List[Regression], threshold: float, out=None):
+    """Resumen de compare_reports() por consola."""
+    out = out or sys.stdout
+    if not regressions:
+        print(f"✅ Sin regresiones (umbral {threshold:.0%})", file=out)
+        return
+    print(f"❌ {len(regressions)} regresiones (umbral {threshold:.0%}):", file=out)
+    for regression in regressions:
+        print(f"   - {regression}", file=out)
@@ -13,24 +13,89 @@ Uso:
     python -m cli.problems search "conversión"
     python -m cli.problems stats
     python -m cli.problems export --format json --output problems.json
+    python -m cli.problems export --format ndjson --output problems.ndjson.gz
+    python -m cli.problems import --file problems.ndjson.gz --batch-size 5000
     python -m cli.problems backup
     python -m cli.problems restore backup_20260115.zip
 """
 
 import json
 import os
+import gzip
 import shutil
 import csv
+import textwrap
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Iterator
 import sys
 
 # Importar repositorio
 from database import FileProblemRepository, SQLiteProblemRepository, ProblemRepository
+from models.problem import Problem, ProblemSummary
 from models.problem_type import ProblemType
 
 
+def open_text(path: str, mode: str = "r", newline: Optional[str] = None):
+    """
+    Abre un fichero de texto UTF-8, comprimido con gzip o no.
+    
+    Al escribir se comprime si la ruta termina en '.gz'; al leer se detecta
+    por la cabecera gzip (da igual la extensión).
+    """
+    if "r" in mode:
+        with open(path, "rb") as f:
+            compressed = f.read(2) == b"\x1f\x8b"
+    else:
+        compressed = str(path).endswith(".gz")
+    
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline=newline)
+    return open(path, mode, encoding="utf-8", newline=newline)
+
+
+def detect_format(path: str) -> str:
+    """Formato de intercambio según la extensión (sin '.gz'): 'ndjson', 'csv' o 'json'."""
+    name = str(path).lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return "json"
+
+
+class TransferProgress:
+    """Contador de export/import: una línea de progreso cada `every` problemas."""
+    
+    def __init__(self, label: str, every: int = 10000):
+        self.label = label
+        self.every = every
+        self.count = 0
+        self.start = time.perf_counter()
+    
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+    
+    @property
+    def rate(self) -> float:
+        """Problemas por segundo desde el inicio."""
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+    
+    def advance(self, n: int = 1):
+        before = self.count
+        self.count += n
+        if self.every and self.count // self.every > before // self.every:
+            print(f"   [PROGRESS] {self.label}: {self.count} problemas ({self.rate:.0f}/s)")
+    
+    def summary(self) -> str:
+        return f"{self.count} problemas en {self.elapsed:.1f}s ({self.rate:.0f}/s)"
+
+
 class ProblemsCLI:
     """Interface CLI para gestión de problemas."""
     
@@ -92,8 +157,8 @@ class ProblemsCLI:
         filters['limit'] = limit
         filters['offset'] = offset
         
-        # Listar
-        problems = self.repo.list(filters)
+        # Listar (resúmenes: no se cargan los problemas salvo en modo verbose)
+        problems = list(self.repo.list_summaries(filters))
         
         if not problems:
             print(f"[INFO] No se encontraron problemas")
@@ -109,15 +174,15 @@ class ProblemsCLI:
         info = self.repo.info()
         print(f"[INFO] Total en BD: {info['total']} | Mostrando {offset+1}-{offset+len(problems)}")
     
-    def _print_problem_summary(self, problem, index: int, verbose: bool = False):
-        """Imprime resumen de un problema."""
-        print(f"\n{index}. {problem.metadata.title} (ID: {problem.id[:8]}...)")
+    def _print_problem_summary(self, problem: ProblemSummary, index: int, verbose: bool = False):
+        """Imprime resumen de un problema (verbose carga el problema completo)."""
+        print(f"\n{index}. {problem.title} (ID: {problem.id[:8]}...)")
         print(f"   Tipo: {problem.type.value if problem.type else 'N/A'}")
-        print(f"   Dificultad: {problem.metadata.difficulty}/5")
-        print(f"   Creado: {problem.metadata.created_at}")
+        print(f"   Dificultad: {problem.difficulty}/5")
+        print(f"   Creado: {problem.created_at}")
         
-        if problem.metadata.tags:
-            print(f"   Tags: {', '.join(problem.metadata.tags)}")
+        if problem.tags:
+            print(f"   Tags: {', '.join(problem.tags)}")
         
         if verbose:
             print(f"   Enunciado: {problem.statement.text[:100]}..." if len(problem.statement.text) > 100 else f"   Enunciado: {problem.statement.text}")
@@ -135,26 +200,9 @@ class ProblemsCLI:
             limit: Máximo de resultados
             verbose: Mostrar detalles
         """
-        query_lower = query.lower()
-        results = []
-        
-        # Buscar en todos los problemas
-        all_problems = self.repo.list({'limit': 1000})
-        
-        for problem in all_problems:
-            # Buscar en título
-            if query_lower in problem.metadata.title.lower():
-                results.append((problem, "título"))
-                continue
-            
-            # Buscar en enunciado
-            if query_lower in problem.statement.text.lower():
-                results.append((problem, "enunciado"))
-                continue
-            
-            # Buscar en tags
-            if any(query_lower in tag.lower() for tag in problem.metadata.tags):
-                results.append((problem, "tag"))
+        # El repositorio busca en TODO el banco (FTS5 en SQLite), ya ordenado
+        results = [(problem, self._match_type(problem, query))
+                   for problem in self.repo.search(query, limit=limit)]
         
         if not results:
             print(f"[INFO] No se encontraron problemas con '{query}'")
@@ -164,11 +212,23 @@ class ProblemsCLI:
         print("=" * 100)
         
         for i, (problem, match_type) in enumerate(results[:limit], 1):
-            self._print_problem_summary(problem, i, verbose)
+            self._print_problem_summary(ProblemSummary.from_problem(problem), i, verbose)
             print(f"   Match: {match_type}")
         
         print("=" * 100)
     
+    def _match_type(self, problem, query: str) -> str:
+        """Indica dónde coincide la búsqueda (solo informativo)."""
+        terms = query.lower().split()
+        title = problem.metadata.title.lower()
+        if any(term in title for term in terms):
+            return "título"
+        if any(term in problem.statement.text.lower() for term in terms):
+            return "enunciado"
+        if any(term in tag.lower() for tag in problem.metadata.tags for term in terms):
+            return "tag"
+        return "texto"
+    
     # ==================== STATS ====================
     
     def stats(self, detailed: bool = False):
@@ -207,46 +267,72 @@ class ProblemsCLI:
     
     # ==================== EXPORT ====================
     
-    def export(self, output_file: str, format: str = "json", type_filter: Optional[str] = None):
+    def export(self, output_file: str, format: str = "json", type_filter: Optional[str] = None,
+               chunk_size: int = 500, progress_every: int = 10000):
         """
         Exporta problemas a archivo.
         
+        Recorre el repositorio por bloques (iter_problems) y escribe según
+        lee: la memoria no crece con el número de problemas.
+        
         Args:
-            output_file: Ruta del archivo de salida
-            format: Formato (json, csv)
+            output_file: Ruta del archivo de salida (si termina en .gz, se comprime)
+            format: Formato (json, ndjson, csv)
             type_filter: Filtrar por tipo
+            chunk_size: Problemas leídos del repositorio por bloque
+            progress_every: Mostrar progreso cada N problemas (0 = nunca)
         """
         filters = {}
         if type_filter:
             filters['type'] = type_filter
         
-        problems = self.repo.list(filters)
+        format = format.lower()
+        if format not in ("json", "ndjson", "csv"):
+            print(f"[ERROR] Formato no soportado: {format}")
+            return
         
         os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
         
-        if format.lower() == "json":
-            self._export_json(problems, output_file)
-        elif format.lower() == "csv":
-            self._export_csv(problems, output_file)
-        else:
-            print(f"[ERROR] Formato no soportado: {format}")
-    
-    def _export_json(self, problems, output_file: str):
-        """Exporta a JSON."""
-        data = {
-            "export_date": datetime.now().isoformat(),
-            "total": len(problems),
-            "problems": [p.to_dict() for p in problems]
-        }
+        problems = self.repo.iter_problems(filters, chunk_size=chunk_size)
+        progress = TransferProgress("Exportado", every=progress_every)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if format == "json":
+            self._export_json(problems, output_file, self.repo.count(filters), progress)
+        elif format == "ndjson":
+            self._export_ndjson(problems, output_file, progress)
+        else:
+            self._export_csv(problems, output_file, progress)
         
-        print(f"[OK] Exportado: {output_file} ({len(problems)} problemas)")
+        print(f"[OK] Exportado: {output_file} ({progress.summary()})")
     
-    def _export_csv(self, problems, output_file: str):
+    def _export_json(self, problems: Iterable[Problem], output_file: str, total: int,
+                     progress: TransferProgress):
+        """Exporta a JSON (un documento), escribiendo problema a problema."""
+        with open_text(output_file, 'w') as f:
+            header = json.dumps({"export_date": datetime.now().isoformat(), "total": total},
+                                ensure_ascii=False, indent=2)
+            f.write(header[:-2] + ',\n  "problems": [')
+            
+            for i, problem in enumerate(problems):
+                body = json.dumps(problem.to_dict(), ensure_ascii=False, indent=2)
+                f.write(("\n" if i == 0 else ",\n") + textwrap.indent(body, "    "))
+                progress.advance()
+            
+            f.write("\n  ]\n}\n" if progress.count else "]\n}\n")
+    
+    def _export_ndjson(self, problems: Iterable[Problem], output_file: str,
+                       progress: TransferProgress):
+        """Exporta a NDJSON: un problema por línea (concatenable y legible en streaming)."""
+        with open_text(output_file, 'w') as f:
+            for problem in problems:
+                f.write(json.dumps(problem.to_dict(), ensure_ascii=False, separators=(',', ':')))
+                f.write("\n")
+                progress.advance()
+    
+    def _export_csv(self, problems: Iterable[Problem], output_file: str,
+                    progress: TransferProgress):
         """Exporta a CSV."""
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        with open_text(output_file, 'w', newline='') as f:
             writer = csv.writer(f)
             
             # Encabezados
@@ -266,46 +352,104 @@ class ProblemsCLI:
                     p.metadata.created_at,
                     p.metadata.updated_at
                 ])
-        
-        print(f"[OK] Exportado: {output_file} ({len(problems)} problemas)")
+                progress.advance()
     
     # ==================== IMPORT ====================
     
-    def import_from_file(self, input_file: str, format: str = "json", skip_duplicates: bool = True):
+    def import_from_file(self, input_file: str, format: str = "auto", skip_duplicates: bool = True,
+                         batch_size: int = 1000, progress_every: int = 10000):
         """
         Importa problemas desde archivo.
         
+        Los problemas se procesan por lotes de batch_size: una consulta de
+        ids existentes y un save_many() (una transacción) por lote. Con NDJSON
+        se lee línea a línea, así que la memoria depende solo de batch_size.
+        
         Args:
-            input_file: Ruta del archivo a importar
-            format: Formato (json)
+            input_file: Ruta del archivo a importar (gzip se detecta solo)
+            format: Formato (json, ndjson; auto = según la extensión)
             skip_duplicates: Saltar problemas que ya existen
+            batch_size: Problemas por lote (consulta de duplicados + commit)
+            progress_every: Mostrar progreso cada N problemas (0 = nunca)
         """
-        if format.lower() != "json":
+        format = format.lower()
+        if format == "auto":
+            format = detect_format(input_file)
+        
+        if format == "ndjson":
+            records = self._read_ndjson(input_file)
+        elif format == "json":
+            records = self._read_json(input_file)
+        else:
             print(f"[ERROR] Formato no soportado: {format}")
             return
         
-        with open(input_file, 'r', encoding='utf-8') as f:
+        progress = TransferProgress("Importado", every=progress_every)
+        totals = {'imported': 0, 'skipped': 0, 'errors': 0}
+        
+        batch = []
+        for p_data in records:
+            batch.append(p_data)
+            if len(batch) >= batch_size:
+                self._import_batch(batch, skip_duplicates, totals, progress)
+                batch = []
+        if batch:
+            self._import_batch(batch, skip_duplicates, totals, progress)
+        
+        print(f"[OK] Importado: {totals['imported']} nuevos, {totals['skipped']} duplicados saltados"
+              f" ({progress.summary()})")
+        if totals['errors']:
+            print(f"[WARN] {totals['errors']} problemas inválidos no importados")
+    
+    def _read_json(self, input_file: str) -> Iterator[Dict[str, Any]]:
+        """Problemas de un export JSON (documento completo: se carga entero)."""
+        with open_text(input_file, 'r') as f:
             data = json.load(f)
         
-        problems_data = data if isinstance(data, list) else data.get('problems', [])
-        
-        imported = 0
-        skipped = 0
-        
-        from models.problem import Problem
-        
-        for p_data in problems_data:
+        yield from (data if isinstance(data, list) else data.get('problems', []))
+    
+    def _read_ndjson(self, input_file: str) -> Iterator[Dict[str, Any]]:
+        """Problemas de un export NDJSON, línea a línea (las vacías se ignoran)."""
+        with open_text(input_file, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    print(f"[WARN] Línea {line_number} ignorada: {e}")
+    
+    def _import_batch(self, batch: List[Dict[str, Any]], skip_duplicates: bool,
+                      totals: Dict[str, int], progress: TransferProgress):
+        """Importa un lote: una consulta de duplicados y un save_many()."""
+        existing = self.repo.existing_ids(p.get('id') for p in batch) if skip_duplicates else set()
+        
+        problems = []
+        for p_data in batch:
             problem_id = p_data.get('id')
+            if skip_duplicates and problem_id in existing:
+                totals['skipped'] += 1
+                continue
             
-            if skip_duplicates and self.repo.exists(problem_id):
-                skipped += 1
+            try:
+                problem = Problem.from_dict(p_data)
+            except Exception as e:
+                print(f"[WARN] Problema {problem_id} no importado: {e}")
+                totals['errors'] += 1
+                continue
+            if not self.repo.validate_problem(problem):
+                print(f"[WARN] Problema {problem_id} no importado: inválido")
+                totals['errors'] += 1
                 continue
             
-            problem = Problem.from_dict(p_data)
-            self.repo.save(problem)
-            imported += 1
+            existing.add(problem.id)  # Repetidos dentro del propio fichero
+            problems.append(problem)
         
-        print(f"[OK] Importado: {imported} nuevos, {skipped} duplicados saltados")
+        if problems:
+            self.repo.save_many(problems)
+            totals['imported'] += len(problems)
+        progress.advance(len(batch))
     
     # ==================== DELETE ====================
     
@@ -340,7 +484,7 @@ class ProblemsCLI:
         if difficulty:
             filters['difficulty'] = difficulty
         
-        problems = self.repo.list(filters)
+        problems = list(self.repo.list_summaries(filters, fields=('id', 'title')))
         
         if not problems:
             print(f"[INFO] No hay problemas que cumplan los criterios")
@@ -348,7 +492,7 @@ class ProblemsCLI:
         
         print(f"[WARN] Se van a eliminar {len(problems)} problema(s)")
         for p in problems[:5]:
-            print(f"   - {p.metadata.title}")
+            print(f"   - {p.title}")
         if len(problems) > 5:
             print(f"   ... y {len(problems) - 5} más")
         
@@ -440,18 +584,17 @@ class ProblemsCLI:
             print("[WARN] Repositorio vacío")
             return
         
-        # Check 2: Cargar cada problema
-        all_problems = self.repo.list({'limit': 1000})
+        # Check 2: Cargar cada problema (de uno en uno: la memoria no crece con el banco)
         corrupted = []
         
-        for problem in all_problems:
+        for problem in self.repo.list_summaries(fields=('id', 'type', 'title')):
             try:
-                # Verificar campos esenciales
+                # Verificar campos esenciales (los del resumen no cargan el problema)
                 assert problem.id
                 assert problem.type
-                assert problem.metadata.title
-                assert problem.statement.text
-            except AssertionError:
+                assert problem.title
+                assert problem.problem.statement.text
+            except Exception:
                 corrupted.append(problem.id)
         
         if corrupted:
@@ -486,6 +629,8 @@ Ejemplos:
   problems stats --detailed
   problems export --format json --output export.json
   problems import --file export.json
+  problems export --format ndjson --output banco.ndjson.gz
+  problems import --file banco.ndjson.gz --batch-size 5000
   problems delete 12345678 --confirm
   problems backup
   problems restore backups/backup_20260115_120000 --confirm
@@ -520,14 +665,16 @@ Ejemplos:
     # COMMAND: export
     export_parser = subparsers.add_parser('export', help='Exportar problemas')
     export_parser.add_argument('--output', required=True, help='Archivo de salida')
-    export_parser.add_argument('--format', choices=['json', 'csv'], default='json', help='Formato')
+    export_parser.add_argument('--format', choices=['json', 'ndjson', 'csv'], default='json', help='Formato (.gz = comprimido)')
     export_parser.add_argument('--type', help='Filtrar por tipo')
+    export_parser.add_argument('--chunk-size', type=int, default=500, help='Problemas leídos por bloque')
     
     # COMMAND: import
     import_parser = subparsers.add_parser('import', help='Importar problemas')
     import_parser.add_argument('--file', required=True, help='Archivo a importar')
-    import_parser.add_argument('--format', choices=['json'], default='json', help='Formato')
+    import_parser.add_argument('--format', choices=['auto', 'json', 'ndjson'], default='auto', help='Formato (auto = según extensión)')
     import_parser.add_argument('--skip-duplicates', action='store_true', default=True, help='Saltar duplicados')
+    import_parser.add_argument('--batch-size', type=int, default=1000, help='Problemas por lote (un commit por lote)')
     
     # COMMAND: delete
     delete_parser = subparsers.add_parser('delete', help='Eliminar problemas')
@@ -569,9 +716,11 @@ Ejemplos:
     elif args.command == 'stats':
         cli.stats(detailed=args.detailed)
     elif args.command == 'export':
-        cli.export(args.output, format=args.format, type_filter=getattr(args, 'type', None))
+        cli.export(args.output, format=args.format, type_filter=getattr(args, 'type', None),
+                   chunk_size=args.chunk_size)
     elif args.command == 'import':
-        cli.import_from_file(args.file, format=args.format, skip_duplicates=args.skip_duplicates)
+        cli.import_from_file(args.file, format=args.format, skip_duplicates=args.skip_duplicates,
+                             batch_size=args.batch_size)
     elif args.command == 'delete':
         if args.id:
             cli.delete(args.id, confirm=args.confirm)
@@ -13,7 +13,9 @@ Operación opCB(B, cadena) = opCBm1(B, cadena) + 1
                            = (flip cada dígito) + 1
 """
 
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
+
+from core.tabla_representacion import TablaRepresentacion
 
 
 def opCB_digito(digito: str, base: int) -> str:
@@ -387,57 +389,32 @@ def analizar_representacion_CB(base: int, longitud: int) -> dict:
     }
 
 
-def generar_tabla_CB(base: int, longitud: int) -> str:
+def generar_tabla_CB(base: int, longitud: int, offset: int = 0, limit: Optional[int] = None) -> str:
     """
-    Genera una tabla de todas las representaciones en CB.
+    Genera una tabla de las representaciones en CB.
     
     Args:
-        base: La base numérica (recomendado: 2 o 10)
-        longitud: Número de dígitos
+        base: La base numérica (2 a 36)
+        longitud: Número de dígitos (hasta 32)
+        offset: Primera fila (en orden de palabra)
+        limit: Número de filas (None = todas; solo tablas pequeñas)
     
     Returns:
         str: Tabla formateada
     """
-    if base == 10 and longitud > 3:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use longitud <= 3."
-    
-    if base == 2 and longitud > 8:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use longitud <= 8."
-    
-    total_combinaciones = base ** longitud
+    tabla = TablaRepresentacion('CB', base, longitud)
+    if tabla.demasiado_grande(limit):
+        return tabla.mensaje_demasiado_grande()
+    ancho = max(15, longitud)
     
     lineas = []
     lineas.append(f"Tabla de representacion en CB (base {base}, {longitud} digitos)")
     lineas.append("=" * 80)
-    lineas.append(f"{'Decimal':>8} | {'Repr. CB':>15} | Significado")
+    lineas.append(f"{'Decimal':>8} | {'Repr. CB':>{ancho}} | Significado")
     lineas.append("-" * 80)
     
-    for i in range(total_combinaciones):
-        # Convertir a representación
-        if base == 10:
-            cb_str = str(i).zfill(longitud)
-        elif base == 2:
-            cb_str = format(i, f'0{longitud}b')
-        else:
-            cb_str = format(i, f'0{longitud}x')
-        
-        # Obtener valor decimal
-        valor = CB_a_decimal(cb_str, base)
-        
-        linea = f"{valor:8d} | {cb_str:>15} | "
-        
-        # Agregar notas especiales
-        max_pos = (base ** (longitud - 1)) - 1
-        min_neg = -(base ** (longitud - 1))
-        
-        if valor == 0:
-            linea += "Cero (unica representacion)"
-        elif valor == max_pos:
-            linea += "Maximo positivo"
-        elif valor == min_neg:
-            linea += "Minimo negativo"
-        
-        lineas.append(linea)
+    for fila in tabla.filas(offset, limit):
+        lineas.append(f"{fila.valor:8d} | {fila.palabra:>{ancho}} | {fila.nota}")
     
     lineas.append("=" * 80)
     
@@ -0,0 +1,178 @@
+"""
+Espacio de códigos de un formato numérico: recorrido perezoso y acceso por rango.
+
+FixedPointUnified, IEEE754Gen y FixedPointFloating heredan de CodeSpace:
+
+- iter_codes(chunk_size, order): trozos (CodeChunk) de (código, valor, clase)
+  en orden ascendente de código ('code') o de valor ('value'), sin
+  materializar el formato completo
+- rank(value):   cuántos valores representables distintos son < value
+- unrank(index): (código, valor, clase) del index-ésimo valor en orden de valor
+
+rank() y unrank() son O(1) (fórmula cerrada sobre la rejilla del formato).
+En orden de código aparecen todos los códigos (NaN, ±0...); en orden de
+valor, cada valor distinto una vez (±0 como +0, sin NaN).
+
+Con NumPy (opcional) cada trozo son arrays: códigos int64 (objeto si no
+caben), valores float64 y clases str. Sin NumPy, listas.
+
+Uso:
+    for chunk in IEEE754Gen(5, 10).iter_codes(chunk_size=4096, order='value'):
+        chunk.codes, chunk.values, chunk.classes
+"""
+
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import Any, Iterator, List, NamedTuple, Sequence, Tuple
+import math
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # NumPy es opcional: los trozos son listas
+    np = None
+    HAS_NUMPY = False
+
+ORDERS = ('code', 'value')
+DEFAULT_CHUNK_SIZE = 65536
+
+# Clases de código
+ZERO = 'zero'
+NORMAL = 'normal'
+DENORMAL = 'denormal'
+INFINITY = 'infinity'
+NAN = 'nan'
+
+
+class CodeChunk(NamedTuple):
+    """Trozo de iter_codes(): tres columnas de la misma longitud."""
+    codes: Any
+    values: Any
+    classes: Any
+
+    def entries(self) -> Iterator[Tuple[int, float, str]]:
+        """(código, valor, clase) uno a uno."""
+        return zip((int(code) for code in self.codes), (float(value) for value in self.values),
+                   (str(cls) for cls in self.classes))
+
+
+class CodeSpace(ABC):
+    """
+    Interfaz de recorrido del espacio de códigos.
+
+    Las subclases definen los tamaños, rank(), los códigos de cada tramo de
+    índices en orden de valor y el valor/clase de un lote de códigos; el
+    recorrido por trozos y unrank() son comunes.
+    """
+
+    @property
+    @abstractmethod
+    def code_count(self) -> int:
+        """Número de códigos (orden de código: índices 0..code_count-1)."""
+
+    @property
+    @abstractmethod
+    def value_count(self) -> int:
+        """Número de valores distintos (orden de valor: índices 0..value_count-1)."""
+
+    @abstractmethod
+    def rank(self, value: Any) -> int:
+        """Cuántos valores representables distintos son < value (ValueError para NaN)."""
+
+    @abstractmethod
+    def _value_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        """Códigos de los índices [start, stop) en orden de valor."""
+
+    @abstractmethod
+    def _code_entries(self, codes: Sequence[int]) -> Tuple[Any, Any]:
+        """(valores, clases) de un lote de códigos."""
+
+    def _code_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        """Códigos de los índices [start, stop) en orden de código."""
+        return range(start, stop)
+
+    def unrank(self, index: int) -> Tuple[int, float, str]:
+        """(código, valor, clase) del index-ésimo valor en orden ascendente."""
+        if not 0 <= index < self.value_count:
+            raise IndexError(f"Índice {index} fuera de [0, {self.value_count})")
+        [code] = self._value_order_codes(index, index + 1)
+        values, classes = self._code_entries([code])
+        return int(code), float(values[0]), str(classes[0])
+
+    def iter_codes(self, chunk_size: int = DEFAULT_CHUNK_SIZE, order: str = 'code') -> Iterator[CodeChunk]:
+        """
+        Recorre el formato por trozos de `chunk_size` entradas.
+
+        Args:
+            chunk_size: entradas por trozo (el último puede ser menor)
+            order: 'code' (todos los códigos, ascendentes) o 'value' (valores
+                   distintos, ascendentes)
+
+        Yields:
+            CodeChunk(codes, values, classes)
+        """
+        if order not in ORDERS:
+            raise ValueError(f"Orden desconocido: {order!r} (válidos: {', '.join(ORDERS)})")
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser >= 1")
+
+        if order == 'code':
+            count, codes_of = self.code_count, self._code_order_codes
+        else:
+            count, codes_of = self.value_count, self._value_order_codes
+        for start in range(0, count, chunk_size):
+            codes = codes_of(start, min(start + chunk_size, count))
+            values, classes = self._code_entries(codes)
+            yield self._make_chunk(codes, values, classes)
+
+    def _make_chunk(self, codes: Sequence[int], values: Any, classes: Any) -> CodeChunk:
+        if not HAS_NUMPY:
+            return CodeChunk(list(codes), list(values), list(classes))
+        if isinstance(codes, range):
+            codes = np.arange(codes.start, codes.stop, dtype=np.int64) if codes.stop < 2 ** 63 else list(codes)
+        code_dtype = np.int64 if self._max_code() < 2 ** 63 else object
+        return CodeChunk(np.asarray(codes, dtype=code_dtype), np.asarray(values, dtype=np.float64),
+                         np.asarray(classes, dtype=str))
+
+    def _max_code(self) -> int:
+        """Mayor código posible (decide si los trozos caben en int64)."""
+        return self.code_count - 1
+
+
+def segment_codes(start: int, stop: int, segments: Sequence[Tuple[int, int, int, int]]) -> List[int]:
+    """
+    Códigos de los índices [start, stop) definidos por tramos afines.
+
+    Args:
+        segments: (desde, hasta, a, b): los índices desde <= i < hasta tienen
+                  código a + b·i
+    """
+    codes: List[int] = []
+    for first, last, offset, step in segments:
+        lo, hi = max(start, first), min(stop, last)
+        if lo < hi:
+            codes.extend(range(offset + step * lo, offset + step * hi, step))
+    return codes
+
+
+def exact_fraction(value: Any) -> Fraction:
+    """Valor exacto de un float/int/Decimal/Fraction finito."""
+    return value if isinstance(value, Fraction) else Fraction(value)
+
+
+def floor_log(value: Fraction, base: int) -> int:
+    """floor(log_B(value)) exacto, para value > 0."""
+    # Estimación por longitud en bits (error < 1 en log2) y corrección exacta
+    log2 = value.numerator.bit_length() - value.denominator.bit_length()
+    exponent = math.floor(log2 / math.log2(base))
+    while Fraction(base) ** exponent > value:
+        exponent -= 1
+    while Fraction(base) ** (exponent + 1) <= value:
+        exponent += 1
+    return exponent
+
+
+def check_rankable(value: Any):
+    """rank() no está definido para NaN."""
+    if value != value:
+        raise ValueError("rank() no está definido para NaN")
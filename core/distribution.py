@@ -0,0 +1,245 @@
+"""
+Distribución de valores representables (histogramas exactos).
+
+Cuenta cuántos valores representables caen en cada intervalo (bin) de un
+formato de punto fijo (FixedPointUnified) o flotante (IEEE754Gen), SIN
+enumerarlos: el número de valores por debajo de un umbral tiene fórmula
+cerrada, así que cada bin cuesta O(1) y el histograma completo O(bins),
+sea el formato de 8 o de 64 bits.
+
+- Punto fijo: los valores son la rejilla k·ε (k entero). Bins lineales
+  de igual anchura; recuento con aritmética entera exacta.
+- IEEE754: valores positivos finitos (denormalizados incluidos, sin truncar
+  mantisas). Bins logarítmicos en base B entre el mínimo denormalizado y el
+  máximo normalizado; recuento con Decimal a precisión suficiente para la
+  mantisa (F dígitos en base B).
+
+Uso:
+    from core.distribution import fixed_point_distribution, ieee754_distribution
+
+    dist = ieee754_distribution(IEEE754Gen(E_bits=11, F_bits=52), num_bins=50)
+    dist.counts          # [int, ...] exactos, suman dist.total
+    dist.labels          # centros de bin formateados ("1.23e-308")
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_CEILING, localcontext
+from typing import List, Union
+import math
+
+from core.ieee754 import IEEE754Gen
+from core.punto_fijo_unified import FixedPointUnified
+
+
+@dataclass
+class Distribution:
+    """Histograma de valores representables."""
+    labels: List[str]  # Centro de cada bin (texto, apto para valores fuera de float)
+    counts: List[int]  # Valores representables en cada bin (exactos)
+    scale: str  # 'linear' o 'log'
+    total: int  # Valores contados (= sum(counts))
+    min_value: Union[float, str]  # Menor valor contado (str si no cabe en float)
+    max_value: Union[float, str]  # Mayor valor contado (str si no cabe en float)
+    extra: dict = field(default_factory=dict)  # Datos específicos del formato
+
+
+# ==================== PUNTO FIJO ====================
+
+def fixed_point_units(fp: FixedPointUnified) -> tuple:
+    """
+    Rango de la rejilla de un punto fijo en unidades de ε = B^-F.
+
+    Returns:
+        (k_min, k_max): los valores representables son k·ε, k_min ≤ k ≤ k_max
+    """
+    top = fp.base ** (fp.E + fp.F)
+    if not fp.signed:
+        return 0, top - 1
+    if fp.representation == 'ms':
+        return -(top - 1), top - 1  # ±0 es un único valor
+    return -top, top - 1
+
+
+def fixed_point_distribution(fp: FixedPointUnified, num_bins: int = 50) -> Distribution:
+    """
+    Histograma exacto de un punto fijo: bins lineales de igual anchura.
+
+    El punto j-ésimo de la rejilla (j = 0..n-1) cae en el bin
+    floor(j·bins/(n-1)) (el último valor, en el último bin); cada bin es un
+    intervalo de j con extremos enteros, así que contar es O(1).
+
+    Args:
+        fp: Formato de punto fijo
+        num_bins: Número de bins (se limita al número de valores)
+
+    Returns:
+        Distribution con scale='linear'
+    """
+    k_min, k_max = fixed_point_units(fp)
+    n = k_max - k_min + 1
+    num_bins = max(1, min(num_bins, n))
+    span = n - 1
+
+    counts = []
+    labels = []
+    unit = fp.base_power_F
+    for i in range(num_bins):
+        if span == 0:
+            counts.append(n)
+        else:
+            first = -((-i * span) // num_bins)  # ceil(i·span / bins)
+            last = n if i == num_bins - 1 else -((-(i + 1) * span) // num_bins)
+            counts.append(last - first)
+        center = k_min + span * (2 * i + 1) / (2 * num_bins)
+        labels.append(f"{center / unit:.2f}")
+
+    return Distribution(
+        labels=labels,
+        counts=counts,
+        scale='linear',
+        total=n,
+        min_value=_as_float(k_min, unit),
+        max_value=_as_float(k_max, unit),
+        extra={'epsilon': float(fp.epsilon), 'uniform': True},
+    )
+
+
+# ==================== IEEE 754 ====================
+
+class _FloatCounter:
+    """
+    Cuenta valores positivos finitos de un IEEE754Gen por debajo de B^L.
+
+    Valores (los de decode()):
+    - denormalizados: m·B^(E_min-F), m = 1..B^F-1
+    - normalizados: (B^F + m)·B^(e-F), m = 0..B^F-1, e = E_min..e_max
+    con e_max = (B^E_bits - 2) - bias (el mayor exponente no especial).
+    """
+
+    def __init__(self, ieee: IEEE754Gen):
+        self.B = ieee.base
+        self.F = ieee.F_bits
+        self.e_min = ieee.E_min
+        self.e_max = (ieee.E_max_encoded - 1) - ieee.bias
+        self.per_binade = self.B ** self.F
+        self.denormals = self.per_binade - 1
+        self.binades = max(0, self.e_max - self.e_min + 1)
+        self.total = self.denormals + self.binades * self.per_binade
+        # Dígitos decimales para distinguir mantisas contiguas (F dígitos base B)
+        self.precision = int(self.F * math.log10(self.B)) + 25
+
+    def below(self, L: Decimal) -> int:
+        """Número de valores positivos < B^L (L = exponente en base B)."""
+        B = Decimal(self.B)
+        e0 = math.floor(L)
+        if e0 < self.e_min:
+            # Solo denormalizados (todos son < B^E_min)
+            return min(self.denormals, max(0, _ceil(B ** (L - self.e_min + self.F)) - 1))
+
+        count = self.denormals
+        if e0 > self.e_max:
+            return count + self.binades * self.per_binade
+
+        count += (e0 - self.e_min) * self.per_binade
+        partial = _ceil(B ** (L - e0 + self.F)) - self.per_binade
+        return count + min(self.per_binade, max(0, partial))
+
+    def log_max(self) -> Decimal:
+        """log_B del mayor valor finito."""
+        B = Decimal(self.B)
+        if self.binades == 0:
+            return (Decimal(self.denormals).ln() / B.ln()) + self.e_min - self.F
+        top = Decimal(2 * self.per_binade - 1)
+        return (top.ln() / B.ln()) + self.e_max - self.F
+
+
+def ieee754_distribution(ieee: IEEE754Gen, num_bins: int = 50) -> Distribution:
+    """
+    Histograma exacto de los valores positivos finitos de un IEEE754Gen.
+
+    Bins logarítmicos (en base B) entre el menor denormalizado y el mayor
+    normalizado. Coste O(bins): no se genera ningún valor.
+
+    Args:
+        ieee: Formato flotante
+        num_bins: Número de bins
+
+    Returns:
+        Distribution con scale='log' (extra: denormals, normals, epsilon)
+    """
+    counter = _FloatCounter(ieee)
+    num_bins = max(1, min(num_bins, counter.total))
+
+    with localcontext() as ctx:
+        ctx.prec = counter.precision
+        ctx.Emax = 10 ** 9
+        ctx.Emin = -10 ** 9
+
+        log_min = Decimal(counter.e_min - counter.F)
+        log_max = counter.log_max()
+        step = (log_max - log_min) / num_bins
+        log10_B = Decimal(counter.B).log10()
+
+        counts = []
+        labels = []
+        previous = 0
+        for i in range(num_bins):
+            if i == num_bins - 1:
+                current = counter.total  # El máximo entra en el último bin
+            else:
+                current = counter.below(log_min + step * (i + 1))
+            counts.append(current - previous)
+            previous = current
+            labels.append(_format_log10((log_min + step * (2 * i + 1) / 2) * log10_B))
+
+        min_value = _from_log10(log_min * log10_B)
+        max_value = _from_log10(log_max * log10_B)
+
+    return Distribution(
+        labels=labels,
+        counts=counts,
+        scale='log',
+        total=counter.total,
+        min_value=min_value,
+        max_value=max_value,
+        extra={
+            'denormals': counter.denormals,
+            'normals': counter.binades * counter.per_binade,
+            'epsilon': float(ieee.epsilon),
+            'uniform': False,
+        },
+    )
+
+
+# ==================== AUXILIARES ====================
+
+def _ceil(value: Decimal) -> int:
+    """Techo exacto de un Decimal (sin pasar por float)."""
+    return int(value.to_integral_value(rounding=ROUND_CEILING))
+
+
+def _as_float(k: int, unit: int) -> Union[float, str]:
+    """k/unit como float, o en texto científico si no cabe."""
+    try:
+        return k / unit
+    except OverflowError:
+        return f"{Decimal(k) / Decimal(unit):.6e}"
+
+
+def _format_log10(log10_value: Decimal) -> str:
+    """Texto '1.23e+45' para 10^log10_value (válido fuera del rango de float)."""
+    exponent = math.floor(log10_value)
+    mantissa = float(Decimal(10) ** (log10_value - exponent))
+    if mantissa >= 9.995:  # El redondeo a 2 decimales sube de década
+        mantissa /= 10
+        exponent += 1
+    return f"{mantissa:.2f}e{exponent:+03d}"
+
+
+def _from_log10(log10_value: Decimal) -> Union[float, str]:
+    """10^log10_value como float si cabe (sin desbordar a 0/inf); si no, texto."""
+    if abs(log10_value) < 400:
+        value = float(Decimal(10) ** log10_value)
+        if value != 0 and not math.isinf(value):
+            return value
+    return _format_log10(log10_value)
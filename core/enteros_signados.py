@@ -67,9 +67,11 @@ CONVENCIÓN MSB/LSB:
 - LSB (Least Significant Bit) = bit 0 = bit menos significativo de magnitud
 """
 
-from typing import Dict, Tuple, List, Union
+from typing import Dict, Tuple, List, Optional, Union
 import math
 
+from core.tabla_representacion import TablaRepresentacion
+
 
 # ============================================================================
 # PARTE 1: ANÁLISIS DE RANGO Y CAPACIDAD
@@ -535,62 +537,46 @@ def crear_cero_negativo_ms(n_bits: int) -> str:
     return '1' + '0' * magnitud_bits
 
 
-def generar_tabla_ms(n_bits: int) -> List[Dict]:
+def generar_tabla_ms(n_bits: int, offset: int = 0, limit: Optional[int] = None,
+                     base: int = 2) -> List[Dict]:
     """
-    Genera tabla completa de valores representables en M&S.
+    Genera la tabla de valores representables en M&S, de menor a mayor
+    (los dos ceros, +0 y -0, seguidos).
+    
+    Args:
+        n_bits: Número de dígitos (incluyendo el de signo)
+        offset: Primera fila
+        limit: Número de filas (None = hasta el final)
+        base: Base de la magnitud (dígito de signo 0 ó 1)
     
     Retorna lista de dicts con:
     - decimal: valor decimal
-    - ms_representation: representación en M&S
+    - ms: representación en M&S
     - signo: + o -
     - magnitud: valor absoluto
-    """
-    info = rango_ms(n_bits)
-    tabla = []
-    
-    # Negativos
-    for i in range(info['min_negativo'], 0):
-        tabla.append({
-            'decimal': i,
-            'ms': decimal_a_ms(i, n_bits),
-            'signo': '-',
-            'magnitud': abs(i)
-        })
-    
-    # Ceros
-    tabla.append({
-        'decimal': 0,
-        'ms': crear_cero_positivo_ms(n_bits),
-        'signo': '+',
-        'magnitud': 0,
-        'nota': '+0'
-    })
-    
-    tabla.append({
-        'decimal': 0,
-        'ms': crear_cero_negativo_ms(n_bits),
-        'signo': '-',
-        'magnitud': 0,
-        'nota': '-0 (duplicado)'
-    })
-    
-    # Positivos
-    for i in range(1, info['max_positivo'] + 1):
-        tabla.append({
-            'decimal': i,
-            'ms': decimal_a_ms(i, n_bits),
-            'signo': '+',
-            'magnitud': i
-        })
-    
-    return tabla
-
-
-def mostrar_tabla_ms(n_bits: int) -> str:
+    - nota: solo en los ceros
+    """
+    tabla = TablaRepresentacion('MS', base, n_bits)
+    filas = []
+    for fila in tabla.filas(offset, limit, orden='valor'):
+        entrada = {
+            'decimal': fila.valor,
+            'ms': fila.palabra,
+            'signo': '-' if fila.codigo >= tabla.separacion else '+',
+            'magnitud': abs(fila.valor)
+        }
+        if fila.nota:
+            entrada['nota'] = fila.nota
+        filas.append(entrada)
+    
+    return filas
+
+
+def mostrar_tabla_ms(n_bits: int, offset: int = 0, limit: Optional[int] = None) -> str:
     """
     Muestra tabla de M&S en formato legible.
     """
-    tabla = generar_tabla_ms(n_bits)
+    tabla = generar_tabla_ms(n_bits, offset, limit)
     
     lineas = [
         f"╔ Tabla de Magnitud y Signo ({n_bits} bits) ╗",
@@ -755,9 +741,9 @@ def CBm1_a_decimal(palabra: str, base: int) -> int:
         # Es positivo o cero
         return valor
     else:
-        # Es negativo: aplicar CB-1
+        # Es negativo: aplicar CB-1 (B^l - 1 es el -0)
         max_val = (base ** longitud) - 1
-        return valor - max_val - 1
+        return valor - max_val
 
 
 def ms_a_CBm1(ms_palabra: str, base: int) -> str:
@@ -884,58 +870,33 @@ def analizar_representacion_CBm1(base: int, longitud: int) -> dict:
     }
 
 
-def generar_tabla_CBm1(base: int, longitud: int) -> str:
+def generar_tabla_CBm1(base: int, longitud: int, offset: int = 0, limit: Optional[int] = None) -> str:
     """
-    Genera una tabla de todas las representaciones en CB-1 para una base y longitud.
+    Genera una tabla de las representaciones en CB-1 para una base y longitud.
     
     Args:
-        base: La base numérica (recomendado: 2 o 10)
-        longitud: Número de dígitos
+        base: La base numérica (2 a 36)
+        longitud: Número de dígitos (hasta 32)
+        offset: Primera fila (en orden de palabra)
+        limit: Número de filas (None = todas; solo tablas pequeñas)
     
     Returns:
-        str: Tabla formateada mostrando todas las representaciones
+        str: Tabla formateada mostrando las representaciones
     """
-    if base == 10 and longitud > 4:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use base 2 o menor longitud."
-    
-    if base == 2 and longitud > 8:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use longitud <= 8."
-    
-    total_combinaciones = base ** longitud
+    tabla = TablaRepresentacion('CBm1', base, longitud)
+    if tabla.demasiado_grande(limit):
+        return tabla.mensaje_demasiado_grande()
+    ancho = max(15, longitud)
     
     lineas = []
     lineas.append(f"Tabla de representacion en CB-{base-1} (base {base}, {longitud} digitos)")
     lineas.append("=" * 80)
     
-    lineas.append(f"{'Decimal':>8} | {'CB-{0}':>15} | Significado".format(base-1, ''))
+    lineas.append(f"{'Decimal':>8} | {'CB-' + str(base - 1):>{ancho}} | Significado")
     lineas.append("-" * 80)
     
-    for i in range(total_combinaciones):
-        # Convertir a representación
-        if base == 10:
-            cb1_str = str(i).zfill(longitud)
-        elif base == 2:
-            cb1_str = format(i, f'0{longitud}b')
-        else:
-            cb1_str = format(i, f'0{longitud}x')
-        
-        # Obtener valor decimal
-        valor = CBm1_a_decimal(cb1_str, base)
-        
-        linea = f"{valor:8d} | {cb1_str:>15} | "
-        
-        # Agregar notas especiales
-        max_pos = (base ** (longitud - 1)) - 1
-        if valor == 0 and cb1_str == '0' * longitud:
-            linea += "Cero positivo (+0)"
-        elif valor == 0 and cb1_str == str(base-1) * longitud:
-            linea += "Cero negativo (-0)"
-        elif valor == max_pos:
-            linea += "Maximo positivo"
-        elif valor == -(max_pos):
-            linea += "Minimo negativo"
-        
-        lineas.append(linea)
+    for fila in tabla.filas(offset, limit):
+        lineas.append(f"{fila.valor:8d} | {fila.palabra:>{ancho}} | {fila.nota}")
     
     lineas.append("=" * 80)
     
@@ -1,9 +1,14 @@
+import hashlib
 import json
+import logging
 import os
 import random
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from core.generator_base import ExerciseData, ExerciseGenerator, ExerciseRandomizer
 from core.catalog import EXERCISE_CATALOG
+from core.instrumentation import Instrumentation, get_instrumentation
 
 # Fase C: Importar repository (opcional)
 try:
@@ -21,8 +26,123 @@ except ImportError:
     HAS_MAPPERS = False
     MAPPER_REGISTRY = {}
 
+def derive_exercise_seed(base_seed: Any, ex_id: str, index: int) -> int:
+    """
+    Deriva la semilla del flujo aleatorio propio de un ejercicio.
+    
+    La semilla depende SOLO de (semilla del config, id del ejercicio, índice),
+    nunca del orden de ejecución, por lo que la construcción paralela es
+    reproducible bit a bit con cualquier número de workers.
+    
+    Args:
+        base_seed: Semilla del config (o la generada para esta construcción)
+        ex_id: ID del ejercicio en el catálogo
+        index: Ocurrencia del ejercicio dentro del examen (0, 1, 2...)
+    
+    Returns:
+        Semilla entera de 64 bits
+    """
+    digest = hashlib.sha256(f"{base_seed}:{ex_id}:{index}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def _generate_exercise(generator: ExerciseGenerator, req: Dict[str, Any], difficulty: int,
+                       instrumentation: Optional[Instrumentation] = None) -> ExerciseData:
+    """
+    Genera un ejercicio según la ruta que especifique su entrada del config.
+    
+    RUTA 1: 'problem_json' → generador directo (sin aleatorización)
+    RUTA 2: 'randomizer_params' → aleatorizador + generador con seed
+    RUTA 3: legacy → generator.generate(difficulty)
+    """
+    data = None
+    instrumentation = instrumentation or get_instrumentation()
+    
+    # RUTA 1: JSON Manual (sin aleatorización) - DEBUG/TESTING
+    if 'problem_json' in req:
+        problem_dict = req['problem_json']
+        instrumentation.event("build.route", "      [JSON] Usando JSON manual (sin aleatorización)")
+        
+        if hasattr(generator, 'generate_from_problem'):
+            # Usar generador directo
+            data = generator.generate_from_problem(problem_dict)
+        else:
+            # Fallback: usar generate legacy
+            data = generator.generate(difficulty=difficulty)
+    
+    # RUTA 2: Con Aleatorizador + Seed Controlable - PRODUCCIÓN
+    elif 'randomizer_params' in req:
+        randomizer_params = req['randomizer_params']
+        randomizer_seed = randomizer_params.get('seed')
+        
+        if instrumentation.enabled:
+            if randomizer_seed is not None:
+                message = f"      [RAND] Generando con seed={randomizer_seed} (reproducible)"
+            else:
+                message = "      [RAND] Generando sin seed (aleatorio)"
+            instrumentation.event("build.route", message)
+        
+        # Buscar aleatorizador (por convención: mismo nombre + 'Randomizer')
+        randomizer_class_name = generator.__class__.__name__.replace('Generator', 'Randomizer')
+        
+        # Crear aleatorizador (aquí simplificado, mejorar después)
+        # TODO: Implementar registro de aleatorizadores similar a generadores
+        if hasattr(generator, '__class__'):
+            # Obtener módulo del generador
+            module = __import__(generator.__class__.__module__, fromlist=[randomizer_class_name])
+            if hasattr(module, randomizer_class_name):
+                randomizer_class = getattr(module, randomizer_class_name)
+                randomizer = randomizer_class(**randomizer_params.get('args', {}))
+                
+                # Generar problema aleatorio
+                problem = randomizer.randomize(seed=randomizer_seed)
+                
+                # Pasar al generador
+                if hasattr(generator, 'generate_from_problem'):
+                    data = generator.generate_from_problem(problem)
+                else:
+                    data = generator.generate(difficulty=difficulty)
+            else:
+                # Fallback
+                data = generator.generate(difficulty=difficulty)
+        else:
+            data = generator.generate(difficulty=difficulty)
+    
+    # RUTA 3: Generación Legacy (backward compatibility)
+    if data is None:
+        data = generator.generate(difficulty=difficulty)
+    
+    return data
+
+
+def _generate_task(task: Tuple[int, str, Dict[str, Any], int, int]) -> Tuple[int, ExerciseData, float]:
+    """
+    Worker de la construcción paralela: genera UN ejercicio con su propio flujo.
+    
+    Los generadores usan el módulo global `random`; cada tarea lo resiembra con
+    la semilla derivada de su (ex_id, índice), así el resultado no depende del
+    proceso ni del orden en que se ejecute.
+    
+    Args:
+        task: (posición, ex_id, entrada del config, dificultad, semilla derivada)
+    
+    El tiempo se mide aquí (en el worker) y lo registra el proceso principal:
+    la instrumentación no cruza procesos.
+    
+    Returns:
+        (posición, ExerciseData generado, segundos de generación)
+    """
+    position, ex_id, req, difficulty, task_seed = task
+    random.seed(task_seed)
+    generator = EXERCISE_CATALOG[ex_id]
+    start = time.perf_counter()
+    data = _generate_exercise(generator, req, difficulty)
+    return position, data, time.perf_counter() - start
+
+
 class ExamBuilder:
-    def __init__(self, config_file: str, problem_repository: Optional['ProblemRepository'] = None):
+    def __init__(self, config_file: str, problem_repository: Optional['ProblemRepository'] = None,
+                 instrumentation: Optional[Instrumentation] = None):
         """
         Crea un ExamBuilder con soporte para persistencia (Fase C).
         
@@ -31,7 +151,10 @@ class ExamBuilder:
             problem_repository: (Opcional) Repositorio para guardar/cargar problemas.
                                Si None, no usa persistencia.
                                Puede ser FileProblemRepository o SQLiteProblemRepository.
+            instrumentation: (Opcional) Destino de progreso, contadores y tiempos.
+                             Si None, la activa (core.instrumentation).
         """
+        self._instrumentation = instrumentation
         self.config = self._load_config(config_file)
         self._configure_seed()
         self.exercises_data: List[ExerciseData] = []
@@ -40,8 +163,15 @@ class ExamBuilder:
         # Fase C: Repositorio
         self.problem_repository = problem_repository
         self.saved_problems: List[str] = []  # IDs de problemas guardados
+        self._pending_saves: List[Any] = []  # Problems pendientes de save_many()
         self.loaded_problems: List[str] = []  # IDs de problemas cargados del repo
+        self._reuse_pool: Dict[Any, List[Any]] = {}  # ProblemType → candidatos de sample()
+        self.build_seed: Any = self.config.get("seed")  # Semilla base de build(workers=...)
 
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self._instrumentation or get_instrumentation()
+    
     def _load_config(self, filename: str) -> Dict[str, Any]:
         if not os.path.exists(filename):
             raise FileNotFoundError(f"El archivo de configuración '{filename}' no existe.")
@@ -53,12 +183,14 @@ class ExamBuilder:
         """Configura la semilla aleatoria si está presente en la configuración."""
         seed = self.config.get("seed")
         if seed is not None:
-            print(f"[SEED] Semilla fija detectada: {seed}. La generación será determinista.")
+            self.instrumentation.event(
+                "build.seed", f"[SEED] Semilla fija detectada: {seed}. La generación será determinista.")
             random.seed(seed)
         else:
-            print("[SEED] Semilla aleatoria (random).")
+            self.instrumentation.event("build.seed", "[SEED] Semilla aleatoria (random).")
 
-    def build(self, use_repository: bool = True, reuse_probability: float = 0.0) -> List[ExerciseData]:
+    def build(self, use_repository: bool = True, reuse_probability: float = 0.0,
+              workers: Optional[int] = None) -> List[ExerciseData]:
         """
         Construye el examen generando los datos para cada ejercicio definido en la configuración.
         
@@ -74,22 +206,60 @@ class ExamBuilder:
         - reuse_probability: (0.0-1.0) Probabilidad de reutilizar problema existente del repositorio
                              en lugar de generar uno nuevo
         
+        CONSTRUCCIÓN PARALELA:
+        - workers: Si None (por defecto), genera en serie con el `random` global sembrado
+                   una vez en _configure_seed() (comportamiento histórico).
+                   Si >= 1, cada (ex_id, índice) usa su propio flujo derivado de la
+                   semilla del config y se genera en un pool de `workers` procesos
+                   (1 = en el propio proceso). El resultado es idéntico bit a bit
+                   con cualquier número de workers.
+        
         IMPORTANTE: Genera dos salidas paralelas:
         1. self.exercises_data: List[ExerciseData] objetos Python (para renderers Python)
         2. self.exercises_json: List[Dict] JSON agnóstico (para cualquier renderer agnóstico)
+        
+        INSTRUMENTACIÓN (ver core.instrumentation):
+        - spans 'build' y 'build.generate' (por generador), 'repo.sample', 'repo.save_many'
+        - contadores 'exercises.generated', 'exercises.reused', 'exercises.saved',
+          'exercises.skipped' y 'repo.errors'
         """
         self.exercises_data = []
         self.exercises_json = []
         self.saved_problems = []
         self.loaded_problems = []
+        self._pending_saves = []
         requested_exercises = self.config.get("exercises", [])
+        instrumentation = self.instrumentation
 
-        print(f"[BUILD] Construyendo examen: {self.config.get('title', 'Sin título')}")
+        instrumentation.event("build.start", f"[BUILD] Construyendo examen: {self.config.get('title', 'Sin título')}")
         
         # Fase C: Mostrar estado del repositorio
-        if self.problem_repository:
+        if self.problem_repository and instrumentation.enabled:
             repo_info = self.problem_repository.info()
-            print(f"   [REPO] Repositorio: {repo_info['backend']} ({repo_info['total']} problemas)")
+            instrumentation.event(
+                "build.repository", f"   [REPO] Repositorio: {repo_info['backend']} ({repo_info['total']} problemas)")
+
+        with instrumentation.span("build"):
+            if workers is not None:
+                self._build_parallel(requested_exercises, use_repository, reuse_probability, workers)
+            else:
+                self._build_serial(requested_exercises, use_repository, reuse_probability)
+        return self.exercises_data
+    
+    def _build_serial(self, requested_exercises: List[Dict[str, Any]], use_repository: bool,
+                      reuse_probability: float) -> None:
+        """Construcción histórica: en serie, con el `random` global (ver build())."""
+        instrumentation = self.instrumentation
+
+        # Fase C: candidatos a reutilizar, una llamada a sample() por tipo
+        # (como mucho uno por ejercicio pedido de ese tipo)
+        if self._reuse_enabled(use_repository, reuse_probability):
+            counts: Dict[Any, int] = {}
+            for req in requested_exercises:
+                if req.get("id") in EXERCISE_CATALOG:
+                    problem_type = self._get_problem_type_for_generator(req["id"])
+                    counts[problem_type] = counts.get(problem_type, 0) + req.get("qty", 1)
+            self._presample_reuse(counts, self.config.get("seed"))
 
         for req in requested_exercises:
             ex_id = req.get("id")
@@ -97,120 +267,326 @@ class ExamBuilder:
             difficulty = req.get("difficulty", 1)
 
             if ex_id not in EXERCISE_CATALOG:
-                print(f"[WARN]  Advertencia: El ejercicio '{ex_id}' no existe en el catálogo. Saltando.")
+                self._skip_unknown(ex_id)
                 continue
 
             # Buscar generador en el catálogo
             generator = EXERCISE_CATALOG[ex_id]
-            print(f"   [*] Generando {qty}x '{ex_id}' ({generator.topic})...")
+            instrumentation.event("build.generator", f"   [*] Generando {qty}x '{ex_id}' ({generator.topic})...")
 
             for i in range(qty):
                 data = None
-                problem = None
+                reused = False
                 
                 # Fase C: Opción 1 - Intentar reutilizar del repositorio
-                if (use_repository and 
-                    self.problem_repository and 
-                    HAS_MAPPERS and 
-                    reuse_probability > 0 and 
+                if (self._reuse_enabled(use_repository, reuse_probability) and
                     random.random() < reuse_probability):
-                    
-                    try:
-                        # Obtener mapper para este tipo
-                        problem_type = self._get_problem_type_for_generator(ex_id)
-                        if problem_type and problem_type in MAPPER_REGISTRY:
-                            mapper = MAPPER_REGISTRY[problem_type]
-                            
-                            # Cargar del repositorio
-                            problems = self.problem_repository.get_by_type(problem_type.value)
-                            if problems:
-                                selected_problem = random.choice(problems)
-                                data = mapper.problem_to_exercise(selected_problem)
-                                self.loaded_problems.append(selected_problem.id)
-                                print(f"      [REUSE]  Reutilizado del repositorio: {selected_problem.id[:8]}...")
-                    except Exception as e:
-                        print(f"      [WARN]  No se pudo reutilizar: {e}")
-                        data = None
+                    data = self._reuse_from_repository(ex_id)
+                    reused = data is not None
                 
-                # RUTA 1: JSON Manual (sin aleatorización) - DEBUG/TESTING
-                if data is None and 'problem_json' in req:
-                    problem_dict = req['problem_json']
-                    print(f"      [JSON] Usando JSON manual (sin aleatorización)")
-                    
-                    if hasattr(generator, 'generate_from_problem'):
-                        # Usar generador directo
-                        data = generator.generate_from_problem(problem_dict)
-                    else:
-                        # Fallback: usar generate legacy
-                        data = generator.generate(difficulty=difficulty)
+                # RUTAS 1-3: Generación (JSON manual, aleatorizador o legacy)
+                if data is None:
+                    with instrumentation.span("build.generate", generator=ex_id):
+                        data = _generate_exercise(generator, req, difficulty, instrumentation)
+                    instrumentation.count("exercises.generated", generator=ex_id)
                 
-                # RUTA 2: Con Aleatorizador + Seed Controlable - PRODUCCIÓN
-                elif data is None and 'randomizer_params' in req:
-                    randomizer_params = req['randomizer_params']
-                    randomizer_seed = randomizer_params.get('seed')
-                    
-                    if randomizer_seed is not None:
-                        print(f"      [RAND] Generando con seed={randomizer_seed} (reproducible)")
-                    else:
-                        print(f"      [RAND] Generando sin seed (aleatorio)")
-                    
-                    # Buscar aleatorizador (por convención: mismo nombre + 'Randomizer')
-                    randomizer_class_name = generator.__class__.__name__.replace('Generator', 'Randomizer')
-                    
-                    # Crear aleatorizador (aquí simplificado, mejorar después)
-                    # TODO: Implementar registro de aleatorizadores similar a generadores
-                    if hasattr(generator, '__class__'):
-                        # Obtener módulo del generador
-                        module = __import__(generator.__class__.__module__, fromlist=[randomizer_class_name])
-                        if hasattr(module, randomizer_class_name):
-                            randomizer_class = getattr(module, randomizer_class_name)
-                            randomizer = randomizer_class(**randomizer_params.get('args', {}))
-                            
-                            # Generar problema aleatorio
-                            problem = randomizer.randomize(seed=randomizer_seed)
-                            
-                            # Pasar al generador
-                            if hasattr(generator, 'generate_from_problem'):
-                                data = generator.generate_from_problem(problem)
-                            else:
-                                data = generator.generate(difficulty=difficulty)
-                        else:
-                            # Fallback
-                            data = generator.generate(difficulty=difficulty)
-                    else:
-                        data = generator.generate(difficulty=difficulty)
+                self._register_exercise(ex_id, data, use_repository and not reused)
+
+        self._flush_saves()
+    
+    def _skip_unknown(self, ex_id: Any) -> None:
+        """Informa de un ejercicio del config que no está en el catálogo."""
+        self.instrumentation.count("exercises.skipped")
+        self.instrumentation.event(
+            "build.unknown_exercise",
+            f"[WARN]  Advertencia: El ejercicio '{ex_id}' no existe en el catálogo. Saltando.",
+            logging.WARNING)
+    
+    def build_variants(self, n: int, seed: Any = None, use_repository: bool = True,
+                       reuse_probability: float = 0.0,
+                       workers: Optional[int] = None) -> Iterator[Tuple[int, List[ExerciseData]]]:
+        """
+        Construye N variantes distintas del examen en una sola pasada.
+        
+        Reutiliza la configuración ya cargada, los generadores del catálogo y
+        (si workers > 1) un único pool de procesos para todas las variantes.
+        Es un generador: cada variante se entrega en cuanto está construida,
+        así el llamador puede renderizarla/escribirla sin esperar al resto.
+        
+        Cada variante usa los flujos por ejercicio de build(workers=...) con
+        su propia semilla base derivada de (seed, número de variante), por lo
+        que la variante k es reproducible de forma independiente.
+        
+        Args:
+            n: Número de variantes (>= 1)
+            seed: Semilla maestra. Si None, usa la del config (o una aleatoria)
+            use_repository: Como en build()
+            reuse_probability: Como en build()
+            workers: Procesos para la generación (None o 1 = en este proceso)
+        
+        Yields:
+            (número de variante empezando en 1, ejercicios de esa variante)
+        
+        Ejemplo:
+            for variant, exercises in builder.build_variants(40, seed=2026):
+                tex = renderer.render(exercises, variant=variant)
+        """
+        if n < 1:
+            raise ValueError(f"n debe ser >= 1, recibió {n}")
+        workers = workers or 1
+        if workers < 1:
+            raise ValueError(f"workers debe ser >= 1, recibió {workers}")
+        
+        master_seed = self._build_seed(seed)
+        requested_exercises = self.config.get("exercises", [])
+        instrumentation = self.instrumentation
+        instrumentation.event("build.start",
+                              f"[BUILD] Construyendo {n} variantes de: {self.config.get('title', 'Sin título')}")
+        
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for variant in range(1, n + 1):
+                self.exercises_data = []
+                self.exercises_json = []
+                self.saved_problems = []
+                self.loaded_problems = []
+                self._pending_saves = []
                 
-                # RUTA 3: Generación Legacy (backward compatibility)
-                if data is None:
-                    data = generator.generate(difficulty=difficulty)
+                instrumentation.event("build.variant", f"   [VAR] Variante {variant}/{n}")
+                variant_seed = derive_exercise_seed(master_seed, "__variant__", variant)
+                with instrumentation.span("build"):
+                    self._build_parallel(requested_exercises, use_repository, reuse_probability,
+                                         workers, base_seed=variant_seed, executor=executor)
+                yield variant, list(self.exercises_data)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _build_parallel(self, requested_exercises: List[Dict[str, Any]], use_repository: bool,
+                        reuse_probability: float, workers: int, base_seed: Any = None,
+                        executor: Optional[ProcessPoolExecutor] = None) -> None:
+        """
+        Construcción con flujos aleatorios por ejercicio (ver build(workers=...)).
+        
+        La decisión de reutilizar y la selección del repositorio se hacen en este
+        proceso (el repositorio no se comparte entre procesos); solo la generación
+        se reparte en el pool. Guardado y serialización respetan el orden del config.
+        
+        Args:
+            base_seed: Semilla base de los flujos. Si None, la del config.
+            executor: Pool ya arrancado a reutilizar (build_variants). Si None y
+                      workers > 1, se crea uno para esta construcción.
+        """
+        if workers < 1:
+            raise ValueError(f"workers debe ser >= 1, recibió {workers}")
+        
+        if base_seed is None:
+            base_seed = self._build_seed()
+        planned = []
+        occurrences: Dict[str, int] = {}
+        reuse_counts: Dict[Any, int] = {}
+        reuse_enabled = self._reuse_enabled(use_repository, reuse_probability)
+        
+        for req in requested_exercises:
+            ex_id = req.get("id")
+            qty = req.get("qty", 1)
+            difficulty = req.get("difficulty", 1)
+            
+            if ex_id not in EXERCISE_CATALOG:
+                self._skip_unknown(ex_id)
+                continue
+            
+            self.instrumentation.event(
+                "build.generator", f"   [*] Generando {qty}x '{ex_id}' ({EXERCISE_CATALOG[ex_id].topic})...")
+            
+            for _ in range(qty):
+                index = occurrences.get(ex_id, 0)
+                occurrences[ex_id] = index + 1
                 
-                self.exercises_data.append(data)
+                # Flujo propio: primero decide reutilización, luego siembra la generación.
+                # El sorteo se consume siempre: con o sin repositorio, la misma
+                # semilla genera los mismos ejercicios
+                stream = random.Random(derive_exercise_seed(base_seed, ex_id, index))
+                reuse_draw = stream.random()
+                wants_reuse = reuse_enabled and reuse_draw < reuse_probability
+                task_seed = stream.getrandbits(64)
                 
-                # Fase C: Guardar en repositorio si está disponible
-                if use_repository and self.problem_repository and HAS_MAPPERS and data is not None:
-                    try:
-                        problem_type = self._get_problem_type_for_generator(ex_id)
-                        if problem_type and problem_type in MAPPER_REGISTRY:
-                            mapper = MAPPER_REGISTRY[problem_type]
-                            problem = mapper.exercise_to_problem(data)
-                            problem_id = self.problem_repository.save(problem)
-                            self.saved_problems.append(problem_id)
-                            print(f"      [SAVE] Guardado en repositorio: {problem_id[:8]}...")
-                    except Exception as e:
-                        print(f"      [WARN]  No se guardó en repositorio: {e}")
+                if wants_reuse:
+                    problem_type = self._get_problem_type_for_generator(ex_id)
+                    reuse_counts[problem_type] = reuse_counts.get(problem_type, 0) + 1
+                planned.append((ex_id, req, difficulty, wants_reuse, task_seed))
+        
+        # Todos los candidatos del examen de una vez (una llamada a sample() por tipo)
+        if reuse_counts:
+            self._presample_reuse(reuse_counts, base_seed)
+        
+        slots: List[Tuple[str, Optional[ExerciseData]]] = []
+        tasks = []
+        for ex_id, req, difficulty, wants_reuse, task_seed in planned:
+            data = self._reuse_from_repository(ex_id) if wants_reuse else None
+            if data is None:
+                tasks.append((len(slots), ex_id, req, difficulty, task_seed))
+            slots.append((ex_id, data))
+        
+        self.instrumentation.event("build.parallel", f"   [PAR] {len(tasks)} ejercicios a generar con {workers} worker(s)")
+        if workers == 1 or len(tasks) <= 1:
+            results = map(_generate_task, tasks)
+            self._collect_parallel_results(slots, results, use_repository)
+        else:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            if executor is not None:
+                results = executor.map(_generate_task, tasks, chunksize=chunksize)
+                self._collect_parallel_results(slots, results, use_repository)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = pool.map(_generate_task, tasks, chunksize=chunksize)
+                    self._collect_parallel_results(slots, results, use_repository)
+    
+    def _collect_parallel_results(self, slots: List[Tuple[str, Optional[ExerciseData]]],
+                                  results, use_repository: bool) -> None:
+        """Coloca los ejercicios generados en su posición y los registra en orden."""
+        # Los huecos ya rellenos son reutilizados: ya están en el repositorio
+        reused = [data is not None for _, data in slots]
+        instrumentation = self.instrumentation
+        for position, data, elapsed in results:
+            ex_id = slots[position][0]
+            slots[position] = (ex_id, data)
+            instrumentation.observe("build.generate", elapsed, generator=ex_id)
+            instrumentation.count("exercises.generated", generator=ex_id)
+        
+        for (ex_id, data), was_reused in zip(slots, reused):
+            self._register_exercise(ex_id, data, use_repository and not was_reused)
+        self._flush_saves()
+    
+    def _build_seed(self, seed: Any = None) -> Any:
+        """
+        Semilla base de los flujos por ejercicio.
+        
+        Usa la indicada o, si no, la del config; si tampoco hay, genera una
+        (del SO). La guarda en self.build_seed para poder reproducir la construcción.
+        """
+        if seed is None:
+            seed = self.config.get("seed")
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.build_seed = seed
+        return seed
+    
+    def _reuse_enabled(self, use_repository: bool, reuse_probability: float) -> bool:
+        """Fase C: ¿Se puede reutilizar del repositorio en esta construcción?"""
+        return bool(use_repository and self.problem_repository and
+                    HAS_MAPPERS and reuse_probability > 0)
+    
+    def _presample_reuse(self, counts: Dict[Any, int], seed: Any = None) -> None:
+        """
+        Fase C: Elige de antemano los problemas a reutilizar en el examen.
+        
+        Una llamada a repository.sample() por tipo (k = huecos de ese tipo),
+        en lugar de listar el repositorio en cada ejercicio reutilizado.
+        Con semilla, la elección es reproducible para un mismo repositorio.
+        
+        Args:
+            counts: ProblemType → número máximo de problemas a reutilizar
+            seed: Semilla base (None = aleatorio)
+        """
+        self._reuse_pool = {}
+        for problem_type, k in counts.items():
+            if not problem_type or problem_type not in MAPPER_REGISTRY:
+                continue
+            type_seed = None if seed is None else derive_exercise_seed(seed, "__reuse__", problem_type.value)
+            try:
+                # sample() los devuelve en orden de sorteo: se consumen desde el final
+                with self.instrumentation.span("repo.sample", type=problem_type.value):
+                    candidates = self.problem_repository.sample(problem_type, k=k, seed=type_seed)
+                self._reuse_pool[problem_type] = candidates[::-1]
+            except Exception as e:
+                self._repo_warning("sample", f"      [WARN]  No se pudo muestrear el repositorio: {e}")
+    
+    def _reuse_from_repository(self, ex_id: str) -> Optional[ExerciseData]:
+        """
+        Fase C: Intenta reutilizar un problema existente del repositorio.
+        
+        Toma el siguiente candidato elegido por _presample_reuse().
+        
+        Args:
+            ex_id: ID del ejercicio en el catálogo
+        
+        Returns:
+            ExerciseData reconstruido, o None si no quedan candidatos
+        """
+        try:
+            # Obtener mapper para este tipo
+            problem_type = self._get_problem_type_for_generator(ex_id)
+            if problem_type and problem_type in MAPPER_REGISTRY:
+                mapper = MAPPER_REGISTRY[problem_type]
                 
-                # Serializar a JSON agnóstico
-                if hasattr(data, 'asdict'):
-                    self.exercises_json.append(data.asdict())
-                else:
-                    # Fallback para ejercicios sin asdict()
-                    self.exercises_json.append({
-                        "title": getattr(data, 'title', ''),
-                        "description": getattr(data, 'description', ''),
-                        "data": str(data)
-                    })
-
-        return self.exercises_data
+                candidates = self._reuse_pool.get(problem_type)
+                if candidates:
+                    selected_problem = candidates.pop()
+                    data = mapper.problem_to_exercise(selected_problem)
+                    self.loaded_problems.append(selected_problem.id)
+                    self.instrumentation.count("exercises.reused", generator=ex_id)
+                    self.instrumentation.event(
+                        "build.reuse", f"      [REUSE]  Reutilizado del repositorio: {selected_problem.id[:8]}...")
+                    return data
+        except Exception as e:
+            self._repo_warning("reuse", f"      [WARN]  No se pudo reutilizar: {e}")
+        return None
+    
+    def _register_exercise(self, ex_id: str, data: ExerciseData, use_repository: bool) -> None:
+        """Añade un ejercicio al examen: lista Python, repositorio (Fase C) y JSON agnóstico."""
+        self.exercises_data.append(data)
+        
+        # Fase C: Preparar para guardar en repositorio (se escribe en lote en _flush_saves)
+        if use_repository and self.problem_repository and HAS_MAPPERS and data is not None:
+            try:
+                problem_type = self._get_problem_type_for_generator(ex_id)
+                if problem_type and problem_type in MAPPER_REGISTRY:
+                    mapper = MAPPER_REGISTRY[problem_type]
+                    problem = mapper.exercise_to_problem(data)
+                    if self.problem_repository.validate_problem(problem):
+                        self._pending_saves.append(problem)
+                    else:
+                        self._repo_warning(
+                            "validate", f"      [WARN]  No se guardó en repositorio: Problem inválido: {problem}")
+            except Exception as e:
+                self._repo_warning("convert", f"      [WARN]  No se guardó en repositorio: {e}")
+        
+        # Serializar a JSON agnóstico
+        if hasattr(data, 'asdict'):
+            self.exercises_json.append(data.asdict())
+        else:
+            # Fallback para ejercicios sin asdict()
+            self.exercises_json.append({
+                "title": getattr(data, 'title', ''),
+                "description": getattr(data, 'description', ''),
+                "data": str(data)
+            })
+    
+    def _flush_saves(self) -> None:
+        """
+        Fase C: Guarda en UNA operación (save_many) los problemas de la construcción.
+        
+        En SQLite es un único executemany + commit en lugar de una conexión y
+        un commit por ejercicio.
+        """
+        pending, self._pending_saves = self._pending_saves, []
+        if not pending:
+            return
+        instrumentation = self.instrumentation
+        try:
+            with instrumentation.span("repo.save_many"):
+                problem_ids = self.problem_repository.save_many(pending)
+            self.saved_problems.extend(problem_ids)
+            instrumentation.count("exercises.saved", len(problem_ids))
+            instrumentation.event("build.save", f"      [SAVE] Guardados en repositorio: {len(problem_ids)} problemas")
+        except Exception as e:
+            self._repo_warning("save", f"      [WARN]  No se guardó en repositorio: {e}")
+    
+    def _repo_warning(self, operation: str, message: str) -> None:
+        """Fase C: fallo no fatal del repositorio (contador + aviso)."""
+        self.instrumentation.count("repo.errors", operation=operation)
+        self.instrumentation.event("build.repository_error", message, logging.WARNING)
     
     def _get_problem_type_for_generator(self, ex_id: str) -> Optional[Any]:
         """
@@ -283,7 +659,7 @@ class ExamBuilder:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(output, f, ensure_ascii=False, indent=2)
         
-        print(f"[SAVE] JSON intermedio guardado: {os.path.abspath(output_file)}")
+        self.instrumentation.event("build.save", f"[SAVE] JSON intermedio guardado: {os.path.abspath(output_file)}")
         return output_file
     # ============== FASE C: MÉTODOS DE PERSISTENCIA ==============
     
@@ -365,5 +741,6 @@ class ExamBuilder:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(report, f, ensure_ascii=False, indent=2)
         
-        print(f"[SAVE] Reporte de persistencia guardado: {os.path.abspath(output_file)}")
+        self.instrumentation.event("build.save",
+                                   f"[SAVE] Reporte de persistencia guardado: {os.path.abspath(output_file)}")
         return output_file
\ No newline at end of file
@@ -11,7 +11,9 @@ Exceso a K permite:
 - Usado en IEEE 754 para exponentes
 """
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+from core.tabla_representacion import TablaRepresentacion
 
 
 def repr_ExcK(numero: int, base: int, longitud: int, K: int) -> str:
@@ -302,55 +304,34 @@ def analizar_representacion_ExcK(base: int, longitud: int, K: int) -> dict:
     }
 
 
-def generar_tabla_ExcK(base: int, longitud: int, K: int) -> str:
+def generar_tabla_ExcK(base: int, longitud: int, K: int, offset: int = 0,
+                      limit: Optional[int] = None) -> str:
     """
-    Genera una tabla de todas las representaciones en ExcK.
+    Genera una tabla de las representaciones en ExcK.
     
     Args:
-        base: La base numérica (recomendado: 2 o 10)
-        longitud: Número de dígitos
+        base: La base numérica (2 a 36)
+        longitud: Número de dígitos (hasta 32)
         K: El sesgo (bias)
+        offset: Primera fila (en orden de palabra)
+        limit: Número de filas (None = todas; solo tablas pequeñas)
     
     Returns:
         str: Tabla formateada
     """
-    if base == 10 and longitud > 3:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use longitud <= 3."
-    
-    if base == 2 and longitud > 8:
-        return f"Tabla muy grande para B={base}, L={longitud}. Use longitud <= 8."
-    
-    total_combinaciones = base ** longitud
+    tabla = TablaRepresentacion('ExcK', base, longitud, K)
+    if tabla.demasiado_grande(limit):
+        return tabla.mensaje_demasiado_grande()
+    ancho = max(15, longitud)
     
     lineas = []
     lineas.append(f"Tabla de representacion en ExcK (base {base}, {longitud} digitos, K={K})")
     lineas.append("=" * 100)
-    lineas.append(f"{'Decimal':>8} | {'Repr. ExcK':>15} | {'Valor Natural':>15} | Significado")
+    lineas.append(f"{'Decimal':>8} | {'Repr. ExcK':>{ancho}} | {'Valor Natural':>15} | Significado")
     lineas.append("-" * 100)
     
-    for i in range(total_combinaciones):
-        # Convertir a representación
-        if base == 10:
-            exc_str = str(i).zfill(longitud)
-        elif base == 2:
-            exc_str = format(i, f'0{longitud}b')
-        else:
-            exc_str = format(i, f'0{longitud}x')
-        
-        # Obtener valor decimal
-        valor = ExcK_a_decimal(exc_str, base, K)
-        
-        linea = f"{valor:8d} | {exc_str:>15} | {i:>15d} | "
-        
-        # Agregar notas especiales
-        if valor == -K:
-            linea += "Minimo (00...0)"
-        elif valor == 0:
-            linea += "Cero (representa 0)"
-        elif valor == (base ** longitud) - 1 - K:
-            linea += "Maximo"
-        
-        lineas.append(linea)
+    for fila in tabla.filas(offset, limit):
+        lineas.append(f"{fila.valor:8d} | {fila.palabra:>{ancho}} | {fila.codigo:>15d} | {fila.nota}")
     
     lineas.append("=" * 100)
     
@@ -1,15 +1,29 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, fields
-from typing import Any, Set, Dict, List
+from typing import Any, Set, Dict, List, NamedTuple, Optional, Tuple
 
 @dataclass
 class ExerciseData:
     """Clase base para los datos de cualquier ejercicio."""
+    # Sin __dict__ propio: las subclases con exercise_dataclass(slots=True)
+    # quedan sin __dict__; las demás lo tienen como siempre
+    __slots__ = ()
+    
     title: str
     description: str
     # Los datos específicos se añadirán en las subclases
 
 
+class FieldLayout(NamedTuple):
+    """Campos del problema y de la solución de una clase (en orden de declaración)."""
+    problem: Tuple[str, ...]
+    solution: Tuple[str, ...]
+
+
+# Registro: clase -> FieldLayout ya validado (se valida UNA vez por clase)
+_FIELD_LAYOUTS: Dict[type, FieldLayout] = {}
+
+
 @dataclass
 class ProblemSolutionExerciseData(ExerciseData, ABC):
     """
@@ -37,8 +51,14 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
             @classmethod
             def solution_field_names(cls) -> Set[str]:
                 return {"expected_output"}
+    
+    La validación de 2-4 se hace una sola vez por clase (field_layout()), no
+    en cada instancia: generar cientos de miles de filas solo paga una
+    búsqueda en el registro.
     """
     
+    __slots__ = ()
+    
     @classmethod
     @abstractmethod
     def problem_field_names(cls) -> Set[str]:
@@ -72,12 +92,31 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
         pass
     
     def __post_init__(self):
-        """Valida que los campos estén correctamente separados."""
+        """Valida que los campos estén correctamente separados (una vez por clase)."""
         super().__post_init__() if hasattr(super(), '__post_init__') else None
         
+        if type(self) not in _FIELD_LAYOUTS:
+            type(self).field_layout()
+    
+    @classmethod
+    def field_layout(cls) -> FieldLayout:
+        """
+        Campos del problema y de la solución, validados y cacheados por clase.
+        
+        Raises:
+            ValueError: Si las categorías se solapan, falta algún campo
+                        o mencionan campos inexistentes
+        """
+        layout = _FIELD_LAYOUTS.get(cls)
+        if layout is None:
+            layout = _FIELD_LAYOUTS[cls] = cls._compile_field_layout()
+        return layout
+    
+    @classmethod
+    def _compile_field_layout(cls) -> FieldLayout:
         # Obtener los conjuntos de campos
-        problem_fields = self.problem_field_names()
-        solution_fields = self.solution_field_names()
+        problem_fields = cls.problem_field_names()
+        solution_fields = cls.solution_field_names()
         
         # Validar que sean disjuntos
         overlap = problem_fields & solution_fields
@@ -88,7 +127,8 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
             )
         
         # Obtener todos los campos de la dataclass (excepto title, description)
-        all_class_fields = {f.name for f in fields(self) if f.name not in {'title', 'description'}}
+        class_fields = [f.name for f in fields(cls) if f.name not in {'title', 'description'}]
+        all_class_fields = set(class_fields)
         
         # Validar que todo campo esté categorizado
         categorized = problem_fields | solution_fields
@@ -106,6 +146,11 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
             raise ValueError(f"problem_field_names() menciona campos inexistentes: {extra_problem}")
         if extra_solution:
             raise ValueError(f"solution_field_names() menciona campos inexistentes: {extra_solution}")
+        
+        return FieldLayout(
+            problem=tuple(name for name in class_fields if name in problem_fields),
+            solution=tuple(name for name in class_fields if name in solution_fields),
+        )
     
     def to_problem_dict(self) -> Dict[str, Any]:
         """
@@ -119,8 +164,7 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
         Returns:
             Dict con solo los campos del problema
         """
-        problem_fields = self.problem_field_names()
-        return {field: getattr(self, field) for field in problem_fields}
+        return {field: getattr(self, field) for field in self.field_layout().problem}
     
     def to_solution_dict(self) -> Dict[str, Any]:
         """
@@ -134,8 +178,7 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
         Returns:
             Dict con solo los campos de solución
         """
-        solution_fields = self.solution_field_names()
-        return {field: getattr(self, field) for field in solution_fields}
+        return {field: getattr(self, field) for field in self.field_layout().solution}
     
     def to_full_dict(self) -> Dict[str, Any]:
         """Devuelve problema + solución (para depuración/logging)."""
@@ -184,6 +227,55 @@ class ProblemSolutionExerciseData(ExerciseData, ABC):
         return result
 
 
+def exercise_dataclass(cls=None, *, slots: bool = False, **dataclass_kwargs):
+    """
+    @dataclass para ejercicios + validación de campos AL DEFINIR la clase.
+    
+    Con slots=True (opcional) las instancias usan __slots__ en lugar de
+    __dict__: ocupan bastante menos memoria cuando se generan en masa, a
+    cambio de no admitir atributos que no sean campos. La clase se vuelve a
+    crear (como hace dataclass(slots=True) en Python >= 3.10), así que sus
+    métodos no pueden usar super() sin argumentos: llamar a la base
+    explícitamente (Base.__post_init__(self)).
+    
+    Ejemplo::
+        @exercise_dataclass(slots=True)
+        class MyExerciseData(ProblemSolutionExerciseData):
+            ...
+    """
+    def wrap(cls):
+        new_cls = dataclass(cls, **dataclass_kwargs)
+        if slots:
+            new_cls = _with_slots(new_cls)
+        if issubclass(new_cls, ProblemSolutionExerciseData):
+            new_cls.field_layout()
+        return new_cls
+    
+    return wrap if cls is None else wrap(cls)
+
+
+def _with_slots(cls: type) -> type:
+    """Copia de una dataclass con __slots__ para sus campos (válido en Python 3.9)."""
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        base_slots = base.__dict__.get('__slots__', ())
+        inherited.update((base_slots,) if isinstance(base_slots, str) else base_slots)
+    
+    field_names = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    # Los valores por defecto ya están en __init__; como atributos de clase
+    # chocarían con los slots del mismo nombre
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
 class ExerciseRandomizer(ABC):
     """
     ALEATORIZADOR: Genera parámetros del PROBLEMA de forma aleatoria.
@@ -197,7 +289,7 @@ class ExerciseRandomizer(ABC):
     """
     
     @abstractmethod
-    def randomize(self, seed: int | None = None) -> Dict[str, Any]:
+    def randomize(self, seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Genera parámetros del problema de forma aleatoria.
         
@@ -10,14 +10,49 @@ Incluye:
 Bit de signo: 0 = positivo, 1 = negativo
 Exponente: formato exceso K (bias)
 Mantisa: implícito "1." para normalizados, "0." para denormalizados
+
+Codificación exacta: el valor (float, int, Decimal o Fraction) se pasa a
+fracción num/den y exponente y mantisa se obtienen con aritmética entera,
+con el modo de redondeo elegido (ROUNDING_MODES). Por defecto se trunca
+(toward_zero), como siempre; el desbordamiento da ±∞.
+
+Lotes: encode_many()/decode_many() codifican/decodifican secuencias (o
+arrays de NumPy) con los mismos bits que encode()/decode(). En base 2, si
+el código cabe en 64 bits, usan NumPy (opcional) de forma vectorizada; si
+no, un bucle en Python sin excepciones ni potencias recalculadas.
+
+Espacio de códigos (core/code_space.py): iter_codes(), rank(), unrank().
+El código de cada entrada es el índice denso
+(signo·B^E_bits + E_encoded)·B^F + M_encoded, que en base 2 coincide con
+el código empaquetado de encode().
 """
 
-from decimal import Decimal
-from typing import Tuple, Union
+from decimal import Decimal, getcontext
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
 import math
 
+from core.code_space import (
+    DENORMAL, INFINITY, NAN, NORMAL, ZERO, CodeSpace, check_rankable, segment_codes
+)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # NumPy es opcional: los lotes usan Python puro
+    np = None
+    HAS_NUMPY = False
 
-class IEEE754Gen:
+# Modos de redondeo de la mantisa (los de IEEE 754)
+ROUNDING_MODES = (
+    'toward_zero',   # Truncar (por defecto)
+    'nearest_even',  # Al más cercano; empates a mantisa par
+    'nearest_away',  # Al más cercano; empates lejos de cero
+    'up',            # Hacia +∞
+    'down',          # Hacia -∞
+)
+
+
+class IEEE754Gen(CodeSpace):
     """
     Punto flotante IEEE 754 genérico con especiales.
     
@@ -33,7 +68,7 @@ class IEEE754Gen:
     - NaN: qNaN (MSB=1) y sNaN (MSB=0, M≠0)
     """
     
-    def __init__(self, E_bits: int, F_bits: int, base: int = 2):
+    def __init__(self, E_bits: int, F_bits: int, base: int = 2, rounding: str = 'toward_zero'):
         """
         Crear representación IEEE 754 genérica.
         
@@ -41,6 +76,7 @@ class IEEE754Gen:
             E_bits: bits para exponente
             F_bits: bits para mantisa (fraccionaria)
             base: base numérica (2, 10, 16, etc.) - por defecto 2
+            rounding: modo de redondeo por defecto de encode() (ROUNDING_MODES)
         
         Ejemplo:
             ieee32 = IEEE754Gen(E_bits=8, F_bits=23, base=2)  # IEEE 754 single
@@ -56,6 +92,7 @@ class IEEE754Gen:
             raise ValueError("E_bits y F_bits deben ser >= 1")
         if base < 2:
             raise ValueError("base debe ser >= 2")
+        self.rounding = self._check_rounding(rounding)
         
         # Bias para exponente (formato exceso K)
         # Bias = B^(E_bits-1) - 1
@@ -73,6 +110,31 @@ class IEEE754Gen:
         # Precisión (máxima mantisa fraccionaria)
         self.epsilon = Decimal(base) ** (-F_bits)
         
+        # Tabla de potencias de la base: B^0..B^(F+1) precalculadas; el resto
+        # (exponentes de los valores codificados) se añaden según se usan
+        self._powers: Dict[int, int] = {k: base ** k for k in range(F_bits + 2)}
+        self._decimal_powers: Dict[Tuple[int, int], Decimal] = {}
+        self._log2_base = math.log2(base)
+        # encode() de floats en base 2 sin pasar a fracción (ver _encode_fields)
+        self._float_fast_path = base == 2 and F_bits < 1000
+        
+        # Constantes de encode()/decode() (no se recalculan por valor)
+        self._mantissa_scale = self._powers[F_bits]  # B^F (entero)
+        self._qnan_mantissa = self._powers[F_bits - 1]
+        self._exponent_shift = F_bits
+        self._sign_shift = E_bits + F_bits
+        # En base 2 los campos empaquetados son campos de bits reales
+        self._packed_fits_64 = base == 2 and 1 + E_bits + F_bits <= 64
+        # Todos los valores finitos caben exactos en un float64 (decode sin Decimal)
+        self._exact_float = (base == 2 and F_bits <= 52 and self.E_max <= 1023
+                             and self.E_min - F_bits >= -1074)
+        
+        # Espacio de códigos: P magnitudes finitas no nulas (E_encoded·B^F + M
+        # en [1, E_max_encoded·B^F)), crecientes en el índice denso
+        self._finite_count = self.E_max_encoded * self._mantissa_scale - 1
+        self._sign_stride = (self.E_max_encoded + 1) * self._mantissa_scale
+        self._vector_entries = self._exact_float and self._packed_fits_64 and self.E_bits + self.F_bits < 63
+        
     def __repr__(self) -> str:
         return f"IEEE754Gen(E_bits={self.E_bits}, F_bits={self.F_bits}, base={self.base})"
     
@@ -87,14 +149,123 @@ class IEEE754Gen:
             'E_min': self.E_min,
             'E_max': self.E_max,
             'epsilon': float(self.epsilon),
-            'normalized_min': float(Decimal(1) * Decimal(self.base) ** self.E_min),
-            'denormalized_min': float(self.epsilon * Decimal(self.base) ** self.E_min),
-            'max': float((Decimal(2) - self.epsilon) * Decimal(self.base) ** self.E_max),
+            'normalized_min': float(Decimal(1) * self._decimal_power(self.E_min)),
+            'denormalized_min': float(self.epsilon * self._decimal_power(self.E_min)),
+            'max': float((Decimal(2) - self.epsilon) * self._decimal_power(self.E_max)),
         }
     
+    # ---------- Potencias y redondeo exacto ----------
+    
+    @staticmethod
+    def _check_rounding(rounding: str) -> str:
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Modo de redondeo desconocido: {rounding!r} (válidos: {', '.join(ROUNDING_MODES)})")
+        return rounding
+    
+    def _power(self, k: int) -> int:
+        """B^k (k >= 0) desde la tabla de la instancia."""
+        power = self._powers.get(k)
+        if power is None:
+            power = self._powers[k] = self.base ** k
+        return power
+    
+    def _decimal_power(self, k: int) -> Decimal:
+        """Decimal(B)^k con la precisión del contexto actual (cacheado por precisión)."""
+        key = (k, getcontext().prec)
+        power = self._decimal_powers.get(key)
+        if power is None:
+            power = self._decimal_powers[key] = Decimal(self.base) ** k
+        return power
+    
+    def _below_power(self, num: int, den: int, k: int) -> bool:
+        """¿num/den < B^k? (exacto)"""
+        if k >= 0:
+            return num < den * self._power(k)
+        return num * self._power(-k) < den
+    
+    def _floor_log(self, num: int, den: int) -> int:
+        """floor(log_B(num/den)) exacto, para num/den > 0."""
+        # Estimación por longitud en bits (error < 1 en log2) y corrección entera
+        log2 = num.bit_length() - den.bit_length()
+        E = log2 if self.base == 2 else math.floor(log2 / self._log2_base)
+        while self._below_power(num, den, E):
+            E -= 1
+        while not self._below_power(num, den, E + 1):
+            E += 1
+        return E
+    
+    def _round_magnitude(self, num: int, den: int, negative: bool, rounding: str) -> Tuple[int, int]:
+        """
+        (E_encoded, M_encoded) del valor num/den > 0 redondeado al formato.
+        
+        Los valores de una banda de exponente son S·B^(E-F) con S entero
+        (normalizados: B^F <= S < 2·B^F; denormalizados: 0 <= S < B^F).
+        S y el resto de num/den · B^(F-E) se calculan con enteros y se elige
+        entre el vecino inferior y el superior según `rounding`. En base > 2
+        hay un hueco entre 2·B^E y B^(E+1): sus vecinos son el mayor valor de
+        la banda y B^(E+1).
+        """
+        F = self.F_bits
+        E = self._floor_log(num, den)
+        if E < self.E_min:
+            E_enc, offset, E = 0, 0, self.E_min
+        else:
+            E_enc, offset = E + self.bias, self._mantissa_scale
+            if E_enc >= self.E_max_encoded:
+                return self.E_max_encoded, 0  # Desbordamiento: infinito
+        
+        shift = F - E
+        if shift >= 0:
+            N, D = num * self._power(shift), den
+        else:
+            N, D = num, den * self._power(-shift)
+        S, rem = divmod(N, D)
+        S_top = offset + self._mantissa_scale - 1
+        
+        if rem == 0 and S <= S_top:
+            return E_enc, S - offset
+        if offset and S >= S_top:
+            # Por encima del mayor valor normalizado de la banda: el vecino
+            # superior es B^(F+1) (unidades B^(E-F)), no S_top + 1
+            twice_mid = D * (S_top + self._power(F + 1))
+            half = (2 * N > twice_mid) - (2 * N < twice_mid)
+            return self._round_in_band(E_enc, S_top - offset, half, negative, rounding)
+        return self._round_in_band(E_enc, S - offset, (2 * rem > D) - (2 * rem < D), negative, rounding)
+    
+    def _round_in_band(self, E_enc: int, M: int, half: int, negative: bool, rounding: str) -> Tuple[int, int]:
+        """Redondeo de un valor inexacto entre las mantisas M y M+1 de la banda E_enc."""
+        if not self._rounds_up(rounding, negative, half, M):
+            return E_enc, M
+        if M < self._mantissa_scale - 1:
+            return E_enc, M + 1
+        return E_enc + 1, 0  # Acarreo a la banda siguiente (o a infinito)
+    
+    @staticmethod
+    def _rounds_up(rounding: str, negative: bool, half: int, lower_mantissa: int) -> bool:
+        """
+        ¿Se elige el vecino de mayor magnitud?
+        
+        half: -1/0/+1 si el valor está por debajo/en/por encima del punto medio
+        """
+        if rounding == 'toward_zero':
+            return False
+        if rounding == 'up':
+            return not negative
+        if rounding == 'down':
+            return negative
+        if half:
+            return half > 0
+        return rounding == 'nearest_away' or lower_mantissa % 2 == 1
+    
+    @staticmethod
+    def _magnitude_ratio(value: Any) -> Tuple[int, int]:
+        """|value| como fracción exacta (num, den)."""
+        num, den = value.as_integer_ratio()
+        return abs(num), den
+    
     def encode_normalized(self, value: float) -> Tuple[int, int, int]:
         """
-        Codificar número normalizado.
+        Codificar número normalizado (mantisa redondeada con self.rounding).
         
         Returns:
             (sign, E_encoded, M_encoded)
@@ -104,26 +275,18 @@ class IEEE754Gen:
         
         # Signo
         sign = 0 if value >= 0 else 1
-        value = abs(value)
+        num, den = self._magnitude_ratio(value)
         
-        # Normalizar: encontrar E tal que 1 ≤ M < 2
-        E = math.floor(math.log(value, self.base))
-        M = value / (self.base ** E)
-        
-        # Codificar mantisa (solo fraccionaria, el 1 es implícito)
-        M_frac = M - 1  # Parte fraccionaria
-        M_encoded = int(M_frac * (self.base ** self.F_bits))
-        
-        # Codificar exponente (exceso K)
-        E_encoded = E + self.bias
+        # Normalizar: E = floor(log_B |value|), exacto
+        E_encoded = self._floor_log(num, den) + self.bias
         
         # Validar rango
         if E_encoded < self.E_min_encoded:
-            raise ValueError(f"Valor {value} es denormalizado, usar encode_denormalized()")
+            raise ValueError(f"Valor {abs(value)} es denormalizado, usar encode_denormalized()")
         if E_encoded >= self.E_max_encoded:
-            raise ValueError(f"Valor {value} es infinito o fuera de rango")
+            raise ValueError(f"Valor {abs(value)} es infinito o fuera de rango")
         
-        return (sign, E_encoded, M_encoded)
+        return (sign,) + self._round_magnitude(num, den, sign == 1, self.rounding)
     
     def encode_denormalized(self, value: float) -> Tuple[int, int, int]:
         """
@@ -137,25 +300,13 @@ class IEEE754Gen:
         
         # Signo
         sign = 0 if value >= 0 else 1
-        value = abs(value)
-        
-        # Para denormalizados: valor = 0.M × B^E_min
-        # E_min = 1 - bias
-        # M = valor / (B^E_min)
-        E_min_real = self.E_min
-        M = value / (self.base ** E_min_real)
+        num, den = self._magnitude_ratio(value)
         
-        # Validar que M < 1
-        if M >= 1:
-            raise ValueError(f"Valor {value} no es denormalizado, es normalizado")
+        # Para denormalizados: valor = 0.M × B^E_min, con 0.M < 1
+        if not self._below_power(num, den, self.E_min):
+            raise ValueError(f"Valor {abs(value)} no es denormalizado, es normalizado")
         
-        # Codificar mantisa (0.M)
-        M_encoded = int(M * (self.base ** self.F_bits))
-        
-        # Exponente encoded es 0 para denormalizados
-        E_encoded = 0
-        
-        return (sign, E_encoded, M_encoded)
+        return (sign,) + self._round_magnitude(num, den, sign == 1, self.rounding)
     
     def encode_infinity(self, positive: bool = True) -> Tuple[int, int, int]:
         """
@@ -189,9 +340,9 @@ class IEEE754Gen:
         
         return (sign, E_encoded, M_encoded)
     
-    def encode(self, value: float) -> int:
+    def encode(self, value: float, rounding: Optional[str] = None) -> int:
         """
-        Codificar un número flotante a su representación IEEE 754 de 32 bits.
+        Codificar un número a su representación IEEE 754 completa.
         
         Este método determina automáticamente si el número es:
         - Normalizado
@@ -199,33 +350,118 @@ class IEEE754Gen:
         - Especial (infinito, NaN)
         
         Args:
-            value: número flotante a codificar
+            value: número a codificar (float, int, Decimal o Fraction: se
+                   codifica su valor exacto)
+            rounding: modo de redondeo (None = self.rounding)
             
         Returns:
             int: representación IEEE 754 completa como entero
         """
-        # Casos especiales
-        if math.isnan(value):
-            sign, E_enc, M_enc = self.encode_nan(quiet=True)
-        elif math.isinf(value):
-            sign, E_enc, M_enc = self.encode_infinity(positive=(value > 0))
-        else:
-            # Intentar normalizado primero
-            try:
-                sign, E_enc, M_enc = self.encode_normalized(value)
-            except ValueError:
-                # Si no es normalizado, intenta denormalizado
-                try:
-                    sign, E_enc, M_enc = self.encode_denormalized(value)
-                except ValueError:
-                    # Si aún no cabe, es infinito
-                    positive = value > 0
-                    sign, E_enc, M_enc = self.encode_infinity(positive=positive)
+        sign, E_enc, M_enc = self._encode_fields(value, rounding)
         
         # Combinar en un entero: [signo|exponente|mantisa]
-        total_bits = 1 + self.E_bits + self.F_bits
-        result = (sign << (self.E_bits + self.F_bits)) | (E_enc << self.F_bits) | M_enc
-        return result
+        return (sign << self._sign_shift) | (E_enc << self._exponent_shift) | M_enc
+    
+    def _encode_fields(self, value: float, rounding: Optional[str] = None) -> Tuple[int, int, int]:
+        """(sign, E_encoded, M_encoded) de cualquier valor (sin excepciones)."""
+        # Casos especiales
+        if value != value:
+            return (0, self.E_max_encoded, self._qnan_mantissa)
+        if value == math.inf or value == -math.inf:
+            return self.encode_infinity(positive=(value > 0))
+        if value == 0:
+            return (0, 0, 0)
+        
+        negative = value < 0
+        rounding = self.rounding if rounding is None else self._check_rounding(rounding)
+        
+        if self._float_fast_path and type(value) is float:
+            # Base 2 y float normalizado: frexp da exponente y mantisa exactos
+            m, e = math.frexp(-value if negative else value)
+            E_enc = e - 1 + self.bias
+            if self.E_min_encoded <= E_enc < self.E_max_encoded:
+                scaled = math.ldexp(m, self.F_bits + 1)  # En [B^F, 2·B^F), exacto
+                S = int(scaled)
+                M_enc = S - self._mantissa_scale
+                frac = scaled - S  # Exacto (resta de floats próximos)
+                if frac:
+                    E_enc, M_enc = self._round_in_band(E_enc, M_enc, (frac > 0.5) - (frac < 0.5),
+                                                       negative, rounding)
+                return (1 if negative else 0, E_enc, M_enc)
+            if E_enc >= self.E_max_encoded:
+                return self.encode_infinity(positive=not negative)
+        
+        num, den = self._magnitude_ratio(value)
+        E_enc, M_enc = self._round_magnitude(num, den, negative, rounding)
+        return (1 if negative else 0, E_enc, M_enc)
+    
+    def encode_many(self, values: Iterable[float], fields: bool = False,
+                    rounding: Optional[str] = None) -> Any:
+        """
+        encode() de muchos valores (mismos bits, valor a valor).
+        
+        Args:
+            values: Secuencia o array de NumPy de floats
+            fields: Si True, devuelve (signos, exponentes, mantisas) en lugar
+                    de los códigos empaquetados (en base != 2 el empaquetado
+                    solapa los campos y no se puede deshacer)
+            rounding: modo de redondeo (None = self.rounding)
+        
+        Returns:
+            Con NumPy: array (uint64 si el código cabe en 64 bits, object si no).
+            Sin NumPy: lista de enteros. Con fields=True, tupla de tres.
+        
+        Ejemplo:
+            codes = IEEE754Gen(8, 23).encode_many([1.5, -0.1, float('inf')])
+        """
+        rounding = self.rounding if rounding is None else self._check_rounding(rounding)
+        if HAS_NUMPY and self._packed_fits_64 and rounding == 'toward_zero':
+            return self._encode_many_numpy(values, fields)
+        
+        encode_fields = self._encode_fields
+        if fields:
+            triples = [encode_fields(value, rounding) for value in values]
+            result = tuple([triple[i] for triple in triples] for i in range(3))
+            return tuple(np.array(column, dtype=object) for column in result) if HAS_NUMPY else result
+        
+        sign_shift, exponent_shift = self._sign_shift, self._exponent_shift
+        codes = []
+        for value in values:
+            sign, E_enc, M_enc = encode_fields(value, rounding)
+            codes.append((sign << sign_shift) | (E_enc << exponent_shift) | M_enc)
+        return np.array(codes, dtype=object) if HAS_NUMPY else codes
+    
+    def _encode_many_numpy(self, values: Iterable[float], fields: bool) -> Any:
+        """encode_many() vectorizado (base 2, código <= 64 bits, truncando)."""
+        v = np.asarray(values, dtype=np.float64).ravel()
+        F = self.F_bits
+        magnitude = np.abs(v)
+        finite = np.isfinite(v)
+        nonzero = finite & (magnitude != 0)
+        
+        # magnitude = m · 2^e con m en [0.5, 1): E = e - 1 y M = 2m en [1, 2)
+        m, e = np.frexp(np.where(finite, magnitude, 0.0))
+        E_enc = e.astype(np.int64) - 1 + self.bias
+        normal = nonzero & (E_enc >= self.E_min_encoded) & (E_enc < self.E_max_encoded)
+        denormal = nonzero & (E_enc < self.E_min_encoded)
+        nan = np.isnan(v)
+        infinite = (nonzero & (E_enc >= self.E_max_encoded)) | np.isinf(v)
+        
+        signs = (v < 0).astype(np.uint64)
+        exponents = np.zeros(v.shape, dtype=np.uint64)
+        mantissas = np.zeros(v.shape, dtype=np.uint64)
+        # Escalar por potencias de 2 es exacto: floor() = int() del escalar
+        exponents[normal] = E_enc[normal]
+        mantissas[normal] = np.floor(np.ldexp(2 * m[normal] - 1, F))
+        mantissas[denormal] = np.floor(np.ldexp(magnitude[denormal], F - self.E_min))
+        exponents[infinite | nan] = self.E_max_encoded
+        mantissas[nan] = self._qnan_mantissa
+        signs[nan] = 0
+        
+        if fields:
+            return signs, exponents, mantissas
+        return ((signs << np.uint64(self._sign_shift))
+                | (exponents << np.uint64(self._exponent_shift)) | mantissas)
     
     def decode(self, sign: int, E_encoded: int, M_encoded: int) -> Union[float, str]:
         """
@@ -243,28 +479,179 @@ class IEEE754Gen:
                 return float('inf') if sign == 0 else float('-inf')
             else:
                 # NaN
-                MSB = M_encoded >= (self.base ** (self.F_bits - 1))
+                MSB = M_encoded >= self._qnan_mantissa
                 return "qNaN" if MSB else "sNaN"
         
         if E_encoded == 0:
             # Denormalizado o cero
             if M_encoded == 0:
                 return 0.0
+            # Denormalizado: ±0.M × B^E_min
+            if self._exact_float:
+                value = math.ldexp(M_encoded, self.E_min - self.F_bits)
             else:
-                # Denormalizado: ±0.M × B^E_min
-                E_real = self.E_min
-                M_frac = Decimal(M_encoded) / Decimal(self.base) ** self.F_bits
-                value = float(M_frac * Decimal(self.base) ** E_real)
-                return -value if sign == 1 else value
+                M_frac = Decimal(M_encoded) / self._decimal_power(self.F_bits)
+                value = float(M_frac * self._decimal_power(self.E_min))
+            return -value if sign == 1 else value
         
         # Normalizado: ±1.M × B^E
         E_real = E_encoded - self.bias
-        M_frac = Decimal(M_encoded) / Decimal(self.base) ** self.F_bits
-        M = 1 + M_frac  # Mantisa implícita
-        value = float(M * Decimal(self.base) ** E_real)
+        if self._exact_float:
+            # Todos los valores del formato son floats exactos: ldexp es exacto
+            value = math.ldexp(self._mantissa_scale + M_encoded, E_real - self.F_bits)
+        else:
+            M_frac = Decimal(M_encoded) / self._decimal_power(self.F_bits)
+            M = 1 + M_frac  # Mantisa implícita
+            value = float(M * self._decimal_power(E_real))
         
         return -value if sign == 1 else value
     
+    def unpack(self, code: int) -> Tuple[int, int, int]:
+        """
+        Inverso del empaquetado de encode(): (sign, E_encoded, M_encoded).
+        
+        Solo en base 2 (en otras bases los campos se solapan al empaquetar).
+        """
+        self._check_unpackable()
+        return (code >> self._sign_shift,
+                (code >> self._exponent_shift) & (self.E_max_encoded),
+                code & (self._mantissa_scale - 1))
+    
+    def _check_unpackable(self):
+        if self.base != 2:
+            raise ValueError(f"Los códigos empaquetados en base {self.base} no se pueden "
+                             "desempaquetar: usa fields=True")
+    
+    def decode_many(self, codes: Any, fields: bool = False) -> Any:
+        """
+        decode() de muchos códigos.
+        
+        Args:
+            codes: Códigos empaquetados de encode_many() (solo base 2) o, con
+                   fields=True, la tupla (signos, exponentes, mantisas)
+            fields: Ver encode_many()
+        
+        Returns:
+            Con NumPy, array float64; sin NumPy, lista de floats. Mismos
+            valores que decode(), salvo que qNaN/sNaN se devuelven como nan.
+        """
+        if fields:
+            signs, exponents, mantissas = codes
+        else:
+            self._check_unpackable()
+        
+        if HAS_NUMPY and self._exact_float and self._packed_fits_64:
+            if fields:
+                signs, exponents, mantissas = (np.asarray(column, dtype=np.uint64).ravel()
+                                               for column in (signs, exponents, mantissas))
+            else:
+                packed = np.asarray(codes, dtype=np.uint64).ravel()
+                signs = packed >> np.uint64(self._sign_shift)
+                exponents = (packed >> np.uint64(self._exponent_shift)) & np.uint64(self.E_max_encoded)
+                mantissas = packed & np.uint64(self._mantissa_scale - 1)
+            return self._decode_many_numpy(signs, exponents, mantissas)
+        
+        if fields:
+            triples = zip(signs, exponents, mantissas)
+        else:
+            triples = (self.unpack(int(code)) for code in codes)
+        decode_value = self._decode_value
+        values = [decode_value(int(s), int(E), int(M)) for s, E, M in triples]
+        return np.array(values, dtype=np.float64) if HAS_NUMPY else values
+    
+    def _decode_value(self, sign: int, E_encoded: int, M_encoded: int) -> float:
+        """decode() como float (nan para qNaN/sNaN)."""
+        if E_encoded == self.E_max_encoded and M_encoded != 0:
+            return math.nan
+        return self.decode(sign, E_encoded, M_encoded)
+    
+    def _decode_many_numpy(self, signs, exponents, mantissas):
+        """decode_many() vectorizado (formatos con valores exactos en float64)."""
+        F = self.F_bits
+        E = exponents.astype(np.int64)
+        M = mantissas.astype(np.float64)  # < 2^52: exacto
+        denormal = E == 0
+        special = E == self.E_max_encoded
+        with np.errstate(over='ignore'):
+            magnitude = np.where(denormal,
+                                 np.ldexp(M, self.E_min - F),
+                                 np.ldexp(M + float(self._mantissa_scale), E - self.bias - F))
+        magnitude[special] = np.where(mantissas[special] == 0, np.inf, np.nan)
+        negative = (signs == 1) & ~(denormal & (mantissas == 0))
+        return np.where(negative, -magnitude, magnitude)
+    
+    # ---------- Espacio de códigos (CodeSpace) ----------
+    
+    @property
+    def code_count(self) -> int:
+        """Todas las combinaciones de signo, exponente y mantisa."""
+        return 2 * self._sign_stride
+    
+    @property
+    def value_count(self) -> int:
+        """-∞, P negativos, 0, P positivos y +∞ (±0 una vez, sin NaN)."""
+        return 2 * self._finite_count + 3
+    
+    def rank(self, value: Any) -> int:
+        """Cuántos valores distintos del formato son < value."""
+        check_rankable(value)
+        P = self._finite_count
+        if value in (math.inf, -math.inf):
+            return 2 * P + 2 if value > 0 else 0
+        if value == 0:
+            return P + 1
+        if value < 0:
+            return 1 + P - self._finite_at_most(abs(value))
+        return P + 2 + self._finite_below(value)
+    
+    def _finite_at_most(self, magnitude: Any) -> int:
+        """Magnitudes finitas no nulas <= magnitude (truncar da la mayor)."""
+        _, E_enc, M_enc = self._encode_fields(magnitude, 'toward_zero')
+        return min(E_enc * self._mantissa_scale + M_enc, self._finite_count)
+    
+    def _finite_below(self, magnitude: Any) -> int:
+        """Magnitudes finitas no nulas < magnitude."""
+        truncated = self._encode_fields(magnitude, 'toward_zero')
+        count = truncated[1] * self._mantissa_scale + truncated[2]
+        if count > self._finite_count:  # Desbordamiento: todas son menores
+            return self._finite_count
+        # Si truncar y redondear hacia arriba coinciden, magnitude es representable
+        exact = count and self._encode_fields(magnitude, 'up') == truncated
+        return count - 1 if exact else count
+    
+    def _value_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        # Índices 0..P: -∞ y negativos (código de -∞ = stride + P + 1);
+        # P+1..2P+2: 0, positivos y +∞ (código = índice - P - 1)
+        P = self._finite_count
+        return segment_codes(start, stop, [(0, P + 1, self._sign_stride + P + 1, -1),
+                                           (P + 1, 2 * P + 3, -(P + 1), 1)])
+    
+    def _code_entries(self, codes: Sequence[int]) -> Tuple[Any, Any]:
+        scale, special = self._mantissa_scale, self.E_max_encoded
+        if HAS_NUMPY and self._vector_entries:
+            codes = np.asarray(codes, dtype=np.int64)
+            signs, rest = np.divmod(codes, self._sign_stride)
+            exponents, mantissas = np.divmod(rest, scale)
+            values = self.decode_many((signs, exponents, mantissas), fields=True)
+            classes = np.select(
+                [(exponents == 0) & (mantissas == 0), exponents == 0,
+                 (exponents == special) & (mantissas == 0), exponents == special],
+                [ZERO, DENORMAL, INFINITY, NAN], NORMAL)
+            return values, classes
+        
+        values, classes = [], []
+        for code in codes:
+            sign, rest = divmod(int(code), self._sign_stride)
+            E_enc, M_enc = divmod(rest, scale)
+            values.append(self._decode_value(sign, E_enc, M_enc))
+            if E_enc == 0:
+                classes.append(DENORMAL if M_enc else ZERO)
+            elif E_enc == special:
+                classes.append(NAN if M_enc else INFINITY)
+            else:
+                classes.append(NORMAL)
+        return values, classes
+    
     def is_special(self, E_encoded: int, M_encoded: int) -> bool:
         """Verificar si es un valor especial (infinito o NaN)."""
         return E_encoded == self.E_max_encoded
@@ -275,14 +662,14 @@ class IEEE754Gen:
     
     def get_range_normalized(self) -> Tuple[float, float]:
         """Obtener rango de números normalizados."""
-        min_norm = float(Decimal(1) * Decimal(self.base) ** self.E_min)
-        max_norm = float((Decimal(2) - self.epsilon) * Decimal(self.base) ** self.E_max)
+        min_norm = float(Decimal(1) * self._decimal_power(self.E_min))
+        max_norm = float((Decimal(2) - self.epsilon) * self._decimal_power(self.E_max))
         return (min_norm, max_norm)
     
     def get_range_denormalized(self) -> Tuple[float, float]:
         """Obtener rango de números denormalizados."""
-        min_denorm = float(self.epsilon * Decimal(self.base) ** self.E_min)
-        max_denorm = float((1 - self.epsilon) * Decimal(self.base) ** self.E_min)
+        min_denorm = float(self.epsilon * self._decimal_power(self.E_min))
+        max_denorm = float((1 - self.epsilon) * self._decimal_power(self.E_min))
         return (min_denorm, max_denorm)
 
 
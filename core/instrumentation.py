@@ -0,0 +1,305 @@
+"""
+Instrumentación: progreso, contadores y tiempos del pipeline de generación.
+
+ExamBuilder, RendererPipeline, LatexAssetManager y los repositorios no
+imprimen: informan a la instrumentación activa mediante
+
+- span(nombre, **etiquetas):  bloque cronometrado (callbacks de inicio/fin)
+- observe(nombre, segundos):  duración medida fuera de un span (p. ej. en
+                              un proceso worker)
+- count(nombre, n, **etiq.):  contadores (generados, reutilizados, guardados...)
+- event(nombre, mensaje):     mensajes de progreso legibles (los antiguos print)
+
+Por defecto la instrumentación es NullInstrumentation: no hace nada y no
+reserva nada en los bucles calientes. Exportadores incluidos:
+
+- LoggingInstrumentation:    eventos y duraciones al módulo logging
+- PrometheusInstrumentation: contadores + histogramas de latencia por etapa
+                             en formato de texto de Prometheus
+- MultiInstrumentation:      reparte a varios (p. ej. logging + Prometheus)
+
+Uso:
+    from core.instrumentation import PrometheusInstrumentation, use_instrumentation
+
+    metrics = PrometheusInstrumentation()
+    with use_instrumentation(metrics):
+        builder.build()
+        renderer.render(exercises)
+    metrics.write("build/metrics/exam.prom")  # textfile collector de node_exporter
+
+Nombres de etiquetas: solo valores de baja cardinalidad (tipo de ejercicio,
+fase, backend), nunca ids de problema.
+"""
+
+import bisect
+import logging
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Cubos de latencia (segundos): de 100µs (una fase) a 30s (un examen grande)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Instrumentation:
+    """
+    Interfaz de instrumentación. Las subclases sobrescriben los callbacks
+    que les interesen; los demás no hacen nada.
+    """
+
+    enabled = True
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[None]:
+        """Cronometra el bloque: span_start() al entrar, span_end() al salir."""
+        self.span_start(name, labels)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.span_end(name, labels, time.perf_counter() - start, error)
+
+    def span_start(self, name: str, labels: Dict[str, Any]):
+        pass
+
+    def span_end(self, name: str, labels: Dict[str, Any], duration_s: float,
+                 error: Optional[BaseException]):
+        """Por defecto, la duración del span se registra como observe()."""
+        self.observe(name, duration_s, **labels)
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        pass
+
+    def count(self, name: str, value: float = 1, **labels: Any):
+        pass
+
+    def event(self, name: str, message: str, level: int = logging.INFO, **labels: Any):
+        pass
+
+
+class NullInstrumentation(Instrumentation):
+    """Instrumentación por defecto: no hace nada (ni siquiera medir el tiempo)."""
+
+    enabled = False
+    _NULL_SPAN = nullcontext()
+
+    def span(self, name: str, **labels: Any):
+        return self._NULL_SPAN
+
+
+class LoggingInstrumentation(Instrumentation):
+    """
+    Eventos al logger 'exam_generator' (o el indicado) y duraciones de los
+    spans en DEBUG.
+
+    main_v2.py la instala con un handler de consola para conservar el
+    progreso que antes se imprimía.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, span_level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger("exam_generator")
+        self.span_level = span_level
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        if self.logger.isEnabledFor(self.span_level):
+            self.logger.log(self.span_level, "%s %.2fms %s", name, seconds * 1000, _format_labels(labels))
+
+    def count(self, name: str, value: float = 1, **labels: Any):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s +%s %s", name, value, _format_labels(labels))
+
+    def event(self, name: str, message: str, level: int = logging.INFO, **labels: Any):
+        self.logger.log(level, message)
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    Contadores e histogramas de latencia en memoria, exportables en el
+    formato de texto de Prometheus (render() / write()).
+
+    - count('exercises.generated')  → exam_generator_exercises_generated_total
+    - span('render.phase', ...)     → exam_generator_render_phase_seconds (histograma)
+
+    Es segura entre hilos (render_batch ejecuta fases en paralelo).
+    """
+
+    def __init__(self, prefix: str = "exam_generator", buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        # nombre → etiquetas → [cuentas por cubo (+Inf al final), suma]
+        self._histograms: Dict[str, Dict[Labels, List[Any]]] = {}
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        key = _labels_key(labels)
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][slot] += 1
+            state[1] += seconds
+
+    def count(self, name: str, value: float = 1, **labels: Any):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """Valor actual de un contador (0 si no existe)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels_key(labels), 0)
+
+    def histogram_count(self, name: str, **labels: Any) -> int:
+        """Observaciones registradas en un histograma (0 si no existe)."""
+        with self._lock:
+            state = self._histograms.get(name, {}).get(_labels_key(labels))
+            return sum(state[0]) if state else 0
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Métricas en el formato de texto de Prometheus (versión 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                metric = self._metric_name(name, "_total")
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{metric}{_format_prometheus_labels(key)} {_format_number(value)}")
+
+            for name in sorted(self._histograms):
+                metric = self._metric_name(name, "_seconds")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, (counts, total) in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == math.inf else _format_number(bound)
+                        lines.append(f"{metric}_bucket{_format_prometheus_labels(key + (('le', le),))} "
+                                     f"{cumulative}")
+                    lines.append(f"{metric}_sum{_format_prometheus_labels(key)} {_format_number(total)}")
+                    lines.append(f"{metric}_count{_format_prometheus_labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """
+        Guarda render() en `path` de forma atómica (escribe y renombra), como
+        espera el textfile collector de node_exporter.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+    def _metric_name(self, name: str, suffix: str) -> str:
+        return _sanitize(f"{self.prefix}_{name}") + suffix
+
+
+class MultiInstrumentation(Instrumentation):
+    """Reparte cada callback entre varias instrumentaciones."""
+
+    def __init__(self, *sinks: Instrumentation):
+        self.sinks = [sink for sink in sinks if sink.enabled]
+        self.enabled = bool(self.sinks)
+
+    def span_start(self, name: str, labels: Dict[str, Any]):
+        for sink in self.sinks:
+            sink.span_start(name, labels)
+
+    def span_end(self, name: str, labels: Dict[str, Any], duration_s: float,
+                 error: Optional[BaseException]):
+        for sink in self.sinks:
+            sink.span_end(name, labels, duration_s, error)
+
+    def observe(self, name: str, seconds: float, **labels: Any):
+        for sink in self.sinks:
+            sink.observe(name, seconds, **labels)
+
+    def count(self, name: str, value: float = 1, **labels: Any):
+        for sink in self.sinks:
+            sink.count(name, value, **labels)
+
+    def event(self, name: str, message: str, level: int = logging.INFO, **labels: Any):
+        for sink in self.sinks:
+            sink.event(name, message, level, **labels)
+
+
+# ---------- Instrumentación activa ----------
+
+_active: Instrumentation = NullInstrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Instrumentación activa (NullInstrumentation si no se configuró ninguna)."""
+    return _active
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> Instrumentation:
+    """
+    Cambia la instrumentación activa del proceso.
+
+    Returns:
+        La anterior (para restaurarla)
+    """
+    global _active
+    previous = _active
+    _active = instrumentation if instrumentation is not None else NullInstrumentation()
+    return previous
+
+
+@contextmanager
+def use_instrumentation(instrumentation: Instrumentation) -> Iterator[Instrumentation]:
+    """Activa `instrumentation` durante el bloque."""
+    previous = set_instrumentation(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        set_instrumentation(previous)
+
+
+# ---------- Formato ----------
+
+def _labels_key(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _sanitize(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_prometheus_labels(key: Labels) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{_sanitize(name)}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    return " ".join(f"{key}={value}" for key, value in labels.items())
+
+
+def _format_number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
@@ -27,12 +27,38 @@ Ejemplo:
     428
     >>> fp.decode(428)
     -5.25
+
+Códigos con signo: un dígito de signo delante de los E+F dígitos.
+- M&S:         negativo = B^(E+F) + magnitud (dígito de signo 1)
+- complemento: negativo = B^(E+F+1) - magnitud (complemento a la base
+               sobre E+F+1 dígitos; en base 2, complemento a 2)
+
+Lotes: encode_array()/decode_array() y add_array()/subtract_array()/
+multiply_array()/divide_array() trabajan con arrays de códigos (NumPy
+int64 si está instalado y el formato cabe; si no, arrays de objetos o
+listas) y devuelven (códigos, máscara de desbordamiento). Internamente
+operan en unidades enteras k = valor·B^F (la rejilla k·ε), sin excepciones
+por elemento: lo que encode() rechazaría se marca en la máscara y, con
+saturate=True, se satura al extremo del rango.
+
+Espacio de códigos (core/code_space.py): iter_codes(), rank(), unrank().
 """
 
 from dataclasses import dataclass
-from typing import Union, Tuple
+from typing import Any, Callable, Iterable, List, Sequence, Union, Tuple
 import math
 
+from core.code_space import (
+    NORMAL, ZERO, CodeSpace, check_rankable, exact_fraction, segment_codes
+)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # NumPy es opcional: los lotes usan Python puro
+    np = None
+    HAS_NUMPY = False
+
 
 @dataclass
 class FixedPointConfig:
@@ -52,7 +78,7 @@ class FixedPointConfig:
             raise ValueError(f"representation debe ser 'ms' o 'complement'. Got {self.representation}")
 
 
-class FixedPointUnified:
+class FixedPointUnified(CodeSpace):
     """
     Clase unificada para punto fijo con cualquier configuración.
     
@@ -86,6 +112,8 @@ class FixedPointUnified:
         self.base_power_E = self.base ** E
         self.base_power_F = self.base ** F
         self.total_bits = E + F + (1 if signed else 0)
+        self.base_power_EF = self.base_power_E * self.base_power_F  # B^(E+F)
+        self._complement_modulus = self.base_power_EF * base  # B^(E+F+1)
         
         # Calcular rango
         if not signed:
@@ -97,6 +125,21 @@ class FixedPointUnified:
         else:  # complemento
             self.min_value = -self.base_power_E
             self.max_value = self.base_power_E - self.epsilon
+        
+        # Rango en unidades k = valor·B^F (lotes)
+        self._units_max = self.base_power_EF - 1
+        if not signed:
+            self._units_min = 0
+        elif representation == 'ms':
+            self._units_min = -self._units_max
+        else:
+            self._units_min = -self.base_power_EF
+        
+        # Lotes en int64: códigos y unidades < 2^53, así la división a float
+        # de decode_array() coincide con la de decode(); productos < 2^62
+        largest_code = self._complement_modulus if signed else self.base_power_EF
+        self._fits_int64 = largest_code < 2 ** 53
+        self._products_fit_int64 = self.base_power_EF ** 2 < 2 ** 62
     
     def encode(self, value: float) -> int:
         """
@@ -128,27 +171,14 @@ class FixedPointUnified:
         magnitude = int(round(abs_value * self.base_power_F))
         
         if self.representation == 'ms':
-            # Magnitud y signo: MSB = signo
-            max_magnitude = int(self.base_power_E * self.base_power_F)
-            if magnitude > max_magnitude:
-                raise ValueError(f"Magnitud fuera de rango: {magnitude} > {max_magnitude}")
-            
-            if sign == 1:
-                return magnitude
-            else:
-                return (1 << self.total_bits) - magnitude - 1 + 1  # Complemento en signo
+            # Magnitud y signo: dígito de signo delante de la magnitud
+            max_magnitude = self.base_power_EF
+            if magnitude >= max_magnitude:
+                raise ValueError(f"Magnitud fuera de rango: {magnitude} >= {max_magnitude}")
         
-        else:  # complemento a base
-            # Complemento a base: rango [-B^E, B^E)
-            max_positive = int(self.base_power_E * self.base_power_F)
-            
-            if sign == 1:
-                return magnitude
-            else:
-                # Negativo: complemento a base
-                # -x se representa como base^(E+F) - magnitude
-                complement = (self.base ** (self.E + self.F)) - magnitude
-                return complement
+        # Complemento a base: rango [-B^E, B^E); -x se representa como
+        # B^(E+F+1) - magnitud
+        return self._code_from_magnitude(magnitude, sign == -1)
     
     def decode(self, raw_value: int) -> float:
         """
@@ -164,26 +194,17 @@ class FixedPointUnified:
             # Sin signo: directo
             return raw_value / self.base_power_F
         
-        # Con signo: detectar signo según representación
-        max_positive = int(self.base_power_E * self.base_power_F)
+        # Con signo: el dígito de signo (raw >= B^(E+F)) indica negativo
+        if raw_value < self.base_power_EF:
+            return raw_value / self.base_power_F
         
         if self.representation == 'ms':
-            # Magnitud y signo: si raw > max_positive, es negativo
-            if raw_value <= max_positive:
-                return raw_value / self.base_power_F
-            else:
-                # Negativo
-                magnitude = ((1 << self.total_bits) - raw_value - 1 + 1)
-                return -magnitude / self.base_power_F
-        
-        else:  # complemento a base
-            # Complemento a base: si raw > max_positive, es negativo
-            if raw_value <= max_positive:
-                return raw_value / self.base_power_F
-            else:
-                # Negativo: complemento a base
-                magnitude = (self.base ** (self.E + self.F)) - raw_value
-                return -magnitude / self.base_power_F
+            # Magnitud y signo: quitar el dígito de signo
+            magnitude = raw_value - self.base_power_EF
+        else:
+            # Negativo: complemento a base
+            magnitude = self._complement_modulus - raw_value
+        return -magnitude / self.base_power_F
     
     def add(self, a: float, b: float) -> float:
         """
@@ -209,12 +230,13 @@ class FixedPointUnified:
         # Codificar → decodificar para simular hardware
         M_a = self.encode(a)
         M_b = self.encode(b)
-        M_result = M_a + M_b
         
-        # Manejar overflow (complemento a base)
-        max_raw = (1 << (self.E + self.F + (1 if self.signed else 0))) - 1
-        if M_result > max_raw:
-            M_result = M_result & ((1 << (self.E + self.F + (1 if self.signed else 0))) - 1)
+        if self.signed and self.representation == 'complement':
+            # Complemento a base: se suman los códigos descartando el acarreo
+            M_result = (M_a + M_b) % self._complement_modulus
+        else:
+            # Sin signo y M&S: se suman las magnitudes con su signo
+            M_result = self._units_to_code(self._code_to_units(M_a) + self._code_to_units(M_b))
         
         return self.decode(M_result)
     
@@ -279,6 +301,265 @@ class FixedPointUnified:
         
         return result
     
+    # ---------- Lotes ----------
+    
+    def encode_array(self, values: Iterable[float], saturate: bool = False) -> Tuple[Any, Any]:
+        """
+        encode() de muchos valores.
+        
+        Args:
+            values: valores decimales
+            saturate: si True, los valores fuera de rango se codifican como
+                      min_value/max_value; si False, su código es 0
+            
+        Returns:
+            (códigos, overflow): overflow[i] es True donde encode() lanzaría
+            ValueError (fuera de rango o NaN)
+        """
+        if HAS_NUMPY and self._fits_int64:
+            return self._encode_array_numpy(values, saturate)
+        
+        scale = self.base_power_F
+        codes, overflow = [], []
+        for value in values:
+            in_range = self.min_value <= value <= self.max_value  # False para NaN
+            if not in_range:
+                if saturate and value == value:
+                    value = self.min_value if value < self.min_value else self.max_value
+                else:
+                    value = 0
+            # Igual que encode(): magnitud redondeada y código según el signo
+            magnitude = int(round(abs(value) * scale))
+            codes.append(self._code_from_magnitude(magnitude, value < 0))
+            overflow.append(not in_range)
+        return self._batch_result(codes, overflow)
+    
+    def decode_array(self, codes: Iterable[int]) -> Any:
+        """
+        decode() de muchos códigos.
+        
+        Returns:
+            Valores (array float64 con NumPy; si no, lista de floats)
+        """
+        if HAS_NUMPY and self._fits_int64:
+            codes = np.asarray(codes, dtype=np.int64)
+            scale = float(self.base_power_F)
+            if not self.signed:
+                return codes / scale
+            negative = codes >= self.base_power_EF
+            magnitude = np.where(negative, abs(self._code_to_units_numpy(codes)), codes) / scale
+            return np.where(negative, -magnitude, magnitude)  # -0.0 como decode()
+        
+        decode = self.decode
+        values = [decode(int(code)) for code in codes]
+        return np.array(values, dtype=np.float64) if HAS_NUMPY else values
+    
+    def add_array(self, codes_a: Iterable[int], codes_b: Iterable[int],
+                  saturate: bool = False) -> Tuple[Any, Any]:
+        """
+        Suma elemento a elemento de dos arrays de códigos.
+        
+        Returns:
+            (códigos, overflow); ver _binary_array()
+        """
+        return self._binary_array(codes_a, codes_b, saturate, lambda a, b: (a + b, 1))
+    
+    def subtract_array(self, codes_a: Iterable[int], codes_b: Iterable[int],
+                       saturate: bool = False) -> Tuple[Any, Any]:
+        """Resta elemento a elemento (a - b) de dos arrays de códigos."""
+        return self._binary_array(codes_a, codes_b, saturate, lambda a, b: (a - b, 1))
+    
+    def multiply_array(self, codes_a: Iterable[int], codes_b: Iterable[int],
+                       saturate: bool = False) -> Tuple[Any, Any]:
+        """
+        Producto elemento a elemento de dos arrays de códigos.
+        
+        Como multiply(): desborda si el producto exacto está fuera de rango;
+        si no, se redondea a la rejilla como encode() (empates a par).
+        """
+        scale = self.base_power_F
+        return self._binary_array(codes_a, codes_b, saturate, lambda a, b: (a * b, scale), wide=True)
+    
+    def divide_array(self, codes_a: Iterable[int], codes_b: Iterable[int],
+                     saturate: bool = False) -> Tuple[Any, Any]:
+        """
+        Cociente elemento a elemento (a / b) de dos arrays de códigos.
+        
+        Como divide(), redondeado como encode(). La división por cero se
+        marca en overflow (con saturate=True da el extremo del signo de a).
+        """
+        scale = self.base_power_F
+        
+        def divide(a, b):
+            sign = (b >= 0) * 2 - 1  # Denominador positivo (también con arrays)
+            return a * sign * scale, b * sign
+        
+        return self._binary_array(codes_a, codes_b, saturate, divide, wide=True)
+    
+    def _binary_array(self, codes_a: Iterable[int], codes_b: Iterable[int], saturate: bool,
+                      op: Callable[[Any, Any], Tuple[Any, Any]], wide: bool = False) -> Tuple[Any, Any]:
+        """
+        Aplica `op` a las unidades de cada par de códigos.
+        
+        op(ka, kb) devuelve el resultado exacto en unidades como fracción
+        (numerador, denominador >= 0; denominador 0 = no definido). Sirve
+        tanto para enteros como para arrays de NumPy; `wide` indica que sus
+        intermedios pueden no caber en int64 (se usan objetos).
+        
+        El resultado se codifica como encode() codificaría el valor exacto:
+        fuera de [min_value, max_value] (o no definido) → overflow[i] = True
+        y código 0, o el extremo del rango con saturate=True.
+        
+        Returns:
+            (códigos, overflow)
+        """
+        if HAS_NUMPY and self._fits_int64:
+            return self._binary_array_numpy(codes_a, codes_b, saturate, op, wide)
+        
+        codes_a, codes_b = list(codes_a), list(codes_b)
+        if len(codes_a) != len(codes_b):
+            raise ValueError(f"Longitudes distintas: {len(codes_a)} y {len(codes_b)}")
+        
+        lo, hi = self._units_min, self._units_max
+        code_lo, code_hi = self._units_to_code(lo), self._units_to_code(hi)
+        codes, overflow = [], []
+        for code_a, code_b in zip(codes_a, codes_b):
+            num, den = op(self._code_to_units(code_a), self._code_to_units(code_b))
+            out = den == 0 or not lo * den <= num <= hi * den
+            if out:
+                code = (code_hi if num > 0 else code_lo if num < 0 else 0) if saturate else 0
+            else:
+                code = self._code_from_magnitude(_round_div(abs(num), den), num < 0)
+            codes.append(code)
+            overflow.append(out)
+        return self._batch_result(codes, overflow)
+    
+    def _code_from_magnitude(self, magnitude: int, negative: bool) -> int:
+        """Código de ±magnitud (en unidades), como encode()."""
+        if not negative or not self.signed:
+            return magnitude
+        if self.representation == 'ms':
+            return self.base_power_EF + magnitude
+        return (self._complement_modulus - magnitude) % self._complement_modulus
+    
+    def _units_to_code(self, units: int) -> int:
+        """Código de unas unidades dentro del rango."""
+        return self._code_from_magnitude(abs(units), units < 0)
+    
+    def _code_to_units(self, code: int) -> int:
+        """Unidades de un código (como decode(): decode(c) == unidades / B^F)."""
+        if not self.signed or code < self.base_power_EF:
+            return code
+        if self.representation == 'ms':
+            return self.base_power_EF - code
+        return code - self._complement_modulus
+    
+    @staticmethod
+    def _batch_result(codes: List[int], overflow: List[bool]) -> Tuple[Any, Any]:
+        if not HAS_NUMPY:
+            return codes, overflow
+        return np.array(codes, dtype=object), np.array(overflow, dtype=bool)
+    
+    # Versiones vectorizadas (NumPy, int64)
+    
+    def _code_from_magnitude_numpy(self, magnitude, negative):
+        if not self.signed:
+            return magnitude
+        if self.representation == 'ms':
+            return np.where(negative, self.base_power_EF + magnitude, magnitude)
+        modulus = self._complement_modulus
+        return np.where(negative, (modulus - magnitude) % modulus, magnitude)
+    
+    def _code_to_units_numpy(self, codes):
+        if not self.signed:
+            return codes
+        if self.representation == 'ms':
+            return np.where(codes >= self.base_power_EF, self.base_power_EF - codes, codes)
+        return np.where(codes >= self.base_power_EF, codes - self._complement_modulus, codes)
+    
+    def _encode_array_numpy(self, values, saturate: bool) -> Tuple[Any, Any]:
+        values = np.asarray(values, dtype=np.float64)
+        in_range = (values >= self.min_value) & (values <= self.max_value)
+        if saturate:
+            values = np.clip(values, self.min_value, self.max_value)
+            valid = ~np.isnan(values)
+        else:
+            valid = in_range
+        values = np.where(valid, values, 0.0)
+        # round() de Python y np.rint redondean igual (empates a par)
+        magnitude = np.rint(np.abs(values) * float(self.base_power_F)).astype(np.int64)
+        return self._code_from_magnitude_numpy(magnitude, values < 0), ~in_range
+    
+    def _binary_array_numpy(self, codes_a, codes_b, saturate: bool, op: Callable,
+                            wide: bool) -> Tuple[Any, Any]:
+        units_a = self._code_to_units_numpy(np.asarray(codes_a, dtype=np.int64))
+        units_b = self._code_to_units_numpy(np.asarray(codes_b, dtype=np.int64))
+        if wide and not self._products_fit_int64:
+            units_a, units_b = units_a.astype(object), units_b.astype(object)
+        
+        num, den = op(units_a, units_b)
+        den = np.broadcast_to(den, np.shape(num)).astype(num.dtype)
+        undefined = den == 0
+        den = np.where(undefined, 1, den)
+        overflow = undefined | (num < self._units_min * den) | (num > self._units_max * den)
+        
+        codes = self._code_from_magnitude_numpy(_round_div_numpy(abs(num), den), num < 0)
+        if saturate:
+            code_lo, code_hi = self._units_to_code(self._units_min), self._units_to_code(self._units_max)
+            extreme = np.where(num > 0, code_hi, np.where(num < 0, code_lo, 0))
+        else:
+            extreme = 0
+        codes = np.where(overflow, extreme, codes)
+        return codes.astype(np.int64), overflow.astype(bool)
+    
+    # ---------- Espacio de códigos (CodeSpace) ----------
+    
+    @property
+    def code_count(self) -> int:
+        """Sin signo: B^(E+F) códigos; con signo, el doble (dígito de signo 0 o negativo)."""
+        return self.base_power_EF * (2 if self.signed else 1)
+    
+    @property
+    def value_count(self) -> int:
+        """Valores k·ε distintos (en M&S, ±0 cuentan una vez)."""
+        return self._units_max - self._units_min + 1
+    
+    def rank(self, value: Any) -> int:
+        """Cuántos valores k·ε son < value."""
+        check_rankable(value)
+        if value in (math.inf, -math.inf):
+            return self.value_count if value > 0 else 0
+        # k·ε < value  ⇔  k <= ceil(value·B^F) - 1
+        bound = math.ceil(exact_fraction(value) * self.base_power_F)
+        return min(max(bound - self._units_min, 0), self.value_count)
+    
+    def _value_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        # Índice i ↔ unidades k = k_min + i
+        k_min, zero_index = self._units_min, -self._units_min
+        segments = [(zero_index, self.value_count, k_min, 1)]
+        if self.signed and self.representation == 'ms':
+            segments.insert(0, (0, zero_index, self.base_power_EF - k_min, -1))
+        elif self.signed:
+            segments.insert(0, (0, zero_index, self._complement_modulus + k_min, 1))
+        return segment_codes(start, stop, segments)
+    
+    def _code_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        if not (self.signed and self.representation == 'complement'):
+            return range(start, stop)
+        # Complemento: positivos [0, B^(E+F)) y negativos [B^(E+F+1) - B^(E+F), B^(E+F+1))
+        top = self.base_power_EF
+        return segment_codes(start, stop, [(0, top, 0, 1),
+                                           (top, 2 * top, self._complement_modulus - 2 * top, 1)])
+    
+    def _max_code(self) -> int:
+        return (self._complement_modulus if self.signed else self.base_power_EF) - 1
+    
+    def _code_entries(self, codes: Sequence[int]) -> Tuple[Any, Any]:
+        values = self.decode_array(codes)
+        if HAS_NUMPY:
+            return values, np.where(values == 0, ZERO, NORMAL)
+        return values, [ZERO if value == 0 else NORMAL for value in values]
+    
     def error_absolute(self, true_value: float) -> float:
         """Error absoluto de representación."""
         encoded = self.encode(true_value)
@@ -313,6 +594,21 @@ class FixedPointUnified:
         return "\n".join(lines)
 
 
+def _round_div(numerator: int, denominator: int) -> int:
+    """numerator/denominator (denominator > 0) redondeado al entero más cercano, empates a par."""
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def _round_div_numpy(numerator, denominator):
+    """_round_div() elemento a elemento (int64 u objetos)."""
+    quotient, remainder = numerator // denominator, numerator % denominator
+    round_up = (2 * remainder > denominator) | ((2 * remainder == denominator) & (quotient % 2 == 1))
+    return np.where(round_up, quotient + 1, quotient)
+
+
 # Funciones auxiliares para compatibilidad con versiones heredadas
 def from_fixedpoint(fp_old) -> FixedPointUnified:
     """Crea FixedPointUnified desde FixedPoint (sin signo)."""
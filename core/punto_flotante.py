@@ -13,14 +13,23 @@ Ventaja sobre punto fijo:
 
 Al mantener M ∈ [1,2), el error relativo se mantiene constante independientemente
 de la escala del número representado.
+
+Espacio de códigos (core/code_space.py): iter_codes(), rank(), unrank().
+El código de cada entrada es pack(M_encoded, E_encoded), un índice denso
+creciente con la magnitud dentro de cada signo; (0, 0) representa el 0.
 """
 
 from decimal import Decimal
-from typing import Tuple
+from fractions import Fraction
+from typing import Any, Sequence, Tuple
 import math
 
+from core.code_space import (
+    NORMAL, ZERO, CodeSpace, check_rankable, exact_fraction, floor_log
+)
+
 
-class FixedPointFloating:
+class FixedPointFloating(CodeSpace):
     """Punto flotante básico con mantisa normalizada en [1,2)."""
     
     def __init__(self, F_M: int, E_bits: int, base: int = 2, signed: bool = True):
@@ -56,6 +65,14 @@ class FixedPointFloating:
         self.max_value = (self.mantisa_max - self.epsilon_mantisa) * Decimal(base) ** self.E_max
         self.min_positive = Decimal(1) * Decimal(base) ** self.E_min
         
+        # Espacio de códigos: rejilla de magnitudes (exponente, fracción)
+        self._mantissa_scale = base ** F_M  # B^F_M
+        self._E_bias = base ** (E_bits - 1) if E_bits > 0 else 0
+        self._E_encoded_min = self.E_min + self._E_bias
+        self._grid_count = (self.E_max - self.E_min + 1) * self._mantissa_scale
+        # Con (M, E) = (0, 0) en la rejilla, ese código es el cero (no B^E_min)
+        self._has_zero = self._E_encoded_min == 0
+        
     def __repr__(self) -> str:
         return f"FP(F_M={self.F_M}, E_bits={self.E_bits}, base={self.base}, signed={self.signed})"
     
@@ -160,6 +177,78 @@ class FixedPointFloating:
         value = sign_mult * float(mantisa) * (self.base ** exponent)
         return value
     
+    def pack(self, M_encoded: int, E_encoded: int) -> int:
+        """Código denso de (M_encoded, E_encoded): (signo·exponentes + E)·B^F_M + fracción."""
+        sign, frac = divmod(M_encoded, self._mantissa_scale) if self.signed else (0, M_encoded)
+        exponent_index = E_encoded - self._E_encoded_min
+        return sign * self._grid_count + exponent_index * self._mantissa_scale + frac
+    
+    def unpack(self, code: int) -> Tuple[int, int]:
+        """Inverso de pack(): (M_encoded, E_encoded)."""
+        sign, grid_index = divmod(code, self._grid_count)
+        exponent_index, frac = divmod(grid_index, self._mantissa_scale)
+        return sign * self._mantissa_scale + frac, exponent_index + self._E_encoded_min
+    
+    # ---------- Espacio de códigos (CodeSpace) ----------
+    
+    @property
+    def code_count(self) -> int:
+        """Magnitudes de la rejilla, por dos si hay signo."""
+        return self._grid_count * (2 if self.signed else 1)
+    
+    @property
+    def value_count(self) -> int:
+        """Cada código tiene un valor distinto."""
+        return self.code_count
+    
+    def rank(self, value: Any) -> int:
+        """Cuántos valores distintos del formato son < value."""
+        check_rankable(value)
+        negatives = self._grid_count if self.signed else 0
+        if value in (math.inf, -math.inf):
+            return self.value_count if value > 0 else 0
+        if value < 0:
+            return negatives - self._grid_at_most(abs(exact_fraction(value))) if self.signed else 0
+        if value == 0:
+            return negatives
+        below = self._grid_below(exact_fraction(value))
+        # El cero ocupa el lugar de B^E_min: también es < value
+        return negatives + below + (1 if self._has_zero and below == 0 else 0)
+    
+    def _grid_at_most(self, magnitude: Fraction) -> int:
+        """Puntos de la rejilla (1.M × B^E) <= magnitude."""
+        exponent = floor_log(magnitude, self.base)
+        if exponent < self.E_min:
+            return 0
+        if exponent > self.E_max:
+            return self._grid_count
+        scale = self._mantissa_scale
+        frac = min(math.floor((magnitude / Fraction(self.base) ** exponent - 1) * scale), scale - 1)
+        return (exponent - self.E_min) * scale + frac + 1
+    
+    def _grid_below(self, magnitude: Fraction) -> int:
+        """Puntos de la rejilla < magnitude."""
+        count = self._grid_at_most(magnitude)
+        if count and self._grid_value(count - 1) == magnitude:
+            return count - 1
+        return count
+    
+    def _grid_value(self, index: int) -> Fraction:
+        exponent_index, frac = divmod(index, self._mantissa_scale)
+        return (1 + Fraction(frac, self._mantissa_scale)) * Fraction(self.base) ** (self.E_min + exponent_index)
+    
+    def _value_order_codes(self, start: int, stop: int) -> Sequence[int]:
+        # Negativos de mayor a menor magnitud y luego la rejilla positiva
+        negatives = self._grid_count if self.signed else 0
+        if start >= negatives:
+            return range(start - negatives, stop - negatives)
+        return ([self._grid_count + negatives - 1 - i for i in range(start, min(stop, negatives))]
+                + list(range(0, max(stop - negatives, 0))))
+    
+    def _code_entries(self, codes: Sequence[int]) -> Tuple[Any, Any]:
+        values = [self.decode(*self.unpack(int(code))) for code in codes]
+        return values, [ZERO if value == 0 else NORMAL for value in values]
+    
     def add(self, v1: float, v2: float) -> float:
         """
         Suma en punto flotante.
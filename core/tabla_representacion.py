@@ -0,0 +1,184 @@
+"""
+Motor común de tablas de representación de enteros: CB, CB-1, M&S y Exceso a K.
+
+Cada fila se calcula aritméticamente a partir del código (el valor natural de
+la palabra): sin convertir la palabra a texto y de vuelta, y sin construir la
+tabla completa. Las filas se generan de forma perezosa y se pueden paginar con
+offset/limit, así que mostrar una página de una tabla de 16 bits cuesta lo
+mismo que mostrar una de 4 bits.
+
+Convenciones (las de cb_representacion, enteros_signados y exceso_k):
+- CB:   código < B^(l-1) → positivo; si no, código - B^l
+- CB-1: código < B^(l-1) → positivo; si no, código - (B^l - 1) (hay -0)
+- M&S:  dígito de signo 0 ó 1 y l-1 dígitos de magnitud (2·B^(l-1) palabras)
+- ExcK: código - K
+
+Uso:
+    tabla = TablaRepresentacion('CB', base=2, longitud=16)
+    for fila in tabla.filas(offset=32760, limit=16):
+        fila.palabra, fila.valor, fila.nota
+"""
+
+from typing import Iterator, List, NamedTuple, Optional
+
+SISTEMAS = ('CB', 'CBm1', 'MS', 'ExcK')
+ORDENES = ('codigo', 'valor')
+BASE_MAXIMA = 36
+LONGITUD_MAXIMA = 32
+# Tablas sin paginar más grandes que esto se rechazan (usar offset/limit)
+MAX_FILAS_SIN_PAGINAR = 1024
+
+DIGITOS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+class FilaTabla(NamedTuple):
+    """Una fila de la tabla."""
+    codigo: int   # Valor natural de la palabra
+    palabra: str
+    valor: int
+    nota: str
+
+
+class TablaRepresentacion:
+    """
+    Tabla perezosa de todas las palabras de un sistema de representación.
+
+    Las filas se indexan de 0 a total_palabras - 1 en orden de código
+    (ascendente por palabra) o de valor (ascendente por valor decimal).
+    """
+
+    def __init__(self, sistema: str, base: int, longitud: int, K: Optional[int] = None):
+        """
+        Args:
+            sistema: 'CB', 'CBm1', 'MS' o 'ExcK'
+            base: base numérica (2 a 36)
+            longitud: número de dígitos (1 a 32; 2 como mínimo en M&S)
+            K: sesgo (solo ExcK)
+
+        Raises:
+            ValueError: si los parámetros no son válidos
+        """
+        if sistema not in SISTEMAS:
+            raise ValueError(f"Sistema desconocido: {sistema!r} (válidos: {', '.join(SISTEMAS)})")
+        if not 2 <= base <= BASE_MAXIMA:
+            raise ValueError(f"La base debe estar entre 2 y {BASE_MAXIMA}")
+        longitud_minima = 2 if sistema == 'MS' else 1
+        if not longitud_minima <= longitud <= LONGITUD_MAXIMA:
+            raise ValueError(f"La longitud debe estar entre {longitud_minima} y {LONGITUD_MAXIMA}")
+        if (sistema == 'ExcK') != (K is not None):
+            raise ValueError("K es obligatorio en ExcK (y solo en ExcK)")
+
+        self.sistema = sistema
+        self.base = base
+        self.longitud = longitud
+        self.K = K
+
+        # Límites precalculados (no se recalculan por fila)
+        self.modulo = base ** longitud                   # B^l
+        self.total_palabras = self.modulo
+        self.separacion = base ** (longitud - 1)         # B^(l-1): primer código negativo
+        self.max_positivo = self.separacion - 1
+        if sistema == 'MS':
+            # Solo las palabras con dígito de signo 0 ó 1
+            self.total_palabras = 2 * self.separacion
+
+    def __repr__(self) -> str:
+        extra = f", K={self.K}" if self.K is not None else ""
+        return f"TablaRepresentacion({self.sistema!r}, base={self.base}, longitud={self.longitud}{extra})"
+
+    def valor(self, codigo: int) -> int:
+        """Valor decimal de la palabra con ese código."""
+        if self.sistema == 'ExcK':
+            return codigo - self.K
+        if codigo < self.separacion:
+            return codigo
+        if self.sistema == 'CB':
+            return codigo - self.modulo
+        if self.sistema == 'CBm1':
+            return codigo - (self.modulo - 1)
+        return self.separacion - codigo  # M&S: -(código - B^(l-1))
+
+    def palabra(self, codigo: int) -> str:
+        """Palabra de `longitud` dígitos del código."""
+        digitos = []
+        for _ in range(self.longitud):
+            codigo, digito = divmod(codigo, self.base)
+            digitos.append(DIGITOS[digito])
+        return ''.join(reversed(digitos))
+
+    def nota(self, codigo: int, valor: int) -> str:
+        """Significado especial de la fila (o '')."""
+        if self.sistema == 'ExcK':
+            if valor == -self.K:
+                return "Minimo (00...0)"
+            if valor == 0:
+                return "Cero (representa 0)"
+            if codigo == self.total_palabras - 1:
+                return "Maximo"
+            return ""
+        if self.sistema == 'MS':
+            if codigo == 0:
+                return "+0"
+            if codigo == self.separacion:
+                return "-0 (duplicado)"
+            return ""
+        if self.sistema == 'CBm1' and valor == 0:
+            return "Cero positivo (+0)" if codigo == 0 else "Cero negativo (-0)"
+        if valor == 0:
+            return "Cero (unica representacion)"
+        if valor == self.max_positivo:
+            return "Maximo positivo"
+        if codigo == self.separacion:
+            return "Minimo negativo"
+        return ""
+
+    def codigo(self, indice: int, orden: str = 'codigo') -> int:
+        """Código de la fila `indice` en el orden dado."""
+        if orden == 'codigo' or self.sistema == 'ExcK':
+            return indice
+        if self.sistema == 'MS':
+            # -max..-1, +0, -0, 1..max
+            magnitud_max = self.max_positivo
+            if indice < magnitud_max:
+                return self.separacion + magnitud_max - indice
+            if indice == magnitud_max:
+                return 0
+            if indice == magnitud_max + 1:
+                return self.separacion
+            return indice - magnitud_max - 1
+        # CB y CB-1: los negativos (códigos >= B^(l-1)) van primero
+        return (indice + self.separacion) % self.total_palabras
+
+    def fila(self, codigo: int) -> FilaTabla:
+        """Fila de un código."""
+        valor = self.valor(codigo)
+        return FilaTabla(codigo, self.palabra(codigo), valor, self.nota(codigo, valor))
+
+    def filas(self, offset: int = 0, limit: Optional[int] = None, orden: str = 'codigo') -> Iterator[FilaTabla]:
+        """
+        Genera las filas [offset, offset + limit) de forma perezosa.
+
+        Args:
+            offset: primera fila (0 = primera de la tabla)
+            limit: número máximo de filas (None = hasta el final)
+            orden: 'codigo' o 'valor'
+        """
+        if orden not in ORDENES:
+            raise ValueError(f"Orden desconocido: {orden!r} (válidos: {', '.join(ORDENES)})")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset y limit deben ser >= 0")
+        fin = self.total_palabras if limit is None else min(offset + limit, self.total_palabras)
+        for indice in range(offset, fin):
+            yield self.fila(self.codigo(indice, orden))
+
+    def pagina(self, offset: int = 0, limit: Optional[int] = None, orden: str = 'codigo') -> List[FilaTabla]:
+        """Lista de las filas de filas()."""
+        return list(self.filas(offset, limit, orden))
+
+    def demasiado_grande(self, limit: Optional[int]) -> bool:
+        """True si se pide la tabla entera sin paginar y es demasiado grande."""
+        return limit is None and self.total_palabras > MAX_FILAS_SIN_PAGINAR
+
+    def mensaje_demasiado_grande(self) -> str:
+        return (f"Tabla muy grande para B={self.base}, L={self.longitud} "
+                f"({self.total_palabras} filas). Use offset/limit.")
@@ -13,7 +13,16 @@ Estructura de directorios:
     ├── logic/
     ├── msi/
     ├── secuencial/
-    └── _index.json  (metadata de búsqueda rápida)
+    ├── _index.json     (snapshot del index: metadata de búsqueda rápida)
+    └── _index.journal  (cambios posteriores al snapshot, uno por línea)
+
+Index:
+    Se carga UNA vez en memoria (snapshot + journal). Cada save/delete añade
+    una línea al journal (O(1)) en lugar de reescribir todo _index.json;
+    cada `compact_every` líneas se compacta en un nuevo snapshot.
+    count() e info() se responden solo desde el index (sin abrir problemas).
+    Además mantiene, por tipo, la lista ordenada de ids: sample() elige por
+    posición sin recorrer el index.
 
 Ventajas:
 - Sin dependencias externas (solo Python)
@@ -23,19 +32,20 @@ Ventajas:
 - Perfecto para desarrollo/testing
 
 Desventajas:
-- Lento para muchos Problems (> 10,000)
-- Búsquedas lentas (lee todo el index)
-- No escalable a múltiples procesos
+- Lento para listar muchos Problems (> 10,000): list() abre cada fichero
+- No escalable a múltiples procesos escribiendo a la vez
 """
 
 import os
 import json
+import random
+from bisect import bisect_left, insort
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
 from datetime import datetime
-from models.problem import Problem
+from models.problem import Problem, ProblemSummary
 from models.problem_type import ProblemType
-from database.repository import ProblemRepository
+from database.repository import ProblemRepository, pick_sample_ids
 
 
 class FileProblemRepository(ProblemRepository):
@@ -49,29 +59,40 @@ class FileProblemRepository(ProblemRepository):
         all_problems = repo.list()
     """
     
-    def __init__(self, base_path: str = "./problems_db"):
+    def __init__(self, base_path: str = "./problems_db", compact_every: int = 1000):
         """
         Inicializa el repositorio.
         
         Args:
             base_path: Ruta donde guardar los ficheros (default: ./problems_db)
+            compact_every: Líneas de journal tras las que se compacta el index
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
         
         # Crear subdirectorios por tipo
         for problem_type in ProblemType:
             type_dir = self.base_path / problem_type.value
             type_dir.mkdir(exist_ok=True)
         
-        # Index para búsquedas rápidas
+        # Index para búsquedas rápidas (snapshot + journal, en memoria)
         self.index_path = self.base_path / "_index.json"
+        self.journal_path = self.base_path / "_index.journal"
+        self._index: Dict[str, Any] = {}
+        self._journal_lines = 0
+        self._journal_offset = 0
+        self._snapshot_stamp = None
+        self._problems_size = 0  # Bytes de los ficheros de problemas (según index)
+        self._ids_by_type: Dict[str, List[str]] = {}  # Ids ordenados por tipo (sample)
         self._ensure_index()
     
     def _ensure_index(self):
         """Crea o restaura el index."""
         if not self.index_path.exists():
             self._rebuild_index()
+        else:
+            self._reload_index()
     
     def _rebuild_index(self):
         """Reconstruye el index leyendo todos los ficheros."""
@@ -93,30 +114,182 @@ class FileProblemRepository(ProblemRepository):
                         if problem_id:
                             index[problem_id] = {
                                 'type': problem_type.value,
-                                'file': str(json_file.relative_to(self.base_path)),
+                                'file': json_file.relative_to(self.base_path).as_posix(),
                                 'metadata': problem_data.get('metadata', {}),
                                 'difficulty': problem_data.get('metadata', {}).get('difficulty'),
                                 'tags': problem_data.get('metadata', {}).get('tags', []),
-                                'created_at': problem_data.get('metadata', {}).get('created_at')
+                                'created_at': problem_data.get('metadata', {}).get('created_at'),
+                                'size': json_file.stat().st_size
                             }
                 except Exception as e:
-                    print(f"Error leyendo {json_file}: {e}")
+                    self._report_load_error(json_file, e)
         
         # Guardar index
-        with open(self.index_path, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+        self._index = index
+        self._reindex_types()
+        self._write_snapshot()
     
-    def _load_index(self) -> Dict[str, Any]:
-        """Carga el index desde disco."""
+    # ==================== INDEX: SNAPSHOT + JOURNAL ====================
+    
+    def _stamp(self, path: Path):
+        """Identifica una versión de un fichero (para detectar cambios externos)."""
+        try:
+            st = path.stat()
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+    
+    def _reload_index(self):
+        """Carga el snapshot y aplica el journal encima."""
+        self._index = {}
         if self.index_path.exists():
             with open(self.index_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+                self._index = json.load(f)
+        self._reindex_types()
+        self._snapshot_stamp = self._stamp(self.index_path)
+        self._journal_lines = 0
+        self._journal_offset = 0
+        self._replay_journal()
+        self._recount_size()
+        
+        if self._journal_lines >= self.compact_every:
+            self._compact()
+    
+    def _replay_journal(self):
+        """Aplica las líneas del journal que aún no están en memoria."""
+        if not self.journal_path.exists():
+            return
+        
+        with open(self.journal_path, 'rb') as f:
+            f.seek(self._journal_offset)
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break  # Línea a medio escribir: se leerá cuando esté completa
+                self._journal_offset += len(raw)
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                self._apply(entry)
+                self._journal_lines += 1
+    
+    def _apply(self, entry: Dict[str, Any]):
+        """Aplica una operación de journal al index en memoria."""
+        problem_id = entry.get('id')
+        old = self._index.pop(problem_id, None)
+        if old is not None:
+            self._problems_size -= old.get('size', 0)
+            self._unlist_id(old['type'], problem_id)
+        if entry.get('op') == 'put':
+            self._index[problem_id] = entry['entry']
+            self._problems_size += entry['entry'].get('size', 0)
+            insort(self._ids_by_type.setdefault(entry['entry']['type'], []), problem_id)
+    
+    def _reindex_types(self):
+        """Reconstruye las listas ordenadas de ids por tipo desde el index."""
+        by_type: Dict[str, List[str]] = {}
+        for problem_id, info in self._index.items():
+            by_type.setdefault(info['type'], []).append(problem_id)
+        for ids in by_type.values():
+            ids.sort()
+        self._ids_by_type = by_type
+    
+    def _unlist_id(self, type_value: str, problem_id: str):
+        """Quita un id de la lista ordenada de su tipo (búsqueda binaria)."""
+        ids = self._ids_by_type.get(type_value, [])
+        position = bisect_left(ids, problem_id)
+        if position < len(ids) and ids[position] == problem_id:
+            del ids[position]
+    
+    def _recount_size(self):
+        """Recalcula el tamaño total (mide solo entradas antiguas sin 'size')."""
+        total = 0
+        for info in self._index.values():
+            if 'size' not in info:
+                try:
+                    info['size'] = self._file_path(info).stat().st_size
+                except OSError:
+                    info['size'] = 0
+            total += info['size']
+        self._problems_size = total
+    
+    def _sync_index(self):
+        """
+        Incorpora cambios hechos por otra instancia sobre el mismo directorio.
+        
+        Coste O(1) si no hubo cambios (dos stat); si otra instancia compactó,
+        recarga; si solo añadió al journal, aplica las líneas nuevas.
+        """
+        if self._stamp(self.index_path) != self._snapshot_stamp:
+            self._reload_index()
+            return
+        journal = self._stamp(self.journal_path)
+        journal_size = journal[1] if journal else 0
+        if journal_size < self._journal_offset:
+            self._reload_index()
+        elif journal_size > self._journal_offset:
+            self._replay_journal()
     
-    def _save_index(self, index: Dict[str, Any]):
-        """Guarda el index a disco."""
-        with open(self.index_path, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+    def _append_journal(self, entry: Dict[str, Any]):
+        """Registra una operación: en memoria + una línea en el journal."""
+        self._sync_index()
+        line = (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+        self._journal_offset += len(line)
+        self._journal_lines += 1
+        self._apply(entry)
+        
+        if self._journal_lines >= self.compact_every:
+            self._compact()
+    
+    def _compact(self):
+        """Vuelca el index en memoria a un nuevo snapshot y vacía el journal."""
+        self._write_snapshot()
+    
+    def _write_snapshot(self):
+        """Escribe _index.json de forma atómica y vacía el journal."""
+        tmp_path = self.index_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+        
+        with open(self.journal_path, 'wb'):
+            pass
+        self._journal_lines = 0
+        self._journal_offset = 0
+        self._snapshot_stamp = self._stamp(self.index_path)
+        self._recount_size()
+    
+    def _load_index(self) -> Dict[str, Any]:
+        """Devuelve el index en memoria (sincronizado con disco)."""
+        self._sync_index()
+        return self._index
+    
+    def _file_path(self, info: Dict[str, Any]) -> Path:
+        """Ruta absoluta del fichero de una entrada del index."""
+        # Los index antiguos generados en Windows guardan rutas con '\\'
+        return self.base_path / info['file'].replace('\\', '/')
+    
+    def _matches(self, info: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+        """¿La entrada del index cumple los filtros type/difficulty/tags?"""
+        problem_type = filters.get('type')
+        difficulty = filters.get('difficulty')
+        tags = filters.get('tags', [])
+        
+        # Filtrar por tipo
+        if problem_type and info['type'] != problem_type:
+            return False
+        
+        # Filtrar por dificultad
+        if difficulty is not None and info['difficulty'] != difficulty:
+            return False
+        
+        # Filtrar por tags (si se especificó alguno, debe estar en el problem)
+        if tags and not any(tag in info['tags'] for tag in tags):
+            return False
+        
+        return True
     
     def _get_problem_path(self, problem: Problem) -> Path:
         """Obtiene la ruta del fichero para un Problem."""
@@ -134,20 +307,24 @@ class FileProblemRepository(ProblemRepository):
         file_path = self._get_problem_path(problem)
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(problem.to_dict(), f, indent=2, ensure_ascii=False)
-        
-        # Actualizar index
-        index = self._load_index()
-        index[problem.id] = {
-            'type': problem.type.value,
-            'file': str(file_path.relative_to(self.base_path)),
-            'metadata': {k: v for k, v in problem.metadata.__dict__.items() if k != 'id'},
-            'difficulty': problem.metadata.difficulty,
-            'tags': problem.metadata.tags,
-            'created_at': problem.metadata.created_at
-        }
-        self._save_index(index)
+        content = json.dumps(problem.to_dict(), indent=2, ensure_ascii=False).encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        
+        # Actualizar index (una línea de journal)
+        self._append_journal({
+            'op': 'put',
+            'id': problem.id,
+            'entry': {
+                'type': problem.type.value,
+                'file': file_path.relative_to(self.base_path).as_posix(),
+                'metadata': {k: v for k, v in problem.metadata.__dict__.items() if k != 'id'},
+                'difficulty': problem.metadata.difficulty,
+                'tags': problem.metadata.tags,
+                'created_at': problem.metadata.created_at,
+                'size': len(content)
+            }
+        })
         
         return problem.id
     
@@ -159,7 +336,7 @@ class FileProblemRepository(ProblemRepository):
             raise FileNotFoundError(f"Problem {problem_id} no encontrado")
         
         file_info = index[problem_id]
-        file_path = self.base_path / file_info['file']
+        file_path = self._file_path(file_info)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Fichero {file_path} no encontrado")
@@ -196,13 +373,12 @@ class FileProblemRepository(ProblemRepository):
             return False
         
         file_info = index[problem_id]
-        file_path = self.base_path / file_info['file']
+        file_path = self._file_path(file_info)
         
         if file_path.exists():
             file_path.unlink()
         
-        del index[problem_id]
-        self._save_index(index)
+        self._append_journal({'op': 'del', 'id': problem_id})
         
         return True
     
@@ -214,24 +390,12 @@ class FileProblemRepository(ProblemRepository):
         problems = []
         
         filters = filters or {}
-        problem_type = filters.get('type')
-        difficulty = filters.get('difficulty')
-        tags = filters.get('tags', [])
         limit = filters.get('limit')
         offset = filters.get('offset', 0)
         
         # Filtrar
-        for problem_id, info in index.items():
-            # Filtrar por tipo
-            if problem_type and info['type'] != problem_type:
-                continue
-            
-            # Filtrar por dificultad
-            if difficulty is not None and info['difficulty'] != difficulty:
-                continue
-            
-            # Filtrar por tags (si se especificó alguno, debe estar en el problem)
-            if tags and not any(tag in info['tags'] for tag in tags):
+        for problem_id, info in list(index.items()):
+            if not self._matches(info, filters):
                 continue
             
             # Cargar problem
@@ -239,7 +403,7 @@ class FileProblemRepository(ProblemRepository):
                 problem = self.load(problem_id)
                 problems.append(problem)
             except Exception as e:
-                print(f"Error cargando {problem_id}: {e}")
+                self._report_load_error(problem_id, e)
                 continue
         
         # Paginación
@@ -250,15 +414,77 @@ class FileProblemRepository(ProblemRepository):
         
         return problems
     
+    def list_summaries(self, filters: Optional[Dict[str, Any]] = None,
+                       fields: Optional[Iterable[str]] = None) -> Iterator[ProblemSummary]:
+        """
+        Itera resúmenes directamente desde el index en memoria (no abre ficheros).
+        
+        Mismos filtros, orden y paginación que list().
+        """
+        filters = filters or {}
+        fields = ProblemSummary.check_fields(fields)
+        limit = filters.get('limit')
+        offset = filters.get('offset', 0) or 0
+        
+        skipped = 0
+        yielded = 0
+        for problem_id, info in list(self._load_index().items()):
+            if not self._matches(info, filters):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if limit and yielded >= limit:
+                break
+            
+            metadata = info.get('metadata', {})
+            values = {
+                'type': info['type'],
+                'title': metadata.get('title'),
+                'topic': metadata.get('topic'),
+                'difficulty': info['difficulty'],
+                'tags': info['tags'],
+                'created_at': info['created_at'],
+            }
+            yield ProblemSummary(problem_id, loader=self.load,
+                                 **{name: values[name] for name in fields if name != 'id'})
+            yielded += 1
+    
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
-        """Cuenta Problems con filtros."""
-        return len(self.list(filters))
+        """Cuenta Problems con filtros (solo desde el index, sin abrir ficheros)."""
+        filters = filters or {}
+        index = self._load_index()
+        
+        if any(key in filters for key in ('type', 'difficulty', 'tags')):
+            total = sum(1 for info in index.values() if self._matches(info, filters))
+        else:
+            total = len(index)
+        
+        # Misma paginación que list()
+        total = max(0, total - (filters.get('offset') or 0))
+        limit = filters.get('limit')
+        return min(total, limit) if limit else total
+    
+    def _sample_ids(self, type_value: Optional[str], k: int, rng: random.Random,
+                    exclude_ids: Set[str]) -> List[str]:
+        """Elige ids por posición en la lista ordenada del tipo (sin abrir ficheros)."""
+        self._sync_index()
+        if type_value:
+            ids = self._ids_by_type.get(type_value, [])
+        else:
+            ids = sorted(self._index)
+        return pick_sample_ids(rng, len(ids), k, ids.__getitem__, lambda: ids, exclude_ids)
     
     def exists(self, problem_id: str) -> bool:
         """Verifica si un Problem existe."""
         index = self._load_index()
         return problem_id in index
     
+    def existing_ids(self, problem_ids: Iterable[str]) -> Set[str]:
+        """Ids que ya existen (una sola sincronización del index)."""
+        index = self._load_index()
+        return {problem_id for problem_id in problem_ids if problem_id in index}
+    
     # ==================== LIMPIEZA ====================
     
     def clear(self) -> int:
@@ -274,7 +500,9 @@ class FileProblemRepository(ProblemRepository):
                     json_file.unlink()
         
         # Limpiar index
-        self._save_index({})
+        self._index = {}
+        self._ids_by_type = {}
+        self._write_snapshot()
         
         return count
     
@@ -298,8 +526,9 @@ class FileProblemRepository(ProblemRepository):
             if count > 0:
                 by_difficulty[difficulty] = count
         
-        # Tamaño
-        total_size = sum(f.stat().st_size for f in self.base_path.rglob("*.json")) / (1024 * 1024)
+        # Tamaño: problemas (contabilidad del index) + ficheros del propio index
+        index_bytes = sum(stamp[1] for stamp in (self._stamp(self.index_path), self._stamp(self.journal_path)) if stamp)
+        total_size = (self._problems_size + index_bytes) / (1024 * 1024)
         
         return {
             'backend': 'file',
@@ -25,9 +25,13 @@ Ejemplo:
     repo.delete(problem_id)
 """
 
+import logging
+import random
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from models.problem import Problem
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Sequence, Set, Union
+from core.instrumentation import get_instrumentation
+from models.problem import Problem, ProblemSummary
 from models.problem_type import ProblemType
 
 
@@ -186,6 +190,147 @@ class ProblemRepository(ABC):
         """
         pass
     
+    def list_summaries(self, filters: Optional[Dict[str, Any]] = None,
+                       fields: Optional[Iterable[str]] = None) -> Iterator[ProblemSummary]:
+        """
+        Itera resúmenes ligeros (ProblemSummary) en lugar de Problems completos.
+        
+        Pensado para listados que solo necesitan id/título/tipo/dificultad:
+        los backends lo sobrescriben para leer solo su index o columnas SQL.
+        Cada resumen carga el Problem completo solo si se accede a un atributo
+        que no está en el resumen (summary.statement, summary.problem...).
+        
+        Implementación por defecto: resúmenes de list() (ya cargados).
+        
+        Args:
+            filters: Mismo formato que list()
+            fields: Campos a proyectar (ProblemSummary.FIELDS). None = todos
+        
+        Returns:
+            Iterador de ProblemSummary (mismo orden que list())
+        
+        Ejemplo:
+            for summary in repo.list_summaries({"type": "numeracion"}, fields=("id", "title")):
+                print(summary.id, summary.title)
+        """
+        ProblemSummary.check_fields(fields)
+        for problem in self.list(filters):
+            yield ProblemSummary.from_problem(problem)
+    
+    def iter_problems(self, filters: Optional[Dict[str, Any]] = None,
+                      chunk_size: int = 500) -> Iterator[Problem]:
+        """
+        Itera Problems completos sin cargarlos todos en memoria.
+        
+        Pensado para exportaciones y recorridos de bancos grandes: la memoria
+        depende de chunk_size, no del número de problemas.
+        
+        Implementación por defecto: resúmenes (solo id) + load() de cada uno.
+        Los backends SQL la sobrescriben para leer por bloques de chunk_size.
+        
+        Args:
+            filters: Mismo formato que list()
+            chunk_size: Problems leídos por bloque (si el backend lee por bloques)
+        
+        Returns:
+            Iterador de Problems (mismo orden que list())
+        
+        Ejemplo:
+            for problem in repo.iter_problems({"type": "numeracion"}):
+                f.write(json.dumps(problem.to_dict()) + "\n")
+        """
+        for summary in self.list_summaries(filters, fields=("id",)):
+            try:
+                yield self.load(summary.id)
+            except Exception as e:
+                self._report_load_error(summary.id, e)
+    
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Problem]:
+        """
+        Busca Problems por texto en título, enunciado, pistas y tags.
+        
+        Implementación por defecto: recorre list() comparando subcadenas
+        (todas las palabras de la consulta deben aparecer). Los backends con
+        índice de texto (SQLite/FTS5) la sobrescriben y ordenan por relevancia.
+        
+        Args:
+            query: Texto a buscar
+            limit: Máximo de resultados
+            offset: Saltar N resultados
+        
+        Returns:
+            Lista de Problems que coinciden
+        
+        Ejemplo:
+            hits = repo.search("complemento a 2", limit=20)
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+        
+        hits = []
+        for problem in self.list():
+            haystack = " ".join([
+                problem.metadata.title or "",
+                problem.statement.text or "",
+                " ".join(str(hint) for hint in problem.statement.hints),
+                " ".join(problem.metadata.tags),
+            ]).lower()
+            if all(term in haystack for term in terms):
+                hits.append(problem)
+        
+        return hits[offset:offset + limit]
+    
+    def sample(self, problem_type: Optional[Union[ProblemType, str]] = None, k: int = 1,
+               seed: Optional[int] = None,
+               exclude_ids: Optional[Iterable[str]] = None) -> List[Problem]:
+        """
+        Elige k Problems al azar (sin repetición) de un tipo.
+        
+        Pensado para reutilizar problemas en ExamBuilder: el coste depende de k,
+        no del tamaño del repositorio (los backends sobrescriben _sample_ids()
+        para elegir ids desde su index sin cargar el resto).
+        
+        Con la misma semilla y el mismo repositorio la elección se repite. Los
+        backends en memoria eligen por posición dentro de la lista de ids
+        ordenada; SQLite sortea rowids, así que para k pequeño puede elegir
+        otros Problems que un repositorio de ficheros con el mismo contenido.
+        
+        Args:
+            problem_type: ProblemType (o su valor). None = cualquier tipo
+            k: Número de Problems a elegir (puede devolver menos si no hay)
+            seed: Semilla para reproducibilidad (None = aleatorio)
+            exclude_ids: Ids que no se deben elegir (ya usados, etc.)
+        
+        Returns:
+            Lista de hasta k Problems distintos
+        
+        Ejemplo:
+            problems = repo.sample(ProblemType.NUMERACION, k=3, seed=42)
+        """
+        type_value = getattr(problem_type, 'value', problem_type)
+        rng = random.Random(seed)
+        problem_ids = self._sample_ids(type_value, k, rng, set(exclude_ids or ()))
+        
+        problems = []
+        for problem_id in problem_ids:
+            try:
+                problems.append(self.load(problem_id))
+            except Exception as e:
+                self._report_load_error(problem_id, e)
+        return problems
+    
+    def _sample_ids(self, type_value: Optional[str], k: int, rng: random.Random,
+                    exclude_ids: Set[str]) -> List[str]:
+        """
+        Elige hasta k ids del tipo indicado para sample().
+        
+        Implementación por defecto: recorre los resúmenes (solo 'id').
+        """
+        filters = {"type": type_value} if type_value else None
+        ids = sorted(summary.id for summary in self.list_summaries(filters, fields=("id",)))
+        return pick_sample_ids(rng, len(ids), k, ids.__getitem__, lambda: ids, exclude_ids)
+    
     @abstractmethod
     def exists(self, problem_id: str) -> bool:
         """
@@ -205,6 +350,24 @@ class ProblemRepository(ABC):
     
     # ==================== LIMPIEZA ====================
     
+    def existing_ids(self, problem_ids: Iterable[str]) -> Set[str]:
+        """
+        Devuelve cuáles de los ids ya existen (consulta en bloque).
+        
+        Implementación por defecto: exists() de cada id. Los backends SQL
+        la sobrescriben con una consulta IN por bloque.
+        
+        Args:
+            problem_ids: Ids a comprobar
+        
+        Returns:
+            Conjunto de ids que existen en el repositorio
+        
+        Ejemplo:
+            nuevos = [p for p in lote if p.id not in repo.existing_ids(p.id for p in lote)]
+        """
+        return {problem_id for problem_id in problem_ids if self.exists(problem_id)}
+    
     @abstractmethod
     def clear(self) -> int:
         """
@@ -245,8 +408,55 @@ class ProblemRepository(ABC):
         """
         pass
     
+    # ==================== ESCRITURA MASIVA ====================
+    
+    def save_many(self, problems: Iterable[Problem]) -> List[str]:
+        """
+        Guarda varios Problems de una vez.
+        
+        Implementación por defecto: save() de cada uno dentro de transaction().
+        Los backends con escritura por lotes (SQLite) la sobrescriben.
+        
+        Args:
+            problems: Problems a guardar
+        
+        Returns:
+            IDs de los Problems guardados (mismo orden)
+        
+        Ejemplo:
+            ids = repo.save_many(problems)
+        """
+        with self.transaction():
+            return [self.save(problem) for problem in problems]
+    
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Agrupa varias escrituras en una unidad.
+        
+        Implementación por defecto: no hace nada (cada save() es independiente).
+        Los backends transaccionales la sobrescriben para confirmar una sola vez.
+        
+        Ejemplo:
+            with repo.transaction():
+                repo.save(p1)
+                repo.save(p2)
+        """
+        yield None
+    
     # ==================== UTILIDADES ====================
     
+    def _report_load_error(self, source: Any, error: Exception) -> None:
+        """
+        Problem ilegible que se salta (corrupto, borrado a medias...).
+        
+        Se informa a la instrumentación activa: contador 'repo.load_errors'
+        (por backend) + aviso.
+        """
+        instrumentation = get_instrumentation()
+        instrumentation.count("repo.load_errors", backend=self.__class__.__name__)
+        instrumentation.event("repo.load_error", f"Error cargando {source}: {error}", logging.WARNING)
+    
     def validate_problem(self, problem: Problem) -> bool:
         """
         Valida que un Problem sea válido para guardar.
@@ -317,3 +527,45 @@ class ProblemRepository(ABC):
             f"location={info['location']}, "
             f"total={info['total']})"
         )
+
+
+def pick_sample_ids(rng: random.Random, total: int, k: int,
+                    id_at: Callable[[int], str],
+                    all_ids: Callable[[], Sequence[str]],
+                    exclude_ids: Set[str]) -> List[str]:
+    """
+    Elige hasta k ids distintos entre `total` ids ordenados.
+    
+    Si k + exclusiones es pequeño frente a total, sortea posiciones y solo
+    consulta esas (id_at); si no, materializa la lista (all_ids) y filtra.
+    El resultado depende solo de rng, total y la lista ordenada de ids.
+    
+    Args:
+        rng: Generador aleatorio (random.Random con semilla)
+        total: Número de ids candidatos
+        k: Número de ids a elegir
+        id_at: Devuelve el id en una posición de la lista ordenada
+        all_ids: Devuelve la lista ordenada completa
+        exclude_ids: Ids que no se pueden elegir
+    
+    Returns:
+        Lista de hasta k ids, en orden de sorteo
+    """
+    if k <= 0 or total <= 0:
+        return []
+    
+    if 2 * (k + len(exclude_ids)) >= total:
+        candidates = [problem_id for problem_id in all_ids() if problem_id not in exclude_ids]
+        return rng.sample(candidates, min(k, len(candidates)))
+    
+    picked = []
+    seen = set()
+    while len(picked) < k and len(seen) < total:
+        position = rng.randrange(total)
+        if position in seen:
+            continue
+        seen.add(position)
+        problem_id = id_at(position)
+        if problem_id not in exclude_ids:
+            picked.append(problem_id)
+    return picked
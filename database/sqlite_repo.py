@@ -16,24 +16,66 @@ Esquema:
     ├── difficulty (INTEGER)
     ├── created_at (TEXT)
     ├── updated_at (TEXT)
+    ├── title, topic, tags (TEXT) - proyección para list_summaries()
     └── índices para búsqueda rápida
+    
+    problem_tags (tabla normalizada, índice por tag)
+    ├── problem_id (TEXT)
+    └── tag (TEXT)
+    
+    problems_fts (tabla virtual FTS5, si SQLite la soporta)
+    └── id, title, statement, hints, tags → search() con ranking bm25
+
+Conexiones:
+    Cada hilo reutiliza SU conexión persistente (modo WAL), en lugar de abrir
+    y cerrar una por operación. Las escrituras masivas van en una sola
+    transacción con save_many() o dentro de `with repo.transaction():`.
 
 Uso:
     repo = SQLiteProblemRepository("./problems.db")
     repo.save(problem)
     repo.load(problem_id)
     repo.list({"type": "numeracion", "difficulty": 4})
+    repo.search("complemento a 2", limit=10)
+    
+    # Inserción masiva (un único commit)
+    repo.save_many(problems)
 """
 
+import os
+import random
+import re
 import sqlite3
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from models.problem import Problem
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set
+from models.problem import Problem, ProblemSummary
 from models.problem_type import ProblemType
 from database.repository import ProblemRepository
 
 
+# Versión del esquema (PRAGMA user_version).
+# 1 = problem_tags + problems_fts
+# 2 = columnas title/topic/tags en problems (resúmenes sin deserializar)
+SCHEMA_VERSION = 2
+
+# Columnas de problems para cada campo de ProblemSummary
+SUMMARY_COLUMNS = {
+    'id': 'id',
+    'type': 'type',
+    'title': 'title',
+    'topic': 'topic',
+    'difficulty': 'difficulty',
+    'tags': 'tags',
+    'created_at': 'created_at',
+}
+
+# Pesos bm25 por columna de problems_fts: id, title, statement, hints, tags
+FTS_WEIGHTS = (0.0, 10.0, 1.0, 2.0, 5.0)
+
+
 class SQLiteProblemRepository(ProblemRepository):
     """
     Repositorio que guarda Problems en base de datos SQLite.
@@ -55,14 +97,80 @@ class SQLiteProblemRepository(ProblemRepository):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Pool: una conexión persistente por hilo (sqlite3 no comparte conexiones entre hilos)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        
         self._init_schema()
     
-    def _get_connection(self):
-        """Obtiene una conexión a la BD."""
-        conn = sqlite3.connect(str(self.db_path))
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Obtiene la conexión persistente del hilo actual (la crea la primera vez).
+        
+        Tras un fork() el proceso hijo abre conexiones propias: nunca reutiliza
+        las heredadas del padre.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.depth = 0
+        with self._pool_lock:
+            self._connections.append(conn)
         return conn
     
+    def _commit(self, conn: sqlite3.Connection):
+        """Confirma la escritura, salvo dentro de transaction() (confirma al salir)."""
+        if getattr(self._local, 'depth', 0) == 0:
+            conn.commit()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Agrupa varias escrituras en UNA transacción (un solo commit/fsync).
+        
+        Es reentrante: las transacciones anidadas se integran en la exterior.
+        Si hay una excepción, se deshace todo lo escrito dentro del bloque.
+        
+        Ejemplo:
+            with repo.transaction():
+                for problem in problems:
+                    repo.save(problem)
+        """
+        conn = self._get_connection()
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.commit()
+    
+    def close(self):
+        """Cierra todas las conexiones del pool (se reabren bajo demanda)."""
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Conexión creada en otro hilo: la cierra su recolector
+                pass
+        self._local = threading.local()
+    
     def _init_schema(self):
         """Crea el esquema de la BD si no existe."""
         conn = self._get_connection()
@@ -76,48 +184,193 @@ class SQLiteProblemRepository(ProblemRepository):
                 data TEXT NOT NULL,
                 difficulty INTEGER,
                 created_at TEXT,
-                updated_at TEXT
+                updated_at TEXT,
+                title TEXT,
+                topic TEXT,
+                tags TEXT
             )
         """)
         
+        # BDs anteriores a la versión 2 no tienen las columnas de proyección
+        columns = {row['name'] for row in cursor.execute("PRAGMA table_info(problems)")}
+        for column in ('title', 'topic', 'tags'):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE problems ADD COLUMN {column} TEXT")
+        
         # Índices para búsqueda rápida
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_type ON problems(type)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_type_id ON problems(type, id)")  # sample()
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_difficulty ON problems(difficulty)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON problems(created_at)")
         
+        # Tags normalizados: filtros por tag en SQL (con índice)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS problem_tags (
+                problem_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (problem_id, tag)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_tag ON problem_tags(tag)")
+        
+        # Texto completo (FTS5 puede no estar compilado en este SQLite)
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS problems_fts USING fts5(
+                    id UNINDEXED, title, statement, hints, tags,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        
+        # Migración: BDs anteriores tienen problems pero no tags/FTS
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._rebuild_search_index(conn)
+        if version < 2:
+            self._backfill_summary_columns(conn)
+        if version < SCHEMA_VERSION:
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
         conn.commit()
-        conn.close()
     
-    # ==================== CRUD ====================
+    def _rebuild_search_index(self, conn: sqlite3.Connection):
+        """Regenera problem_tags y problems_fts a partir de la tabla problems."""
+        conn.execute("DELETE FROM problem_tags")
+        if self.has_fts:
+            conn.execute("DELETE FROM problems_fts")
+        
+        cursor = conn.execute("SELECT data FROM problems")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            problems = [Problem.from_dict(json.loads(row['data'])) for row in rows]
+            self._write_search_index(conn, problems)
     
-    def save(self, problem: Problem) -> str:
-        """Guarda un Problem en la BD."""
-        if not self.validate_problem(problem):
-            raise ValueError(f"Problem inválido: {problem}")
+    def _backfill_summary_columns(self, conn: sqlite3.Connection):
+        """Rellena title/topic/tags de filas guardadas antes de la versión 2."""
+        rows = conn.execute("SELECT id, data FROM problems WHERE title IS NULL").fetchall()
+        updates = []
+        for row in rows:
+            metadata = json.loads(row['data']).get('metadata', {})
+            updates.append((
+                metadata.get('title'),
+                metadata.get('topic'),
+                json.dumps(metadata.get('tags', []), ensure_ascii=False),
+                row['id']
+            ))
+        conn.executemany("UPDATE problems SET title = ?, topic = ?, tags = ? WHERE id = ?", updates)
+    
+    def _write_search_index(self, conn: sqlite3.Connection, problems: List[Problem]):
+        """Sustituye las filas de problem_tags/problems_fts de estos Problems."""
+        ids = [(problem.id,) for problem in problems]
+        conn.executemany("DELETE FROM problem_tags WHERE problem_id = ?", ids)
+        conn.executemany(
+            "INSERT OR IGNORE INTO problem_tags (problem_id, tag) VALUES (?, ?)",
+            [(problem.id, tag) for problem in problems for tag in problem.metadata.tags]
+        )
+        
+        if self.has_fts:
+            conn.executemany("DELETE FROM problems_fts WHERE id = ?", ids)
+            conn.executemany(
+                "INSERT INTO problems_fts (id, title, statement, hints, tags) VALUES (?, ?, ?, ?, ?)",
+                [(
+                    problem.id,
+                    problem.metadata.title or "",
+                    problem.statement.text or "",
+                    " ".join(str(hint) for hint in problem.statement.hints),
+                    " ".join(problem.metadata.tags)
+                ) for problem in problems]
+            )
+    
+    def _delete_search_index(self, conn: sqlite3.Connection, problem_ids: Optional[List[str]] = None):
+        """Borra las filas de búsqueda de esos IDs (o todas si None)."""
+        if problem_ids is None:
+            conn.execute("DELETE FROM problem_tags")
+            if self.has_fts:
+                conn.execute("DELETE FROM problems_fts")
+            return
+        ids = [(problem_id,) for problem_id in problem_ids]
+        conn.executemany("DELETE FROM problem_tags WHERE problem_id = ?", ids)
+        if self.has_fts:
+            conn.executemany("DELETE FROM problems_fts WHERE id = ?", ids)
+    
+    def _write_problems(self, conn: sqlite3.Connection, problems: List[Problem]):
+        """INSERT OR REPLACE de los Problems + su índice de búsqueda."""
+        conn.executemany("""
+            INSERT OR REPLACE INTO problems
+            (id, type, data, difficulty, created_at, updated_at, title, topic, tags)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [self._problem_row(problem) for problem in problems])
+        self._write_search_index(conn, problems)
+    
+    def _where_clause(self, filters: Dict[str, Any]) -> tuple:
+        """Condiciones SQL (type, difficulty, tags) comunes a list() y count()."""
+        query = " WHERE 1=1"
+        params = []
         
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        if 'type' in filters:
+            query += " AND type = ?"
+            params.append(filters['type'])
         
-        problem_json = json.dumps(problem.to_dict(), ensure_ascii=False)
+        if 'difficulty' in filters:
+            query += " AND difficulty = ?"
+            params.append(filters['difficulty'])
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO problems
-            (id, type, data, difficulty, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        # Tags: basta con que el problema tenga alguno de los indicados
+        tags = filters.get('tags') or []
+        if tags:
+            placeholders = ", ".join("?" for _ in tags)
+            query += f" AND id IN (SELECT problem_id FROM problem_tags WHERE tag IN ({placeholders}))"
+            params.extend(tags)
+        
+        return query, params
+    
+    def _problem_row(self, problem: Problem) -> tuple:
+        """Fila (id, type, data, difficulty, created_at, updated_at, title, topic, tags) de un Problem."""
+        return (
             problem.id,
             problem.type.value,
-            problem_json,
+            json.dumps(problem.to_dict(), ensure_ascii=False),
             problem.metadata.difficulty,
             problem.metadata.created_at,
-            problem.metadata.updated_at
-        ))
+            problem.metadata.updated_at,
+            problem.metadata.title,
+            problem.metadata.topic,
+            json.dumps(problem.metadata.tags, ensure_ascii=False)
+        )
+    
+    # ==================== CRUD ====================
+    
+    def save(self, problem: Problem) -> str:
+        """Guarda un Problem en la BD."""
+        if not self.validate_problem(problem):
+            raise ValueError(f"Problem inválido: {problem}")
         
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            self._write_problems(conn, [problem])
         
         return problem.id
     
+    def save_many(self, problems: Iterable[Problem]) -> List[str]:
+        """
+        Guarda muchos Problems con un único executemany y un único commit.
+        
+        Valida todos antes de escribir: si alguno es inválido no se guarda ninguno.
+        """
+        problems = list(problems)
+        for problem in problems:
+            if not self.validate_problem(problem):
+                raise ValueError(f"Problem inválido: {problem}")
+        
+        with self.transaction() as conn:
+            self._write_problems(conn, problems)
+        
+        return [problem.id for problem in problems]
+    
     def load(self, problem_id: str) -> Problem:
         """Carga un Problem de la BD."""
         conn = self._get_connection()
@@ -125,7 +378,6 @@ class SQLiteProblemRepository(ProblemRepository):
         
         cursor.execute("SELECT data FROM problems WHERE id = ?", (problem_id,))
         row = cursor.fetchone()
-        conn.close()
         
         if not row:
             raise FileNotFoundError(f"Problem {problem_id} no encontrado")
@@ -154,37 +406,25 @@ class SQLiteProblemRepository(ProblemRepository):
     
     def delete(self, problem_id: str) -> bool:
         """Elimina un Problem de la BD."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM problems WHERE id = ?", (problem_id,))
-        affected = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            cursor = conn.execute("DELETE FROM problems WHERE id = ?", (problem_id,))
+            affected = cursor.rowcount
+            self._delete_search_index(conn, [problem_id])
         
         return affected > 0
     
     # ==================== LECTURA ====================
     
     def list(self, filters: Optional[Dict[str, Any]] = None) -> List[Problem]:
-        """Lista Problems con filtros opcionales."""
+        """Lista Problems con filtros opcionales (todos aplicados en SQL)."""
         filters = filters or {}
         
         conn = self._get_connection()
         cursor = conn.cursor()
         
         # Construir query
-        query = "SELECT data FROM problems WHERE 1=1"
-        params = []
-        
-        if 'type' in filters:
-            query += " AND type = ?"
-            params.append(filters['type'])
-        
-        if 'difficulty' in filters:
-            query += " AND difficulty = ?"
-            params.append(filters['difficulty'])
+        where, params = self._where_clause(filters)
+        query = "SELECT data FROM problems" + where
         
         # Orden
         query += " ORDER BY created_at DESC"
@@ -199,23 +439,69 @@ class SQLiteProblemRepository(ProblemRepository):
         
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        conn.close()
         
-        # Cargar Problems
+        return self._rows_to_problems(rows)
+    
+    def list_summaries(self, filters: Optional[Dict[str, Any]] = None,
+                       fields: Optional[Iterable[str]] = None) -> Iterator[ProblemSummary]:
+        """
+        Itera resúmenes leyendo solo las columnas pedidas (nunca el JSON 'data').
+        
+        Mismos filtros, orden y paginación que list(). Las filas se leen por
+        bloques, así que la memoria no crece con el tamaño del resultado.
+        """
+        filters = filters or {}
+        fields = ProblemSummary.check_fields(fields)
+        
+        where, params = self._where_clause(filters)
+        columns = ", ".join(SUMMARY_COLUMNS[name] for name in fields)
+        query = f"SELECT {columns} FROM problems" + where + " ORDER BY created_at DESC"
+        
+        limit = filters.get('limit')
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, filters.get('offset', 0)])
+        
+        cursor = self._get_connection().execute(query, params)
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for row in rows:
+                values = {name: row[SUMMARY_COLUMNS[name]] for name in fields}
+                if 'tags' in values:
+                    values['tags'] = json.loads(values['tags']) if values['tags'] else []
+                yield ProblemSummary(loader=self.load, **values)
+    
+    def iter_problems(self, filters: Optional[Dict[str, Any]] = None,
+                      chunk_size: int = 500) -> Iterator[Problem]:
+        """Itera Problems leyendo 'data' por bloques de chunk_size filas (fetchmany)."""
+        filters = filters or {}
+        
+        where, params = self._where_clause(filters)
+        query = "SELECT data FROM problems" + where + " ORDER BY created_at DESC"
+        
+        limit = filters.get('limit')
+        if limit:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, filters.get('offset', 0)])
+        
+        cursor = self._get_connection().execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from self._rows_to_problems(rows)
+    
+    def _rows_to_problems(self, rows) -> List[Problem]:
+        """Deserializa filas con columna 'data' (las corruptas se saltan)."""
         problems = []
         for row in rows:
             try:
                 problem_data = json.loads(row['data'])
-                problem = Problem.from_dict(problem_data)
-                
-                # Filtrar por tags si es necesario
-                tags_filter = filters.get('tags', [])
-                if tags_filter and not any(tag in problem.metadata.tags for tag in tags_filter):
-                    continue
-                
-                problems.append(problem)
+                problems.append(Problem.from_dict(problem_data))
             except Exception as e:
-                print(f"Error cargando problem: {e}")
+                self._report_load_error("problem", e)
                 continue
         
         return problems
@@ -227,22 +513,91 @@ class SQLiteProblemRepository(ProblemRepository):
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        query = "SELECT COUNT(*) as cnt FROM problems WHERE 1=1"
-        params = []
+        where, params = self._where_clause(filters)
+        cursor.execute("SELECT COUNT(*) as cnt FROM problems" + where, params)
+        row = cursor.fetchone()
         
-        if 'type' in filters:
-            query += " AND type = ?"
-            params.append(filters['type'])
+        return row['cnt'] if row else 0
+    
+    def _sample_ids(self, type_value: Optional[str], k: int, rng: random.Random,
+                    exclude_ids: Set[str]) -> List[str]:
+        """
+        Elige ids sorteando rowids entre el mínimo y el máximo del tipo.
         
-        if 'difficulty' in filters:
-            query += " AND difficulty = ?"
-            params.append(filters['difficulty'])
+        Cada rowid sorteado es una búsqueda O(log N) por clave primaria; si
+        no existe o es de otro tipo se sortea otro (rechazo: la elección es
+        uniforme). Solo se leen todos los ids cuando k y las exclusiones
+        cubren buena parte del tipo o los rowids del tipo están dispersos
+        (menos de la mitad del rango ocupado).
+        """
+        conn = self._get_connection()
+        where, params = (" WHERE type = ?", [type_value]) if type_value else ("", [])
+        
+        total = conn.execute("SELECT COUNT(*) FROM problems" + where, params).fetchone()[0]
+        if k <= 0 or total <= 0:
+            return []
+        
+        # Dos subconsultas: MIN y MAX juntos no usan el índice
+        low, high = conn.execute(
+            f"SELECT (SELECT MIN(rowid) FROM problems{where}), (SELECT MAX(rowid) FROM problems{where})",
+            params + params
+        ).fetchone()
+        if low is None:  # Borrados entre consultas
+            return []
+        span = high - low + 1
+        
+        if 2 * (k + len(exclude_ids)) >= total or 2 * total < span:
+            candidates = [row[0] for row in conn.execute(
+                "SELECT id FROM problems" + where + " ORDER BY id", params)
+                if row[0] not in exclude_ids]
+            return rng.sample(candidates, min(k, len(candidates)))
+        
+        lookup = "SELECT id FROM problems WHERE rowid = ?" + (" AND type = ?" if type_value else "")
+        picked = []
+        tried = set()
+        while len(picked) < k and len(tried) < span:
+            rowid = low + rng.randrange(span)
+            if rowid in tried:
+                continue
+            tried.add(rowid)
+            row = conn.execute(lookup, [rowid] + params).fetchone()
+            if row and row[0] not in exclude_ids:
+                picked.append(row[0])
+        return picked
+    
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Problem]:
+        """
+        Búsqueda de texto completo en título, enunciado, pistas y tags.
         
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        conn.close()
+        Usa FTS5 con ranking bm25 (el título pesa más que el enunciado) y
+        coincidencia por prefijo de cada palabra; ignora tildes y mayúsculas.
+        Sin FTS5 recurre a LIKE sobre el JSON (mismo resultado, sin ranking).
+        """
+        terms = re.findall(r"\w+", query, flags=re.UNICODE)
+        if not terms:
+            return []
         
-        return row['cnt'] if row else 0
+        conn = self._get_connection()
+        
+        if self.has_fts:
+            match = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+            weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+            rows = conn.execute(f"""
+                SELECT p.data AS data
+                FROM problems_fts
+                JOIN problems p ON p.id = problems_fts.id
+                WHERE problems_fts MATCH ?
+                ORDER BY bm25(problems_fts, {weights})
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset)).fetchall()
+        else:
+            where = " AND ".join("data LIKE ?" for _ in terms)
+            rows = conn.execute(
+                f"SELECT data FROM problems WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [f"%{term}%" for term in terms] + [limit, offset]
+            ).fetchall()
+        
+        return self._rows_to_problems(rows)
     
     def exists(self, problem_id: str) -> bool:
         """Verifica si un Problem existe."""
@@ -252,11 +607,23 @@ class SQLiteProblemRepository(ProblemRepository):
         cursor.execute("SELECT 1 FROM problems WHERE id = ?", (problem_id,))
         exists = cursor.fetchone() is not None
         
-        conn.close()
         return exists
     
     # ==================== LIMPIEZA ====================
     
+    def existing_ids(self, problem_ids: Iterable[str]) -> Set[str]:
+        """Ids que ya existen, con una consulta IN por bloque de 500 ids."""
+        problem_ids = list(problem_ids)
+        conn = self._get_connection()
+        
+        found = set()
+        for start in range(0, len(problem_ids), 500):
+            chunk = problem_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT id FROM problems WHERE id IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return found
+    
     def clear(self) -> int:
         """Borra TODOS los Problems."""
         conn = self._get_connection()
@@ -266,8 +633,8 @@ class SQLiteProblemRepository(ProblemRepository):
         count = cursor.fetchone()['cnt']
         
         cursor.execute("DELETE FROM problems")
-        conn.commit()
-        conn.close()
+        self._delete_search_index(conn)
+        self._commit(conn)
         
         return count
     
@@ -298,10 +665,12 @@ class SQLiteProblemRepository(ProblemRepository):
         """)
         by_difficulty = {row['difficulty']: row['cnt'] for row in cursor.fetchall()}
         
-        conn.close()
-        
-        # Tamaño
-        size_mb = self.db_path.stat().st_size / (1024 * 1024) if self.db_path.exists() else 0
+        # Tamaño (incluye el WAL pendiente de checkpoint)
+        size_bytes = 0
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            if path.exists():
+                size_bytes += path.stat().st_size
+        size_mb = size_bytes / (1024 * 1024)
         
         return {
             'backend': 'sqlite',
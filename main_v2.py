@@ -1,18 +1,79 @@
 import os
 import argparse
+import logging
+import sys
 from core.exam_builder import ExamBuilder
+from core.instrumentation import (
+    LoggingInstrumentation, MultiInstrumentation, PrometheusInstrumentation, set_instrumentation
+)
 from renderers.latex.main_renderer import LatexExamRenderer
+from renderers.latex.fragment_cache import FragmentCache
+from renderers.latex.pdf_compiler import PdfCompileService, CompileError, get_compiler
 
 def main():
     # Configuración por defecto para pruebas
     default_config = os.path.join("config", "test_exam.json")
     
+    parser = argparse.ArgumentParser(description="Generador de Exámenes V2")
+    parser.add_argument("--config", default=default_config, help="Archivo de configuración JSON")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Construcción paralela con N procesos (flujo aleatorio por ejercicio)")
+    parser.add_argument("--variants", type=int, default=None,
+                        help="Genera N variantes (modelos) del examen en una sola pasada")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Semilla maestra de las variantes (por defecto, la del config)")
+    parser.add_argument("--pdf", action="store_true",
+                        help="Compila también los PDF (examen y solución en paralelo)")
+    parser.add_argument("--pdf-workers", type=int, default=2,
+                        help="Compilaciones LaTeX simultáneas (por defecto, 2)")
+    parser.add_argument("--latex", default="pdflatex",
+                        help="Compilador LaTeX: pdflatex, lualatex o tectonic")
+    parser.add_argument("--metrics", default=None,
+                        help="Exporta contadores y latencias por etapa (formato Prometheus) a este fichero")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Solo avisos y errores del progreso interno")
+    args = parser.parse_args()
+    
+    metrics = setup_instrumentation(args)
+    try:
+        run(args)
+    finally:
+        if metrics is not None:
+            print(f"📈 Métricas: {os.path.abspath(metrics.write(args.metrics))}")
+
+def setup_instrumentation(args):
+    """
+    Progreso interno (builder, renderers, repositorios) a la consola vía
+    logging y, con --metrics, también a un PrometheusInstrumentation.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("exam_generator")
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING if args.quiet else logging.INFO)
+    logger.propagate = False
+    
+    metrics = PrometheusInstrumentation() if args.metrics else None
+    sinks = [LoggingInstrumentation(logger)] + ([metrics] if metrics else [])
+    set_instrumentation(sinks[0] if len(sinks) == 1 else MultiInstrumentation(*sinks))
+    return metrics
+
+def run(args):
     print("🚀 Iniciando Generador de Exámenes V2...")
     
+    if args.variants:
+        pdf_service = make_pdf_service(args)
+        try:
+            build_variants(args.config, args.variants, args.seed, args.workers, pdf_service)
+        finally:
+            if pdf_service:
+                pdf_service.close()
+        return
+    
     # 1. Construcción
     try:
-        builder = ExamBuilder(default_config)
-        exercises = builder.build()
+        builder = ExamBuilder(args.config)
+        exercises = builder.build(workers=args.workers)
     except Exception as e:
         print(f"❌ Error al construir el examen: {e}")
         return
@@ -23,16 +84,17 @@ def main():
 
     output_dir = os.path.join("build", "latex")
     os.makedirs(output_dir, exist_ok=True)
+    # Ejercicios ya renderizados en ejecuciones anteriores se sirven desde la caché
+    fragment_cache = FragmentCache()
 
     # 2. Renderizado EXAMEN (Enunciado)
     print("🎨 Renderizando Examen (Enunciado)...")
     try:
-        renderer_exam = LatexExamRenderer(is_solution=False)
-        latex_code = renderer_exam.render(exercises)
+        renderer_exam = LatexExamRenderer(is_solution=False, fragment_cache=fragment_cache)
         
         output_file = os.path.join(output_dir, "Examen_V2.tex")
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write(latex_code)
+            renderer_exam.render_to(f, exercises)
         print(f"✅ Examen generado: {os.path.abspath(output_file)}")
         
     except Exception as e:
@@ -43,12 +105,11 @@ def main():
     # 3. Renderizado SOLUCIÓN
     print("🎨 Renderizando Solución...")
     try:
-        renderer_sol = LatexExamRenderer(is_solution=True)
-        latex_code_sol = renderer_sol.render(exercises)
+        renderer_sol = LatexExamRenderer(is_solution=True, fragment_cache=fragment_cache)
         
         output_file_sol = os.path.join(output_dir, "Solucion_V2.tex")
         with open(output_file_sol, "w", encoding="utf-8") as f:
-            f.write(latex_code_sol)
+            renderer_sol.render_to(f, exercises)
         print(f"✅ Solución generada: {os.path.abspath(output_file_sol)}")
         
     except Exception as e:
@@ -56,5 +117,75 @@ def main():
         import traceback
         traceback.print_exc()
 
+    # 4. Compilación PDF (examen y solución a la vez)
+    if args.pdf:
+        tex_files = [os.path.join(output_dir, name) for name in ("Examen_V2.tex", "Solucion_V2.tex")]
+        tex_files = [path for path in tex_files if os.path.exists(path)]
+        print("📄 Compilando PDF...")
+        with make_pdf_service(args) as pdf_service:
+            pdf_service.prepare_format(LatexExamRenderer().write_static_preamble(output_dir))
+            wait_pdfs([pdf_service.submit(path) for path in tex_files])
+
+def make_pdf_service(args):
+    """Servicio de compilación PDF según los argumentos (None si no se pidió --pdf)."""
+    if not args.pdf:
+        return None
+    return PdfCompileService(compiler=get_compiler(args.latex), workers=args.pdf_workers)
+
+def wait_pdfs(futures):
+    """Espera a las compilaciones encoladas e informa de cada resultado."""
+    for future in futures:
+        try:
+            result = future.result()
+            print(f"✅ PDF: {os.path.abspath(result.pdf_path)}")
+        except CompileError as e:
+            print(f"❌ Error al compilar PDF: {e}")
+            print(e.log)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error al compilar PDF: {e}")
+
+def build_variants(config_file: str, n: int, seed=None, workers=None, pdf_service=None):
+    """
+    Genera N variantes del examen reutilizando builder y renderers ya cargados.
+    
+    Cada variante se escribe (examen + solución) en cuanto se construye:
+    build/latex/Examen_V2_M01.tex, build/latex/Solucion_V2_M01.tex, ...
+    
+    Con pdf_service, cada .tex se encola para compilar nada más escribirse:
+    la compilación de un modelo se solapa con la construcción del siguiente.
+    """
+    output_dir = os.path.join("build", "latex")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    builder = ExamBuilder(config_file)
+    # Problemas reutilizados entre modelos se renderizan una sola vez
+    fragment_cache = FragmentCache()
+    renderer_exam = LatexExamRenderer(is_solution=False, fragment_cache=fragment_cache)
+    renderer_sol = LatexExamRenderer(is_solution=True, fragment_cache=fragment_cache)
+    width = len(str(n))
+    pending = []
+    
+    # Un único preámbulo estático para todos los modelos (examen y solución):
+    # se genera una vez y, con --pdf, se precompila una vez como formato
+    renderer_sol.share_static_preamble(renderer_exam)
+    if pdf_service:
+        pdf_service.prepare_format(renderer_exam.write_static_preamble(output_dir))
+    
+    for variant, exercises in builder.build_variants(n, seed=seed, workers=workers):
+        suffix = f"M{variant:0{max(2, width)}d}"
+        for renderer, name in ((renderer_exam, "Examen"), (renderer_sol, "Solucion")):
+            output_file = os.path.join(output_dir, f"{name}_V2_{suffix}.tex")
+            with open(output_file, "w", encoding="utf-8") as f:
+                renderer.render_to(f, exercises, variant=variant)
+            if pdf_service:
+                pending.append(pdf_service.submit(output_file))
+        print(f"✅ Modelo {variant}/{n} generado: {suffix}")
+    
+    if pending:
+        print(f"📄 Esperando {len(pending)} PDF...")
+        wait_pdfs(pending)
+    
+    print(f"✅ {n} variantes en {os.path.abspath(output_dir)} (semilla maestra: {builder.build_seed})")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,11 +3,12 @@ Models: Clases agnósticas para persistencia.
 
 Proporciona:
 - Problem: Representación agnóstica de un ejercicio
+- ProblemSummary: Resumen ligero (proyección) con carga perezosa del Problem
 - ProblemType: Enum de tipos soportados
 - Mappers: Conversión ExerciseData ↔ Problem
 """
 
-from models.problem import Problem
+from models.problem import Problem, ProblemSummary
 from models.problem_type import ProblemType
 from models.mappers import (
     get_mapper,
@@ -21,6 +22,7 @@ from models.mappers import (
 
 __all__ = [
     'Problem',
+    'ProblemSummary',
     'ProblemType',
     'get_mapper',
     'ProblemMapper',
@@ -16,7 +16,7 @@ Ventajas:
 
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Optional
 from uuid import uuid4
 from models.problem_type import ProblemType
 
@@ -233,3 +233,102 @@ class Problem:
             f"title={self.metadata.title!r}, "
             f"difficulty={self.metadata.difficulty})"
         )
+
+
+class ProblemSummary:
+    """
+    Resumen ligero de un Problem (id, tipo, título, dificultad...).
+    
+    Lo devuelven los listados por proyección (repo.list_summaries()) leyendo
+    solo el index o las columnas SQL, sin deserializar el problema completo.
+    
+    Es además un PROXY PEREZOSO: cualquier atributo que no sea un campo del
+    resumen (statement, solution, metadata...) carga el Problem completo la
+    primera vez (con el loader del repositorio) y lo delega en él.
+    
+    Ejemplo:
+        for summary in repo.list_summaries({"type": "numeracion"}):
+            print(summary.id, summary.title)      # sin cargar el problema
+            print(summary.statement.text)         # carga el problema aquí
+    """
+    
+    # Campos que puede proyectar un repositorio
+    FIELDS = ('id', 'type', 'title', 'topic', 'difficulty', 'tags', 'created_at')
+    
+    __slots__ = FIELDS + ('_loader', '_problem')
+    
+    def __init__(self, id: str, loader: Optional[Callable[[str], Problem]] = None, **fields):
+        self.id = id
+        self._loader = loader
+        self._problem = None
+        for name, value in fields.items():
+            if name not in self.FIELDS:
+                raise ValueError(f"Campo de resumen desconocido: {name}. Válidos: {self.FIELDS}")
+            if name == 'type' and isinstance(value, str):
+                value = ProblemType(value)
+            setattr(self, name, value)
+    
+    @classmethod
+    def check_fields(cls, fields: Optional[Iterable[str]]) -> tuple:
+        """Normaliza el parámetro `fields` de list_summaries() (None = todos)."""
+        if fields is None:
+            return cls.FIELDS
+        fields = tuple(fields)
+        unknown = set(fields) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Campos de resumen desconocidos: {unknown}. Válidos: {cls.FIELDS}")
+        return fields if 'id' in fields else ('id',) + fields
+    
+    @classmethod
+    def from_problem(cls, problem: Problem) -> "ProblemSummary":
+        """Resumen de un Problem ya cargado (no necesita loader)."""
+        summary = cls(
+            problem.id,
+            type=problem.type,
+            title=problem.metadata.title,
+            topic=problem.metadata.topic,
+            difficulty=problem.metadata.difficulty,
+            tags=problem.metadata.tags,
+            created_at=problem.metadata.created_at,
+        )
+        summary._problem = problem
+        return summary
+    
+    @property
+    def problem(self) -> Problem:
+        """El Problem completo (se carga una sola vez, bajo demanda)."""
+        if self._problem is None:
+            if self._loader is None:
+                raise RuntimeError(f"ProblemSummary {self.id} no tiene loader para cargar el problema")
+            self._problem = self._loader(self.id)
+        return self._problem
+    
+    @property
+    def is_loaded(self) -> bool:
+        """True si el Problem completo ya se ha cargado."""
+        return self._problem is not None
+    
+    def __getattr__(self, name: str):
+        # Solo se llama si `name` no está asignado: campo no proyectado o atributo del Problem
+        if name.startswith('_'):
+            raise AttributeError(name)
+        problem = self.problem
+        if name in ProblemSummary.FIELDS:
+            value = {
+                'type': problem.type,
+                'title': problem.metadata.title,
+                'topic': problem.metadata.topic,
+                'difficulty': problem.metadata.difficulty,
+                'tags': problem.metadata.tags,
+                'created_at': problem.metadata.created_at,
+            }[name]
+            setattr(self, name, value)
+            return value
+        return getattr(problem, name)
+    
+    def __repr__(self) -> str:
+        try:
+            title = object.__getattribute__(self, 'title')  # sin cargar el problema
+        except AttributeError:
+            title = '?'
+        return f"ProblemSummary(id={self.id[:8]}..., title={title!r})"
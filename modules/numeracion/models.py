@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Set
-from core.generator_base import ProblemSolutionExerciseData, ExerciseData
+from core.generator_base import ProblemSolutionExerciseData, ExerciseData, exercise_dataclass
 
 # Mapeo de índices a tipos de representación
 COLUMN_NAMES = {
@@ -10,7 +10,7 @@ COLUMN_NAMES = {
     3: "BCD"
 }
 
-@dataclass
+@exercise_dataclass(slots=True)
 class ConversionRow(ProblemSolutionExerciseData):
     """
     IMPLEMENTACIÓN DE LA INTERFAZ: Separación Problema ↔ Solución.
@@ -55,7 +55,8 @@ class ConversionRow(ProblemSolutionExerciseData):
     
     def __post_init__(self):
         """Valida separación + validaciones específicas de numeración."""
-        super().__post_init__()
+        # Base explícita: con slots=True la clase se recrea (ver exercise_dataclass)
+        ProblemSolutionExerciseData.__post_init__(self)
         
         if not 0 <= self.target_col_idx < 4:
             raise ValueError(f"target_col_idx debe estar entre 0-3, recibió {self.target_col_idx}")
@@ -71,7 +72,7 @@ class ConversionRow(ProblemSolutionExerciseData):
         """Devuelve el nombre del sistema de representación target."""
         return COLUMN_NAMES.get(self.target_col_idx, "Desconocido")
 
-@dataclass
+@exercise_dataclass(slots=True)
 class ArithmeticOp(ProblemSolutionExerciseData):
     """
     IMPLEMENTACIÓN DE LA INTERFAZ: Separación Problema ↔ Solución.
@@ -1,3 +1,5 @@
+import io
+from typing import TextIO
 from modules.combinacional.models import KarnaughExerciseData, LogicProblemExerciseData, MSIExerciseData
 from renderers.latex.utils.truth_table import TruthTableRenderer
 from renderers.latex.utils.karnaugh import KarnaughMapRenderer
@@ -5,6 +7,7 @@ from renderers.latex.utils.circuit import DigitalCircuitRenderer
 from renderers.latex.utils.asset_manager import LatexAssetManager
 
 class CombinacionalLatexRenderer:
+
     def __init__(self, is_solution: bool = False):
         self.is_solution = is_solution
         self.tt_renderer = TruthTableRenderer()
@@ -13,76 +16,82 @@ class CombinacionalLatexRenderer:
         self.asset_manager = LatexAssetManager()
 
     def render(self, data: object, index: int) -> str:
+        out = io.StringIO()
+        self.render_to(out, data, index)
+        return out.getvalue()
+
+    def render_to(self, out: TextIO, data: object, index: int):
+        """Escribe el ejercicio en `out` fragmento a fragmento (sin acumular)."""
+        if not isinstance(data, (KarnaughExerciseData, LogicProblemExerciseData, MSIExerciseData)):
+            return
+
         # Marcador de inicio de ejercicio
-        latex = "\n" + "%" * 60 + "\n"
-        latex += f"% >>>>>> INICIO EJERCICIO {index}: {data.title} <<<<<<\n"
-        latex += "%" * 60 + "\n"
+        out.write("\n" + "%" * 60 + "\n")
+        out.write(f"% >>>>>> INICIO EJERCICIO {index}: {data.title} <<<<<<\n")
+        out.write("%" * 60 + "\n")
 
         if isinstance(data, KarnaughExerciseData):
-            return latex + self._render_karnaugh(data, index)
+            self._render_karnaugh(out, data, index)
         elif isinstance(data, LogicProblemExerciseData):
-            return latex + self._render_problem(data, index)
-        elif isinstance(data, MSIExerciseData):
-            return latex + self._render_msi(data, index)
-        return ""
-
-    def _render_karnaugh(self, data: KarnaughExerciseData, index: int) -> str:
-        latex = fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n"
-        latex += r"\begin{tcolorbox}[title=Enunciado]" + "\n"
-        latex += fr"\noindent {data.description}" + "\n"
-
-        latex += self.tt_renderer.render(data.vars_name, data.out_name, data.truth_table_outputs)
-
-        latex += r"\noindent Se pide:" + "\n"
-        latex += r"\begin{enumerate}[label=\alph*)]" + "\n"
-        latex += fr"\item Obtener la expresión canónica ({data.canon_type})." + "\n"
-        latex += r"\item Simplificar por Karnaugh." + "\n"
-        latex += fr"\item Implementar con puertas \textbf{{{data.gate_type}}}." + "\n"
-        latex += r"\end{enumerate} \end{tcolorbox}" + "\n"
-
-        latex += r"\textbf{Espacio de Resolución:}" + "\n"
+            self._render_problem(out, data, index)
+        else:
+            self._render_msi(out, data, index)
+
+    def _render_karnaugh(self, out: TextIO, data: KarnaughExerciseData, index: int):
+        out.write(fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n")
+        out.write(r"\begin{tcolorbox}[title=Enunciado]" + "\n")
+        out.write(fr"\noindent {data.description}" + "\n")
+
+        out.write(self.tt_renderer.render(data.vars_name, data.out_name, data.truth_table_outputs))
+
+        out.write(r"\noindent Se pide:" + "\n")
+        out.write(r"\begin{enumerate}[label=\alph*)]" + "\n")
+        out.write(fr"\item Obtener la expresión canónica ({data.canon_type})." + "\n")
+        out.write(r"\item Simplificar por Karnaugh." + "\n")
+        out.write(fr"\item Implementar con puertas \textbf{{{data.gate_type}}}." + "\n")
+        out.write(r"\end{enumerate} \end{tcolorbox}" + "\n")
+
+        out.write(r"\textbf{Espacio de Resolución:}" + "\n")
         
         # Usar Asset Manager para el Mapa de Karnaugh
         vars_left = "".join(data.vars_name[:2])
         vars_top = "".join(data.vars_name[2:])
         
         generator_func = lambda: self.kmap_renderer.render_template(vars_left, vars_top, data.out_name)
-        latex += self.asset_manager.get_component(f"ej{index}_kmap", generator_func)
+        out.write(self.asset_manager.get_component(f"ej{index}_kmap", generator_func))
         
-        latex += r"\vspace{3cm}" + "\n"
-        return latex
-
-    def _render_problem(self, data: LogicProblemExerciseData, index: int) -> str:
-        latex = fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n"
-        latex += r"\begin{tcolorbox}[title=Enunciado]" + "\n"
-        latex += fr"\textbf{{Contexto: {data.context_title}}}" + "\n"
-        latex += r"\begin{itemize}" + "\n"
-        for v in data.variables_desc: latex += fr"\item {v}" + "\n"
-        latex += fr"\item Salida: {data.output_desc}" + "\n"
-        latex += r"\end{itemize}" + "\n"
-        latex += fr"\textit{{Lógica: {data.logic_description}}}" + "\n"
-        latex += r"\end{tcolorbox}" + "\n"
-
-        latex += r"\textbf{1. Tabla de Verdad:}" + "\n"
-        latex += self.tt_renderer.render(data.vars_clean, data.out_clean, None)
+        out.write(r"\vspace{3cm}" + "\n")
+
+    def _render_problem(self, out: TextIO, data: LogicProblemExerciseData, index: int):
+        out.write(fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n")
+        out.write(r"\begin{tcolorbox}[title=Enunciado]" + "\n")
+        out.write(fr"\textbf{{Contexto: {data.context_title}}}" + "\n")
+        out.write(r"\begin{itemize}" + "\n")
+        for v in data.variables_desc: out.write(fr"\item {v}" + "\n")
+        out.write(fr"\item Salida: {data.output_desc}" + "\n")
+        out.write(r"\end{itemize}" + "\n")
+        out.write(fr"\textit{{Lógica: {data.logic_description}}}" + "\n")
+        out.write(r"\end{tcolorbox}" + "\n")
+
+        out.write(r"\textbf{1. Tabla de Verdad:}" + "\n")
+        out.write(self.tt_renderer.render(data.vars_clean, data.out_clean, None))
         
-        latex += r"\newpage \textbf{2. Mapa de Karnaugh:}" + "\n"
+        out.write(r"\newpage \textbf{2. Mapa de Karnaugh:}" + "\n")
         
         l_izq = "".join(data.vars_clean[:2])
         l_sup = "".join(data.vars_clean[2:])
         
         generator_func = lambda: self.kmap_renderer.render_template(l_izq, l_sup, data.out_clean)
-        latex += self.asset_manager.get_component(f"ej{index}_problem_kmap", generator_func)
+        out.write(self.asset_manager.get_component(f"ej{index}_problem_kmap", generator_func))
         
-        latex += r"\vspace{1cm}" + "\n"
-        latex += r"\noindent \textbf{3. Esquema Lógico:}" + "\n"
-        latex += r"\vspace{4cm}" + "\n"
-        return latex
-
-    def _render_msi(self, data: MSIExerciseData, index: int) -> str:
-        latex = fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n"
-        latex += r"\begin{tcolorbox}[title=Enunciado]" + "\n"
-        latex += fr"{data.description}" + "\n"
+        out.write(r"\vspace{1cm}" + "\n")
+        out.write(r"\noindent \textbf{3. Esquema Lógico:}" + "\n")
+        out.write(r"\vspace{4cm}" + "\n")
+
+    def _render_msi(self, out: TextIO, data: MSIExerciseData, index: int):
+        out.write(fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n")
+        out.write(r"\begin{tcolorbox}[title=Enunciado]" + "\n")
+        out.write(fr"{data.description}" + "\n")
         
         component_id = f"ej{index}_msi_{data.block_type.lower()}"
         
@@ -95,21 +104,20 @@ class CombinacionalLatexRenderer:
         else:
             gen_func = lambda: "% Tipo desconocido"
 
-        latex += self.asset_manager.get_component(component_id, gen_func)
+        out.write(self.asset_manager.get_component(component_id, gen_func))
 
         if data.block_type == 'MUX':
-            latex += fr"Entradas I0-I15: {data.params['inputs']} \\ Determine Y para:" + "\n"
-            latex += r"\begin{enumerate}" + "\n"
+            out.write(fr"Entradas I0-I15: {data.params['inputs']} \\ Determine Y para:" + "\n")
+            out.write(r"\begin{enumerate}" + "\n")
             for case in data.params['cases']:
-                latex += fr"\item Enable={case['ena']}, Dir={case['addr']:04b}" + "\n"
-            latex += r"\end{enumerate}" + "\n"
+                out.write(fr"\item Enable={case['ena']}, Dir={case['addr']:04b}" + "\n")
+            out.write(r"\end{enumerate}" + "\n")
         elif data.block_type == 'COMPARADOR':
-            latex += fr"\noindent Determine las salidas ($>, =, <$) para las entradas: \\" + "\n"
-            latex += fr"\textbf{{A}} = {data.params['A']} ({data.params['A']:04b}), \textbf{{B}} = {data.params['B']} ({data.params['B']:04b})" + "\n"
+            out.write(fr"\noindent Determine las salidas ($>, =, <$) para las entradas: \\" + "\n")
+            out.write(fr"\textbf{{A}} = {data.params['A']} ({data.params['A']:04b}), \textbf{{B}} = {data.params['B']} ({data.params['B']:04b})" + "\n")
         elif data.block_type == 'SUMADOR':
-            latex += fr"\noindent Determine la salida S y el acarreo de salida Cout para: \\" + "\n"
-            latex += fr"\textbf{{A}} = {data.params['A']} ({data.params['A']:04b}), \textbf{{B}} = {data.params['B']} ({data.params['B']:04b}) \\" + "\n"
-            latex += r"(Analice para \textbf{Cin=0} y \textbf{Cin=1})" + "\n"
+            out.write(fr"\noindent Determine la salida S y el acarreo de salida Cout para: \\" + "\n")
+            out.write(fr"\textbf{{A}} = {data.params['A']} ({data.params['A']:04b}), \textbf{{B}} = {data.params['B']} ({data.params['B']:04b}) \\" + "\n")
+            out.write(r"(Analice para \textbf{Cin=0} y \textbf{Cin=1})" + "\n")
 
-        latex += r"\end{tcolorbox} \vspace{5cm}" + "\n"
-        return latex
+        out.write(r"\end{tcolorbox} \vspace{5cm}" + "\n")
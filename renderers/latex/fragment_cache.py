@@ -0,0 +1,259 @@
+"""
+Caché de fragmentos LaTeX renderizados, direccionada por contenido.
+
+Renderizar el mismo ejercicio dos veces (un problema reutilizado del
+repositorio en varias variantes, o regenerar un examen sin cambios) repite
+todo el formateo. La caché guarda el LaTeX de cada ejercicio bajo el hash de:
+
+    contenido del ejercicio (dataclasses.asdict) + tipo
+    + posición en el examen (el texto dice "Ejercicio N" y los componentes se llaman ejN_*)
+    + examen/solución + renderer (hash del código fuente de su clase y sus bases)
+    + sal opcional (recursos fijos y configuración, ver LatexExamRenderer)
+
+Así, editar el código de un renderer invalida sus fragmentos sin tocar nada más.
+
+Dos niveles:
+- Memoria: LRU de `memory_entries` fragmentos (acierto = sin tocar disco)
+- Disco: <cache_dir>/<hash[:2]>/<hash>.json, acotado a `max_bytes`; al
+  superarlo se borran los fragmentos usados hace más tiempo
+
+Cada entrada guarda también los componentes TikZ que escribió el renderer
+(LatexAssetManager), para reponerlos al servir el fragmento desde la caché.
+
+Uso:
+    cache = FragmentCache("build/fragment_cache")
+    key = cache.make_key(exercise, index, is_solution, renderer)
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache.put(key, text, components)
+"""
+
+import dataclasses
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.instrumentation import get_instrumentation
+
+
+@dataclass
+class CachedFragment:
+    """Fragmento LaTeX de un ejercicio + componentes que lo acompañan."""
+    text: str
+    components: List[Tuple[str, str]] = field(default_factory=list)  # (fichero, contenido)
+
+    def size(self) -> int:
+        return len(self.text) + sum(len(content) for _, content in self.components)
+
+
+_signatures: Dict[type, str] = {}
+
+
+def renderer_signature(renderer_cls: type) -> str:
+    """
+    Identificador de un renderer: nombre + sha256 del código fuente de los
+    módulos de su clase y sus bases (cambia con cualquier edición).
+    """
+    signature = _signatures.get(renderer_cls)
+    if signature is None:
+        digest = hashlib.sha256()
+        for cls in renderer_cls.__mro__:
+            try:
+                path = inspect.getsourcefile(cls)
+            except TypeError:  # builtins (object)
+                continue
+            if path is None:
+                continue
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        signature = f"{renderer_cls.__qualname__}:{digest.hexdigest()}"
+        _signatures[renderer_cls] = signature
+    return signature
+
+
+class FragmentCache:
+    """Caché LRU (memoria + disco acotado) de fragmentos renderizados."""
+
+    def __init__(self, cache_dir: Union[str, Path, None] = os.path.join("build", "fragment_cache"),
+                 max_bytes: int = 64 * 1024 * 1024, memory_entries: int = 1024):
+        """
+        Args:
+            cache_dir: Carpeta del almacén en disco (None: solo memoria)
+            max_bytes: Tamaño máximo del almacén en disco
+            memory_entries: Fragmentos que se mantienen en memoria
+        """
+        if memory_entries < 1:
+            raise ValueError(f"memory_entries debe ser >= 1, recibió {memory_entries}")
+
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+
+        self._memory: "OrderedDict[str, CachedFragment]" = OrderedDict()
+        self._disk: Optional["OrderedDict[str, int]"] = None  # hash -> bytes (LRU, cargado bajo demanda)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- Claves ----------
+
+    @staticmethod
+    def make_key(data: Any, index: int, is_solution: bool, renderer: Any, salt: str = "") -> Optional[str]:
+        """
+        Clave del fragmento, o None si el ejercicio no es cacheable
+        (no es un dataclass o su contenido no es serializable).
+        """
+        if not dataclasses.is_dataclass(data) or isinstance(data, type):
+            return None
+        try:
+            content = json.dumps(dataclasses.asdict(data), sort_keys=True,
+                                 ensure_ascii=False, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return None
+
+        renderer_id = renderer_signature(type(renderer))
+        header = f"{type(data).__qualname__}\n{index}\n{int(is_solution)}\n{renderer_id}\n{salt}\n"
+        return hashlib.sha256((header + content).encode('utf-8')).hexdigest()
+
+    # ---------- Lectura / escritura ----------
+
+    def get(self, key: str) -> Optional[CachedFragment]:
+        """Fragmento cacheado (memoria y, si no está, disco) o None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            entry = self._read_disk(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, text: str, components: Optional[List[Tuple[str, str]]] = None) -> CachedFragment:
+        """Guarda un fragmento en memoria y en disco (con desalojo por tamaño)."""
+        entry = CachedFragment(text, list(components or []))
+        with self._lock:
+            self._remember(key, entry)
+            self._write_disk(key, entry)
+        return entry
+
+    def clear(self):
+        """Vacía la memoria y el almacén en disco."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index()):
+                self._remove_disk(key)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk) if self._disk is not None else None,
+                'disk_bytes': self._disk_bytes if self._disk is not None else None,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    # ---------- Internos ----------
+
+    def _remember(self, key: str, entry: CachedFragment):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _disk_index(self) -> "OrderedDict[str, int]":
+        """Índice del almacén (una sola lectura del directorio, ordenado por uso)."""
+        if self._disk is None:
+            self._disk = OrderedDict()
+            self._disk_bytes = 0
+            if self.cache_dir is not None and self.cache_dir.exists():
+                found = []
+                for path in self.cache_dir.glob("*/*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    found.append((stat.st_mtime, path.stem, stat.st_size))
+                for _, key, size in sorted(found):
+                    self._disk[key] = size
+                    self._disk_bytes += size
+        return self._disk
+
+    def _read_disk(self, key: str) -> Optional[CachedFragment]:
+        if self.cache_dir is None or key not in self._disk_index():
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            entry = CachedFragment(raw['text'], [tuple(c) for c in raw.get('components', [])])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            get_instrumentation().event(
+                "fragment_cache.error", f"   [WARN] Fragmento de caché ilegible ({path.name}): {e}", logging.WARNING)
+            self._remove_disk(key)
+            return None
+
+        os.utime(path)  # Marca de uso para el desalojo entre ejecuciones
+        self._disk.move_to_end(key)
+        return entry
+
+    def _write_disk(self, key: str, entry: CachedFragment):
+        if self.cache_dir is None:
+            return
+        index = self._disk_index()
+        payload = json.dumps({'text': entry.text, 'components': entry.components},
+                             ensure_ascii=False).encode('utf-8')
+        if len(payload) > self.max_bytes:
+            return  # Nunca cabría: solo en memoria
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            get_instrumentation().event(
+                "fragment_cache.error", f"   [WARN] No se pudo guardar el fragmento en caché: {e}", logging.WARNING)
+            return
+
+        self._disk_bytes += len(payload) - index.pop(key, 0)
+        index[key] = len(payload)
+        while self._disk_bytes > self.max_bytes and len(index) > 1:
+            oldest = next(iter(index))
+            self._remove_disk(oldest)
+            self.evictions += 1
+
+    def _remove_disk(self, key: str):
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
@@ -1,6 +1,7 @@
+import io
 import json
 import os
-from typing import List
+from typing import Iterable, Optional, TextIO
 from core.generator_base import ExerciseData
 from modules.numeracion.models import ConversionExerciseData
 from modules.combinacional.models import KarnaughExerciseData, LogicProblemExerciseData, MSIExerciseData
@@ -8,16 +9,27 @@ from modules.secuencial.models import SequentialExerciseData
 from renderers.latex.numeracion_renderer import NumeracionLatexRenderer
 from renderers.latex.combinacional_renderer import CombinacionalLatexRenderer
 from renderers.latex.secuencial_renderer import SecuencialLatexRenderer
+from renderers.latex.pdf_compiler import FORMAT_DUMP_MARKER
+from renderers.latex.fragment_cache import FragmentCache
 
 class LatexExamRenderer:
-    def __init__(self, is_solution: bool = False):
+    def __init__(self, is_solution: bool = False, fragment_cache: Optional[FragmentCache] = None):
+        """
+        Args:
+            is_solution: Renderizar la versión con soluciones
+            fragment_cache: Caché de ejercicios ya renderizados (compartible
+                            entre examen, solución y variantes)
+        """
         self.is_solution = is_solution
+        self.fragment_cache = fragment_cache
+        self._fragment_salt: Optional[str] = None
         self.numeracion_renderer = NumeracionLatexRenderer(is_solution)
         self.combinacional_renderer = CombinacionalLatexRenderer(is_solution)
         self.secuencial_renderer = SecuencialLatexRenderer(is_solution)
         
         self.header_config = self._load_json(os.path.join("config", "header.json"))
         self.scoring_config = self._load_json(os.path.join("config", "scoring.json"))
+        self._static_preamble: Optional[str] = None
 
     def _load_json(self, filename: str) -> dict:
         if os.path.exists(filename):
@@ -25,36 +37,134 @@ class LatexExamRenderer:
                 return json.load(f)
         return {}
 
-    def render(self, exercises: List[ExerciseData]) -> str:
-        latex = self._get_preamble()
+    def render(self, exercises: Iterable[ExerciseData], variant: Optional[int] = None) -> str:
+        """
+        Renderiza el examen completo.
+        
+        Args:
+            exercises: Ejercicios a renderizar (en orden)
+            variant: Número de variante/modelo (build_variants). Si se indica,
+                     aparece en el título para identificar cada versión.
+        """
+        out = io.StringIO()
+        self.render_to(out, exercises, variant)
+        return out.getvalue()
+
+    def render_to(self, out: TextIO, exercises: Iterable[ExerciseData], variant: Optional[int] = None):
+        """
+        Escribe el examen completo en `out` (fichero, pipe, respuesta HTTP...).
+
+        Cada ejercicio se escribe en cuanto se renderiza y no se acumula el
+        documento: con un generador de ejercicios la memoria no crece con el
+        tamaño del examen.
+
+        Args:
+            out: Destino de texto (cualquier objeto con write(str))
+            exercises: Ejercicios a renderizar (en orden; puede ser un generador)
+            variant: Número de variante/modelo (ver render)
+        """
+        out.write(self.get_static_preamble())
+        out.write(self._get_document_header(variant))
         
         for i, ex_data in enumerate(exercises, 1):
             if isinstance(ex_data, ConversionExerciseData):
-                latex += self.numeracion_renderer.render(ex_data, i)
+                self._render_exercise(out, self.numeracion_renderer, ex_data, i)
             elif isinstance(ex_data, (KarnaughExerciseData, LogicProblemExerciseData, MSIExerciseData)):
-                latex += self.combinacional_renderer.render(ex_data, i)
+                self._render_exercise(out, self.combinacional_renderer, ex_data, i)
             elif isinstance(ex_data, SequentialExerciseData):
-                latex += self.secuencial_renderer.render(ex_data, i)
+                self._render_exercise(out, self.secuencial_renderer, ex_data, i)
             else:
-                latex += f"\\section*{{Ejercicio {i}: Tipo desconocido}}\n"
-                latex += f"No hay renderizador para {type(ex_data).__name__}\n"
+                out.write(f"\\section*{{Ejercicio {i}: Tipo desconocido}}\n")
+                out.write(f"No hay renderizador para {type(ex_data).__name__}\n")
         
-        latex += self._get_footer()
-        return latex
+        out.write(self._get_footer())
+
+    def _render_exercise(self, out: TextIO, renderer, ex_data: ExerciseData, index: int):
+        """Escribe un ejercicio, desde la caché de fragmentos si ya se renderizó."""
+        key = None
+        if self.fragment_cache is not None:
+            key = self.fragment_cache.make_key(ex_data, index, self.is_solution, renderer,
+                                               salt=self._get_fragment_salt())
+        if key is None:
+            renderer.render_to(out, ex_data, index)
+            return
+
+        asset_manager = getattr(renderer, "asset_manager", None)
+        entry = self.fragment_cache.get(key)
+        if entry is not None:
+            # Reponer los componentes TikZ (no escribe si ya están al día)
+            for filename, content in entry.components:
+                asset_manager.write_component(filename, content)
+            out.write(entry.text)
+            return
+
+        fragment = io.StringIO()
+        if asset_manager is not None:
+            with asset_manager.capture() as components:
+                renderer.render_to(fragment, ex_data, index)
+        else:
+            components = []
+            renderer.render_to(fragment, ex_data, index)
+        self.fragment_cache.put(key, fragment.getvalue(), components)
+        out.write(fragment.getvalue())
+
+    def _get_fragment_salt(self) -> str:
+        """
+        Parte de la clave común a todos los fragmentos: los recursos fijos
+        disponibles y la configuración que leen los renderers (header/scoring).
+        """
+        if self._fragment_salt is None:
+            config = json.dumps([self.header_config, self.scoring_config], sort_keys=True, ensure_ascii=False)
+            self._fragment_salt = (self.combinacional_renderer.asset_manager.fixed_resources_signature()
+                                   + "\n" + config)
+        return self._fragment_salt
+
+    def _get_preamble(self, variant: Optional[int] = None) -> str:
+        """Preámbulo estático (compartido) + cabecera propia del documento."""
+        return self.get_static_preamble() + self._get_document_header(variant)
 
-    def _get_preamble(self) -> str:
+    def get_static_preamble(self) -> str:
+        """
+        Parte del preámbulo que solo depende de la configuración (header.json):
+        paquetes, estilos y cabecera de página. Es idéntica en examen,
+        solución y todas las variantes, así que se genera una sola vez.
+
+        Termina en FORMAT_DUMP_MARKER: todo lo anterior se puede volcar a un
+        formato precompilado (PdfCompileService) y compartir entre documentos.
+        """
+        if self._static_preamble is None:
+            self._static_preamble = self._build_static_preamble()
+        return self._static_preamble
+
+    def share_static_preamble(self, other: "LatexExamRenderer"):
+        """Reutiliza el preámbulo estático de otro renderer con la misma configuración."""
+        if other.header_config == self.header_config:
+            self._static_preamble = other.get_static_preamble()
+
+    def write_static_preamble(self, output_dir: str, filename: str = "Preambulo_V2.tex") -> str:
+        """
+        Escribe el preámbulo compartido como documento volcable a formato
+        (mylatexformat). Solo reescribe el fichero si su contenido cambia.
+
+        Returns:
+            Ruta del fichero
+        """
+        path = os.path.join(output_dir, filename)
+        content = self.get_static_preamble() + "\n\\begin{document}\n\\end{document}\n"
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == content:
+                    return path
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def _build_static_preamble(self) -> str:
         h = self.header_config
         logo = h.get("logo_path", "")
-        full_exam_title = h.get('exam_title', '')
-        if h.get('exam_type'): full_exam_title += fr" - {h.get('exam_type')}"
-        
-        if self.is_solution:
-            full_exam_title += r" \textcolor{red}{(SOLUCIÓN)}"
-            
         right_header = fr"\textbf{{{h.get('subject', '')}}}"
         if h.get('semester'): right_header += fr" \\ {h.get('semester')}"
         if h.get('term'): right_header += fr" \\ {h.get('term')}"
-        date_str = h.get('date', '')
 
         # Lógica para mostrar profesores
         show_prof = h.get("show_professors", False)
@@ -99,10 +209,25 @@ class LatexExamRenderer:
 \lhead{{\includegraphics[height=1.5cm]{{{logo}}}}}
 \chead{{\textbf{{{h.get('university', '')}}} \\ {h.get('department', '')}}}
 \rhead{{{right_header}}}
-
-\lfoot{{\small {full_exam_title}}}
 \cfoot{{{cfoot_content}}}
 \rfoot{{\small Página \thepage\ de \pageref{{LastPage}}}}
+{FORMAT_DUMP_MARKER}
+"""
+
+    def _get_document_header(self, variant: Optional[int] = None) -> str:
+        """Campos propios de cada documento: título (variante, solución) y fecha."""
+        h = self.header_config
+        full_exam_title = h.get('exam_title', '')
+        if h.get('exam_type'): full_exam_title += fr" - {h.get('exam_type')}"
+        if variant is not None: full_exam_title += fr" - Modelo {variant}"
+        
+        if self.is_solution:
+            full_exam_title += r" \textcolor{red}{(SOLUCIÓN)}"
+            
+        date_str = h.get('date', '')
+
+        return fr"""
+\lfoot{{\small {full_exam_title}}}
 
 \begin{{document}}
 
@@ -14,6 +14,10 @@ from renderers.latex.renderer_base import ExerciseRendererPhase, PhaseOutput
 class NumeracionPhase1Structure(ExerciseRendererPhase):
     """Fase 1: Estructura y marcos de la tabla."""
     
+    # Independiente de las otras fases: solo lee problema/solución
+    requires = ()
+    provides = 'phase1_state'
+    
     def render(self, exercise_json: Dict[str, Any], is_solution: bool = False) -> PhaseOutput:
         """
         Renderiza SOLO la estructura/marcos de la tabla de conversión.
@@ -42,14 +46,11 @@ Etiqueta & Decimal & Binario & C2 & SM & BCD \\\\
         latex += "\\end{tabular}\n"
         
         # JSON intermedio: pasar todo para la siguiente fase
-        output_json = {
-            **exercise_json,
-            'phase1_state': {
-                'table_structure_defined': True,
-                'rows': 4,
-                'columns': 6
-            }
-        }
+        output_json = self._with_state(exercise_json, 'phase1_state', {
+            'table_structure_defined': True,
+            'rows': 4,
+            'columns': 6
+        })
         
         return PhaseOutput(
             latex_content=latex,
@@ -57,11 +58,19 @@ Etiqueta & Decimal & Binario & C2 & SM & BCD \\\\
             phase_name="estructura",
             tex_filename="01_numeracion_estructura.tex"
         )
+    
+    @property
+    def phase_name(self) -> str:
+        return "estructura"
 
 
 class NumeracionPhase2Details(ExerciseRendererPhase):
     """Fase 2: Detalles visuales (bordes, colores, alineación)."""
     
+    # Independiente de las otras fases: solo lee problema/solución
+    requires = ()
+    provides = 'phase2_state'
+    
     def render(self, exercise_json: Dict[str, Any], is_solution: bool = False) -> PhaseOutput:
         """
         Renderiza DETALLES VISUALES: colores, alineación, estilos.
@@ -103,13 +112,10 @@ class NumeracionPhase2Details(ExerciseRendererPhase):
         latex += "% Nota: Colores definidos, estructura lista para contenido\n"
         
         # JSON intermedio
-        output_json = {
-            **exercise_json,
-            'phase2_state': {
-                'colors_defined': True,
-                'styling_applied': True
-            }
-        }
+        output_json = self._with_state(exercise_json, 'phase2_state', {
+            'colors_defined': True,
+            'styling_applied': True
+        })
         
         return PhaseOutput(
             latex_content=latex,
@@ -117,11 +123,19 @@ class NumeracionPhase2Details(ExerciseRendererPhase):
             phase_name="detalles",
             tex_filename="02_numeracion_detalles.tex"
         )
+    
+    @property
+    def phase_name(self) -> str:
+        return "detalles"
 
 
 class NumeracionPhase3Text(ExerciseRendererPhase):
     """Fase 3 (ÚLTIMA): Texto, enunciados, soluciones."""
     
+    # Independiente de las otras fases: solo lee problema/solución
+    requires = ()
+    provides = None
+    
     def render(self, exercise_json: Dict[str, Any], is_solution: bool = False) -> PhaseOutput:
         """
         Renderiza CONTENIDO FINAL: valores, soluciones, explicaciones.
@@ -185,3 +199,7 @@ Completa la tabla anterior con los valores correspondientes.
             phase_name="texto",
             tex_filename="03_numeracion_texto.tex"
         )
+    
+    @property
+    def phase_name(self) -> str:
+        return "texto"
@@ -0,0 +1,405 @@
+"""
+Compilación de exámenes a PDF: pool de workers LaTeX + caché por contenido.
+
+Última etapa del pipeline (después de LatexExamRenderer):
+
+    Examen_V2.tex ─┐                      ┌─→ Examen_V2.pdf
+                   ├─→ PdfCompileService ─┤
+    Solucion_V2.tex┘   (N workers)        └─→ Solucion_V2.pdf
+
+- Pool acotado: como mucho `workers` compilaciones a la vez; examen y
+  solución (y todas las variantes) se compilan en paralelo.
+- Caché: la clave es el hash del .tex, de los ficheros que incluye
+  (\\input/\\include/\\includegraphics: componentes TikZ, recursos fijos,
+  logo) y del compilador. Si ya existe un PDF para ese contenido, se copia
+  sin llamar a LaTeX.
+- Formato precompilado: si el documento marca el final de su preámbulo
+  estático con FORMAT_DUMP_MARKER, la carga de paquetes se vuelca UNA vez
+  a un .fmt (estilo mylatexformat) y todos los documentos con el mismo
+  preámbulo arrancan desde él.
+
+Progreso ([PDF], [FMT]), contadores y tiempos (span 'pdf.compile') van a
+core.instrumentation, como en el resto del pipeline.
+
+La única dependencia es un binario LaTeX local (pdflatex o tectonic).
+Los tests usan un compilador stub (cualquier subclase de LatexCompiler).
+
+Uso:
+    with PdfCompileService(workers=2) as service:
+        exam, solution = service.compile_many(["build/latex/Examen_V2.tex",
+                                               "build/latex/Solucion_V2.tex"])
+        print(exam.pdf_path, exam.cached)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from core.instrumentation import Instrumentation, get_instrumentation
+
+
+# Fin del preámbulo estático (paquetes). Sin formato es un no-op; con un
+# formato de mylatexformat, todo lo anterior ya está cargado y se salta.
+FORMAT_DUMP_MARKER = r"\csname endofdump\endcsname"
+
+# Ficheros de los que depende el PDF (entran en la clave de caché)
+_DEPENDENCY_RE = re.compile(r"\\(input|include|includegraphics)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}")
+_COMMENT_RE = re.compile(r"(?<!\\)%.*")
+GRAPHICS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg", ".eps")
+
+
+class CompileError(RuntimeError):
+    """La compilación LaTeX falló (incluye el final del log)."""
+
+    def __init__(self, message: str, log: str = ""):
+        super().__init__(message)
+        self.log = log
+
+
+@dataclass
+class CompileResult:
+    """Resultado de compilar un documento."""
+    tex_path: Path
+    pdf_path: Path
+    content_hash: str
+    cached: bool  # True si el PDF salió de la caché (sin compilar)
+    format_name: Optional[str] = None  # Formato precompilado usado (si hubo)
+
+
+# ==================== COMPILADORES ====================
+
+class LatexCompiler:
+    """
+    Interfaz de un compilador LaTeX.
+
+    Las subclases implementan compile(); build_format() es opcional
+    (devolver None = el compilador no usa formatos precompilados).
+    """
+
+    name = "latex"
+
+    def signature(self) -> str:
+        """Identifica la configuración del compilador (entra en la clave de caché)."""
+        return self.name
+
+    def build_format(self, preamble_path: Path, jobname: str, output_dir: Path) -> Optional[Path]:
+        """Vuelca el preámbulo de preamble_path a output_dir/jobname.fmt."""
+        return None
+
+    def compile(self, tex_path: Path, output_dir: Path, format_path: Optional[Path] = None) -> Path:
+        """Compila tex_path dejando el PDF (y auxiliares) en output_dir. Devuelve el PDF."""
+        raise NotImplementedError
+
+
+class PdfLatexCompiler(LatexCompiler):
+    """pdflatex (o un binario compatible), con soporte de formatos mylatexformat."""
+
+    name = "pdflatex"
+
+    def __init__(self, binary: str = "pdflatex", runs: int = 2, timeout: float = 300):
+        """
+        Args:
+            binary: Ejecutable (pdflatex, lualatex...)
+            runs: Pasadas por documento (2: referencias como \\pageref{LastPage})
+            timeout: Segundos máximos por pasada
+        """
+        self.binary = binary
+        self.runs = runs
+        self.timeout = timeout
+
+    def signature(self) -> str:
+        return f"{self.binary}:{self.runs}"
+
+    def _run(self, args: List[str], cwd: Path, env: Optional[Dict[str, str]] = None):
+        result = subprocess.run(
+            [self.binary, "-interaction=nonstopmode", "-halt-on-error"] + args,
+            cwd=str(cwd), env=env, capture_output=True, timeout=self.timeout
+        )
+        if result.returncode != 0:
+            log = result.stdout.decode("utf-8", errors="replace")
+            raise CompileError(f"{self.binary} falló ({result.returncode})", log[-4000:])
+
+    def build_format(self, preamble_path: Path, jobname: str, output_dir: Path) -> Optional[Path]:
+        self._run(
+            ["-ini", f"-jobname={jobname}", f"-output-directory={output_dir}",
+             f"&{self.binary}", "mylatexformat.ltx", str(preamble_path)],
+            cwd=preamble_path.parent
+        )
+        return output_dir / f"{jobname}.fmt"
+
+    def compile(self, tex_path: Path, output_dir: Path, format_path: Optional[Path] = None) -> Path:
+        args = [f"-output-directory={output_dir}"]
+        env = None
+        if format_path is not None:
+            # El formato se busca por nombre en TEXFORMATS (el ':' final añade las rutas por defecto)
+            env = dict(os.environ, TEXFORMATS=f"{format_path.parent}{os.pathsep}")
+            args.append(f"-fmt={format_path.stem}")
+
+        # cwd = carpeta del .tex: rutas relativas (\input, logo) como al compilar a mano
+        for _ in range(self.runs):
+            self._run(args + [tex_path.name], cwd=tex_path.parent, env=env)
+        return output_dir / f"{tex_path.stem}.pdf"
+
+
+class TectonicCompiler(LatexCompiler):
+    """tectonic: resuelve él mismo las pasadas; no usa formatos externos."""
+
+    name = "tectonic"
+
+    def __init__(self, binary: str = "tectonic", timeout: float = 300):
+        self.binary = binary
+        self.timeout = timeout
+
+    def compile(self, tex_path: Path, output_dir: Path, format_path: Optional[Path] = None) -> Path:
+        result = subprocess.run(
+            [self.binary, "--outdir", str(output_dir), tex_path.name],
+            cwd=str(tex_path.parent), capture_output=True, timeout=self.timeout
+        )
+        if result.returncode != 0:
+            log = (result.stdout + result.stderr).decode("utf-8", errors="replace")
+            raise CompileError(f"{self.binary} falló ({result.returncode})", log[-4000:])
+        return output_dir / f"{tex_path.stem}.pdf"
+
+
+def get_compiler(name: str = "pdflatex") -> LatexCompiler:
+    """Compilador por nombre: 'pdflatex', 'lualatex', 'tectonic'..."""
+    if name == "tectonic":
+        return TectonicCompiler()
+    return PdfLatexCompiler(binary=name)
+
+
+# ==================== SERVICIO ====================
+
+class PdfCompileService:
+    """
+    Compila documentos .tex a PDF con un pool acotado y caché por contenido.
+
+    Es seguro llamarlo desde varios hilos; cada formato precompilado se
+    construye una sola vez aunque varios documentos lo pidan a la vez.
+    """
+
+    def __init__(self, compiler: Optional[LatexCompiler] = None, workers: int = 2,
+                 cache_dir: Union[str, Path] = os.path.join("build", "pdf_cache"),
+                 use_format: bool = True, instrumentation: Optional[Instrumentation] = None):
+        """
+        Args:
+            compiler: Compilador (por defecto, pdflatex)
+            workers: Compilaciones simultáneas como máximo
+            cache_dir: Carpeta de PDFs cacheados (<hash>.pdf) y formatos (.fmt)
+            use_format: Precompilar el preámbulo estático si el documento lo marca
+            instrumentation: Destino de eventos, contadores y tiempos
+                             (None = la activa en core.instrumentation)
+        """
+        if workers < 1:
+            raise ValueError(f"workers debe ser >= 1, recibió {workers}")
+
+        self.compiler = compiler or PdfLatexCompiler()
+        self.workers = workers
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.use_format = use_format
+        self._instrumentation = instrumentation
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="latex")
+        self._formats: Dict[str, Future] = {}
+        self._formats_lock = threading.Lock()
+
+        # Se actualizan desde los hilos del pool
+        self._stats_lock = threading.Lock()
+        self.compiled = 0
+        self.cache_hits = 0
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self._instrumentation or get_instrumentation()
+
+    # ---------- API ----------
+
+    def submit(self, tex_path: Union[str, Path], pdf_path: Union[str, Path, None] = None) -> Future:
+        """Encola un documento; el Future devuelve su CompileResult."""
+        return self._executor.submit(self.compile, tex_path, pdf_path)
+
+    def compile_many(self, tex_paths: Iterable[Union[str, Path]]) -> List[CompileResult]:
+        """Compila varios documentos en paralelo (resultados en el mismo orden)."""
+        futures = [self.submit(path) for path in tex_paths]
+        return [future.result() for future in futures]
+
+    def compile(self, tex_path: Union[str, Path], pdf_path: Union[str, Path, None] = None) -> CompileResult:
+        """
+        Compila un documento (en el hilo actual) o lo sirve desde la caché.
+
+        Args:
+            tex_path: Documento .tex
+            pdf_path: Destino del PDF (por defecto, junto al .tex)
+        """
+        tex_path = Path(tex_path).resolve()
+        pdf_path = Path(pdf_path) if pdf_path else tex_path.with_suffix(".pdf")
+        with self.instrumentation.span("pdf.compile"):
+            return self._compile(tex_path, pdf_path)
+
+    def _compile(self, tex_path: Path, pdf_path: Path) -> CompileResult:
+        instrumentation = self.instrumentation
+        source = tex_path.read_text(encoding="utf-8")
+        content_hash = self.content_hash(source, tex_path.parent)
+        cached_pdf = self.cache_dir / f"{content_hash}.pdf"
+
+        if cached_pdf.exists():
+            shutil.copyfile(cached_pdf, pdf_path)
+            with self._stats_lock:
+                self.cache_hits += 1
+            instrumentation.count("pdf.cache_hits")
+            instrumentation.event("pdf.cached", f"   [PDF] {tex_path.name}: sin cambios (caché)")
+            return CompileResult(tex_path, pdf_path, content_hash, cached=True)
+
+        format_path = self._get_format(source) if self.use_format else None
+
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as work_dir:
+            output = self.compiler.compile(tex_path, Path(work_dir), format_path)
+            # Primero a la caché (os.replace es atómico) y de ahí al destino.
+            # La copia temporal va en work_dir: dos hilos pueden compilar el
+            # mismo contenido a la vez y no deben compartir el .tmp
+            tmp_cached = Path(work_dir) / f"{content_hash}.tmp"
+            shutil.copyfile(output, tmp_cached)
+            os.replace(tmp_cached, cached_pdf)
+        shutil.copyfile(cached_pdf, pdf_path)
+
+        with self._stats_lock:
+            self.compiled += 1
+        instrumentation.count("pdf.compiled")
+        instrumentation.event("pdf.compiled", f"   [PDF] {tex_path.name} → {pdf_path.name}")
+        return CompileResult(tex_path, pdf_path, content_hash, cached=False,
+                             format_name=format_path.stem if format_path else None)
+
+    def prepare_format(self, preamble_path: Union[str, Path]) -> Optional[Path]:
+        """
+        Construye de antemano el formato de un preámbulo compartido
+        (LatexExamRenderer.write_static_preamble). Los documentos que empiecen
+        por ese mismo preámbulo lo reutilizan sin esperar a construirlo.
+        """
+        if not self.use_format:
+            return None
+        return self._get_format(Path(preamble_path).read_text(encoding="utf-8"))
+
+    def content_hash(self, source: str, base_dir: Optional[Path] = None) -> str:
+        """
+        Clave de caché: contenido del documento + configuración del compilador.
+
+        Con base_dir (la carpeta desde la que compila LaTeX) entra también el
+        contenido de cada fichero incluido, recursivamente en los .tex: si
+        cambia un componente o el logo, el PDF de la caché ya no vale.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.compiler.signature().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+        if base_dir is not None:
+            for name, content in self._dependencies(source, Path(base_dir), set()):
+                digest.update(b"\0" + name.encode("utf-8") + b"\0")
+                digest.update(content if content is not None else b"\0missing")
+        return digest.hexdigest()
+
+    def _dependencies(self, source: str, base_dir: Path,
+                      seen: Set[Path]) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """(ruta, contenido o None si no existe) de cada fichero incluido."""
+        for command, name in _DEPENDENCY_RE.findall(_COMMENT_RE.sub("", source)):
+            path = self._resolve_dependency(base_dir, name.strip(), command)
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                content = path.read_bytes()
+            except OSError:
+                yield name, None
+                continue
+            yield name, content
+            if path.suffix == ".tex":
+                # LaTeX resuelve los \input anidados desde la misma carpeta
+                yield from self._dependencies(content.decode("utf-8", errors="replace"), base_dir, seen)
+
+    @staticmethod
+    def _resolve_dependency(base_dir: Path, name: str, command: str) -> Path:
+        """Ruta del fichero como la busca LaTeX (extensión implícita)."""
+        path = base_dir / name
+        if path.suffix:
+            return path
+        extensions = GRAPHICS_EXTENSIONS if command == "includegraphics" else (".tex",)
+        for extension in extensions:
+            candidate = path.with_name(path.name + extension)
+            if candidate.exists():
+                return candidate
+        return path.with_name(path.name + extensions[0])
+
+    def close(self):
+        """Espera a las compilaciones pendientes y libera el pool."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "PdfCompileService":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ---------- Formatos precompilados ----------
+
+    def _get_format(self, source: str) -> Optional[Path]:
+        """
+        Formato del preámbulo estático del documento (lo construye la primera vez).
+
+        El preámbulo es todo lo anterior a FORMAT_DUMP_MARKER; documentos con
+        el mismo preámbulo (examen, solución, variantes) comparten formato.
+        """
+        position = source.find(FORMAT_DUMP_MARKER)
+        if position < 0:
+            return None
+        preamble = source[:position]
+        jobname = "exam-" + hashlib.sha256(
+            (self.compiler.signature() + "\0" + preamble).encode("utf-8")).hexdigest()[:16]
+
+        with self._formats_lock:
+            future = self._formats.get(jobname)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._formats[jobname] = future
+
+        if owner:
+            try:
+                future.set_result(self._build_format(preamble, jobname))
+            except CompileError as e:
+                # Sin formato se compila igual (solo más lento): no es fatal
+                self.instrumentation.event("pdf.format_error",
+                                           f"   [WARN] No se pudo precompilar el preámbulo: {e}",
+                                           logging.WARNING)
+                future.set_result(None)
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def _build_format(self, preamble: str, jobname: str) -> Optional[Path]:
+        """Vuelca el preámbulo a cache_dir/formats/<jobname>.fmt (reutiliza uno existente)."""
+        format_dir = self.cache_dir / "formats"
+        format_dir.mkdir(exist_ok=True)
+        format_path = format_dir / f"{jobname}.fmt"
+        if format_path.exists():
+            return format_path
+
+        preamble_path = format_dir / f"{jobname}.tex"
+        preamble_path.write_text(
+            preamble + FORMAT_DUMP_MARKER + "\n\\begin{document}\n\\end{document}\n",
+            encoding="utf-8"
+        )
+        with self.instrumentation.span("pdf.format"):
+            built = self.compiler.build_format(preamble_path, jobname, format_dir)
+        if built is not None:
+            self.instrumentation.count("pdf.formats_built")
+            self.instrumentation.event("pdf.format", f"   [FMT] Preámbulo precompilado: {built.name}")
+        return built
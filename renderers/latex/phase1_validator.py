@@ -32,6 +32,11 @@ class Phase1DataValidator(ExerciseRendererPhase):
     Esta fase NO genera contenido visual, solo validación y documentación.
     """
     
+    # Dependencias (ver RendererPipeline): las demás fases esperan a la validación
+    requires = ()
+    provides = 'phase1_validation'
+    gate = True
+    
     # Campos requeridos para cada tipo de ejercicio
     REQUIRED_FIELDS = {
         'ConversionRow': {
@@ -86,16 +91,13 @@ class Phase1DataValidator(ExerciseRendererPhase):
         latex = self._generate_debug_tex(debug_info, exercise_type)
         
         # Preparar JSON limpio para siguiente fase
-        cleaned_json = {
-            **exercise_json,
-            'phase1_validation': {
-                'status': 'valid',
-                'exercise_type': exercise_type,
-                'problem_fields': list(problem.keys()),
-                'solution_fields': list(solution.keys()),
-                'validated_at': 'phase1'
-            }
-        }
+        cleaned_json = self._with_state(exercise_json, 'phase1_validation', {
+            'status': 'valid',
+            'exercise_type': exercise_type,
+            'problem_fields': list(problem.keys()),
+            'solution_fields': list(solution.keys()),
+            'validated_at': 'phase1'
+        })
         
         return PhaseOutput(
             latex_content=latex,
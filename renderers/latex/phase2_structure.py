@@ -32,6 +32,10 @@ class Phase2StructureGenerator(ExerciseRendererPhase):
     - Agrega enunciados o explicaciones (eso es Fase 5)
     """
     
+    # Dependencias (ver RendererPipeline)
+    requires = ()
+    provides = 'phase2_structure'
+    
     # Ancho de celdas (em, unidades LaTeX)
     CELL_WIDTH = "2.5em"
     
@@ -66,18 +70,15 @@ class Phase2StructureGenerator(ExerciseRendererPhase):
         latex = self._generate_latex_table(num_rows, is_solution)
         
         # Preparar JSON para siguiente fase con metadata de Fase2
-        output_json = {
-            **exercise_json,
-            'phase2_structure': {
-                'status': 'generated',
-                'table_type': 'numeracion_conversion',
-                'num_rows': num_rows,
-                'num_cols': len(self.CONVERSION_COLUMNS),
-                'columns': self.CONVERSION_COLUMNS,
-                'structure_defined': True,
-                'is_solution': is_solution
-            }
-        }
+        output_json = self._with_state(exercise_json, 'phase2_structure', {
+            'status': 'generated',
+            'table_type': 'numeracion_conversion',
+            'num_rows': num_rows,
+            'num_cols': len(self.CONVERSION_COLUMNS),
+            'columns': self.CONVERSION_COLUMNS,
+            'structure_defined': True,
+            'is_solution': is_solution
+        })
         
         return PhaseOutput(
             latex_content=latex,
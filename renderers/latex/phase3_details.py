@@ -35,6 +35,10 @@ class Phase3Details(ExerciseRendererPhase):
     La tabla sigue siendo VACÍA en esta fase, pero ESTILIZADA.
     """
     
+    # Dependencias (ver RendererPipeline)
+    requires = ('phase2_structure',)
+    provides = 'phase3_details'
+    
     # Definición de colores (RGB)
     PROBLEMA_COLOR = "240,240,240"  # Gris muy claro
     SOLUCION_COLOR = "200,255,200"  # Verde muy claro
@@ -84,20 +88,17 @@ class Phase3Details(ExerciseRendererPhase):
         )
         
         # Preparar JSON para siguiente fase
-        output_json = {
-            **exercise_json,
-            'phase3_details': {
-                'status': 'styled',
-                'problema_color': self.PROBLEMA_COLOR if not is_solution else None,
-                'solucion_color': self.SOLUCION_COLOR if is_solution else None,
-                'encabezado_color': self.ENCABEZADO_COLOR,
-                'cell_padding': self.CELL_PADDING,
-                'row_height': self.ROW_HEIGHT,
-                'font': self.FONT_FAMILY,
-                'styles_applied': True,
-                'is_solution': is_solution
-            }
-        }
+        output_json = self._with_state(exercise_json, 'phase3_details', {
+            'status': 'styled',
+            'problema_color': self.PROBLEMA_COLOR if not is_solution else None,
+            'solucion_color': self.SOLUCION_COLOR if is_solution else None,
+            'encabezado_color': self.ENCABEZADO_COLOR,
+            'cell_padding': self.CELL_PADDING,
+            'row_height': self.ROW_HEIGHT,
+            'font': self.FONT_FAMILY,
+            'styles_applied': True,
+            'is_solution': is_solution
+        })
         
         return PhaseOutput(
             latex_content=latex,
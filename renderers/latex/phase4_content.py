@@ -35,6 +35,10 @@ class Phase4Content(ExerciseRendererPhase):
     La tabla ahora está LLENA DE VALORES y ESTILIZADA.
     """
     
+    # Dependencias (ver RendererPipeline)
+    requires = ('phase2_structure',)
+    provides = 'phase4_content'
+    
     # Definición de colores (mismo que Fase 3)
     PROBLEMA_COLOR = "240,240,240"  # Gris muy claro
     SOLUCION_COLOR = "200,255,200"  # Verde muy claro
@@ -66,7 +70,6 @@ class Phase4Content(ExerciseRendererPhase):
         exercise_type = metadata.get('exercise_type', 'unknown')
         
         phase2_struct = exercise_json.get('phase2_structure', {})
-        phase3_details = exercise_json.get('phase3_details', {})
         
         num_rows = phase2_struct.get('num_rows', 1)
         num_cols = phase2_struct.get('num_cols', 6)
@@ -89,17 +92,14 @@ class Phase4Content(ExerciseRendererPhase):
         )
         
         # Preparar JSON para siguiente fase (Fase 5)
-        output_json = {
-            **exercise_json,
-            'phase4_content': {
-                'status': 'populated',
-                'exercise_type': exercise_type,
-                'num_rows_filled': len(values),
-                'values_extracted': True,
-                'content_added': True,
-                'is_solution': is_solution
-            }
-        }
+        output_json = self._with_state(exercise_json, 'phase4_content', {
+            'status': 'populated',
+            'exercise_type': exercise_type,
+            'num_rows_filled': len(values),
+            'values_extracted': True,
+            'content_added': True,
+            'is_solution': is_solution
+        })
         
         return PhaseOutput(
             latex_content=latex,
@@ -38,6 +38,10 @@ class Phase5Text(ExerciseRendererPhase):
     Output JSON es None (final del pipeline).
     """
     
+    # Dependencias (ver RendererPipeline)
+    requires = ('phase3_details', 'phase4_content')
+    provides = 'phase5_text'
+    
     # Colores (heredados)
     PROBLEMA_COLOR = "240,240,240"
     SOLUCION_COLOR = "200,255,200"
@@ -92,20 +96,17 @@ class Phase5Text(ExerciseRendererPhase):
         output_json = None  # No hay siguiente fase
         
         # Metadata de Fase 5 (para auditoría, no para siguiente)
-        final_metadata = {
-            **exercise_json,
-            'phase5_text': {
-                'status': 'completed',
-                'exercise_type': exercise_type,
-                'statement_extracted': bool(statement),
-                'instructions_extracted': bool(instructions),
-                'explanation_extracted': bool(explanation),
-                'steps_extracted': len(steps) > 0,
-                'document_complete': True,
-                'is_solution': is_solution,
-                'pipeline_complete': True
-            }
-        }
+        final_metadata = self._with_state(exercise_json, 'phase5_text', {
+            'status': 'completed',
+            'exercise_type': exercise_type,
+            'statement_extracted': bool(statement),
+            'instructions_extracted': bool(instructions),
+            'explanation_extracted': bool(explanation),
+            'steps_extracted': len(steps) > 0,
+            'document_complete': True,
+            'is_solution': is_solution,
+            'pipeline_complete': True
+        })
         
         return PhaseOutput(
             latex_content=latex,
@@ -22,13 +22,38 @@ FLUJO:
     ↓
   RendererPipeline
     └─ Compone: main.tex con \include{phase1.tex}...\include{phaseN.tex}
+
+DEPENDENCIAS (opcional):
+  Una fase puede declarar qué claves de estado lee (`requires`) y cuál
+  añade (`provides`). Si todas declaran `requires`, el pipeline no espera
+  a la fase anterior: lanza todas a la vez y cada una solo se bloquea al LEER
+  una clave que aún se está calculando (PhaseState perezoso). Así, la
+  extracción de enunciados de Fase 5 se solapa con las Fases 2-4. La
+  validación (Fase 1, `gate`) sí termina antes de lanzar las demás.
+
+LOTES:
+  render_batch() pasa muchos ejercicios por las mismas fases (en hilos) y
+  prefija los ficheros de cada uno (ej01_..., ej02_...): un único main.tex
+  incluye las fases de todo el examen.
+
+INSTRUMENTACIÓN (core.instrumentation):
+  spans 'render' / 'render.batch' y 'render.phase' (por tipo y fase),
+  contadores 'render.files_written' / 'render.files_unchanged'. El progreso
+  ('verbose') se envía como eventos, no con print().
 """
 
+import logging
+
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, Any, Tuple, Optional, List
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Tuple, Optional, List, Iterable, Iterator, Set
 from pathlib import Path
 
+from core.instrumentation import Instrumentation, get_instrumentation
+from renderers.latex.utils.changed_writer import ChangedFileWriter
+
 
 @dataclass
 class PhaseOutput:
@@ -39,6 +64,59 @@ class PhaseOutput:
     tex_filename: str = "phase.tex"
 
 
+class PhaseState(Mapping):
+    """
+    Estado inmutable que recorre el pipeline: JSON del ejercicio + una capa
+    por fase ('phase2_structure', ...).
+
+    Añadir una capa (with_state) NO copia el JSON: la nueva vista comparte
+    la base y las capas anteriores (compartición estructural). Una capa
+    puede ser un Future todavía pendiente: se resuelve (esperando) al leerla.
+    """
+
+    __slots__ = ("_base", "_layers")
+
+    def __init__(self, base: Mapping, layers: Optional[Dict[str, Any]] = None):
+        self._base = base
+        self._layers = layers or {}
+
+    @classmethod
+    def of(cls, exercise_json: Mapping) -> "PhaseState":
+        """Vista PhaseState de un JSON (sin copiarlo)."""
+        return exercise_json if isinstance(exercise_json, PhaseState) else cls(exercise_json)
+
+    def with_state(self, key: str, value: Any) -> "PhaseState":
+        """Nueva vista con la capa `key` añadida (la actual no cambia)."""
+        layers = dict(self._layers)
+        layers[key] = value
+        return PhaseState(self._base, layers)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._layers:
+            value = self._layers[key]
+            return value.result() if isinstance(value, Future) else value
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._layers or key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        for key in self._layers:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for key in self._layers if key not in self._base)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copia plana (para serializar a JSON)."""
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"PhaseState(capas={list(self._layers)})"
+
+
 class ExerciseRendererPhase(ABC):
     """
     CLASE BASE: Define interfaz para cada fase del pipeline de renderers.
@@ -47,8 +125,19 @@ class ExerciseRendererPhase(ABC):
     - Es determinista: mismo JSON → mismo TEX
     - Separa responsabilidades
     - Produce salida compilable + comunicación con siguiente fase
+    
+    Dependencias (opcionales, ver RendererPipeline):
+    - requires: claves de estado de fases anteriores que lee esta fase
+                (None = depende de la fase anterior, encadenado clásico)
+    - provides: clave que añade esta fase a su output_json (None = ninguna)
+    - gate: las fases posteriores no arrancan hasta que esta termine bien
+            (validación); se ejecuta siempre, aunque `only` no la pida
     """
     
+    requires: Optional[Tuple[str, ...]] = None
+    provides: Optional[str] = None
+    gate: bool = False
+    
     @abstractmethod
     def render(self, exercise_json: Dict[str, Any], is_solution: bool = False) -> PhaseOutput:
         """
@@ -83,6 +172,10 @@ class ExerciseRendererPhase(ABC):
     def _extract_metadata(self, exercise_json: Dict[str, Any]) -> Dict[str, Any]:
         """Extrae metadata del ejercicio."""
         return exercise_json.get('metadata', {})
+    
+    def _with_state(self, exercise_json: Mapping, key: str, value: Dict[str, Any]) -> PhaseState:
+        """JSON para la siguiente fase: el de entrada + `key` (sin copiarlo)."""
+        return PhaseState.of(exercise_json).with_state(key, value)
 
 
 class RendererPipeline:
@@ -90,71 +183,329 @@ class RendererPipeline:
     ORQUESTADOR: Encadena fases sucesivas de rendering.
     
     RESPONSABILIDADES:
-    - Ejecutar fases en orden
+    - Ejecutar fases en orden (o en paralelo si declaran dependencias)
     - Pasar JSON intermedio entre fases
     - Recolectar TEX de cada fase
     - Componer TEX final con \include{}
-    - Guardar archivos intermedios (opcional)
+    - Guardar archivos intermedios (solo los que cambian)
     """
     
-    def __init__(self, exercise_type: str, output_dir: str = "build/latex"):
+    def __init__(self, exercise_type: str, output_dir: str = "build/latex",
+                 workers: int = 1, verbose: bool = True,
+                 instrumentation: Optional[Instrumentation] = None):
+        """
+        Args:
+            exercise_type: Tipo de ejercicio (para los mensajes y las etiquetas)
+            output_dir: Carpeta de los .tex de cada fase
+            workers: Fases simultáneas (1 = secuencial en el hilo actual)
+            verbose: Emitir eventos de progreso de cada fase
+            instrumentation: Destino de eventos, contadores y tiempos
+                             (None = la activa en core.instrumentation)
+        """
+        if workers < 1:
+            raise ValueError(f"workers debe ser >= 1, recibió {workers}")
         self.exercise_type = exercise_type
         self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.verbose = verbose
         self.phases: List[ExerciseRendererPhase] = []
         self.phase_outputs: List[PhaseOutput] = []
+        self.batch_outputs: List[List[PhaseOutput]] = []  # Por ejercicio (render_batch)
+        self._writer = ChangedFileWriter()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._instrumentation = instrumentation
+    
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self._instrumentation or get_instrumentation()
+    
+    def _progress(self, message: str, level: int = logging.INFO):
+        """Evento de progreso (solo con verbose)."""
+        if self.verbose:
+            self.instrumentation.event("render.progress", message, level, type=self.exercise_type)
     
     def add_phase(self, phase: ExerciseRendererPhase) -> "RendererPipeline":
         """Agregar una fase al pipeline (orden importa)."""
         self.phases.append(phase)
         return self  # Fluent interface
     
-    def render(self, exercise_json: Dict[str, Any], is_solution: bool = False) -> Tuple[str, List[str]]:
+    def render(self, exercise_json: Dict[str, Any], is_solution: bool = False,
+               only: Optional[Iterable[str]] = None) -> Tuple[str, List[str]]:
         """
         Renderiza el ejercicio a través de todas las fases.
         
         Args:
             exercise_json: Datos del ejercicio (problema + solución)
             is_solution: Si es para soluciones o enunciado
+            only: Nombres de fase a generar (evaluación perezosa: solo se
+                  ejecutan esas fases y las que necesitan). None = todas.
         
         Returns:
             (main_latex_code, list_of_phase_tex_files)
         """
-        self.phase_outputs = []
-        current_json = exercise_json
+        phases = self._select_phases(only)
         
-        print(f"🎨 Renderizando {self.exercise_type} ({len(self.phases)} fases)...")
+        self._progress(f"🎨 Renderizando {self.exercise_type} ({len(phases)} fases)...")
         
-        # Ejecutar cada fase
-        for i, phase in enumerate(self.phases, 1):
-            print(f"   Phase {i}/{len(self.phases)}: {phase.phase_name}...", end=" ")
+        with self.instrumentation.span("render", type=self.exercise_type):
+            try:
+                self.phase_outputs = self._run(phases, exercise_json, is_solution)
+            finally:
+                # Como en render_batch(): el pool vive lo que dura el render
+                self.close()
+            self.batch_outputs = [self.phase_outputs]
             
-            # Renderizar esta fase
-            output = phase.render(current_json, is_solution=is_solution)
-            self.phase_outputs.append(output)
+            # Componer LaTeX final
+            tex_files = self._save_phase_files()
+            main_tex = self._compose_main_tex(tex_files)
+        
+        return main_tex, tex_files
+    
+    def render_batch(self, exercises: Iterable[Dict[str, Any]], is_solution: bool = False,
+                     workers: Optional[int] = None, only: Optional[Iterable[str]] = None,
+                     prefix: str = "ej") -> Tuple[str, List[str]]:
+        """
+        Renderiza muchos ejercicios con las MISMAS instancias de fase.
+        
+        Cada ejercicio recorre sus fases en un hilo (en el acto, sin anidar
+        pools) y sus ficheros se renombran con un prefijo por ejercicio
+        (ej01_01_numeracion_estructura.tex, ej02_...), así que no se pisan.
+        El main.tex resultante incluye todos, en el orden de `exercises`.
+        
+        Args:
+            exercises: JSON de cada ejercicio
+            is_solution: Si es para soluciones o enunciado
+            workers: Ejercicios simultáneos (None = self.workers)
+            only: Fases a generar (ver render())
+            prefix: Prefijo de los ficheros de cada ejercicio
+        
+        Returns:
+            (main_latex_code, list_of_phase_tex_files) de todo el lote
+        """
+        exercises = list(exercises)
+        workers = self.workers if workers is None else workers
+        if workers < 1:
+            raise ValueError(f"workers debe ser >= 1, recibió {workers}")
+        phases = self._select_phases(only)
+        
+        self._progress(f"🎨 Renderizando {len(exercises)} ejercicios de {self.exercise_type} "
+                       f"({len(phases)} fases, {workers} hilos)...")
+        
+        with self.instrumentation.span("render.batch", type=self.exercise_type):
+            main_tex, tex_files = self._render_batch(exercises, phases, is_solution, workers, prefix)
+        
+        self._progress(f"   ✅ {len(exercises)} ejercicios, {len(tex_files)} ficheros de fase")
+        return main_tex, tex_files
+    
+    def _render_batch(self, exercises: List[Dict[str, Any]], phases: List[ExerciseRendererPhase],
+                      is_solution: bool, workers: int, prefix: str) -> Tuple[str, List[str]]:
+        """Cuerpo de render_batch() (dentro de su span)."""
+        def _render_one(exercise_json):
+            return self._run(phases, exercise_json, is_solution, inline=True, report=False)
+        
+        if workers > 1 and len(exercises) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(exercises)),
+                                    thread_name_prefix="render-batch") as pool:
+                futures = [pool.submit(_render_one, ex) for ex in exercises]
+        else:
+            futures = []
+            for exercise_json in exercises:
+                future: Future = Future()
+                try:
+                    future.set_result(_render_one(exercise_json))
+                except Exception as e:
+                    future.set_exception(e)
+                futures.append(future)
+        
+        width = max(2, len(str(len(exercises))))
+        batch = []
+        for i, future in enumerate(futures, 1):
+            try:
+                outputs = future.result()
+            except Exception as e:
+                # Se informa el primer ejercicio que falla, en orden
+                self._progress(f"   ❌ Ejercicio {i}/{len(exercises)}: {e}", logging.ERROR)
+                raise
+            namespace = f"{prefix}{i:0{width}d}_"
+            batch.append([replace(output, tex_filename=namespace + output.tex_filename)
+                          for output in outputs])
+        
+        self.batch_outputs = batch
+        self.phase_outputs = [output for outputs in batch for output in outputs]
+        
+        tex_files = self._save_phase_files()
+        return self._compose_main_tex(tex_files), tex_files
+    
+    def close(self):
+        """Libera los hilos del pipeline (render() ya lo hace al terminar)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self) -> "RendererPipeline":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    # ---------- Planificación ----------
+    
+    def _has_dependencies(self) -> bool:
+        """True si todas las fases declaran qué leen (grafo de dependencias)."""
+        return bool(self.phases) and all(phase.requires is not None for phase in self.phases)
+    
+    def _dependencies(self, index: int) -> List[int]:
+        """Índices de las fases de las que depende la fase `index`."""
+        phase = self.phases[index]
+        if phase.requires is None or not self._has_dependencies():
+            return [index - 1] if index > 0 else []
+        
+        providers = {p.provides: i for i, p in enumerate(self.phases[:index]) if p.provides}
+        gates = {i for i, p in enumerate(self.phases[:index]) if p.gate}
+        return sorted(gates | {providers[key] for key in phase.requires if key in providers})
+    
+    def _select_phases(self, only: Optional[Iterable[str]]) -> List[ExerciseRendererPhase]:
+        """Fases pedidas + sus dependencias (en el orden del pipeline)."""
+        if only is None:
+            return list(self.phases)
+        
+        wanted = set(only)
+        unknown = wanted - {phase.phase_name for phase in self.phases}
+        if unknown:
+            raise ValueError(f"Fases desconocidas: {sorted(unknown)}")
+        
+        selected: Set[int] = set()
+        pending = [i for i, phase in enumerate(self.phases) if phase.phase_name in wanted]
+        while pending:
+            index = pending.pop()
+            if index not in selected:
+                selected.add(index)
+                pending.extend(self._dependencies(index))
+        return [phase for i, phase in enumerate(self.phases) if i in selected]
+    
+    # ---------- Ejecución ----------
+    
+    def _run(self, phases: List[ExerciseRendererPhase], exercise_json: Dict[str, Any],
+             is_solution: bool, inline: bool = False, report: bool = True) -> List[PhaseOutput]:
+        """Ejecuta las fases de un ejercicio (grafo si hay dependencias)."""
+        if self._has_dependencies():
+            return self._run_graph(phases, exercise_json, is_solution, inline, report)
+        return self._run_chain(phases, exercise_json, is_solution, report)
+    
+    def _run_chain(self, phases: List[ExerciseRendererPhase], exercise_json: Dict[str, Any],
+                   is_solution: bool, report: bool = True) -> List[PhaseOutput]:
+        """Encadenado clásico: cada fase recibe el output_json de la anterior."""
+        outputs = []
+        current_json = exercise_json
+        for i, phase in enumerate(phases, 1):
+            output = self._render_phase(phase, current_json, is_solution)
+            outputs.append(output)
             
             # Pasar JSON intermedio a siguiente fase
             if output.output_json is not None:
                 current_json = output.output_json
-            
-            print("✅")
+            if report:
+                self._report(i, len(phases), phase)
+        return outputs
+    
+    def _run_graph(self, phases: List[ExerciseRendererPhase], exercise_json: Dict[str, Any],
+                   is_solution: bool, inline: bool = False, report: bool = True) -> List[PhaseOutput]:
+        """
+        Ejecuta las fases según sus dependencias.
         
-        # Componer LaTeX final
-        tex_files = self._save_phase_files()
-        main_tex = self._compose_main_tex(tex_files)
+        Cada fase recibe una vista PhaseState con las capas de las fases
+        ANTERIORES como Futures: arranca enseguida y solo espera al leer una
+        clave pendiente. Se encolan en orden (FIFO), así que una fase solo
+        puede esperar a fases que ya están en marcha: no hay interbloqueo.
+        Tras una fase `gate` (validación) se espera a que termine: si falla,
+        las siguientes no llegan a lanzarse.
+        Con inline=True se ejecutan en el hilo actual (render_batch).
+        """
+        base = PhaseState.of(exercise_json)
+        layers: Dict[str, Future] = {}
+        futures: List[Future] = []
         
-        return main_tex, tex_files
+        for phase in phases:
+            view = PhaseState(base, {**base._layers, **layers})
+            future = self._submit(phase, view, is_solution, inline)
+            if phase.provides:
+                layers[phase.provides] = self._layer_future(future, phase.provides)
+            futures.append(future)
+            if phase.gate and future.exception() is not None:
+                break
+        
+        outputs = []
+        error = None
+        for i, (phase, future) in enumerate(zip(phases, futures), 1):
+            try:
+                outputs.append(future.result())
+                if report:
+                    self._report(i, len(phases), phase)
+            except Exception as e:
+                # Se informa el primer fallo en orden de fases (la causa raíz)
+                error = error or e
+        if error is not None:
+            raise error
+        return outputs
+    
+    def _submit(self, phase: ExerciseRendererPhase, view: PhaseState, is_solution: bool,
+                inline: bool = False) -> Future:
+        """Lanza una fase (en el pool, o en el acto si workers=1 o inline)."""
+        if self.workers > 1 and not inline:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="render-phase")
+            return self._executor.submit(self._render_phase, phase, view, is_solution)
+        
+        future: Future = Future()
+        try:
+            future.set_result(self._render_phase(phase, view, is_solution))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    @staticmethod
+    def _layer_future(phase_future: Future, key: str) -> Future:
+        """Future con solo la capa `key` del output_json de una fase."""
+        layer: Future = Future()
+        
+        def _done(done: Future):
+            try:
+                output = done.result()
+                if output.output_json is None or key not in output.output_json:
+                    raise KeyError(f"La fase no produjo '{key}'")
+                layer.set_result(output.output_json[key])
+            except Exception as e:
+                layer.set_exception(e)
+        
+        phase_future.add_done_callback(_done)
+        return layer
+    
+    def _render_phase(self, phase: ExerciseRendererPhase, exercise_json: Mapping,
+                      is_solution: bool) -> PhaseOutput:
+        """Una fase, cronometrada como span 'render.phase'."""
+        with self.instrumentation.span("render.phase", type=self.exercise_type, phase=phase.phase_name):
+            return phase.render(exercise_json, is_solution=is_solution)
+    
+    def _report(self, index: int, total: int, phase: ExerciseRendererPhase):
+        self._progress(f"   Phase {index}/{total}: {phase.phase_name}... ✅")
     
     def _save_phase_files(self) -> List[str]:
-        """Guarda archivos TEX para cada fase."""
+        """Guarda archivos TEX para cada fase (solo los que han cambiado)."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        instrumentation = self.instrumentation
         tex_files = []
+        written = 0
         
         for output in self.phase_outputs:
             tex_file = self.output_dir / output.tex_filename
-            tex_file.write_text(output.latex_content, encoding='utf-8')
+            if self._writer.write(tex_file, output.latex_content):
+                written += 1
+                self._progress(f"      💾 Guardado: {tex_file}", logging.DEBUG)
             tex_files.append(output.tex_filename)
-            print(f"      💾 Guardado: {tex_file}")
         
+        instrumentation.count("render.files_written", written, type=self.exercise_type)
+        instrumentation.count("render.files_unchanged", len(tex_files) - written, type=self.exercise_type)
         return tex_files
     
     def _compose_main_tex(self, tex_files: List[str]) -> str:
@@ -180,14 +531,15 @@ class RendererPipeline:
     def save_main_file(self, filename: str = "main.tex") -> Path:
         """Guarda el archivo TEX principal."""
         if not self.phase_outputs:
-            raise RuntimeError("No hay fases renderizadas. Llama a render() primero.")
+            raise RuntimeError("No hay fases renderizadas. Llama a render() o render_batch() primero.")
         
         main_path = self.output_dir / filename
         tex_files = [o.tex_filename for o in self.phase_outputs]
         main_tex = self._compose_main_tex(tex_files)
         
-        main_path.write_text(main_tex, encoding='utf-8')
-        print(f"📄 Archivo principal guardado: {main_path}")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self._writer.write(main_path, main_tex):
+            self._progress(f"📄 Archivo principal guardado: {main_path}")
         return main_path
 
 
@@ -1,9 +1,12 @@
+import io
+from typing import TextIO
 from modules.secuencial.models import SequentialExerciseData
 from renderers.latex.utils.circuit import DigitalCircuitRenderer
 from renderers.latex.utils.timing import TimingDiagramRenderer
 from renderers.latex.utils.asset_manager import LatexAssetManager
 
 class SecuencialLatexRenderer:
+
     def __init__(self, is_solution: bool = False):
         self.is_solution = is_solution
         self.circuit_renderer = DigitalCircuitRenderer()
@@ -11,36 +14,40 @@ class SecuencialLatexRenderer:
         self.asset_manager = LatexAssetManager()
 
     def render(self, data: SequentialExerciseData, index: int) -> str:
+        out = io.StringIO()
+        self.render_to(out, data, index)
+        return out.getvalue()
+
+    def render_to(self, out: TextIO, data: SequentialExerciseData, index: int):
+        """Escribe el ejercicio en `out` fragmento a fragmento (sin acumular)."""
         # Marcador de inicio
-        latex = "\n" + "%" * 60 + "\n"
-        latex += f"% >>>>>> INICIO EJERCICIO {index}: {data.title} <<<<<<\n"
-        latex += "%" * 60 + "\n"
+        out.write("\n" + "%" * 60 + "\n")
+        out.write(f"% >>>>>> INICIO EJERCICIO {index}: {data.title} <<<<<<\n")
+        out.write("%" * 60 + "\n")
         
-        latex += fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n"
+        out.write(fr"\newpage \section*{{Ejercicio {index}: {data.title}}}" + "\n")
         
         edge_txt = "Subida" if data.edge_type == "Subida" else "Bajada"
         async_txt = f"Async \\textbf{{{data.async_type}(asyn)}} a nivel {data.async_level}" if data.has_async else "Sin Async"
 
-        latex += r"\begin{tcolorbox}[title=Enunciado]" + "\n"
-        latex += fr"Síncrono ({data.logic_type}) por {edge_txt}. FF {data.ff_type}. {async_txt}." + "\n"
+        out.write(r"\begin{tcolorbox}[title=Enunciado]" + "\n")
+        out.write(fr"Síncrono ({data.logic_type}) por {edge_txt}. FF {data.ff_type}. {async_txt}." + "\n")
 
         # Circuito (Asset Manager)
         circuit_id = f"ej{index}_seq_circuit"
         circuit_gen = lambda: self.circuit_renderer.render_sequential_circuit(data)
-        latex += self.asset_manager.get_component(circuit_id, circuit_gen)
+        out.write(self.asset_manager.get_component(circuit_id, circuit_gen))
         
-        latex += r"\end{tcolorbox}" + "\n"
+        out.write(r"\end{tcolorbox}" + "\n")
 
         # Cronograma (Asset Manager)
         timing_id = f"ej{index}_seq_timing"
         timing_gen = lambda: self.timing_renderer.render(data)
-        latex += self.asset_manager.get_component(timing_id, timing_gen)
-        
-        latex += r"\vspace{0.5cm}" + "\n"
-        latex += r"\noindent \textbf{Se pide:}" + "\n"
-        latex += r"\begin{enumerate}[label=\alph*)]" + "\n"
-        latex += r"\item Completar el cronograma (salidas Q0, Q1)." + "\n"
-        latex += r"\item Determinar la secuencia de estados." + "\n"
-        latex += r"\end{enumerate}" + "\n"
+        out.write(self.asset_manager.get_component(timing_id, timing_gen))
         
-        return latex
+        out.write(r"\vspace{0.5cm}" + "\n")
+        out.write(r"\noindent \textbf{Se pide:}" + "\n")
+        out.write(r"\begin{enumerate}[label=\alph*)]" + "\n")
+        out.write(r"\item Completar el cronograma (salidas Q0, Q1)." + "\n")
+        out.write(r"\item Determinar la secuencia de estados." + "\n")
+        out.write(r"\end{enumerate}" + "\n")
@@ -1,6 +1,11 @@
+import hashlib
+import logging
 import os
 import pathlib
-from typing import Callable
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+from core.instrumentation import get_instrumentation
+from renderers.latex.utils.changed_writer import ChangedFileWriter
 
 class LatexAssetManager:
     def __init__(self, base_build_path="build/latex"):
@@ -17,10 +22,24 @@ class LatexAssetManager:
         # Asegurar que existe el directorio de componentes generados
         os.makedirs(self.components_path, exist_ok=True)
 
+        # Los borradores solo se reescriben si cambia su contenido
+        self._writer = ChangedFileWriter()
+        # Componentes generados mientras hay una captura activa (ver capture())
+        self._captured: Optional[List[Tuple[str, str]]] = None
+
+    @property
+    def writes(self) -> int:
+        """Borradores escritos realmente en disco."""
+        return self._writer.writes
+
     def get_component(self, name_id: str, content_generator_func: Callable[[], str]) -> str:
         r"""
         Gestiona un componente LaTeX (ej: un diagrama TikZ).
+
+        Instrumentación: contador 'assets.components' con source=fixed|generated
+        y 'assets.written' por cada borrador que cambia en disco.
         """
+        instrumentation = get_instrumentation()
         
         # Nombre del archivo esperado
         filename = f"{name_id}.tex"
@@ -32,7 +51,8 @@ class LatexAssetManager:
         # print(f"🔍 Buscando: {fixed_file_path}")
         
         if fixed_file_path.exists():
-            print(f"✨ Recurso fijo encontrado: {filename}")
+            instrumentation.count("assets.components", source="fixed")
+            instrumentation.event("assets.fixed", f"✨ Recurso fijo encontrado: {filename}", logging.DEBUG)
             # Ruta relativa para el \input desde el archivo Examen_Final.tex (que está en build/latex/)
             # Necesitamos subir 2 niveles (../../) para salir de build/latex/ y entrar a resources/latex/
             # Usamos forward slashes para LaTeX
@@ -49,8 +69,43 @@ class LatexAssetManager:
         
         full_content = header + content
         
-        draft_path = os.path.join(self.components_path, filename)
-        with open(draft_path, "w", encoding="utf-8") as f:
-            f.write(full_content)
+        instrumentation.count("assets.components", source="generated")
+        if self.write_component(filename, full_content):
+            instrumentation.count("assets.written")
+        if self._captured is not None:
+            self._captured.append((filename, full_content))
             
         return fr"\input{{components/{filename}}}" + "\n"
+
+    def write_component(self, filename: str, content: str) -> bool:
+        """
+        Escribe un borrador en components/ solo si su contenido cambia.
+
+        Returns:
+            True si se escribió el fichero
+        """
+        return self._writer.write(os.path.join(self.components_path, filename), content)
+
+    def fixed_resources_signature(self) -> str:
+        """Hash de los recursos fijos disponibles (cambia si se añade/edita uno)."""
+        entries = []
+        if self.resources_path.exists():
+            for path in sorted(self.resources_path.glob("*.tex")):
+                entries.append(f"{path.name}:{path.stat().st_mtime_ns}")
+        return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()[:16]
+
+    @contextmanager
+    def capture(self) -> Iterator[List[Tuple[str, str]]]:
+        """
+        Registra los borradores generados dentro del bloque como
+        (fichero, contenido), para poder reponerlos después con
+        write_component() (caché de fragmentos).
+        """
+        previous = self._captured
+        self._captured = []
+        try:
+            yield self._captured
+        finally:
+            captured, self._captured = self._captured, previous
+            if previous is not None:
+                previous.extend(captured)
@@ -0,0 +1,54 @@
+"""
+Escritura de ficheros generados solo cuando cambia su contenido.
+
+Regenerar un examen sin cambios no debe reescribir decenas de .tex: cada
+reescritura cambia la fecha de modificación (y dispara recompilaciones
+de LaTeX/editores). El escritor recuerda el hash de lo último escrito en
+cada ruta y, la primera vez, lo compara con el fichero que ya hubiera.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Union
+
+
+class ChangedFileWriter:
+    """Escribe ficheros de texto solo si su contenido es distinto."""
+
+    def __init__(self):
+        self._known: Dict[str, str] = {}  # ruta -> sha256 del contenido en disco
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.skipped = 0
+
+    def write(self, path: Union[str, os.PathLike], content: str) -> bool:
+        """
+        Escribe `content` en `path` (UTF-8, sin traducir saltos de línea).
+
+        Returns:
+            True si se escribió; False si el fichero ya tenía ese contenido
+        """
+        path = os.fspath(path)
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            if self._known.get(path) == digest:
+                self.skipped += 1
+                return False
+
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).hexdigest() == digest:
+                    with self._lock:
+                        self._known[path] = digest
+                        self.skipped += 1
+                    return False
+
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._known[path] = digest
+            self.writes += 1
+        return True
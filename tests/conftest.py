@@ -0,0 +1,63 @@
+"""
+Fixtures compartidas por los tests.
+"""
+
+import pytest
+
+from database import FileProblemRepository, SQLiteProblemRepository
+from models.problem import Problem
+from models.problem_type import ProblemType
+from modules.numeracion.models import ArithmeticOp, ConversionExerciseData, ConversionRow
+
+
+@pytest.fixture
+def make_conversion():
+    """Fábrica de ejercicios de conversión de 8 bits (uno distinto por i)."""
+    return _make_conversion
+
+
+def _make_conversion(i: int) -> ConversionExerciseData:
+    row = ConversionRow(title="", description="", label="a", val_decimal=i, target_col_idx=0, representable=True,
+                        target_val_str=format(i, "08b"), sol_bin=format(i, "08b"),
+                        sol_c2=format(i, "08b"), sol_sm=format(i, "08b"), sol_bcd="NR")
+    op = ArithmeticOp(title="", description="", op_type="Suma", system="Binario Natural", operand1="a", operand2="a",
+                      operator_symbol="+", val1_dec=i, val2_dec=i, result_dec=2 * i,
+                      result_bin=format(2 * i, "08b"), overflow=False, underflow=False,
+                      carry_bits="0" * 8)
+    return ConversionExerciseData(title=f"Conversión {i}", description="Convierte",
+                                  n_bits=8, rows=[row], operations=[op])
+
+
+@pytest.fixture
+def make_problem():
+    """Fábrica de Problems de prueba (título, enunciado y solución según i)."""
+    return _make_problem
+
+
+def _make_problem(i: int, problem_type: ProblemType = ProblemType.NUMERACION,
+                  difficulty: int = 1, tags=None) -> Problem:
+    return Problem(
+        type=problem_type,
+        metadata=Problem.Metadata(
+            title=f"Problema {i}",
+            topic="Test",
+            difficulty=difficulty,
+            tags=list(tags or []),
+        ),
+        statement=Problem.Statement(
+            text=f"Enunciado del problema {i}",
+            problem_fields={"val_decimal": i},
+        ),
+        solution=Problem.Solution(solution_fields={"sol_bin": format(i, "08b")}),
+    )
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def repo(request, tmp_path):
+    """Repositorio vacío de cada backend (los tests de un solo backend lo redefinen)."""
+    if request.param == "file":
+        yield FileProblemRepository(str(tmp_path / "db"))
+    else:
+        repository = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+        yield repository
+        repository.close()
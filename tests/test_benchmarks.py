@@ -0,0 +1,208 @@
+"""
+Tests del harness de benchmarks (benchmarks/: report, generators, profiling, pipeline).
+"""
+
+import os
+import time
+
+import pytest
+
+from benchmarks import pipeline
+from benchmarks.generators import GeneratorCase, discover_cases, run_case, run_suite
+from benchmarks.report import (
+    compare_reports, load_report, make_report, percentile, save_report, summarize_latencies
+)
+from benchmarks.profiling import StageProfiler
+from core import exam_builder
+from core.generator_base import ExerciseGenerator
+
+
+class FakeGenerator(ExerciseGenerator):
+    def __init__(self, fail_every: int = 0):
+        self.calls = 0
+        self.fail_every = fail_every
+
+    def topic(self):
+        return "Prueba"
+
+    def generate(self, difficulty=1):
+        self.calls += 1
+        print("traza del generador")
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise ValueError("fallo ocasional")
+        return {"n": self.calls}
+
+
+class OnlyFromProblem(ExerciseGenerator):
+    def topic(self):
+        return "Prueba"
+
+    def generate_from_problem(self, problem_dict):
+        return dict(problem_dict, solved=True)
+
+
+def make_case(generator, mode="generate"):
+    return GeneratorCase(f"test:fake:{mode}", "test", "fake", mode, lambda: generator)
+
+
+def report_with(**cases):
+    return make_report("generators", {case_id: {"status": "ok", **metrics} for case_id, metrics in cases.items()})
+
+
+class TestEstadisticas:
+    def test_percentiles(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([7], 0.99) == 7
+
+    def test_resumen(self):
+        stats = summarize_latencies([1000] * 10)
+        assert stats["ops_per_sec"] == 1_000_000
+        assert stats["p50_us"] == stats["p99_us"] == 1.0
+
+
+class TestRunCase:
+    def test_mide_y_silencia_trazas(self, capsys):
+        generator = FakeGenerator()
+        entry = run_case(make_case(generator), iterations=30, warmup=5, memory_samples=3)
+
+        assert entry["status"] == "ok"
+        assert entry["iterations"] == 30 and entry["errors"] == 0
+        assert entry["ops_per_sec"] > 0 and entry["p99_us"] >= entry["p50_us"]
+        assert entry["peak_kib"] >= 0
+        assert generator.calls == 38
+        assert "traza" not in capsys.readouterr().out
+
+    def test_fallos_ocasionales_se_cuentan(self):
+        entry = run_case(make_case(FakeGenerator(fail_every=4)), iterations=20, warmup=0, memory_samples=0)
+
+        assert entry["status"] == "ok"
+        assert entry["iterations"] + entry["errors"] == 20
+        assert "fallo ocasional" in entry["error"]
+
+    def test_modo_no_implementado(self):
+        entry = run_case(make_case(OnlyFromProblem(), "generate"), iterations=5)
+        assert entry["status"] == "skipped"
+
+    def test_from_problem_sin_aleatorizador(self):
+        entry = run_case(make_case(OnlyFromProblem(), "randomized"), iterations=5, memory_samples=0)
+        assert entry["status"] == "ok"
+
+    def test_generador_no_disponible(self):
+        def broken():
+            raise ImportError("no existe")
+
+        entry = run_case(GeneratorCase("x", "mapper", "9.9", "generate", broken), iterations=5)
+        assert entry["status"] == "unavailable"
+
+    def test_descubre_mapper_y_catalogo(self):
+        sources = {case.source for case in discover_cases()}
+        assert sources == {"mapper", "catalog"}
+        assert all("2.1.1.2" in case.case_id for case in discover_cases("2.1.1.2"))
+
+
+class TestInforme:
+    def test_ida_y_vuelta(self, tmp_path):
+        report = run_suite([make_case(FakeGenerator())], iterations=5, warmup=0, memory_samples=0, verbose=False)
+        path = save_report(report, tmp_path / "sub" / "bench.json")
+
+        loaded = load_report(path)
+
+        assert loaded["suite"] == "generators"
+        assert loaded["cases"]["test:fake:generate"]["status"] == "ok"
+        assert loaded["params"]["iterations"] == 5
+
+    def test_detecta_regresiones(self):
+        baseline = report_with(a={"ops_per_sec": 1000, "p99_us": 10, "peak_kib": 4},
+                               b={"ops_per_sec": 1000, "p99_us": 10, "peak_kib": 4})
+        current = report_with(a={"ops_per_sec": 800, "p99_us": 10.5, "peak_kib": 4},
+                              b={"ops_per_sec": 950, "p99_us": 10, "peak_kib": 6})
+
+        regressions = compare_reports(baseline, current, threshold=0.10)
+
+        assert [(r.case_id, r.metric) for r in regressions] == [("a", "ops_per_sec"), ("b", "peak_kib")]
+        assert regressions[0].change == pytest.approx(0.2)
+
+    def test_caso_que_pasa_a_fallar(self):
+        baseline = report_with(a={"ops_per_sec": 1000})
+        current = make_report("generators", {"a": {"status": "error", "error": "x"}})
+
+        [regression] = compare_reports(baseline, current)
+
+        assert regression.metric == "status"
+
+    def test_suites_distintas(self):
+        with pytest.raises(ValueError):
+            compare_reports(make_report("generators", {}), make_report("pipeline", {}))
+
+
+class TestStageProfiler:
+    def test_tiempos_propios_sin_subetapas(self):
+        profiler = StageProfiler()
+        with profiler.stage("total"):
+            with profiler.stage("hija"):
+                time.sleep(0.02)
+            with profiler.stage("hija"):
+                time.sleep(0.02)
+
+        results = profiler.results()
+
+        assert results["hija"]["calls"] == 2
+        assert results["hija"]["wall_s"] >= 0.04
+        assert results["total"]["self_wall_s"] < results["total"]["wall_s"] - 0.035
+
+    def test_memoria_por_etapa(self):
+        with StageProfiler(track_memory=True) as profiler:
+            with profiler.stage("asigna"):
+                data = [bytes(1024) for _ in range(200)]
+        assert profiler.results()["asigna"]["peak_kib"] >= 200
+        assert len(data) == 200
+
+    def test_patched_restaura_el_metodo(self):
+        class Target:
+            def work(self):
+                return 42
+
+        target = Target()
+        profiler = StageProfiler()
+        with profiler.patched(target, "work", "trabajo"):
+            assert target.work() == 42
+        assert "work" not in vars(target)
+        assert profiler.results()["trabajo"]["calls"] == 1
+
+
+class TestPipeline:
+    def test_caso_completo(self, tmp_path):
+        cwd = os.getcwd()
+        catalog = dict(exam_builder.EXERCISE_CATALOG)
+
+        entry = pipeline.run_case(6, "sqlite", repeat=1, profile_path=tmp_path / "p.folded")
+
+        assert entry["status"] == "ok" and entry["exercises"] == 6
+        assert set(entry["stages"]) == set(pipeline.STAGES) | {pipeline.OTHER_STAGE}
+        # El desglose suma el total (salvo redondeo)
+        assert sum(stage["share"] for stage in entry["stages"].values()) == pytest.approx(1, abs=0.01)
+        assert sum(stage["wall_s"] for stage in entry["stages"].values()) == pytest.approx(entry["wall_s"], abs=1e-4)
+        assert entry["stages"]["repo_save"]["calls"] == 1
+        assert entry["stages"]["mapper"]["calls"] == 3
+        assert "peak_kib" in entry["stages"]["build"]
+        assert (tmp_path / "p.folded").exists()
+        assert os.getcwd() == cwd
+        assert exam_builder.EXERCISE_CATALOG == catalog
+
+    def test_sin_repositorio(self):
+        entry = pipeline.run_case(4, "none", repeat=1, track_memory=False)
+        assert entry["status"] == "ok"
+        assert "mapper" not in entry["stages"]
+
+    def test_regresion_por_etapa(self):
+        def report(render_s):
+            return make_report("pipeline", {"10:file": {
+                "status": "ok", "stages": {"render_exam": {"wall_s": render_s},
+                                           "config_load": {"wall_s": 0.0001}}}})
+
+        [regression] = compare_reports(report(0.1), report(0.2))
+
+        assert regression.metric == "stages.render_exam.wall_s"
+        assert compare_reports(report(0.1), report(0.105)) == []
@@ -0,0 +1,183 @@
+"""
+Tests del espacio de códigos (core/code_space.py) en FixedPointUnified,
+IEEE754Gen y FixedPointFloating: iter_codes() por trozos, rank() y unrank().
+
+Los valores exactos de cada código se calculan con fracciones para poder
+comprobar el orden también en bases distintas de 2.
+"""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+from core import code_space, ieee754, punto_fijo_unified
+from core.ieee754 import IEEE754Gen
+from core.punto_fijo_unified import FixedPointUnified
+from core.punto_flotante import FixedPointFloating
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def numpy_mode(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        for module in (code_space, ieee754, punto_fijo_unified):
+            monkeypatch.setattr(module, "HAS_NUMPY", False)
+    return request.param
+
+
+def entries(space, chunk_size, order):
+    chunks = list(space.iter_codes(chunk_size=chunk_size, order=order))
+    assert all(len(chunk.codes) == chunk_size for chunk in chunks[:-1])
+    return [entry for chunk in chunks for entry in chunk.entries()]
+
+
+def check_value_order(space, exact):
+    """Orden de valor estrictamente creciente y rank/unrank coherentes con él."""
+    listed = entries(space, 7, 'value')
+    assert len(listed) == space.value_count
+    values = [exact(code) for code, _, _ in listed]
+    assert all(a < b for a, b in zip(values, values[1:]))
+
+    for index, (entry, value) in enumerate(zip(listed, values)):
+        assert space.unrank(index) == entry
+        assert space.rank(value) == index
+        if index + 1 < len(values) and math.isfinite(values[index + 1]) and math.isfinite(value):
+            assert space.rank((value + values[index + 1]) / 2) == index + 1
+
+
+def fixed_exact(fp):
+    return lambda code: Fraction(fp._code_to_units(code), fp.base_power_F)
+
+
+def ieee_exact(ieee):
+    def exact(code):
+        sign, rest = divmod(code, ieee._sign_stride)
+        E_enc, M_enc = divmod(rest, ieee._mantissa_scale)
+        if E_enc == ieee.E_max_encoded:
+            return -math.inf if sign else math.inf
+        fraction = Fraction(M_enc, ieee._mantissa_scale)
+        if E_enc == 0:
+            magnitude = fraction * Fraction(ieee.base) ** ieee.E_min
+        else:
+            magnitude = (1 + fraction) * Fraction(ieee.base) ** (E_enc - ieee.bias)
+        return -magnitude if sign else magnitude
+    return exact
+
+
+def floating_exact(fp):
+    def exact(code):
+        if fp.unpack(code) == (0, 0):
+            return Fraction(0)
+        sign, grid_index = divmod(code, fp._grid_count)
+        return -fp._grid_value(grid_index) if sign else fp._grid_value(grid_index)
+    return exact
+
+
+class TestFixedPointUnified:
+    FORMATS = [(3, 2, 2, False, 'complement'), (3, 2, 2, True, 'complement'),
+               (3, 2, 2, True, 'ms'), (1, 1, 10, True, 'complement'), (1, 1, 16, True, 'ms')]
+
+    @pytest.mark.parametrize("E,F,base,signed,representation", FORMATS)
+    def test_orden_de_codigo(self, numpy_mode, E, F, base, signed, representation):
+        fp = FixedPointUnified(E, F, base, signed, representation)
+        listed = entries(fp, 10, 'code')
+        assert len(listed) == fp.code_count
+        assert [code for code, _, _ in listed] == sorted(code for code, _, _ in listed)
+        assert all(value == fp.decode(code) for code, value, _ in listed)
+        assert {cls for _, value, cls in listed if value == 0} == {'zero'}
+
+    @pytest.mark.parametrize("E,F,base,signed,representation", FORMATS)
+    def test_orden_de_valor(self, numpy_mode, E, F, base, signed, representation):
+        fp = FixedPointUnified(E, F, base, signed, representation)
+        check_value_order(fp, fixed_exact(fp))
+
+    def test_codificacion_con_signo(self):
+        # Complemento a la base sobre E+F+1 dígitos; M&S con dígito de signo
+        assert FixedPointUnified(4, 4, 2, True, 'complement').encode(-5.25) == 428
+        assert FixedPointUnified(2, 2, 10, True, 'complement').encode(-5.25) == 99475
+        fp = FixedPointUnified(2, 2, 10, True, 'ms')
+        assert fp.encode(-5.25) == 10525
+        assert fp.decode(10525) == -5.25
+        assert fp.add(-3.5, 1.25) == -2.25
+
+    def test_rank_fuera_de_rango(self):
+        fp = FixedPointUnified(3, 2, 2, True, 'ms')
+        assert fp.rank(-100) == 0 and fp.rank(-math.inf) == 0
+        assert fp.rank(100) == fp.value_count == fp.rank(math.inf)
+        with pytest.raises(ValueError):
+            fp.rank(math.nan)
+
+
+class TestIEEE754Gen:
+    FORMATS = [(3, 2, 2), (2, 2, 10), (2, 1, 16), (3, 1, 3)]
+
+    @pytest.mark.parametrize("E_bits,F_bits,base", FORMATS)
+    def test_orden_de_valor(self, numpy_mode, E_bits, F_bits, base):
+        ieee = IEEE754Gen(E_bits, F_bits, base)
+        check_value_order(ieee, ieee_exact(ieee))
+        assert ieee.unrank(0)[2] == ieee.unrank(ieee.value_count - 1)[2] == 'infinity'
+
+    def test_orden_de_codigo_y_clases(self, numpy_mode):
+        ieee = IEEE754Gen(3, 2)
+        listed = entries(ieee, 16, 'code')
+        assert [code for code, _, _ in listed] == list(range(ieee.code_count))
+        for code, value, cls in listed:
+            fields = ieee.unpack(code)  # En base 2 el código es el empaquetado
+            expected = ieee.decode(*fields)
+            assert value == expected or (math.isnan(value) and isinstance(expected, str))
+        classes = [cls for _, _, cls in listed]
+        assert classes.count('zero') == 2 and classes.count('infinity') == 2
+        assert classes.count('nan') == 2 * (ieee._mantissa_scale - 1)
+        assert classes.count('denormal') == 2 * (ieee._mantissa_scale - 1)
+
+    def test_binary64_sin_materializar(self):
+        ieee = IEEE754Gen(11, 52)
+        # -∞, P negativos, el 0 y los positivos de código 1..encode(1.0)-1
+        assert ieee.rank(1.0) == 1 + ieee._finite_count + ieee.encode(1.0)
+        code, value, cls = ieee.unrank(ieee.rank(1.0))
+        assert (code, value, cls) == (ieee.encode(1.0), 1.0, 'normal')
+        first = next(ieee.iter_codes(chunk_size=4, order='value'))
+        assert [float(v) for v in first.values][:2] == [-math.inf, -1.7976931348623157e308]
+        rng = random.Random(5)
+        for value in [rng.uniform(-1e9, 1e9) for _ in range(50)]:
+            assert ieee.unrank(ieee.rank(value))[1] == value
+
+
+class TestFixedPointFloating:
+    FORMATS = [(2, 2, 2, True), (2, 2, 2, False), (1, 2, 3, True), (2, 0, 2, True), (1, 1, 10, False)]
+
+    @pytest.mark.parametrize("F_M,E_bits,base,signed", FORMATS)
+    def test_orden_de_valor(self, F_M, E_bits, base, signed):
+        fp = FixedPointFloating(F_M, E_bits, base, signed)
+        check_value_order(fp, floating_exact(fp))
+
+    @pytest.mark.parametrize("F_M,E_bits,base,signed", FORMATS)
+    def test_orden_de_codigo(self, F_M, E_bits, base, signed):
+        fp = FixedPointFloating(F_M, E_bits, base, signed)
+        listed = entries(fp, 5, 'code')
+        assert [code for code, _, _ in listed] == list(range(fp.code_count))
+        for code, value, _ in listed:
+            assert fp.pack(*fp.unpack(code)) == code
+            assert value == fp.decode(*fp.unpack(code))
+
+
+class TestApi:
+    def test_argumentos_invalidos(self):
+        ieee = IEEE754Gen(3, 2)
+        with pytest.raises(ValueError):
+            next(ieee.iter_codes(order='random'))
+        with pytest.raises(ValueError):
+            next(ieee.iter_codes(chunk_size=0))
+        with pytest.raises(IndexError):
+            ieee.unrank(ieee.value_count)
+
+    def test_trozos_numpy(self):
+        np = pytest.importorskip("numpy")
+        chunk = next(IEEE754Gen(8, 23).iter_codes(chunk_size=1000))
+        assert chunk.codes.dtype == np.int64 and chunk.values.dtype == np.float64
+        assert len(chunk.classes) == 1000
+        chunk = next(FixedPointUnified(40, 40, 2, True, 'complement').iter_codes(chunk_size=3))
+        assert chunk.codes.dtype == object
@@ -0,0 +1,110 @@
+"""
+Tests para core.distribution: histogramas exactos de punto fijo e IEEE754.
+
+Los recuentos analíticos se comparan con la enumeración por fuerza bruta
+de todos los códigos en formatos pequeños.
+"""
+
+import time
+from decimal import Decimal, localcontext
+
+import pytest
+
+from core.distribution import (
+    fixed_point_distribution, fixed_point_units, ieee754_distribution
+)
+from core.ieee754 import IEEE754Gen
+from core.punto_fijo_unified import FixedPointUnified
+
+
+def brute_force_positive_values(ieee):
+    """Valores positivos finitos de todos los códigos (vía decode())."""
+    values = set()
+    for E_enc in range(ieee.E_max_encoded):  # E todo unos = especiales
+        for M_enc in range(ieee.base ** ieee.F_bits):
+            value = ieee.decode(0, E_enc, M_enc)
+            if value > 0:
+                values.add((E_enc, M_enc))
+    return values
+
+
+def exact_value(ieee, E_enc, M_enc):
+    """Valor exacto como Decimal (decode() devuelve float)."""
+    B, F = Decimal(ieee.base), ieee.F_bits
+    if E_enc == 0:
+        return Decimal(M_enc) * B ** (ieee.E_min - F)
+    return (B ** F + M_enc) * B ** (E_enc - ieee.bias - F)
+
+
+class TestFixedPoint:
+    @pytest.mark.parametrize("signed,representation", [
+        (False, 'complement'), (True, 'ms'), (True, 'complement')])
+    @pytest.mark.parametrize("base", [2, 3, 10])
+    def test_coincide_con_fuerza_bruta(self, signed, representation, base):
+        fp = FixedPointUnified(E=2, F=2, base=base, signed=signed, representation=representation)
+        k_min, k_max = fixed_point_units(fp)
+        dist = fixed_point_distribution(fp, num_bins=7)
+
+        expected = [0] * 7
+        span = k_max - k_min
+        for k in range(k_min, k_max + 1):
+            expected[min(6, (k - k_min) * 7 // span)] += 1
+        assert dist.counts == expected
+        assert dist.total == sum(expected)
+
+    def test_rango(self):
+        fp = FixedPointUnified(E=4, F=4, base=2, signed=True, representation='complement')
+        dist = fixed_point_distribution(fp)
+        assert dist.min_value == fp.min_value
+        assert dist.max_value == fp.max_value
+        assert len(dist.counts) == 50
+
+    def test_menos_valores_que_bins(self):
+        fp = FixedPointUnified(E=1, F=1, base=2, signed=False)
+        dist = fixed_point_distribution(fp, num_bins=50)
+        assert dist.counts == [1, 1, 1, 1]
+
+
+class TestIEEE754:
+    @pytest.mark.parametrize("E,F,base", [(3, 2, 2), (3, 3, 2), (2, 2, 3), (2, 1, 10), (1, 3, 2)])
+    def test_coincide_con_fuerza_bruta(self, E, F, base):
+        ieee = IEEE754Gen(E_bits=E, F_bits=F, base=base)
+        codes = brute_force_positive_values(ieee)
+        num_bins = min(9, len(codes))  # El motor limita bins al número de valores
+        dist = ieee754_distribution(ieee, num_bins=num_bins)
+        assert dist.total == len(codes)
+        assert sum(dist.counts) == len(codes)
+
+        # Recontar con los mismos bordes logarítmicos, valor a valor
+        with localcontext() as ctx:
+            ctx.prec = 60
+            B = Decimal(base)
+            logs = sorted((exact_value(ieee, *code).ln() / B.ln()) for code in codes)
+            log_min, log_max = logs[0], logs[-1]
+            step = (log_max - log_min) / num_bins
+            expected = [0] * num_bins
+            for log in logs:
+                index = int((log - log_min) / step) if log < log_max else num_bins - 1
+                expected[min(index, num_bins - 1)] += 1
+        assert dist.counts == expected
+
+    def test_incluye_denormalizados(self):
+        ieee = IEEE754Gen(E_bits=3, F_bits=2)
+        dist = ieee754_distribution(ieee)
+        assert dist.extra['denormals'] == 3
+        assert dist.min_value == pytest.approx(2 ** (ieee.E_min - 2))
+
+    def test_binary64_exacto_y_rapido(self):
+        start = time.perf_counter()
+        dist = ieee754_distribution(IEEE754Gen(E_bits=11, F_bits=52))
+        assert time.perf_counter() - start < 1.0
+        # Valores positivos finitos de binary64: 0x7FEFFFFFFFFFFFFF
+        assert dist.total == sum(dist.counts) == 0x7FEFFFFFFFFFFFFF
+        assert dist.min_value == 5e-324
+        assert dist.max_value == 1.7976931348623157e308
+
+    def test_formato_fuera_de_rango_float(self):
+        dist = ieee754_distribution(IEEE754Gen(E_bits=8, F_bits=16, base=10), num_bins=10)
+        assert isinstance(dist.max_value, str)
+        assert dist.total == sum(dist.counts)
+        assert len(dist.labels) == 10
@@ -0,0 +1,242 @@
+"""
+Tests para la construcción paralela de ExamBuilder (flujos aleatorios por ejercicio).
+
+Verifica que build(workers=N) es reproducible bit a bit con cualquier
+número de workers y que cada (ex_id, índice) tiene su propio flujo.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from core import exam_builder
+from core.exam_builder import ExamBuilder, derive_exercise_seed
+from core.generator_base import ExerciseData, ExerciseGenerator
+from database import FileProblemRepository
+from models.problem_type import ProblemType
+
+
+@dataclass
+class DummyExerciseData(ExerciseData):
+    values: list
+
+
+class DummyGenerator(ExerciseGenerator):
+    """Generador mínimo que consume el `random` global como los reales."""
+
+    def topic(self) -> str:
+        return "Dummy"
+
+    def generate(self, difficulty: int = 1) -> DummyExerciseData:
+        return DummyExerciseData(
+            title="Dummy",
+            description=f"Dificultad {difficulty}",
+            values=[random.randint(0, 10**9) for _ in range(8)]
+        )
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setitem(exam_builder.EXERCISE_CATALOG, "dummy_a", DummyGenerator())
+    monkeypatch.setitem(exam_builder.EXERCISE_CATALOG, "dummy_b", DummyGenerator())
+    config = {
+        "title": "Paralelo",
+        "seed": 2024,
+        "exercises": [
+            {"id": "dummy_a", "qty": 5},
+            {"id": "dummy_b", "qty": 4, "difficulty": 2},
+            {"id": "dummy_a", "qty": 3},
+        ]
+    }
+    path = tmp_path / "exam.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+
+def _values(builder):
+    return [ex.values for ex in builder.exercises_data]
+
+
+class TestDeriveExerciseSeed:
+    def test_determinista(self):
+        assert derive_exercise_seed(1, "a", 0) == derive_exercise_seed(1, "a", 0)
+
+    def test_distinta_por_componente(self):
+        seeds = {
+            derive_exercise_seed(1, "a", 0),
+            derive_exercise_seed(2, "a", 0),
+            derive_exercise_seed(1, "b", 0),
+            derive_exercise_seed(1, "a", 1),
+        }
+        assert len(seeds) == 4
+
+
+class TestParallelBuild:
+    def test_identico_con_cualquier_numero_de_workers(self, config_file):
+        serial = ExamBuilder(config_file)
+        serial.build(workers=1)
+
+        parallel = ExamBuilder(config_file)
+        parallel.build(workers=3)
+
+        assert len(serial.exercises_data) == 12
+        assert _values(serial) == _values(parallel)
+        assert serial.exercises_json == parallel.exercises_json
+
+    def test_independiente_del_estado_global(self, config_file):
+        first = ExamBuilder(config_file)
+        random.seed(999)
+        first.build(workers=1)
+
+        second = ExamBuilder(config_file)
+        random.random()
+        second.build(workers=1)
+
+        assert _values(first) == _values(second)
+
+    def test_ocurrencias_repetidas_no_colisionan(self, config_file):
+        builder = ExamBuilder(config_file)
+        builder.build(workers=1)
+        values = [tuple(v) for v in _values(builder)]
+        assert len(set(values)) == len(values)
+
+    def test_orden_del_config(self, config_file):
+        builder = ExamBuilder(config_file)
+        builder.build(workers=2)
+        descriptions = [ex.description for ex in builder.exercises_data]
+        assert descriptions == ["Dificultad 1"] * 5 + ["Dificultad 2"] * 4 + ["Dificultad 1"] * 3
+
+    def test_sin_seed_registra_build_seed(self, config_file):
+        builder = ExamBuilder(config_file)
+        builder.config["seed"] = None
+        builder.build(workers=1)
+        assert builder.build_seed is not None
+
+        replay = ExamBuilder(config_file)
+        replay.config["seed"] = builder.build_seed
+        replay.build(workers=1)
+        assert _values(builder) == _values(replay)
+
+    def test_workers_invalido(self, config_file):
+        with pytest.raises(ValueError):
+            ExamBuilder(config_file).build(workers=0)
+
+
+class TestBuildVariants:
+    def test_variantes_distintas_y_reproducibles(self, config_file):
+        builder = ExamBuilder(config_file)
+        first = [_values_of(ex) for _, ex in builder.build_variants(3, seed=11)]
+
+        replay = ExamBuilder(config_file)
+        second = [_values_of(ex) for _, ex in replay.build_variants(3, seed=11, workers=2)]
+
+        assert first == second
+        assert len({tuple(map(tuple, v)) for v in first}) == 3
+
+    def test_numeracion_de_variantes(self, config_file):
+        builder = ExamBuilder(config_file)
+        variants = [variant for variant, _ in builder.build_variants(4, seed=1)]
+        assert variants == [1, 2, 3, 4]
+        assert len(builder.exercises_data) == 12
+
+    def test_semilla_maestra_distinta(self, config_file):
+        a = [_values_of(ex) for _, ex in ExamBuilder(config_file).build_variants(1, seed=1)]
+        b = [_values_of(ex) for _, ex in ExamBuilder(config_file).build_variants(1, seed=2)]
+        assert a != b
+
+    def test_n_invalido(self, config_file):
+        with pytest.raises(ValueError):
+            list(ExamBuilder(config_file).build_variants(0))
+
+
+def _values_of(exercises):
+    return [ex.values for ex in exercises]
+
+
+class DummyMapper:
+    """Mapper mínimo: el ejercicio reutilizado lleva el id del Problem en `values`."""
+
+    def __init__(self, make_problem):
+        self.make_problem = make_problem
+
+    def problem_to_exercise(self, problem):
+        return DummyExerciseData(title="Reutilizado", description="repo", values=[problem.id])
+
+    def exercise_to_problem(self, data):
+        return self.make_problem(len(data.values))
+
+
+@pytest.fixture
+def reuse_setup(tmp_path, monkeypatch, make_problem):
+    monkeypatch.setitem(exam_builder.EXERCISE_CATALOG, "numeracion", DummyGenerator())
+    monkeypatch.setitem(exam_builder.MAPPER_REGISTRY, ProblemType.NUMERACION, DummyMapper(make_problem))
+    monkeypatch.setattr(exam_builder, "HAS_MAPPERS", True)
+
+    repo = FileProblemRepository(str(tmp_path / "db"))
+    repo.save_many([make_problem(i) for i in range(30)])
+
+    config = {"title": "Reuso", "seed": 5, "exercises": [{"id": "numeracion", "qty": 6}]}
+    path = tmp_path / "reuse.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path), repo
+
+
+class TestReuseSampling:
+    @pytest.mark.parametrize("workers", [None, 1])
+    def test_una_llamada_a_sample_por_tipo(self, reuse_setup, monkeypatch, workers):
+        config_file, repo = reuse_setup
+        calls = []
+        original = repo.sample
+        monkeypatch.setattr(repo, "sample", lambda *a, **kw: calls.append(kw) or original(*a, **kw))
+
+        builder = ExamBuilder(config_file, problem_repository=repo)
+        builder.build(use_repository=False, reuse_probability=1.0, workers=workers)
+
+        assert len(calls) == 0  # use_repository=False: ni reutiliza ni muestrea
+        builder.build(reuse_probability=1.0, workers=workers)
+        assert [kw["k"] for kw in calls] == [6]
+        assert len(set(builder.loaded_problems)) == 6
+
+    def test_reutilizacion_reproducible(self, reuse_setup):
+        config_file, repo = reuse_setup
+        first = ExamBuilder(config_file, problem_repository=repo)
+        first.build(use_repository=True, reuse_probability=1.0, workers=1)
+
+        second = ExamBuilder(config_file, problem_repository=repo)
+        second.build(use_repository=True, reuse_probability=1.0, workers=2)
+
+        assert _values(first) == _values(second)
+        assert [v[0] for v in _values(first)] == first.loaded_problems
+        assert repo.count() == 30  # Los reutilizados no se vuelven a guardar
+
+    def test_misma_semilla_con_y_sin_repositorio(self, reuse_setup, tmp_path):
+        config_file, repo = reuse_setup
+        without = ExamBuilder(config_file)
+        without.build(reuse_probability=0.5, workers=1)
+
+        with_repo = ExamBuilder(config_file, problem_repository=repo)
+        with_repo.build(reuse_probability=0.5, workers=1)
+        generated = [(i, ex.values) for i, ex in enumerate(with_repo.exercises_data)
+                     if ex.title != "Reutilizado"]
+        assert 0 < len(generated) < 6
+        assert generated == [(i, _values(without)[i]) for i, _ in generated]
+
+        # Repositorio vacío: todo se genera, igual que sin repositorio
+        empty = ExamBuilder(config_file, problem_repository=FileProblemRepository(str(tmp_path / "vacio")))
+        empty.build(reuse_probability=0.5, workers=1)
+        assert _values(empty) == _values(without)
+
+    def test_genera_si_se_agotan_los_candidatos(self, reuse_setup):
+        config_file, repo = reuse_setup
+        for problem_id in [s.id for s in repo.list_summaries(fields=("id",))][2:]:
+            repo.delete(problem_id)
+
+        builder = ExamBuilder(config_file, problem_repository=repo)
+        builder.build(use_repository=False, reuse_probability=1.0, workers=1)
+        assert len(builder.exercises_data) == 6
+
+        builder.build(reuse_probability=1.0, workers=1)
+        assert len(builder.loaded_problems) == 2
+        assert len(builder.exercises_data) == 6
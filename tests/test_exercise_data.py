@@ -0,0 +1,130 @@
+"""
+Tests de la validación por clase de ProblemSolutionExerciseData
+y del modo __slots__ (core/generator_base.py).
+"""
+
+from dataclasses import dataclass
+from typing import Set
+
+import pytest
+
+from core.generator_base import ProblemSolutionExerciseData, exercise_dataclass
+from modules.numeracion.models import ArithmeticOp, ConversionRow
+
+
+def make_row(**overrides) -> ConversionRow:
+    values = dict(title="", description="", label="a", val_decimal=5, target_col_idx=0,
+                  representable=True, target_val_str="101", sol_bin="101", sol_c2="0101",
+                  sol_sm="0101", sol_bcd="0101")
+    values.update(overrides)
+    return ConversionRow(**values)
+
+
+class TestFieldLayout:
+    def test_valida_una_sola_vez_por_clase(self):
+        calls = []
+
+        @dataclass
+        class Counted(ProblemSolutionExerciseData):
+            x: int
+            y: int
+
+            @classmethod
+            def problem_field_names(cls) -> Set[str]:
+                calls.append("problem")
+                return {"x"}
+
+            @classmethod
+            def solution_field_names(cls) -> Set[str]:
+                return {"y"}
+
+        for i in range(100):
+            data = Counted("t", "d", i, -i)
+            assert data.to_problem_dict() == {"x": i}
+            assert data.to_solution_dict() == {"y": -i}
+
+        assert calls == ["problem"]
+
+    def test_error_en_la_primera_instancia(self):
+        @dataclass
+        class Overlap(ProblemSolutionExerciseData):
+            x: int
+
+            @classmethod
+            def problem_field_names(cls) -> Set[str]:
+                return {"x"}
+
+            @classmethod
+            def solution_field_names(cls) -> Set[str]:
+                return {"x"}
+
+        with pytest.raises(ValueError, match="AMBAS"):
+            Overlap("t", "d", 1)
+
+    def test_exercise_dataclass_valida_al_definir(self):
+        with pytest.raises(ValueError, match="no categorizados"):
+            @exercise_dataclass
+            class Missing(ProblemSolutionExerciseData):
+                x: int
+                y: int
+
+                @classmethod
+                def problem_field_names(cls) -> Set[str]:
+                    return {"x"}
+
+                @classmethod
+                def solution_field_names(cls) -> Set[str]:
+                    return set()
+
+    def test_orden_de_declaracion(self):
+        assert list(make_row().to_problem_dict()) == ["label", "val_decimal", "target_col_idx", "representable"]
+        assert ConversionRow.field_layout().solution == ("target_val_str", "sol_bin", "sol_c2", "sol_sm", "sol_bcd")
+
+
+class TestSlots:
+    def test_modelos_de_numeracion_sin_dict(self):
+        assert not hasattr(make_row(), "__dict__")
+        assert "__slots__" in vars(ArithmeticOp)
+
+    def test_post_init_sigue_validando(self):
+        with pytest.raises(ValueError, match="target_col_idx"):
+            make_row(target_col_idx=7)
+
+    def test_no_admite_atributos_extra(self):
+        with pytest.raises(AttributeError):
+            make_row().extra = 1
+
+    def test_slots_con_valores_por_defecto(self):
+        @exercise_dataclass(slots=True)
+        class WithDefault(ProblemSolutionExerciseData):
+            x: int
+            y: int = 3
+
+            @classmethod
+            def problem_field_names(cls) -> Set[str]:
+                return {"x"}
+
+            @classmethod
+            def solution_field_names(cls) -> Set[str]:
+                return {"y"}
+
+        data = WithDefault("t", "d", 1)
+        assert (data.title, data.x, data.y) == ("t", 1, 3)
+        assert WithDefault.__slots__ == ("title", "description", "x", "y")
+        assert WithDefault.__qualname__.endswith("WithDefault")
+        assert not hasattr(data, "__dict__")
+
+    def test_sin_slots_por_defecto(self):
+        @exercise_dataclass
+        class Plain(ProblemSolutionExerciseData):
+            x: int
+
+            @classmethod
+            def problem_field_names(cls) -> Set[str]:
+                return {"x"}
+
+            @classmethod
+            def solution_field_names(cls) -> Set[str]:
+                return set()
+
+        assert hasattr(Plain("t", "d", 1), "__dict__")
@@ -0,0 +1,103 @@
+"""
+Tests para FileProblemRepository: index en memoria con journal append-only.
+"""
+
+import json
+
+import pytest
+
+from database.file_repo import FileProblemRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    return FileProblemRepository(str(tmp_path / "db"), compact_every=50)
+
+
+class TestJournal:
+    def test_save_no_reescribe_snapshot(self, repo, make_problem):
+        before = repo.index_path.read_bytes()
+        repo.save(make_problem(1))
+        assert repo.index_path.read_bytes() == before
+        assert len(repo.journal_path.read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_reabrir_reproduce_index(self, repo, tmp_path, make_problem):
+        problems = [make_problem(i) for i in range(10)]
+        for p in problems:
+            repo.save(p)
+        repo.delete(problems[3].id)
+
+        reopened = FileProblemRepository(str(tmp_path / "db"))
+        assert reopened.count() == 9
+        assert not reopened.exists(problems[3].id)
+        assert reopened.load(problems[4].id).metadata.title == "Problema 4"
+
+    def test_compactacion(self, repo, tmp_path, make_problem):
+        for i in range(60):
+            repo.save(make_problem(i))
+
+        assert len(json.loads(repo.index_path.read_text(encoding="utf-8"))) == 50
+        assert len(repo.journal_path.read_text(encoding="utf-8").splitlines()) == 10
+        assert FileProblemRepository(str(tmp_path / "db")).count() == 60
+
+    def test_linea_incompleta_ignorada(self, repo, tmp_path, make_problem):
+        repo.save(make_problem(1))
+        with open(repo.journal_path, "ab") as f:
+            f.write(b'{"op":"put","id":"x"')
+
+        reopened = FileProblemRepository(str(tmp_path / "db"))
+        assert reopened.count() == 1
+
+    def test_ve_cambios_de_otra_instancia(self, repo, tmp_path, make_problem):
+        other = FileProblemRepository(str(tmp_path / "db"), compact_every=50)
+        problem = make_problem(1)
+        other.save(problem)
+        assert repo.exists(problem.id)
+
+        other.clear()
+        assert repo.count() == 0
+
+
+class TestCountFromIndex:
+    def test_count_no_abre_ficheros(self, repo, make_problem):
+        for i in range(6):
+            repo.save(make_problem(i, difficulty=1 + i % 2, tags=["par"] if i % 2 == 0 else []))
+        for json_file in repo.base_path.glob("numeracion/*.json"):
+            json_file.unlink()
+
+        assert repo.count() == 6
+        assert repo.count({"difficulty": 2}) == 3
+        assert repo.count({"tags": ["par"]}) == 3
+        assert repo.count({"type": "karnaugh"}) == 0
+
+    def test_count_con_paginacion(self, repo, make_problem):
+        for i in range(7):
+            repo.save(make_problem(i))
+        assert repo.count({"limit": 5}) == 5
+        assert repo.count({"offset": 5, "limit": 5}) == 2
+        assert repo.count() == len(repo.list())
+
+
+class TestSizeAccounting:
+    def test_tamano_acumulado(self, repo, make_problem):
+        repo.save(make_problem(1))
+        problem = make_problem(2)
+        repo.save(problem)
+        files = list(repo.base_path.glob("numeracion/*.json"))
+        assert repo._problems_size == sum(f.stat().st_size for f in files)
+
+        repo.delete(problem.id)
+        files = list(repo.base_path.glob("numeracion/*.json"))
+        assert repo._problems_size == sum(f.stat().st_size for f in files)
+
+    def test_index_antiguo_sin_size(self, tmp_path, make_problem):
+        repo = FileProblemRepository(str(tmp_path / "db"))
+        repo.save(make_problem(1))
+        repo._compact()
+        index = json.loads(repo.index_path.read_text(encoding="utf-8"))
+        for entry in index.values():
+            entry.pop("size")
+        repo.index_path.write_text(json.dumps(index), encoding="utf-8")
+
+        reopened = FileProblemRepository(str(tmp_path / "db"))
+        assert reopened._problems_size == repo._problems_size > 0
@@ -0,0 +1,218 @@
+"""
+Tests de la caché de fragmentos LaTeX (renderers/latex/fragment_cache.py)
+y de la escritura condicional de componentes (LatexAssetManager).
+"""
+
+import logging
+
+import pytest
+
+from core.instrumentation import LoggingInstrumentation, use_instrumentation
+from modules.combinacional.models import KarnaughExerciseData
+from renderers.latex.combinacional_renderer import CombinacionalLatexRenderer
+from renderers.latex import fragment_cache
+from renderers.latex.fragment_cache import FragmentCache, renderer_signature
+from renderers.latex.main_renderer import LatexExamRenderer
+from renderers.latex.numeracion_renderer import NumeracionLatexRenderer
+from renderers.latex.utils.asset_manager import LatexAssetManager
+
+
+def make_karnaugh(out_name: str = "F") -> KarnaughExerciseData:
+    return KarnaughExerciseData(
+        title="Karnaugh", description="Simplifica", vars_name=list("ABCD"), out_name=out_name,
+        truth_table_outputs=[0, 1] * 8, canon_type="Minitérminos", gate_type="NAND",
+        minterms=[1, 3], maxterms=[0, 2], simplified_sop="", simplified_pos="",
+        simplified_nand="", simplified_nor="",
+    )
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Los renderers escriben en build/latex relativo al directorio actual."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestClaves:
+    def test_misma_entrada_misma_clave(self, make_conversion):
+        renderer = NumeracionLatexRenderer()
+        a = FragmentCache.make_key(make_conversion(3), 1, False, renderer)
+        b = FragmentCache.make_key(make_conversion(3), 1, False, renderer)
+        assert a == b and a is not None
+
+    @pytest.mark.parametrize("change", ["contenido", "indice", "solucion", "fuente", "sal"])
+    def test_cualquier_cambio_cambia_la_clave(self, change, monkeypatch, make_conversion):
+        renderer = NumeracionLatexRenderer()
+        base = FragmentCache.make_key(make_conversion(3), 1, False, renderer)
+        args = [make_conversion(3), 1, False, renderer]
+        kwargs = {}
+        if change == "contenido":
+            args[0] = make_conversion(4)
+        elif change == "indice":
+            args[1] = 2
+        elif change == "solucion":
+            args[2] = True
+        elif change == "fuente":
+            # Otro código fuente del renderer → otra firma
+            monkeypatch.setitem(fragment_cache._signatures, NumeracionLatexRenderer, "editado")
+        else:
+            kwargs["salt"] = "otro"
+        assert FragmentCache.make_key(*args, **kwargs) != base
+
+    def test_firma_desde_el_codigo_fuente(self):
+        signature = renderer_signature(NumeracionLatexRenderer)
+        assert signature.startswith("NumeracionLatexRenderer:")
+        assert signature != renderer_signature(CombinacionalLatexRenderer)
+        assert renderer_signature(NumeracionLatexRenderer) is signature  # Calculada una vez
+
+    def test_la_configuracion_cambia_la_sal(self):
+        renderer = LatexExamRenderer()
+        salt = renderer._get_fragment_salt()
+        renderer = LatexExamRenderer()
+        renderer.scoring_config = {"puntos": 99}
+        assert renderer._get_fragment_salt() != salt
+
+    def test_no_dataclass_no_cacheable(self):
+        assert FragmentCache.make_key("texto", 1, False, NumeracionLatexRenderer()) is None
+
+
+class TestAlmacen:
+    def test_memoria(self):
+        cache = FragmentCache(cache_dir=None)
+        assert cache.get("k") is None
+        cache.put("k", "texto", [("a.tex", "x")])
+
+        entry = cache.get("k")
+
+        assert entry.text == "texto" and entry.components == [("a.tex", "x")]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_en_memoria(self):
+        cache = FragmentCache(cache_dir=None, memory_entries=2)
+        for key in "abc":
+            cache.put(key, key)
+        assert cache.get("a") is None
+        assert cache.get("c").text == "c"
+
+    def test_persiste_en_disco(self, tmp_path):
+        FragmentCache(tmp_path).put("ab" * 32, "texto", [("c.tex", "tikz")])
+
+        cache = FragmentCache(tmp_path)
+        entry = cache.get("ab" * 32)
+
+        assert entry.text == "texto" and entry.components == [("c.tex", "tikz")]
+        assert cache.disk_hits == 1
+
+    def test_desalojo_por_tamano(self, tmp_path):
+        cache = FragmentCache(tmp_path, max_bytes=500)
+        keys = [f"{i:02d}" * 32 for i in range(5)]
+        for key in keys:
+            cache.put(key, "x" * 150)
+
+        assert cache.evictions > 0
+        assert cache.stats()["disk_bytes"] <= 500
+        reopened = FragmentCache(tmp_path, max_bytes=500)
+        assert reopened.get(keys[0]) is None
+        assert reopened.get(keys[-1]).text == "x" * 150
+
+    def test_fichero_corrupto(self, tmp_path, capsys, caplog):
+        key = "cd" * 32
+        FragmentCache(tmp_path).put(key, "texto")
+        (tmp_path / key[:2] / f"{key}.json").write_text("{roto", encoding="utf-8")
+
+        cache = FragmentCache(tmp_path)
+        with use_instrumentation(LoggingInstrumentation()), \
+                caplog.at_level(logging.WARNING, logger="exam_generator"):
+            assert cache.get(key) is None
+
+        assert not (tmp_path / key[:2] / f"{key}.json").exists()
+        assert [r.levelno for r in caplog.records] == [logging.WARNING]
+        assert "ilegible" in caplog.records[0].getMessage()
+        assert capsys.readouterr().out == ""  # Aviso como evento, no print()
+
+    def test_clear(self, tmp_path):
+        cache = FragmentCache(tmp_path)
+        cache.put("ef" * 32, "texto")
+        cache.clear()
+        assert cache.get("ef" * 32) is None
+        assert not list(tmp_path.glob("*/*.json"))
+
+
+class TestAssetManager:
+    def test_no_reescribe_contenido_igual(self, workdir):
+        manager = LatexAssetManager()
+        assert manager.write_component("a.tex", "uno")
+        assert not manager.write_component("a.tex", "uno")
+        assert manager.write_component("a.tex", "dos")
+        assert manager.writes == 2
+
+    def test_fichero_previo_identico(self, workdir):
+        LatexAssetManager().write_component("a.tex", "uno")
+        manager = LatexAssetManager()
+        assert not manager.write_component("a.tex", "uno")
+        assert manager.writes == 0
+
+    def test_capture(self, workdir):
+        manager = LatexAssetManager()
+        with manager.capture() as captured:
+            text = manager.get_component("ej1_kmap", lambda: "% tikz")
+
+        assert text == "\\input{components/ej1_kmap.tex}\n"
+        assert [name for name, _ in captured] == ["ej1_kmap.tex"]
+        assert captured[0][1].endswith("% tikz")
+
+
+class TestRenderConCache:
+    def test_segunda_vez_desde_cache(self, workdir, monkeypatch, make_conversion):
+        cache = FragmentCache(cache_dir=None)
+        renderer = LatexExamRenderer(fragment_cache=cache)
+        exercises = [make_conversion(1), make_karnaugh()]
+        first = renderer.render(exercises)
+
+        calls = []
+        monkeypatch.setattr(NumeracionLatexRenderer, "render_to",
+                            lambda *args: calls.append(args))
+        monkeypatch.setattr(CombinacionalLatexRenderer, "render_to",
+                            lambda *args: calls.append(args))
+        second = renderer.render(exercises)
+
+        assert second == first
+        assert calls == []
+        assert cache.hits == 2
+
+    def test_igual_que_sin_cache(self, workdir, make_conversion):
+        exercises = [make_conversion(1), make_karnaugh()]
+        expected = LatexExamRenderer(is_solution=True).render(exercises)
+
+        cached = LatexExamRenderer(is_solution=True, fragment_cache=FragmentCache(workdir / "c"))
+        assert cached.render(exercises) == expected
+        assert cached.render(exercises) == expected
+
+    def test_examen_y_solucion_no_se_mezclan(self, workdir, make_conversion):
+        cache = FragmentCache(cache_dir=None)
+        exam = LatexExamRenderer(False, fragment_cache=cache).render([make_conversion(5)])
+        solution = LatexExamRenderer(True, fragment_cache=cache).render([make_conversion(5)])
+        assert exam != solution
+
+    def test_repone_componentes_desde_disco(self, workdir):
+        store = workdir / "fragments"
+        LatexExamRenderer(fragment_cache=FragmentCache(store)).render([make_karnaugh()])
+        component = workdir / "build" / "latex" / "components" / "ej1_kmap.tex"
+        original = component.read_text(encoding="utf-8")
+        component.unlink()
+
+        renderer = LatexExamRenderer(fragment_cache=FragmentCache(store))
+        renderer.render([make_karnaugh()])
+
+        assert component.read_text(encoding="utf-8") == original
+        assert renderer.fragment_cache.disk_hits == 1
+
+    def test_cache_caliente_no_escribe(self, workdir):
+        renderer = LatexExamRenderer(fragment_cache=FragmentCache(cache_dir=None))
+        renderer.render([make_karnaugh()])
+        manager = renderer.combinacional_renderer.asset_manager
+        writes = manager.writes
+
+        renderer.render([make_karnaugh()])
+
+        assert manager.writes == writes
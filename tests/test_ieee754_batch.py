@@ -0,0 +1,86 @@
+"""
+Tests de IEEE754Gen.encode_many()/decode_many() (core/ieee754.py).
+
+Los lotes deben dar exactamente los mismos bits que encode() y los mismos
+valores que decode(), con y sin NumPy.
+"""
+
+import math
+import random
+
+import pytest
+
+from core import ieee754
+from core.ieee754 import IEEE754Gen
+
+FORMATS = [(8, 23, 2), (11, 52, 2), (5, 10, 2), (3, 2, 2), (15, 112, 2), (3, 5, 10), (4, 3, 16)]
+SPECIALS = [0.0, -0.0, math.inf, -math.inf, math.nan, 5e-324, -1e-300, 1e300, 0.125, 1 - 2 ** -53]
+
+
+def sample_values(n=500, seed=0):
+    rng = random.Random(seed)
+    values = [rng.uniform(-1000, 1000) for _ in range(n)]
+    values += [rng.choice((-1, 1)) * math.ldexp(rng.random(), rng.randint(-1070, 1020)) for _ in range(n)]
+    return values + SPECIALS
+
+
+def as_list(result):
+    return [int(x) for x in result]
+
+
+def same_float(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def numpy_mode(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ieee754, "HAS_NUMPY", False)
+    return request.param
+
+
+class TestEncodeMany:
+    @pytest.mark.parametrize("E_bits,F_bits,base", FORMATS)
+    def test_mismos_bits_que_encode(self, numpy_mode, E_bits, F_bits, base):
+        ieee = IEEE754Gen(E_bits, F_bits, base)
+        values = [v for v in sample_values() if base == 2 or abs(v) > 1e-250 or v == 0]
+
+        assert as_list(ieee.encode_many(values)) == [ieee.encode(v) for v in values]
+
+    def test_campos(self, numpy_mode):
+        ieee = IEEE754Gen(3, 5, base=10)
+        signs, exponents, mantissas = ieee.encode_many([1.5, -250.0, math.inf], fields=True)
+        assert list(zip(as_list(signs), as_list(exponents), as_list(mantissas))) == [
+            ieee._encode_fields(1.5), ieee._encode_fields(-250.0), ieee.encode_infinity()]
+
+    def test_justo_bajo_una_potencia_de_dos(self):
+        # math.log(1 - 2**-53, 2) redondea a 0: la mantisa salía negativa
+        ieee = IEEE754Gen(11, 52)
+        sign, E_enc, M_enc = ieee.unpack(ieee.encode(1 - 2 ** -53))
+        assert (sign, E_enc - ieee.bias, M_enc) == (0, -1, 2 ** 52 - 1)
+
+
+class TestDecodeMany:
+    @pytest.mark.parametrize("E_bits,F_bits", [(8, 23), (11, 52), (5, 10), (15, 112)])
+    def test_mismos_valores_que_decode(self, numpy_mode, E_bits, F_bits):
+        ieee = IEEE754Gen(E_bits, F_bits)
+        codes = [ieee.encode(v) for v in sample_values()] + [ieee.encode(math.nan) - 1]  # sNaN...
+
+        decoded = ieee.decode_many(codes)
+
+        expected = [ieee.decode(*ieee.unpack(code)) for code in codes]
+        expected = [math.nan if isinstance(value, str) else value for value in expected]
+        assert all(same_float(float(a), b) for a, b in zip(decoded, expected))
+
+    def test_ida_y_vuelta_por_campos_en_base_10(self, numpy_mode):
+        ieee = IEEE754Gen(3, 5, base=10)
+        fields = ieee.encode_many([1.5, -0.25, 12345.0], fields=True)
+        assert [float(v) for v in ieee.decode_many(fields, fields=True)] == \
+            [ieee.decode(*t) for t in zip(*fields)]
+
+    def test_empaquetado_en_base_10_no_invertible(self):
+        ieee = IEEE754Gen(3, 5, base=10)
+        with pytest.raises(ValueError):
+            ieee.decode_many([ieee.encode(1.5)])
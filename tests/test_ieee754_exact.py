@@ -0,0 +1,142 @@
+"""
+Tests de la codificación exacta y los modos de redondeo de IEEE754Gen
+(core/ieee754.py).
+
+Los valores representables se obtienen con decode() (mantisa implícita
+1.M en cualquier base) y se comparan con fracciones exactas.
+"""
+
+import bisect
+import math
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from core.ieee754 import ROUNDING_MODES, IEEE754Gen
+
+
+def exact_value(ieee, fields):
+    """Valor exacto (Fraction) de unos campos finitos."""
+    sign, E_enc, M_enc = fields
+    scale = ieee.base ** ieee.F_bits
+    if E_enc == 0:
+        magnitude = Fraction(M_enc, scale) * Fraction(ieee.base) ** ieee.E_min
+    else:
+        magnitude = (1 + Fraction(M_enc, scale)) * Fraction(ieee.base) ** (E_enc - ieee.bias)
+    return -magnitude if sign else magnitude
+
+
+def all_finite(ieee):
+    """Todos los valores finitos no negativos del formato, ordenados."""
+    scale = ieee.base ** ieee.F_bits
+    values = {exact_value(ieee, (0, E_enc, M_enc))
+              for E_enc in range(ieee.E_max_encoded) for M_enc in range(scale)}
+    return sorted(values)
+
+
+class TestBase2:
+    def test_modo_por_defecto_trunca_como_antes(self):
+        ieee = IEEE754Gen(8, 23)
+        assert ieee.rounding == "toward_zero"
+        assert ieee.encode(0.1) == 0x3DCCCCCC       # float32 redondeado daría ...CD
+        assert ieee.encode(-2.5) == 0xC0200000
+        assert ieee.encode(1e40) == 0x7F800000       # Desbordamiento: infinito
+
+    def test_nearest_even_coincide_con_float32(self):
+        import struct
+        ieee = IEEE754Gen(8, 23, rounding="nearest_even")
+        rng = random.Random(3)
+        values = [rng.uniform(-1e6, 1e6) for _ in range(500)] + [rng.uniform(-1e-40, 1e-40) for _ in range(200)]
+        for value in values:
+            assert ieee.encode(value) == struct.unpack("<I", struct.pack("<f", value))[0]
+
+    def test_empates(self):
+        ieee = IEEE754Gen(3, 2)  # 1.00, 1.25, 1.50, 1.75 × 2^E
+        assert ieee.decode(*ieee._encode_fields(1.125, "nearest_even")) == 1.0
+        assert ieee.decode(*ieee._encode_fields(1.375, "nearest_even")) == 1.5
+        assert ieee.decode(*ieee._encode_fields(1.125, "nearest_away")) == 1.25
+        assert ieee.decode(*ieee._encode_fields(-1.125, "nearest_away")) == -1.25
+
+    def test_acarreo_a_la_banda_siguiente_y_a_infinito(self):
+        ieee = IEEE754Gen(3, 2)
+        assert ieee.decode(*ieee._encode_fields(1.9, "up")) == 2.0
+        largest = ieee.decode(0, ieee.E_max_encoded - 1, 3)  # 1.75 × 2^3
+        assert ieee._encode_fields(largest + 0.5, "up") == ieee.encode_infinity()
+        assert ieee._encode_fields(largest + 0.5, "nearest_even") == ieee.unpack(ieee.encode(largest))
+
+    def test_up_y_down_segun_el_signo(self):
+        ieee = IEEE754Gen(3, 2)
+        assert ieee.decode(*ieee._encode_fields(1.1, "up")) == 1.25
+        assert ieee.decode(*ieee._encode_fields(1.1, "down")) == 1.0
+        assert ieee.decode(*ieee._encode_fields(-1.1, "up")) == -1.0
+        assert ieee.decode(*ieee._encode_fields(-1.1, "down")) == -1.25
+
+    def test_binary128_desde_fraction_y_decimal(self):
+        ieee = IEEE754Gen(15, 112)
+        third = ieee.unpack(ieee.encode(Fraction(1, 3)))
+        assert third == (0, ieee.bias - 2, int("01" * 56, 2))
+        assert ieee.encode(Decimal("0.1")) != ieee.encode(0.1)  # 0.1 exacto ≠ el double 0.1
+        assert ieee.encode(10 ** 40) == ieee.encode(Fraction(10 ** 40))
+
+
+class TestOtrasBases:
+    @pytest.mark.parametrize("E_bits,F_bits,base", [(2, 2, 10), (2, 1, 16), (2, 2, 3)])
+    @pytest.mark.parametrize("rounding", ROUNDING_MODES)
+    def test_redondeo_al_valor_representable(self, E_bits, F_bits, base, rounding):
+        ieee = IEEE754Gen(E_bits, F_bits, base)
+        grid = all_finite(ieee)
+        rng = random.Random(base)
+        samples = [Fraction(rng.randint(1, 10 ** 6), rng.randint(1, 10 ** 4)) for _ in range(300)]
+        samples = [x for x in samples if x < grid[-1]] + grid[1:40] + [(a + b) / 2 for a, b in zip(grid, grid[1:])]
+
+        for x in samples:
+            fields = ieee._encode_fields(x, rounding)
+            assert fields[2] < base ** F_bits
+            got = exact_value(ieee, fields)
+            lower = grid[bisect.bisect_right(grid, x) - 1]
+            upper = grid[bisect.bisect_left(grid, x)]
+            if rounding in ("toward_zero", "down"):
+                assert got == lower
+            elif rounding == "up":
+                assert got == upper
+            elif x - lower != upper - x:
+                assert got == min((lower, upper), key=lambda v: abs(v - x))
+            elif rounding == "nearest_away":
+                assert got == upper
+
+    def test_hueco_entre_bandas(self):
+        ieee = IEEE754Gen(3, 2, base=10)  # Banda E=0: 1.00 .. 1.99; luego 10.0
+        assert exact_value(ieee, ieee._encode_fields(5)) == Fraction(199, 100)
+        assert exact_value(ieee, ieee._encode_fields(5, "up")) == 10
+        assert exact_value(ieee, ieee._encode_fields(6, "nearest_even")) == 10
+        assert exact_value(ieee, ieee._encode_fields(5.9, "nearest_even")) == Fraction(199, 100)
+
+    def test_campos_dentro_de_su_anchura(self):
+        ieee = IEEE754Gen(3, 5, base=10)
+        for value in (123.456, 0.5, -9.99e50, 1e-120, 7):
+            sign, E_enc, M_enc = ieee._encode_fields(value)
+            assert 0 <= M_enc < 10 ** 5 and 0 <= E_enc <= ieee.E_max_encoded
+
+
+class TestApi:
+    def test_modo_desconocido(self):
+        with pytest.raises(ValueError):
+            IEEE754Gen(8, 23, rounding="stochastic")
+        with pytest.raises(ValueError):
+            IEEE754Gen(8, 23).encode(1.0, rounding="stochastic")
+
+    def test_encode_many_con_redondeo(self):
+        ieee = IEEE754Gen(5, 10)
+        values = [0.1, -0.3, 65519.0, 1e-7, math.inf]
+        assert list(ieee.encode_many(values, rounding="nearest_even")) == \
+            [ieee.encode(v, rounding="nearest_even") for v in values]
+
+    def test_normalizado_y_denormalizado(self):
+        ieee = IEEE754Gen(8, 23)
+        with pytest.raises(ValueError):
+            ieee.encode_normalized(1e-40)
+        with pytest.raises(ValueError):
+            ieee.encode_denormalized(1.0)
+        assert ieee.encode_denormalized(1e-40) == ieee._encode_fields(1e-40)
@@ -0,0 +1,169 @@
+"""
+Tests de la instrumentación (core/instrumentation.py) y de su uso en
+ExamBuilder, RendererPipeline y los repositorios.
+"""
+
+import logging
+
+import pytest
+
+from core.exam_builder import ExamBuilder
+from core.instrumentation import (
+    Instrumentation, LoggingInstrumentation, MultiInstrumentation, NullInstrumentation,
+    PrometheusInstrumentation, get_instrumentation, set_instrumentation, use_instrumentation
+)
+from renderers.latex.renderer_base import RendererPipeline, SimpleRendererPhase
+from tests.test_exam_builder_parallel import config_file, reuse_setup  # noqa: F401 (fixtures)
+
+
+class Recorder(Instrumentation):
+    """Instrumentación que apunta cada callback."""
+
+    def __init__(self):
+        self.calls = []
+
+    def span_start(self, name, labels):
+        self.calls.append(("start", name))
+
+    def span_end(self, name, labels, duration_s, error):
+        self.calls.append(("end", name, type(error).__name__ if error else None))
+
+    def event(self, name, message, level=logging.INFO, **labels):
+        self.calls.append(("event", name))
+
+
+class TestPrometheus:
+    def test_contadores_e_histogramas(self):
+        metrics = PrometheusInstrumentation(buckets=(0.01, 0.1))
+        metrics.count("exercises.generated", generator="a")
+        metrics.count("exercises.generated", 2, generator="a")
+        metrics.observe("render.phase", 0.01, phase="p1")
+        metrics.observe("render.phase", 0.05, phase="p1")
+        metrics.observe("render.phase", 3.0, phase="p1")
+
+        text = metrics.render()
+
+        assert '# TYPE exam_generator_exercises_generated_total counter' in text
+        assert 'exam_generator_exercises_generated_total{generator="a"} 3' in text
+        assert 'exam_generator_render_phase_seconds_bucket{phase="p1",le="0.01"} 1' in text
+        assert 'exam_generator_render_phase_seconds_bucket{phase="p1",le="0.1"} 2' in text
+        assert 'exam_generator_render_phase_seconds_bucket{phase="p1",le="+Inf"} 3' in text
+        assert 'exam_generator_render_phase_seconds_count{phase="p1"} 3' in text
+        assert metrics.histogram_count("render.phase", phase="p1") == 3
+
+    def test_escapa_etiquetas(self):
+        metrics = PrometheusInstrumentation()
+        metrics.count("x", tipo='a"b\\c')
+        assert 'exam_generator_x_total{tipo="a\\"b\\\\c"} 1' in metrics.render()
+
+    def test_write_atomico(self, tmp_path):
+        metrics = PrometheusInstrumentation()
+        metrics.count("x")
+        path = metrics.write(tmp_path / "m" / "exam.prom")
+        assert path.read_text(encoding="utf-8") == metrics.render()
+        assert list(path.parent.iterdir()) == [path]
+
+
+class TestInstrumentacionActiva:
+    def test_por_defecto_no_hace_nada(self):
+        instrumentation = get_instrumentation()
+        assert isinstance(instrumentation, NullInstrumentation)
+        assert instrumentation.span("a") is instrumentation.span("b")
+
+    def test_use_instrumentation_restaura(self):
+        previous = get_instrumentation()
+        with use_instrumentation(Recorder()) as recorder:
+            assert get_instrumentation() is recorder
+        assert get_instrumentation() is previous
+        assert set_instrumentation(None) is previous
+        assert isinstance(get_instrumentation(), NullInstrumentation)
+
+    def test_span_con_error(self):
+        recorder = Recorder()
+        with pytest.raises(ValueError):
+            with recorder.span("fallo"):
+                raise ValueError("x")
+        assert recorder.calls == [("start", "fallo"), ("end", "fallo", "ValueError")]
+
+    def test_multi_y_logging(self, caplog):
+        metrics = PrometheusInstrumentation()
+        multi = MultiInstrumentation(LoggingInstrumentation(), metrics, NullInstrumentation())
+        with caplog.at_level(logging.INFO, logger="exam_generator"):
+            multi.event("build.start", "[BUILD] hola")
+            with multi.span("build"):
+                pass
+        assert "[BUILD] hola" in caplog.messages
+        assert metrics.histogram_count("build") == 1
+        assert len(multi.sinks) == 2
+
+
+class TestExamBuilder:
+    def test_contadores_y_tiempos_por_generador(self, config_file, capsys):
+        metrics = PrometheusInstrumentation()
+        builder = ExamBuilder(config_file, instrumentation=metrics)
+        builder.build()
+
+        assert metrics.counter_value("exercises.generated", generator="dummy_a") == 8
+        assert metrics.histogram_count("build.generate", generator="dummy_b") == 4
+        assert metrics.histogram_count("build") == 1
+        assert capsys.readouterr().out == ""  # Sin print() en el camino caliente
+
+    def test_paralelo_registra_tiempos_del_worker(self, config_file):
+        metrics = PrometheusInstrumentation()
+        with use_instrumentation(metrics):
+            ExamBuilder(config_file).build(workers=2)
+        assert metrics.histogram_count("build.generate", generator="dummy_a") == 8
+
+    def test_reutilizados_y_guardados(self, reuse_setup):
+        config_file, repo = reuse_setup
+        for problem_id in [s.id for s in repo.list_summaries(fields=("id",))][2:]:
+            repo.delete(problem_id)
+        metrics = PrometheusInstrumentation()
+
+        ExamBuilder(config_file, problem_repository=repo, instrumentation=metrics).build(
+            reuse_probability=1.0, workers=1)
+
+        assert metrics.counter_value("exercises.reused", generator="numeracion") == 2
+        assert metrics.counter_value("exercises.generated", generator="numeracion") == 4
+        assert metrics.counter_value("exercises.saved") == 4
+        assert metrics.histogram_count("repo.save_many") == 1
+
+    def test_progreso_por_ejercicio_en_info(self, reuse_setup, caplog):
+        # main_v2 deja el logger en INFO: [REUSE] debe seguir viéndose
+        config_file, repo = reuse_setup
+        with caplog.at_level(logging.INFO, logger="exam_generator"):
+            ExamBuilder(config_file, problem_repository=repo,
+                        instrumentation=LoggingInstrumentation()).build(reuse_probability=1.0, workers=1)
+        assert any("[REUSE]" in message for message in caplog.messages)
+
+
+class TestRendererPipeline:
+    def test_tiempos_por_fase_y_ficheros(self, tmp_path):
+        metrics = PrometheusInstrumentation()
+        pipeline = RendererPipeline("x", str(tmp_path), instrumentation=metrics)
+        pipeline.add_phase(SimpleRendererPhase("a")).add_phase(SimpleRendererPhase("b"))
+
+        pipeline.render({"title": "T"})
+        pipeline.render({"title": "T"})
+
+        assert metrics.histogram_count("render.phase", type="x", phase="a") == 2
+        assert metrics.histogram_count("render", type="x") == 2
+        assert metrics.counter_value("render.files_written", type="x") == 2
+        assert metrics.counter_value("render.files_unchanged", type="x") == 2
+
+    def test_progreso_como_eventos(self, tmp_path, capsys):
+        recorder = Recorder()
+        pipeline = RendererPipeline("x", str(tmp_path), instrumentation=recorder)
+        pipeline.add_phase(SimpleRendererPhase("a"))
+        pipeline.render_batch([{"title": "1"}, {"title": "2"}])
+
+        assert ("event", "render.progress") in recorder.calls
+        assert ("end", "render.batch", None) in recorder.calls
+        assert capsys.readouterr().out == ""
+
+    def test_verbose_false_sin_eventos(self, tmp_path):
+        recorder = Recorder()
+        pipeline = RendererPipeline("x", str(tmp_path), verbose=False, instrumentation=recorder)
+        pipeline.add_phase(SimpleRendererPhase("a"))
+        pipeline.render({"title": "T"})
+        assert not [call for call in recorder.calls if call[0] == "event"]
@@ -0,0 +1,106 @@
+"""
+Tests del preámbulo compartido de LatexExamRenderer.
+
+El preámbulo estático (paquetes + cabecera de página) se genera una vez y es
+idéntico en examen, solución y variantes; solo el título va por documento.
+"""
+
+import os
+
+import pytest
+
+from renderers.latex.main_renderer import LatexExamRenderer
+from renderers.latex.pdf_compiler import FORMAT_DUMP_MARKER, PdfCompileService
+
+from tests.test_pdf_compiler import StubCompiler
+
+
+@pytest.fixture
+def renderers():
+    return LatexExamRenderer(is_solution=False), LatexExamRenderer(is_solution=True)
+
+
+class TestPreambuloEstatico:
+    def test_termina_en_marcador(self, renderers):
+        exam, _ = renderers
+        assert exam.get_static_preamble().rstrip().endswith(FORMAT_DUMP_MARKER)
+
+    def test_identico_en_examen_solucion_y_variantes(self, renderers):
+        exam, solution = renderers
+        documents = [exam.render([]), exam.render([], variant=1),
+                     solution.render([], variant=2), solution.render([])]
+
+        static = exam.get_static_preamble()
+        assert static == solution.get_static_preamble()
+        assert all(doc.startswith(static) for doc in documents)
+
+    def test_campos_de_variante_despues_del_marcador(self, renderers):
+        _, solution = renderers
+        document = solution.render([], variant=7)
+        static, dynamic = document.split(FORMAT_DUMP_MARKER, 1)
+
+        assert "Modelo 7" in dynamic and "SOLUCIÓN" in dynamic
+        assert "Modelo" not in static and "SOLUCIÓN" not in static
+        assert "\\begin{document}" in dynamic
+
+    def test_se_genera_una_vez(self, renderers, monkeypatch):
+        exam, solution = renderers
+        calls = []
+        original = LatexExamRenderer._build_static_preamble
+
+        def counting(self):
+            calls.append(self)
+            return original(self)
+
+        monkeypatch.setattr(LatexExamRenderer, "_build_static_preamble", counting)
+        for variant in range(1, 6):
+            exam.render([], variant=variant)
+        solution.share_static_preamble(exam)
+        solution.render([], variant=1)
+
+        assert calls == [exam]
+
+    def test_no_comparte_con_otra_configuracion(self, renderers):
+        exam, solution = renderers
+        solution.header_config = dict(solution.header_config, university="Otra")
+
+        solution.share_static_preamble(exam)
+
+        assert "Otra" in solution.get_static_preamble()
+
+
+class TestFicheroCompartido:
+    def test_escribe_documento_volcable(self, renderers, tmp_path):
+        exam, _ = renderers
+        path = exam.write_static_preamble(str(tmp_path))
+
+        content = open(path, encoding="utf-8").read()
+        assert content.startswith(exam.get_static_preamble())
+        assert content.rstrip().endswith("\\end{document}")
+
+    def test_no_reescribe_si_no_cambia(self, renderers, tmp_path):
+        exam, _ = renderers
+        path = tmp_path / "Preambulo_V2.tex"
+        exam.write_static_preamble(str(tmp_path))
+        os.utime(path, ns=(0, 0))
+
+        exam.write_static_preamble(str(tmp_path))
+
+        assert path.stat().st_mtime_ns == 0
+
+    def test_formato_compartido_por_todas_las_variantes(self, renderers, tmp_path):
+        exam, solution = renderers
+        compiler = StubCompiler()
+        with PdfCompileService(compiler=compiler, cache_dir=tmp_path / "cache", workers=4) as service:
+            service.prepare_format(exam.write_static_preamble(str(tmp_path)))
+            paths = []
+            for variant in range(1, 4):
+                for renderer, name in ((exam, "Examen"), (solution, "Solucion")):
+                    path = tmp_path / f"{name}_M{variant}.tex"
+                    path.write_text(renderer.render([], variant=variant), encoding="utf-8")
+                    paths.append(path)
+            results = service.compile_many(paths)
+
+        assert len(compiler.formats) == 1
+        assert len({r.format_name for r in results}) == 1
+        assert results[0].format_name is not None
@@ -0,0 +1,81 @@
+"""
+Tests del renderizado en streaming (render_to) de LatexExamRenderer.
+
+render() es un envoltorio de render_to(): ambos deben producir el mismo
+documento, y render_to() debe escribir cada ejercicio según se renderiza.
+"""
+
+import io
+
+import pytest
+
+from renderers.latex.main_renderer import LatexExamRenderer
+from renderers.latex.numeracion_renderer import NumeracionLatexRenderer
+
+
+class CountingStream(io.StringIO):
+    """StringIO que cuenta las llamadas a write()."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.mark.parametrize("is_solution", [False, True])
+class TestRenderTo:
+    def test_igual_que_render(self, is_solution, make_conversion):
+        renderer = LatexExamRenderer(is_solution=is_solution)
+        exercises = [make_conversion(i) for i in range(1, 4)]
+        out = io.StringIO()
+
+        renderer.render_to(out, exercises, variant=2)
+
+        assert out.getvalue() == renderer.render(exercises, variant=2)
+
+    def test_tipo_desconocido(self, is_solution):
+        renderer = LatexExamRenderer(is_solution=is_solution)
+        out = io.StringIO()
+
+        renderer.render_to(out, ["no es un ejercicio"])
+
+        assert "No hay renderizador para str" in out.getvalue()
+        assert out.getvalue().endswith(r"\end{document}")
+
+
+class TestStreaming:
+    def test_escribe_cada_ejercicio_al_renderizarlo(self, make_conversion):
+        renderer = LatexExamRenderer()
+        out = io.StringIO()
+        seen = []
+
+        def exercises():
+            for i in range(1, 4):
+                # Al pedir el ejercicio i, el anterior ya está escrito
+                seen.append(out.getvalue().count(r"\section*{Ejercicio"))
+                yield make_conversion(i)
+
+        renderer.render_to(out, exercises())
+
+        assert seen == [0, 1, 2]
+        assert out.getvalue().count(r"\section*{Ejercicio") == 3
+
+    def test_fragmentos_sin_acumular(self, make_conversion):
+        out = CountingStream()
+
+        NumeracionLatexRenderer(is_solution=True).render_to(out, make_conversion(5), 1)
+
+        assert out.writes > 10
+
+    def test_render_grid_envoltorio(self, make_conversion):
+        renderer = NumeracionLatexRenderer(is_solution=True)
+        op = make_conversion(3).operations[0]
+        out = io.StringIO()
+
+        renderer._render_grid_to(out, 8, op)
+
+        assert out.getvalue() == renderer._render_grid(8, op)
+        assert out.getvalue().startswith(r"\begin{center}")
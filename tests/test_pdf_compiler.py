@@ -0,0 +1,292 @@
+"""
+Tests del servicio de compilación PDF (renderers/latex/pdf_compiler.py).
+
+No necesitan LaTeX: un compilador stub "compila" copiando el .tex al PDF.
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from core.instrumentation import LoggingInstrumentation, PrometheusInstrumentation
+from renderers.latex.pdf_compiler import (
+    CompileError, FORMAT_DUMP_MARKER, LatexCompiler, PdfCompileService
+)
+
+
+class StubCompiler(LatexCompiler):
+    """Compilador falso: el PDF es el propio .tex; registra llamadas."""
+
+    name = "stub"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.compiled = []
+        self.formats = []
+        self.formats_used = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def build_format(self, preamble_path, jobname, output_dir):
+        time.sleep(self.delay)
+        with self._lock:
+            self.formats.append(preamble_path.read_text(encoding="utf-8"))
+        format_path = output_dir / f"{jobname}.fmt"
+        format_path.write_text("fmt", encoding="utf-8")
+        return format_path
+
+    def compile(self, tex_path, output_dir, format_path=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise CompileError("stub falló", "! Undefined control sequence.")
+            pdf = output_dir / f"{tex_path.stem}.pdf"
+            pdf.write_bytes(tex_path.read_bytes())
+            with self._lock:
+                self.compiled.append(tex_path.name)
+                self.formats_used.append(format_path)
+            return pdf
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def write_tex(directory, name, body, preamble="\\documentclass{article}\n"):
+    path = directory / name
+    path.write_text(
+        preamble + FORMAT_DUMP_MARKER + "\n\\begin{document}\n" + body + "\n\\end{document}",
+        encoding="utf-8"
+    )
+    return path
+
+
+@pytest.fixture
+def service_factory(tmp_path):
+    services = []
+
+    def factory(compiler, **kwargs):
+        service = PdfCompileService(compiler=compiler, cache_dir=tmp_path / "cache", **kwargs)
+        services.append(service)
+        return service
+
+    yield factory
+    for service in services:
+        service.close()
+
+
+class TestCompilacion:
+    def test_genera_pdf_junto_al_tex(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+
+        result = service.compile(tex)
+
+        assert result.pdf_path == tex.with_suffix(".pdf")
+        assert result.pdf_path.read_bytes() == tex.read_bytes()
+        assert not result.cached
+        assert compiler.compiled == ["Examen_V2.tex"]
+
+    def test_destino_explicito(self, tmp_path, service_factory):
+        service = service_factory(StubCompiler())
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+
+        result = service.compile(tex, tmp_path / "otro.pdf")
+
+        assert result.pdf_path == tmp_path / "otro.pdf"
+        assert result.pdf_path.exists()
+
+    def test_error_se_propaga_y_no_se_cachea(self, tmp_path, service_factory):
+        service = service_factory(StubCompiler(fail=True))
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+
+        with pytest.raises(CompileError) as excinfo:
+            service.compile(tex)
+
+        assert "Undefined" in excinfo.value.log
+        assert not list((tmp_path / "cache").glob("*.pdf"))
+
+    def test_workers_invalidos(self, tmp_path):
+        with pytest.raises(ValueError):
+            PdfCompileService(compiler=StubCompiler(), workers=0, cache_dir=tmp_path)
+
+
+class TestCache:
+    def test_mismo_contenido_no_recompila(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+
+        service.compile(tex)
+        tex.with_suffix(".pdf").unlink()
+        result = service.compile(tex)
+
+        assert result.cached
+        assert result.pdf_path.exists()
+        assert compiler.compiled == ["Examen_V2.tex"]
+        assert (service.compiled, service.cache_hits) == (1, 1)
+
+    def test_contenido_distinto_recompila(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+        service.compile(tex)
+
+        write_tex(tmp_path, "Examen_V2.tex", "adiós")
+        result = service.compile(tex)
+
+        assert not result.cached
+        assert len(compiler.compiled) == 2
+
+    def test_componente_incluido_cambia_la_clave(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        (tmp_path / "components").mkdir()
+        component = tmp_path / "components" / "ej1_kmap.tex"
+        component.write_text("\\input{components/ej1_nested}\n", encoding="utf-8")
+        nested = tmp_path / "components" / "ej1_nested.tex"
+        nested.write_text("% tikz v1\n", encoding="utf-8")
+        tex = write_tex(tmp_path, "Examen_V2.tex",
+                        "\\input{components/ej1_kmap.tex}\n\\includegraphics[height=1cm]{logo}")
+        (tmp_path / "logo.png").write_bytes(b"png v1")
+
+        assert not service.compile(tex).cached
+        assert service.compile(tex).cached
+
+        nested.write_text("% tikz v2\n", encoding="utf-8")  # Solo cambia un \input anidado
+        assert not service.compile(tex).cached
+        (tmp_path / "logo.png").write_bytes(b"png v2")
+        assert not service.compile(tex).cached
+        assert len(compiler.compiled) == 3
+
+    def test_comentarios_no_son_dependencias(self, tmp_path, service_factory):
+        service = service_factory(StubCompiler())
+        tex = write_tex(tmp_path, "Examen_V2.tex", "% \\input{components/nada}\nhola")
+        assert service.content_hash(tex.read_text(encoding="utf-8"), tmp_path) == \
+            service.content_hash(tex.read_text(encoding="utf-8"))
+
+    def test_cache_persiste_entre_servicios(self, tmp_path, service_factory):
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+        service_factory(StubCompiler()).compile(tex)
+
+        compiler = StubCompiler()
+        result = service_factory(compiler).compile(tex)
+
+        assert result.cached
+        assert compiler.compiled == []
+
+
+class TestConcurrencia:
+    def test_examen_y_solucion_en_paralelo(self, tmp_path, service_factory):
+        compiler = StubCompiler(delay=0.2)
+        service = service_factory(compiler, workers=2)
+        paths = [write_tex(tmp_path, "Examen_V2.tex", "e"),
+                 write_tex(tmp_path, "Solucion_V2.tex", "s")]
+
+        results = service.compile_many(paths)
+
+        assert [r.tex_path.name for r in results] == ["Examen_V2.tex", "Solucion_V2.tex"]
+        assert compiler.max_active == 2
+
+    def test_contadores_desde_varios_hilos(self, tmp_path, service_factory):
+        service = service_factory(StubCompiler(), workers=8)
+        paths = [write_tex(tmp_path, f"M{i}.tex", str(i % 10)) for i in range(40)]
+        service.compile_many(paths)
+        service.compile_many(paths)
+        assert service.compiled + service.cache_hits == 80
+
+    def test_pool_acotado(self, tmp_path, service_factory):
+        compiler = StubCompiler(delay=0.05)
+        service = service_factory(compiler, workers=2)
+        paths = [write_tex(tmp_path, f"M{i}.tex", str(i)) for i in range(6)]
+
+        service.compile_many(paths)
+
+        assert compiler.max_active <= 2
+        assert sorted(compiler.compiled) == sorted(p.name for p in paths)
+
+
+class TestFormato:
+    def test_formato_compartido_se_construye_una_vez(self, tmp_path, service_factory):
+        compiler = StubCompiler(delay=0.05)
+        service = service_factory(compiler, workers=4)
+        paths = [write_tex(tmp_path, f"M{i}.tex", str(i)) for i in range(4)]
+
+        results = service.compile_many(paths)
+
+        assert len(compiler.formats) == 1
+        assert compiler.formats[0].startswith("\\documentclass{article}\n")
+        assert len({r.format_name for r in results}) == 1
+        assert all(fmt is not None for fmt in compiler.formats_used)
+
+    def test_preambulos_distintos_formatos_distintos(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        a = write_tex(tmp_path, "a.tex", "x")
+        b = write_tex(tmp_path, "b.tex", "x", preamble="\\documentclass{report}\n")
+
+        service.compile_many([a, b])
+
+        assert len(compiler.formats) == 2
+
+    def test_sin_marcador_no_usa_formato(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler)
+        tex = tmp_path / "plano.tex"
+        tex.write_text("\\documentclass{article}\\begin{document}x\\end{document}", encoding="utf-8")
+
+        result = service.compile(tex)
+
+        assert compiler.formats == []
+        assert result.format_name is None
+
+    def test_use_format_false(self, tmp_path, service_factory):
+        compiler = StubCompiler()
+        service = service_factory(compiler, use_format=False)
+
+        service.compile(write_tex(tmp_path, "a.tex", "x"))
+
+        assert compiler.formats == []
+        assert compiler.formats_used == [None]
+
+    def test_fallo_del_formato_compila_sin_formato(self, tmp_path, service_factory):
+        class BrokenFormat(StubCompiler):
+            def build_format(self, preamble_path, jobname, output_dir):
+                raise CompileError("sin mylatexformat")
+
+        compiler = BrokenFormat()
+        service = service_factory(compiler)
+
+        result = service.compile(write_tex(tmp_path, "a.tex", "x"))
+
+        assert result.pdf_path.exists()
+        assert compiler.formats_used == [None]
+
+
+class TestInstrumentacion:
+    def test_eventos_contadores_y_tiempos(self, tmp_path, service_factory, capsys):
+        metrics = PrometheusInstrumentation()
+        service = service_factory(StubCompiler(), instrumentation=metrics)
+        tex = write_tex(tmp_path, "Examen_V2.tex", "hola")
+
+        service.compile_many([tex])
+        service.compile(tex)
+
+        assert metrics.counter_value("pdf.compiled") == 1
+        assert metrics.counter_value("pdf.cache_hits") == 1
+        assert metrics.counter_value("pdf.formats_built") == 1
+        assert metrics.histogram_count("pdf.compile") == 2
+        assert capsys.readouterr().out == ""  # Sin print() desde los hilos del pool
+
+    def test_progreso_por_logging(self, tmp_path, service_factory, caplog):
+        service = service_factory(StubCompiler(), instrumentation=LoggingInstrumentation())
+        with caplog.at_level(logging.INFO, logger="exam_generator"):
+            service.compile(write_tex(tmp_path, "Examen_V2.tex", "hola"))
+        assert any(message.startswith("   [PDF] Examen_V2.tex") for message in caplog.messages)
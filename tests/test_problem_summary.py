@@ -0,0 +1,69 @@
+"""
+Tests para los listados por proyección (list_summaries) y ProblemSummary.
+"""
+
+import pytest
+
+from models.problem import ProblemSummary
+from models.problem_type import ProblemType
+
+
+class TestListSummaries:
+    def test_campos_del_resumen(self, repo, make_problem):
+        problem = make_problem(1, ProblemType.KARNAUGH, difficulty=3, tags=["a", "b"])
+        repo.save(problem)
+
+        [summary] = repo.list_summaries()
+        assert summary.id == problem.id
+        assert summary.type is ProblemType.KARNAUGH
+        assert summary.title == "Problema 1"
+        assert summary.topic == "Test"
+        assert summary.difficulty == 3
+        assert summary.tags == ["a", "b"]
+        assert summary.created_at == problem.metadata.created_at
+        assert not summary.is_loaded
+
+    def test_mismos_resultados_que_list(self, repo, make_problem):
+        for i in range(12):
+            repo.save(make_problem(i, difficulty=1 + i % 3, tags=["x"] if i % 4 == 0 else []))
+
+        for filters in ({}, {"difficulty": 2}, {"tags": ["x"]}, {"limit": 5, "offset": 3}):
+            expected = [p.id for p in repo.list(dict(filters))]
+            assert [s.id for s in repo.list_summaries(dict(filters))] == expected
+
+    def test_proyeccion_y_carga_perezosa(self, repo, make_problem):
+        problem = make_problem(7)
+        repo.save(problem)
+
+        [summary] = repo.list_summaries(fields=("title",))
+        assert summary.title == "Problema 7"
+        assert not summary.is_loaded
+
+        # Atributos fuera del resumen cargan el Problem completo
+        assert summary.statement.text == "Enunciado del problema 7"
+        assert summary.is_loaded
+        assert summary.difficulty == 1
+        assert summary.problem.solution.solution_fields == {"sol_bin": "00000111"}
+
+    def test_campo_desconocido(self, repo):
+        with pytest.raises(ValueError):
+            list(repo.list_summaries(fields=("statement",)))
+
+
+class TestProblemSummary:
+    def test_from_problem_no_necesita_loader(self, make_problem):
+        problem = make_problem(3)
+        summary = ProblemSummary.from_problem(problem)
+        assert summary.is_loaded
+        assert summary.problem is problem
+        assert summary.metadata is problem.metadata
+
+    def test_sin_loader(self):
+        summary = ProblemSummary("abc", title="T")
+        with pytest.raises(RuntimeError):
+            summary.statement
+
+    def test_slots(self):
+        summary = ProblemSummary("abc", title="T")
+        assert not hasattr(summary, "__dict__")
+        assert "abc" in repr(summary)
@@ -0,0 +1,123 @@
+"""
+Tests para export/import en streaming de cli/problems.py (JSON, NDJSON, gzip).
+"""
+
+import gzip
+import json
+
+import pytest
+
+from cli.problems import ProblemsCLI, detect_format
+from database import SQLiteProblemRepository
+from models.problem_type import ProblemType
+
+
+@pytest.fixture
+def target(tmp_path):
+    repository = SQLiteProblemRepository(str(tmp_path / "target.db"))
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def fill(repo, make_problem):
+    """Guarda n problemas en `repo` y los devuelve."""
+    def _fill(n=25):
+        problems = [make_problem(i, ProblemType.NUMERACION if i % 5 else ProblemType.MSI)
+                    for i in range(n)]
+        repo.save_many(problems)
+        return problems
+    return _fill
+
+
+class TestExport:
+    @pytest.mark.parametrize("name", ["out.ndjson", "out.ndjson.gz"])
+    def test_ndjson_una_linea_por_problema(self, repo, tmp_path, name, fill):
+        problems = fill()
+        path = tmp_path / name
+        ProblemsCLI(repo).export(str(path), format="ndjson")
+
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert sorted(json.loads(line)["id"] for line in lines) == sorted(p.id for p in problems)
+
+    def test_json_valido_y_filtrado(self, repo, tmp_path, fill):
+        fill()
+        path = tmp_path / "out.json"
+        ProblemsCLI(repo).export(str(path), format="json", type_filter="msi", chunk_size=2)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["total"] == 5
+        assert len(data["problems"]) == 5
+        assert all(p["type"] == "msi" for p in data["problems"])
+
+    def test_json_vacio(self, repo, tmp_path):
+        path = tmp_path / "empty.json"
+        ProblemsCLI(repo).export(str(path), format="json")
+        assert json.loads(path.read_text(encoding="utf-8"))["problems"] == []
+
+    def test_progreso(self, repo, tmp_path, capsys, fill):
+        fill(n=10)
+        ProblemsCLI(repo).export(str(tmp_path / "out.ndjson"), format="ndjson", progress_every=4)
+        out = capsys.readouterr().out
+        assert out.count("[PROGRESS]") == 2
+        assert "10 problemas" in out
+
+
+class TestImport:
+    @pytest.mark.parametrize("name,format", [
+        ("bank.ndjson.gz", "ndjson"), ("bank.ndjson", "ndjson"), ("bank.json", "json")])
+    def test_ida_y_vuelta(self, repo, target, tmp_path, name, format, fill):
+        problems = fill()
+        path = tmp_path / name
+        ProblemsCLI(repo).export(str(path), format=format)
+
+        ProblemsCLI(target).import_from_file(str(path), batch_size=7)
+        assert target.count() == len(problems)
+        original = problems[3]
+        assert target.load(original.id).to_dict() == original.to_dict()
+
+    def test_salta_duplicados_en_bloque(self, repo, target, tmp_path, capsys, monkeypatch, fill):
+        problems = fill(n=10)
+        path = tmp_path / "bank.ndjson"
+        ProblemsCLI(repo).export(str(path), format="ndjson")
+        target.save_many(problems[:4])
+
+        # Sin exists() por problema: una consulta por lote
+        monkeypatch.setattr(target, "exists", lambda _: pytest.fail("exists() por problema"))
+        ProblemsCLI(target).import_from_file(str(path), batch_size=3)
+
+        assert target.count() == 10
+        assert "6 nuevos, 4 duplicados saltados" in capsys.readouterr().out
+
+    def test_un_save_many_por_lote(self, repo, target, tmp_path, monkeypatch, fill):
+        fill(n=10)
+        path = tmp_path / "bank.ndjson"
+        ProblemsCLI(repo).export(str(path), format="ndjson")
+
+        sizes = []
+        original = target.save_many
+        monkeypatch.setattr(target, "save_many", lambda ps: sizes.append(len(ps)) or original(ps))
+        ProblemsCLI(target).import_from_file(str(path), batch_size=4)
+        assert sizes == [4, 4, 2]
+
+    def test_repetidos_dentro_del_fichero_y_lineas_rotas(self, target, tmp_path, capsys, make_problem):
+        problem = make_problem(1)
+        line = json.dumps(problem.to_dict())
+        path = tmp_path / "bank.jsonl"
+        path.write_text(f"{line}\n\n{{roto\n{line}\n", encoding="utf-8")
+
+        ProblemsCLI(target).import_from_file(str(path))
+        assert target.count() == 1
+        out = capsys.readouterr().out
+        assert "Línea 3 ignorada" in out
+        assert "1 nuevos, 1 duplicados saltados" in out
+
+
+class TestDetectFormat:
+    def test_por_extension(self):
+        assert detect_format("a.ndjson.gz") == "ndjson"
+        assert detect_format("a.JSONL") == "ndjson"
+        assert detect_format("a.json.gz") == "json"
+        assert detect_format("a.csv") == "csv"
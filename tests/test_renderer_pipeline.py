@@ -0,0 +1,267 @@
+"""
+Tests del RendererPipeline con dependencias entre fases
+(renderers/latex/renderer_base.py).
+"""
+
+import threading
+import time
+
+import pytest
+
+from modules.numeracion.models import ConversionRow
+from renderers.latex.phase1_validator import Phase1DataValidator, ValidationError
+from renderers.latex.phase2_structure import Phase2StructureGenerator
+from renderers.latex.phase3_details import Phase3Details
+from renderers.latex.phase4_content import Phase4Content
+from renderers.latex.phase5_text import Phase5Text
+from renderers.latex.renderer_base import (
+    ExerciseRendererPhase, PhaseOutput, PhaseState, RendererPipeline, SimpleRendererPhase
+)
+
+FIVE_PHASES = (Phase1DataValidator, Phase2StructureGenerator, Phase3Details, Phase4Content, Phase5Text)
+
+
+def make_row_json(i: int = 5) -> dict:
+    return ConversionRow(
+        title=f"Fila {i}", description="Convierte", label="a", val_decimal=i, target_col_idx=0,
+        representable=True, target_val_str=format(i, "08b"), sol_bin=format(i, "08b"),
+        sol_c2=format(i, "08b"), sol_sm=format(i, "08b"), sol_bcd="NR",
+    ).asdict()
+
+
+def make_pipeline(tmp_path, workers=1):
+    pipeline = RendererPipeline("numeracion", output_dir=str(tmp_path), workers=workers, verbose=False)
+    for phase_cls in FIVE_PHASES:
+        pipeline.add_phase(phase_cls())
+    return pipeline
+
+
+def chain_reference(exercise_json, is_solution):
+    """Encadenado clásico, fase a fase, con dicts planos."""
+    outputs = []
+    current = exercise_json
+    for phase_cls in FIVE_PHASES:
+        output = phase_cls().render(current, is_solution=is_solution)
+        outputs.append(output.latex_content)
+        current = output.output_json
+    return outputs
+
+
+class RecordingPhase(ExerciseRendererPhase):
+    """Fase de prueba: registra inicio/fin y opcionalmente lee una clave."""
+
+    def __init__(self, name, provides=None, reads=None, delay=0.0, log=None):
+        self._name = name
+        self.provides = provides
+        self.requires = (reads,) if reads else ()
+        self.reads = reads
+        self.delay = delay
+        self.log = log if log is not None else []
+
+    def render(self, exercise_json, is_solution=False):
+        self.log.append(("start", self._name, time.monotonic()))
+        seen = exercise_json[self.reads] if self.reads else None
+        time.sleep(self.delay)
+        self.log.append(("end", self._name, time.monotonic()))
+        output_json = self._with_state(exercise_json, self.provides, {"from": self._name, "seen": seen}) \
+            if self.provides else None
+        return PhaseOutput(f"% {self._name}\n", output_json, self._name, f"{self._name}.tex")
+
+    @property
+    def phase_name(self):
+        return self._name
+
+
+class TestPhaseState:
+    def test_with_state_no_modifica_ni_copia(self):
+        problem = {"label": "a"}
+        base = {"problem": problem}
+        state = PhaseState.of(base)
+
+        new = state.with_state("phase2_structure", {"num_rows": 1})
+
+        assert "phase2_structure" not in state and "phase2_structure" not in base
+        assert new["problem"] is problem
+        assert new.to_dict() == {"problem": problem, "phase2_structure": {"num_rows": 1}}
+        assert len(new) == 2
+
+    def test_capas_pendientes_se_resuelven_al_leer(self):
+        from concurrent.futures import Future
+        pending = Future()
+        state = PhaseState({}, {"x": pending})
+        threading.Timer(0.05, pending.set_result, args=(42,)).start()
+        assert state["x"] == 42
+
+
+@pytest.mark.parametrize("is_solution", [False, True])
+class TestEquivalencia:
+    def test_secuencial_igual_que_encadenado(self, tmp_path, is_solution):
+        exercise = make_row_json()
+        make_pipeline(tmp_path).render(exercise, is_solution=is_solution)
+        pipeline = make_pipeline(tmp_path)
+        pipeline.render(exercise, is_solution=is_solution)
+
+        assert [o.latex_content for o in pipeline.phase_outputs] == chain_reference(exercise, is_solution)
+
+    def test_paralelo_igual_que_encadenado(self, tmp_path, is_solution):
+        exercise = make_row_json()
+        with make_pipeline(tmp_path, workers=4) as pipeline:
+            main_tex, files = pipeline.render(exercise, is_solution=is_solution)
+
+        assert [o.latex_content for o in pipeline.phase_outputs] == chain_reference(exercise, is_solution)
+        assert files == [o.tex_filename for o in pipeline.phase_outputs]
+        assert pipeline.phase_outputs[-1].output_json["phase2_structure"]["num_rows"] >= 1
+
+
+class TestDependencias:
+    def test_fases_independientes_se_solapan(self, tmp_path):
+        log = []
+        pipeline = RendererPipeline("x", str(tmp_path), workers=3, verbose=False)
+        pipeline.add_phase(RecordingPhase("a", provides="a", delay=0.2, log=log))
+        pipeline.add_phase(RecordingPhase("b", provides="b", delay=0.2, log=log))
+        pipeline.add_phase(RecordingPhase("c", reads="a", log=log))
+        with pipeline:
+            pipeline.render({})
+
+        times = {(kind, name): t for kind, name, t in log}
+        assert times[("start", "b")] < times[("end", "a")]
+        assert times[("end", "c")] >= times[("end", "a")]
+        assert pipeline.phase_outputs[2].latex_content == "% c\n"
+
+    def test_lectura_perezosa_recibe_valor(self, tmp_path):
+        pipeline = RendererPipeline("x", str(tmp_path), workers=2, verbose=False)
+        pipeline.add_phase(RecordingPhase("a", provides="a", delay=0.05))
+        pipeline.add_phase(RecordingPhase("b", provides="b", reads="a"))
+        with pipeline:
+            pipeline.render({})
+        assert pipeline.phase_outputs[1].output_json["b"]["seen"] == {"from": "a", "seen": None}
+
+    def test_hilos_liberados_sin_close(self, tmp_path):
+        def phase_threads():
+            return [t for t in threading.enumerate() if t.name.startswith("render-phase")]
+
+        pipeline = RendererPipeline("x", str(tmp_path), workers=3, verbose=False)
+        pipeline.add_phase(RecordingPhase("a", provides="a", delay=0.05))
+        pipeline.add_phase(RecordingPhase("b", provides="b", reads="a"))
+        pipeline.render({})
+        assert phase_threads() == []
+        pipeline.render({})  # Un pool nuevo por render()
+        assert phase_threads() == []
+        assert pipeline.phase_outputs[1].output_json["b"]["seen"] == {"from": "a", "seen": None}
+
+    def test_error_de_validacion_tiene_prioridad(self, tmp_path):
+        exercise = make_row_json()
+        del exercise["metadata"]
+        with make_pipeline(tmp_path, workers=4) as pipeline:
+            with pytest.raises(ValidationError):
+                pipeline.render(exercise)
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_validacion_antes_de_cualquier_fase(self, tmp_path, monkeypatch, workers):
+        started = []
+        for phase_cls in FIVE_PHASES[1:]:
+            original = phase_cls.render
+            monkeypatch.setattr(phase_cls, "render",
+                                lambda self, *a, _original=original, **kw:
+                                started.append(self.phase_name) or _original(self, *a, **kw))
+        exercise = make_row_json()
+        del exercise["metadata"]
+
+        for only in (None, ["texto"], ["estructura"]):
+            with make_pipeline(tmp_path, workers=workers) as pipeline:
+                with pytest.raises(ValidationError):
+                    pipeline.render(exercise, only=only)
+        assert started == []
+
+    def test_only_ejecuta_dependencias(self, tmp_path):
+        pipeline = make_pipeline(tmp_path)
+        pipeline.render(make_row_json(), only=["texto"])
+        assert [o.phase_name for o in pipeline.phase_outputs] == [
+            "validador", "estructura", "detalles", "contenido", "texto"]
+
+        pipeline.render(make_row_json(), only=["estructura"])
+        assert [o.phase_name for o in pipeline.phase_outputs] == ["validador", "estructura"]
+
+    def test_only_fase_desconocida(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_pipeline(tmp_path).render(make_row_json(), only=["nada"])
+
+    def test_fases_sin_dependencias_se_encadenan(self, tmp_path):
+        pipeline = RendererPipeline("x", str(tmp_path), workers=4, verbose=False)
+        pipeline.add_phase(SimpleRendererPhase("uno")).add_phase(SimpleRendererPhase("dos"))
+        pipeline.render({"title": "T"})
+        assert [o.latex_content for o in pipeline.phase_outputs] == [
+            "% Phase: uno\n% Ejercicio: T\n", "% Phase: dos\n% Ejercicio: T\n"]
+
+
+class TestFicheros:
+    def test_no_reescribe_fases_sin_cambios(self, tmp_path):
+        pipeline = make_pipeline(tmp_path)
+        pipeline.render(make_row_json(5))
+        pipeline.save_main_file()
+        assert pipeline._writer.writes == 6
+
+        pipeline.render(make_row_json(5))
+        pipeline.save_main_file()
+        assert pipeline._writer.writes == 6
+
+    def test_solo_reescribe_las_que_cambian(self, tmp_path):
+        pipeline = make_pipeline(tmp_path)
+        pipeline.render(make_row_json(5))
+        structure = (tmp_path / "02_fase2_estructura.tex").read_text(encoding="utf-8")
+
+        pipeline.render(make_row_json(6))
+
+        assert 0 < pipeline._writer.writes - 5 < 5
+        assert (tmp_path / "02_fase2_estructura.tex").read_text(encoding="utf-8") == structure
+
+    def test_workers_invalidos(self, tmp_path):
+        with pytest.raises(ValueError):
+            RendererPipeline("x", str(tmp_path), workers=0)
+
+
+class TestRenderBatch:
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_igual_que_render_por_ejercicio(self, tmp_path, workers):
+        exercises = [make_row_json(i) for i in range(1, 6)]
+        pipeline = make_pipeline(tmp_path / "lote")
+
+        main_tex, tex_files = pipeline.render_batch(exercises, workers=workers)
+
+        assert len(tex_files) == 5 * len(FIVE_PHASES)
+        for i, exercise in enumerate(exercises):
+            contents = [o.latex_content for o in pipeline.batch_outputs[i]]
+            assert contents == chain_reference(exercise, is_solution=False)
+        assert main_tex.count("\n\\include{") == len(tex_files)
+
+    def test_ficheros_con_prefijo_por_ejercicio(self, tmp_path):
+        pipeline = make_pipeline(tmp_path)
+
+        _, tex_files = pipeline.render_batch([make_row_json(1), make_row_json(2)])
+
+        assert tex_files[0] == "ej01_00_fase1_validacion.tex"
+        assert tex_files[len(FIVE_PHASES)].startswith("ej02_")
+        assert all((tmp_path / name).exists() for name in tex_files)
+        assert len(set(tex_files)) == len(tex_files)
+
+    def test_main_incluye_en_orden(self, tmp_path):
+        pipeline = make_pipeline(tmp_path)
+        pipeline.render_batch([make_row_json(i) for i in range(3)], workers=3)
+
+        main = pipeline.save_main_file().read_text(encoding="utf-8")
+
+        includes = [line for line in main.splitlines() if line.startswith("\\include{")]
+        assert len(includes) == 3 * len(FIVE_PHASES)
+        assert [line[len("\\include{"):][:4] for line in includes[::len(FIVE_PHASES)]] == ["ej01", "ej02", "ej03"]
+
+    def test_error_indica_primer_ejercicio(self, tmp_path):
+        bad = make_row_json(3)
+        bad.pop("problem")
+        pipeline = make_pipeline(tmp_path)
+
+        with pytest.raises(ValidationError):
+            pipeline.render_batch([make_row_json(1), bad, make_row_json(2)], workers=2)
+
+    def test_workers_invalidos(self, tmp_path):
+        with pytest.raises(ValueError):
+            make_pipeline(tmp_path).render_batch([make_row_json(1)], workers=0)
@@ -0,0 +1,130 @@
+"""
+Tests para repository.sample(): muestreo aleatorio sin repetición por tipo.
+"""
+
+import random
+
+import pytest
+
+from database import FileProblemRepository, SQLiteProblemRepository
+from database.repository import ProblemRepository
+from models.problem_type import ProblemType
+
+
+@pytest.fixture
+def fill(repo, make_problem):
+    """Guarda n problemas en `repo` y los devuelve."""
+    def _fill(n=40):
+        problems = [make_problem(i, ProblemType.NUMERACION if i % 4 else ProblemType.KARNAUGH)
+                    for i in range(n)]
+        repo.save_many(problems)
+        return problems
+    return _fill
+
+
+class TestSample:
+    def test_solo_del_tipo_y_sin_repeticion(self, repo, fill):
+        fill()
+        sample = repo.sample(ProblemType.NUMERACION, k=10, seed=1)
+        ids = [p.id for p in sample]
+        assert len(ids) == 10
+        assert len(set(ids)) == 10
+        assert all(p.type is ProblemType.NUMERACION for p in sample)
+
+    def test_reproducible_con_semilla(self, repo, fill):
+        fill()
+        first = [p.id for p in repo.sample("numeracion", k=5, seed=7)]
+        second = [p.id for p in repo.sample(ProblemType.NUMERACION, k=5, seed=7)]
+        assert first == second
+
+    def test_excluye_ids(self, repo, fill):
+        problems = fill()
+        excluded = {p.id for p in problems if p.type is ProblemType.NUMERACION}
+        excluded.discard(problems[1].id)
+        [only] = repo.sample(ProblemType.NUMERACION, k=3, seed=3, exclude_ids=excluded)
+        assert only.id == problems[1].id
+
+    def test_k_mayor_que_disponibles(self, repo, fill):
+        fill(n=8)
+        sample = repo.sample(ProblemType.KARNAUGH, k=10, seed=0)
+        assert len(sample) == 2
+
+    def test_tipo_vacio_y_k_cero(self, repo, fill):
+        fill(n=8)
+        assert repo.sample(ProblemType.MSI, k=3) == []
+        assert repo.sample(ProblemType.NUMERACION, k=0) == []
+
+    def test_sin_tipo_elige_de_todos(self, repo, fill):
+        problems = fill(n=12)
+        sample = repo.sample(k=12, seed=5)
+        assert {p.id for p in sample} == {p.id for p in problems}
+
+    def test_refleja_borrados(self, repo, fill):
+        problems = fill(n=8)
+        for problem in problems:
+            if problem.type is ProblemType.KARNAUGH:
+                repo.delete(problem.id)
+        assert repo.sample(ProblemType.KARNAUGH, k=2) == []
+
+
+class TestSampleEntreBackends:
+    def test_misma_eleccion_en_todos_los_backends(self, tmp_path, make_problem):
+        problems = [make_problem(i) for i in range(60)]
+        file_repo = FileProblemRepository(str(tmp_path / "db"))
+        sqlite_repo = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+        try:
+            for repository in (file_repo, sqlite_repo):
+                repository.save_many(problems)
+            for k in (3, 40):  # Sorteo por posición y lista completa
+                # La implementación por defecto (list_summaries) elige igual que el índice
+                assert ([p.id for p in file_repo.sample(ProblemType.NUMERACION, k=k, seed=11)] ==
+                        ProblemRepository._sample_ids(sqlite_repo, "numeracion", k, random.Random(11), set()))
+            # SQLite sortea rowids; con la lista completa coincide con los demás
+            assert ([p.id for p in sqlite_repo.sample(ProblemType.NUMERACION, k=40, seed=11)] ==
+                    [p.id for p in file_repo.sample(ProblemType.NUMERACION, k=40, seed=11)])
+        finally:
+            sqlite_repo.close()
+
+    def test_sqlite_sortea_rowids_sin_offset(self, tmp_path, make_problem):
+        repo = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+        try:
+            problems = [make_problem(i, ProblemType.NUMERACION if i % 4 else ProblemType.KARNAUGH)
+                        for i in range(400)]
+            repo.save_many(problems)
+            statements = []
+            repo._get_connection().set_trace_callback(statements.append)
+
+            sample = repo.sample(ProblemType.NUMERACION, k=5, seed=4)
+            assert len({p.id for p in sample}) == 5
+            assert all(p.type is ProblemType.NUMERACION for p in sample)
+            assert not any("OFFSET" in sql for sql in statements)
+            assert any("rowid = " in sql for sql in statements)
+            assert [p.id for p in repo.sample(ProblemType.NUMERACION, k=5, seed=4)] == [p.id for p in sample]
+        finally:
+            repo.close()
+
+    def test_sqlite_disperso_lee_todos_los_ids(self, tmp_path, make_problem):
+        repo = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+        try:
+            problems = [make_problem(i) for i in range(100)]
+            repo.save_many(problems)
+            for problem in problems[1:-1]:
+                if problem is not problems[50]:
+                    repo.delete(problem.id)
+            sample = repo.sample(ProblemType.NUMERACION, k=1, seed=0)
+            assert [p.id for p in sample][0] in {problems[0].id, problems[50].id, problems[-1].id}
+        finally:
+            repo.close()
+
+    def test_index_de_tipos_tras_recargar(self, tmp_path, make_problem):
+        repo = FileProblemRepository(str(tmp_path / "db"), compact_every=5)
+        problems = [make_problem(i) for i in range(12)]
+        repo.save_many(problems)
+        repo.delete(problems[0].id)
+
+        reopened = FileProblemRepository(str(tmp_path / "db"))
+        assert reopened._ids_by_type == repo._ids_by_type
+        assert (
+            [p.id for p in reopened.sample(ProblemType.NUMERACION, k=4, seed=2)] ==
+            [p.id for p in repo.sample(ProblemType.NUMERACION, k=4, seed=2)]
+        )
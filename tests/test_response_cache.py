@@ -0,0 +1,83 @@
+"""
+Tests para web.response_cache.ResponseCache (LRU + TTL + ETag).
+"""
+
+import pytest
+
+from web.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMakeKey:
+    def test_canonica(self):
+        a = ResponseCache.make_key('/api/convert', {"value": "10", "to_bases": [2, 16]})
+        b = ResponseCache.make_key('/api/convert', {"to_bases": [2, 16], "value": "10"})
+        assert a == b
+
+    def test_distingue_endpoint_y_cuerpo(self):
+        body = {"E": 8}
+        assert ResponseCache.make_key('/a', body) != ResponseCache.make_key('/b', body)
+        assert ResponseCache.make_key('/a', body) != ResponseCache.make_key('/a', {"E": 9})
+
+
+class TestResponseCache:
+    def test_acierto_y_fallo(self):
+        cache = ResponseCache()
+        assert cache.get("k") is None
+        stored = cache.put("k", b'{"ok": true}')
+        assert cache.get("k") is stored
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+        assert stats['hit_ratio'] == 0.5
+
+    def test_etag_depende_del_contenido(self):
+        cache = ResponseCache()
+        assert cache.put("a", b"x").etag == cache.put("b", b"x").etag
+        assert cache.put("c", b"y").etag != cache.put("d", b"x").etag
+
+    def test_lru_desaloja_el_menos_usado(self):
+        cache = ResponseCache(maxsize=2)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")  # "b" pasa a ser el menos usado
+        cache.put("c", b"3")
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+
+    def test_caducidad(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, clock=clock)
+        cache.put("k", b"1")
+        clock.now = 9.9
+        assert cache.get("k") is not None
+        clock.now = 10.0
+        assert cache.get("k") is None
+        assert cache.stats()['expirations'] == 1
+
+    def test_sin_caducidad(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttl=0, clock=clock)
+        cache.put("k", b"1")
+        clock.now = 10 ** 9
+        assert cache.get("k") is not None
+
+    def test_clear_mantiene_contadores(self):
+        cache = ResponseCache()
+        cache.put("k", b"1")
+        cache.get("k")
+        assert cache.clear() == 1
+        assert cache.get("k") is None
+        assert cache.stats()['hits'] == 1
+
+    def test_maxsize_invalido(self):
+        with pytest.raises(ValueError):
+            ResponseCache(maxsize=0)
@@ -0,0 +1,205 @@
+"""
+Tests para SQLiteProblemRepository: pool de conexiones, WAL y escritura por lotes.
+"""
+
+import threading
+
+import pytest
+
+from database.sqlite_repo import SQLiteProblemRepository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repository = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+    yield repository
+    repository.close()
+
+
+class TestConnectionPool:
+    def test_reutiliza_conexion_en_el_mismo_hilo(self, repo):
+        assert repo._get_connection() is repo._get_connection()
+
+    def test_modo_wal(self, repo):
+        mode = repo._get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_conexion_por_hilo(self, repo, make_problem):
+        main_conn = repo._get_connection()
+        seen = []
+
+        def worker():
+            seen.append(repo._get_connection())
+            repo.save(make_problem(1))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen and seen[0] is not main_conn
+        assert repo.count() == 1
+
+    def test_close_y_reapertura(self, repo, make_problem):
+        repo.save(make_problem(1))
+        repo.close()
+        assert repo.count() == 1
+
+
+class TestSaveMany:
+    def test_roundtrip(self, repo, make_problem):
+        problems = [make_problem(i) for i in range(50)]
+        ids = repo.save_many(problems)
+
+        assert ids == [p.id for p in problems]
+        assert repo.count() == 50
+        assert repo.load(ids[7]).statement.problem_fields == {"val_decimal": 7}
+
+    def test_invalido_no_guarda_nada(self, repo, make_problem):
+        bad = make_problem(2)
+        bad.statement.text = ""
+        with pytest.raises(ValueError):
+            repo.save_many([make_problem(1), bad])
+        assert repo.count() == 0
+
+    def test_reemplaza_existentes(self, repo, make_problem):
+        problem = make_problem(1)
+        repo.save(problem)
+        problem.metadata.title = "Modificado"
+        repo.save_many([problem])
+        assert repo.count() == 1
+        assert repo.load(problem.id).metadata.title == "Modificado"
+
+
+class TestTransaction:
+    def test_commit_al_salir(self, repo, tmp_path, make_problem):
+        with repo.transaction():
+            repo.save(make_problem(1))
+            repo.save(make_problem(2))
+
+        other = SQLiteProblemRepository(str(tmp_path / "problems.db"))
+        try:
+            assert other.count() == 2
+        finally:
+            other.close()
+
+    def test_rollback_con_excepcion(self, repo, make_problem):
+        with pytest.raises(RuntimeError):
+            with repo.transaction():
+                repo.save(make_problem(1))
+                raise RuntimeError("fallo")
+        assert repo.count() == 0
+
+    def test_anidada(self, repo, make_problem):
+        with repo.transaction():
+            repo.save(make_problem(1))
+            with repo.transaction():
+                repo.save_many([make_problem(2), make_problem(3)])
+            repo.delete("no-existe")
+        assert repo.count() == 3
+
+
+class TestTagFilters:
+    def test_list_y_count_por_tag(self, repo, make_problem):
+        repo.save_many([make_problem(i, tags=["par"] if i % 2 == 0 else ["impar"]) for i in range(20)])
+        repo.save(make_problem(100, tags=["par", "especial"]))
+
+        assert repo.count({"tags": ["par"]}) == 11
+        assert repo.count({"tags": ["especial", "impar"]}) == 11
+        assert len(repo.list({"tags": ["par"]})) == 11
+
+    def test_paginacion_tras_filtrar_tags(self, repo, make_problem):
+        repo.save_many([make_problem(i, tags=["x"] if i < 5 else []) for i in range(30)])
+        page = repo.list({"tags": ["x"], "limit": 3, "offset": 3})
+        assert len(page) == 2
+        assert all("x" in p.metadata.tags for p in page)
+
+    def test_actualizar_tags(self, repo, make_problem):
+        problem = make_problem(1, tags=["viejo"])
+        repo.save(problem)
+        repo.update(problem.id, {"metadata.tags": ["nuevo"]})
+        assert repo.count({"tags": ["viejo"]}) == 0
+        assert repo.count({"tags": ["nuevo"]}) == 1
+
+
+class TestSearch:
+    def test_busca_en_titulo_enunciado_y_pistas(self, repo, make_problem):
+        a = make_problem(1)
+        a.metadata.title = "Complemento a dos"
+        b = make_problem(2)
+        b.statement.text = "Convierte usando complemento a uno"
+        c = make_problem(3)
+        c.statement.hints = ["Recuerda el complemento"]
+        d = make_problem(4)
+        repo.save_many([a, b, c, d])
+
+        hits = repo.search("complemento")
+        assert {p.id for p in hits} == {a.id, b.id, c.id}
+        # El título pesa más en el ranking
+        assert hits[0].id == a.id
+
+    def test_ignora_tildes_y_prefijos(self, repo, make_problem):
+        problem = make_problem(1)
+        problem.metadata.title = "Conversión entre bases"
+        repo.save(problem)
+        assert [p.id for p in repo.search("conversion")] == [problem.id]
+        assert [p.id for p in repo.search("conver BAS")] == [problem.id]
+
+    def test_sin_limite_de_1000(self, repo, make_problem):
+        repo.save_many([make_problem(i) for i in range(1200)])
+        target = make_problem(5000)
+        target.metadata.title = "Aguja única"
+        repo.save(target)
+        assert [p.id for p in repo.search("aguja")] == [target.id]
+
+    def test_limit_offset(self, repo, make_problem):
+        repo.save_many([make_problem(i) for i in range(15)])
+        first = repo.search("enunciado", limit=10)
+        rest = repo.search("enunciado", limit=10, offset=10)
+        assert len(first) == 10 and len(rest) == 5
+        assert not {p.id for p in first} & {p.id for p in rest}
+
+    def test_delete_y_clear_limpian_indice(self, repo, make_problem):
+        problem = make_problem(1, tags=["t"])
+        repo.save(problem)
+        repo.delete(problem.id)
+        assert repo.search("problema") == []
+        assert repo.count({"tags": ["t"]}) == 0
+
+        repo.save(make_problem(2, tags=["t"]))
+        repo.clear()
+        assert repo.search("problema") == []
+        assert repo.count({"tags": ["t"]}) == 0
+
+    def test_consulta_con_caracteres_especiales(self, repo, make_problem):
+        repo.save(make_problem(1))
+        assert repo.search('"') == []
+        assert len(repo.search('problema* (1')) == 1
+
+
+class TestMigration:
+    def test_bd_antigua_se_indexa(self, tmp_path, make_problem):
+        import json
+        import sqlite3
+
+        db = tmp_path / "old.db"
+        problem = make_problem(1, tags=["legacy"])
+        conn = sqlite3.connect(str(db))
+        conn.execute("""
+            CREATE TABLE problems (id TEXT PRIMARY KEY, type TEXT NOT NULL, data TEXT NOT NULL,
+                                   difficulty INTEGER, created_at TEXT, updated_at TEXT)
+        """)
+        conn.execute("INSERT INTO problems VALUES (?, ?, ?, ?, ?, ?)", (
+            problem.id, problem.type.value, json.dumps(problem.to_dict()),
+            1, problem.metadata.created_at, problem.metadata.updated_at))
+        conn.commit()
+        conn.close()
+
+        repository = SQLiteProblemRepository(str(db))
+        try:
+            assert repository.count({"tags": ["legacy"]}) == 1
+            assert [p.id for p in repository.search("problema")] == [problem.id]
+            [summary] = repository.list_summaries()
+            assert (summary.title, summary.tags) == ("Problema 1", ["legacy"])
+            assert not summary.is_loaded
+        finally:
+            repository.close()
@@ -0,0 +1,92 @@
+"""
+Tests del motor de tablas de representación (core/tabla_representacion.py)
+y de las funciones generar_tabla_* que lo usan.
+
+Los valores calculados aritméticamente deben coincidir con las conversiones
+por cadena de cada módulo (CB_a_decimal, CBm1_a_decimal, ms_a_decimal,
+ExcK_a_decimal).
+"""
+
+import pytest
+
+from core.cb_representacion import CB_a_decimal, generar_tabla_CB
+from core.enteros_signados import (
+    CBm1_a_decimal, generar_tabla_CBm1, generar_tabla_ms, ms_a_decimal, repr_CBm1
+)
+from core.exceso_k_representacion import ExcK_a_decimal, generar_tabla_ExcK
+from core.tabla_representacion import TablaRepresentacion
+
+
+class TestValores:
+    @pytest.mark.parametrize("base,longitud", [(2, 4), (10, 2), (16, 2), (3, 3)])
+    def test_como_las_conversiones_por_cadena(self, base, longitud):
+        for sistema, a_decimal in (('CB', CB_a_decimal), ('CBm1', CBm1_a_decimal),
+                                   ('ExcK', lambda palabra, b: ExcK_a_decimal(palabra, b, 5))):
+            tabla = TablaRepresentacion(sistema, base, longitud, 5 if sistema == 'ExcK' else None)
+            filas = tabla.pagina()
+            assert len(filas) == base ** longitud
+            assert [fila.codigo for fila in filas] == list(range(base ** longitud))
+            for fila in filas:
+                assert int(fila.palabra, base) == fila.codigo
+                assert fila.valor == a_decimal(fila.palabra, base)
+
+    def test_ms_binario(self):
+        filas = TablaRepresentacion('MS', 2, 5).pagina()
+        assert [fila.valor for fila in filas] == [ms_a_decimal(fila.palabra) for fila in filas]
+
+    def test_cbm1_ida_y_vuelta(self):
+        for numero in (-1239, -1, 0, 5, 4999):
+            assert CBm1_a_decimal(repr_CBm1(numero, 10, 5), 10) == numero
+
+    @pytest.mark.parametrize("sistema", ['CB', 'CBm1', 'MS'])
+    def test_orden_de_valor(self, sistema):
+        tabla = TablaRepresentacion(sistema, 3, 3)
+        filas = tabla.pagina(orden='valor')
+        assert sorted(fila.codigo for fila in filas) == list(range(tabla.total_palabras))
+        assert [fila.valor for fila in filas] == sorted(fila.valor for fila in filas)
+
+
+class TestPaginacion:
+    def test_pagina_de_tabla_enorme(self):
+        tabla = TablaRepresentacion('CB', 36, 32)
+        ultimas = tabla.pagina(offset=tabla.total_palabras - 2)
+        assert [fila.palabra for fila in ultimas] == ['z' * 31 + 'y', 'z' * 32]
+        assert [fila.valor for fila in ultimas] == [-2, -1]
+
+    def test_paginas_concatenadas(self):
+        tabla = TablaRepresentacion('ExcK', 2, 6, K=31)
+        paginas = [tabla.pagina(offset, 10) for offset in range(0, tabla.total_palabras, 10)]
+        assert [fila for pagina in paginas for fila in pagina] == tabla.pagina()
+
+    def test_parametros_invalidos(self):
+        with pytest.raises(ValueError):
+            TablaRepresentacion('CB', 37, 2)
+        with pytest.raises(ValueError):
+            TablaRepresentacion('CB', 2, 33)
+        with pytest.raises(ValueError):
+            TablaRepresentacion('ExcK', 2, 4)
+        with pytest.raises(ValueError):
+            TablaRepresentacion('CB', 2, 4).pagina(orden='azar')
+
+
+class TestGenerarTabla:
+    def test_notas(self):
+        tabla = generar_tabla_CB(2, 4)
+        assert "       7 |            0111 | Maximo positivo" in tabla
+        assert "      -8 |            1000 | Minimo negativo" in tabla
+        assert "       0 |              99 | Cero negativo (-0)" not in generar_tabla_CBm1(10, 2, limit=5)
+        assert "       0 |              99 | Cero negativo (-0)" in generar_tabla_CBm1(10, 2, offset=95)
+        assert "Maximo" in generar_tabla_ExcK(2, 4, 8, offset=15)
+
+    def test_tabla_grande_sin_paginar(self):
+        assert generar_tabla_CB(2, 16).startswith("Tabla muy grande")
+        pagina = generar_tabla_CB(2, 16, offset=32767, limit=2).splitlines()
+        assert pagina[4].split() == ['32767', '|', '0111111111111111', '|', 'Maximo', 'positivo']
+        assert pagina[5].split()[:3] == ['-32768', '|', '1000000000000000']
+
+    def test_generar_tabla_ms(self):
+        tabla = generar_tabla_ms(3)
+        assert [(e['decimal'], e['ms']) for e in tabla] == [
+            (-3, '111'), (-2, '110'), (-1, '101'), (0, '000'), (0, '100'), (1, '001'), (2, '010'), (3, '011')]
+        assert [e.get('nota') for e in tabla[3:5]] == ['+0', '-0 (duplicado)']
+        assert generar_tabla_ms(16, offset=3, limit=2)[0]['decimal'] == -32764
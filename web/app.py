@@ -16,9 +16,10 @@ Uso:
 
 import os
 import sys
+from functools import wraps
 from pathlib import Path
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, make_response, request
 from flask_cors import CORS
 
 # Agregar core/ al path para importar módulos
@@ -30,10 +31,13 @@ sys.path.insert(0, str(WEB_DIR))
 try:
     from core.ieee754 import IEEE754Gen
     from core.punto_fijo_unified import FixedPointUnified
+    from core.distribution import fixed_point_distribution, ieee754_distribution
 except ImportError as e:
     print(f"Error importando módulos core: {e}")
     sys.exit(1)
 
+from response_cache import ResponseCache
+
 # Importar servicios de Lenguajes Formales
 try:
     # Importar desde el módulo web.models (archivo web/models.py)
@@ -89,6 +93,51 @@ CORS(app)
 app.config['JSON_SORT_KEYS'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
 
+# ============================================================================
+# Caché de respuestas (endpoints puros: misma entrada → misma respuesta)
+# ============================================================================
+
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get('API_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('API_CACHE_TTL', 600))
+)
+
+def cached_endpoint(view):
+    """
+    Sirve desde caché las respuestas de un endpoint puro de su cuerpo JSON.
+    
+    Solo se guardan respuestas 200; los errores se recalculan siempre.
+    Cada respuesta lleva ETag: si el cliente envía If-None-Match con el
+    ETag vigente se responde 304 sin cuerpo. La cabecera X-Cache indica
+    HIT o MISS.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        body = request.get_json(silent=True)
+        if body is None:
+            return view(*args, **kwargs)
+        
+        key = response_cache.make_key(request.path, body)
+        entry = response_cache.get(key)
+        cache_status = 'HIT'
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = response_cache.put(key, response.get_data(), response.status_code, response.mimetype)
+            cache_status = 'MISS'
+        
+        if entry.etag in request.if_none_match:
+            response_cache.record_not_modified()
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        response.headers['X-Cache'] = cache_status
+        return response
+    
+    return wrapper
+
 # ============================================================================
 # Inicializar Servicios de Lenguajes Formales
 # ============================================================================
@@ -153,6 +202,7 @@ def language_order():
 # ============================================================================
 
 @app.route('/api/ieee754/encode', methods=['POST'])
+@cached_endpoint
 def ieee754_encode():
     """Codificar número decimal a IEEE754"""
     try:
@@ -198,6 +248,7 @@ def ieee754_encode():
         }), 400
 
 @app.route('/api/ieee754/characteristics', methods=['POST'])
+@cached_endpoint
 def ieee754_characteristics():
     """Obtener características de IEEE754"""
     try:
@@ -228,6 +279,7 @@ def ieee754_characteristics():
         }), 400
 
 @app.route('/api/ieee754/special', methods=['POST'])
+@cached_endpoint
 def ieee754_special():
     """Obtener números especiales (∞, NaN, etc)"""
     try:
@@ -275,6 +327,7 @@ def ieee754_special():
 # ============================================================================
 
 @app.route('/api/convert', methods=['POST'])
+@cached_endpoint
 def convert_bases():
     """Convertir número entre múltiples bases"""
     try:
@@ -336,6 +389,7 @@ def convert_bases():
 # ============================================================================
 
 @app.route('/api/distribution/fixed_point', methods=['POST'])
+@cached_endpoint
 def distribution_fixed_point():
     """Analizar distribución de números en punto fijo"""
     try:
@@ -376,6 +430,7 @@ def distribution_fixed_point():
         }), 400
 
 @app.route('/api/distribution/chart-data', methods=['POST'])
+@cached_endpoint
 def distribution_chart_data():
     """Obtener datos para gráfica de distribución (Chart.js compatible)"""
     try:
@@ -392,6 +447,14 @@ def distribution_chart_data():
                 'error': 'Base inválida. Debe estar entre 2 y 36.'
             }), 400
         
+        # Número de bins del histograma
+        num_bins = int(data.get('bins', 50))
+        if num_bins < 1 or num_bins > 1000:
+            return jsonify({
+                'success': False,
+                'error': 'bins inválido. Debe estar entre 1 y 1000.'
+            }), 400
+        
         if tipo_numero == 'fixed_point':
             # ===== PUNTO FIJO =====
             E = int(data.get('E', 4))
@@ -433,37 +496,9 @@ def distribution_chart_data():
                 }), 400
             
             total_bits = E + F
-            total_numbers = 2 ** total_bits
             
-            # Generar datos de frecuencia para gráfica de distribución
-            # Dividir rango en 50 bins para visualización
-            min_val = float(fp.min_value)
-            max_val = float(fp.max_value)
-            epsilon = float(fp.epsilon)
-            
-            # Crear bins
-            num_bins = min(50, total_numbers)
-            if max_val > min_val:
-                bin_width = (max_val - min_val) / num_bins
-            else:
-                bin_width = 1.0
-            
-            labels = []
-            frequencies = []
-            
-            for i in range(num_bins):
-                bin_start = min_val + (i * bin_width)
-                bin_end = bin_start + bin_width
-                bin_center = (bin_start + bin_end) / 2
-                
-                # Estimar frecuencia (uniforme en punto fijo)
-                if max_val > min_val:
-                    frequency = total_numbers / num_bins
-                else:
-                    frequency = total_numbers
-                
-                labels.append(f"{bin_center:.2f}")
-                frequencies.append(frequency)
+            # Histograma exacto de la rejilla k·ε (O(bins), sin enumerar valores)
+            dist = fixed_point_distribution(fp, num_bins=num_bins)
             
             return jsonify({
                 'success': True,
@@ -473,11 +508,11 @@ def distribution_chart_data():
                 'representation': representation_str,
                 'base': base,
                 'tipo_numero': 'fixed_point',
-                'labels': labels,
+                'labels': dist.labels,
                 'datasets': [
                     {
                         'label': f'Distribución ({representation_str})',
-                        'data': frequencies,
+                        'data': dist.counts,
                         'backgroundColor': 'rgba(75, 192, 192, 0.6)',
                         'borderColor': 'rgba(75, 192, 192, 1)',
                         'borderWidth': 1,
@@ -485,10 +520,10 @@ def distribution_chart_data():
                     }
                 ],
                 'statistics': {
-                    'min': min_val,
-                    'max': max_val,
-                    'epsilon': epsilon,
-                    'total_numbers': total_numbers,
+                    'min': dist.min_value,
+                    'max': dist.max_value,
+                    'epsilon': dist.extra['epsilon'],
+                    'total_numbers': dist.total,
                     'total_bits': total_bits,
                     'uniform': True,
                     'gap_type': 'uniforme'
@@ -527,106 +562,40 @@ def distribution_chart_data():
             
             total_bits = 1 + E + F  # sign + exponent + mantissa
             
-            # Para IEEE754, la distribución es no-uniforme (logarítmica en magnitud)
-            # Generar valores representables
-            representable_values = []
+            # Distribución no uniforme: bins logarítmicos sobre los valores positivos
+            # finitos (denormalizados incluidos). Recuento exacto en O(bins).
+            dist = ieee754_distribution(ieee, num_bins=num_bins)
             
-            # Generar valores positivos
-            # El rango de exponente depende de la base y E bits
-            exp_min = 1 - ieee.bias
-            exp_max = ieee.bias - 1
-            
-            for exponent in range(exp_min, exp_max + 1):
-                for mantissa in range(0, min(base**F, 100)):  # Limitar para rendimiento
-                    try:
-                        # Normalizado: 1.M × B^E
-                        val = (1 + mantissa / (base**F)) * (base ** exponent)
-                        representable_values.append(val)
-                        representable_values.append(-val)
-                    except (OverflowError, ValueError, ZeroDivisionError):
-                        pass
-            
-            representable_values = sorted(set([v for v in representable_values if v != 0]))
-            
-            # Crear bins logarítmicos para valores positivos
-            num_bins = 50
-            if representable_values:
-                min_val = min([v for v in representable_values if v > 0])
-                max_val = max([v for v in representable_values if v > 0])
-                
-                # Escala logarítmica en base correspondiente
-                import math
-                if base == 10:
-                    log_func = math.log10
-                elif base == 2:
-                    log_func = math.log2
-                else:
-                    # Para otras bases, usar cambio de base
-                    log_func = lambda x: math.log(x) / math.log(base)
-                
-                try:
-                    log_min = log_func(min_val) if min_val > 0 else -10
-                    log_max = log_func(max_val) if max_val > 0 else 10
-                except (ValueError, ZeroDivisionError):
-                    log_min = -10
-                    log_max = 10
-                
-                labels = []
-                frequencies = []
-                
-                for i in range(num_bins):
-                    log_start = log_min + (i / num_bins) * (log_max - log_min)
-                    log_end = log_min + ((i + 1) / num_bins) * (log_max - log_min)
-                    
-                    # Convertir de log a valor lineal según la base
-                    try:
-                        bin_start = base ** log_start
-                        bin_end = base ** log_end
-                        bin_center = (bin_start + bin_end) / 2
-                        
-                        # Contar valores en este bin
-                        count = len([v for v in representable_values 
-                                   if bin_start <= v < bin_end])
-                    except (OverflowError, ValueError):
-                        bin_center = 0
-                        count = 0
-                    
-                    labels.append(f"{bin_center:.2e}")
-                    frequencies.append(count)
-                
-                return jsonify({
-                    'success': True,
-                    'chart_type': 'bar',
-                    'E': E,
-                    'F': F,
-                    'base': base,
-                    'tipo_numero': 'floating_point',
-                    'labels': labels,
-                    'datasets': [
-                        {
-                            'label': f'Distribución IEEE754 ({E},{F})',
-                            'data': frequencies,
-                            'backgroundColor': 'rgba(200, 100, 150, 0.6)',
-                            'borderColor': 'rgba(200, 100, 150, 1)',
-                            'borderWidth': 1,
-                            'tension': 0.1
-                        }
-                    ],
-                    'statistics': {
-                        'min': min_val,
-                        'max': max_val,
-                        'epsilon': 2**(-F),
-                        'total_numbers': total_bits,
-                        'total_bits': total_bits,
-                        'uniform': False,
-                        'gap_type': 'logarítmica'
+            return jsonify({
+                'success': True,
+                'chart_type': 'bar',
+                'E': E,
+                'F': F,
+                'base': base,
+                'tipo_numero': 'floating_point',
+                'labels': dist.labels,
+                'datasets': [
+                    {
+                        'label': f'Distribución IEEE754 ({E},{F})',
+                        'data': dist.counts,
+                        'backgroundColor': 'rgba(200, 100, 150, 0.6)',
+                        'borderColor': 'rgba(200, 100, 150, 1)',
+                        'borderWidth': 1,
+                        'tension': 0.1
                     }
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': 'No se pudieron generar valores IEEE754'
-                }), 400
+                ],
+                'statistics': {
+                    'min': dist.min_value,
+                    'max': dist.max_value,
+                    'epsilon': dist.extra['epsilon'],
+                    'total_numbers': dist.total,
+                    'denormal_numbers': dist.extra['denormals'],
+                    'normal_numbers': dist.extra['normals'],
+                    'total_bits': total_bits,
+                    'uniform': False,
+                    'gap_type': 'logarítmica'
+                }
+            })
         
         else:
             return jsonify({
@@ -647,6 +616,7 @@ def distribution_chart_data():
 # ============================================================================
 
 @app.route('/api/representations/bcd', methods=['POST'])
+@cached_endpoint
 def bcd_conversion():
     """Convertir número decimal a BCD (Binary Coded Decimal)"""
     try:
@@ -707,6 +677,7 @@ def bcd_conversion():
         }), 400
 
 @app.route('/api/representations/biquinario', methods=['POST'])
+@cached_endpoint
 def biquinario_conversion():
     """Convertir número decimal a Biquinario (7 bits)"""
     try:
@@ -771,6 +742,7 @@ def biquinario_conversion():
         }), 400
 
 @app.route('/api/representations/compare', methods=['POST'])
+@cached_endpoint
 def compare_representations():
     """Comparar múltiples representaciones de un número"""
     try:
@@ -843,6 +815,22 @@ def health_check():
         'message': 'GeneratorFEExercises Web API - Fase 7'
     })
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Contadores de la caché de respuestas (aciertos, fallos, desalojos...)"""
+    return jsonify({
+        'success': True,
+        'cache': response_cache.stats()
+    })
+
+@app.route('/api/cache/clear', methods=['POST'])
+def cache_clear():
+    """Vaciar la caché de respuestas"""
+    return jsonify({
+        'success': True,
+        'cleared': response_cache.clear()
+    })
+
 # ============================================================================
 # API: LENGUAJES FORMALES - Alfabetos (7 endpoints)
 # ============================================================================
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché de respuestas para endpoints puros de la API web.
+
+Los endpoints de simulación (IEEE754, conversión de bases, distribución,
+representaciones) son funciones puras de su cuerpo JSON: con los mismos
+parámetros devuelven siempre la misma respuesta. En una sesión de
+laboratorio muchos alumnos piden los mismos pocos conjuntos de parámetros,
+así que la respuesta se calcula una vez y se sirve desde memoria.
+
+Características:
+    - Clave: endpoint + cuerpo JSON canónico (claves ordenadas, sin espacios),
+      así {"E": 8, "F": 23} y {"F": 23, "E": 8} comparten entrada
+    - Acotada: LRU con `maxsize` entradas y caducidad `ttl` segundos
+    - ETag por respuesta (hash del contenido) para responder 304
+    - Contadores de aciertos/fallos/desalojos para /api/cache/stats
+    - Segura entre hilos (el servidor Flask atiende en paralelo)
+
+No depende de Flask: app.py la envuelve en un decorador.
+
+Uso:
+    cache = ResponseCache(maxsize=1024, ttl=600)
+    key = cache.make_key('/api/convert', body)
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache.put(key, payload_bytes)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class CacheEntry:
+    """Respuesta cacheada (cuerpo ya serializado)."""
+    body: bytes
+    etag: str
+    status: int = 200
+    mimetype: str = 'application/json'
+    expires_at: float = 0.0
+
+
+class ResponseCache:
+    """Caché LRU con caducidad para respuestas de endpoints puros."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: Máximo de respuestas guardadas (las menos usadas se desalojan)
+            ttl: Segundos de validez de cada respuesta (<= 0: sin caducidad)
+            clock: Reloj monotónico (inyectable en tests)
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize debe ser >= 1, recibió {maxsize}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def make_key(endpoint: str, body: Any) -> str:
+        """
+        Clave canónica: mismo endpoint y mismo JSON (sin importar el orden
+        de las claves ni los espacios) producen la misma clave.
+        """
+        canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(f"{endpoint}\n{canonical}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """ETag (sin comillas) a partir del contenido de la respuesta."""
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Devuelve la entrada vigente (y la marca como usada) o None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl > 0 and entry.expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, status: int = 200,
+            mimetype: str = 'application/json') -> CacheEntry:
+        """Guarda una respuesta (desaloja la menos usada si está llena)."""
+        entry = CacheEntry(
+            body=body,
+            etag=self.make_etag(body),
+            status=status,
+            mimetype=mimetype,
+            expires_at=self._clock() + self.ttl,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def record_not_modified(self):
+        """Cuenta una respuesta 304 (el cliente ya tenía la versión vigente)."""
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self) -> int:
+        """Vacía la caché (los contadores se mantienen). Devuelve las entradas borradas."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para /api/cache/stats."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'not_modified': self.not_modified,
+            }
@@ -81,15 +81,15 @@ async function analyzeDistribution() {
             <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-top: 20px;">
                 <div class="stat-box">
                     <label>Mín. Valor:</label>
-                    <span>${stats.min.toFixed(6)}</span>
+                    <span>${formatStat(stats.min)}</span>
                 </div>
                 <div class="stat-box">
                     <label>Máx. Valor:</label>
-                    <span>${stats.max.toFixed(6)}</span>
+                    <span>${formatStat(stats.max)}</span>
                 </div>
                 <div class="stat-box">
                     <label>Epsilon (Brecha):</label>
-                    <span>${stats.epsilon.toFixed(6)}</span>
+                    <span>${formatStat(stats.epsilon)}</span>
                 </div>
                 <div class="stat-box">
                     <label>Total Bits:</label>
@@ -154,7 +154,7 @@ async function analyzeDistribution() {
                     tooltip: {
                         callbacks: {
                             label: function(context) {
-                                return `Frecuencia: ${context.parsed.y.toFixed(2)}`;
+                                return `Frecuencia: ${context.parsed.y.toLocaleString()}`;
                             }
                         }
                     }
@@ -190,6 +190,19 @@ async function analyzeDistribution() {
     }
 }
 
+/**
+ * Formatear un extremo del rango (el servidor lo envía como texto si no cabe en float)
+ */
+function formatStat(value) {
+    if (typeof value !== 'number') {
+        return value;
+    }
+    const magnitude = Math.abs(value);
+    return (magnitude !== 0 && (magnitude < 1e-4 || magnitude >= 1e9))
+        ? value.toExponential(6)
+        : value.toFixed(6);
+}
+
 /**
  * Limpiar gráfica
  */